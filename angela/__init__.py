@@ -2,65 +2,39 @@
 """
 Angela CLI: AI-powered command-line assistant integrated into your terminal shell.
 """
+from typing import Any, Optional
 
 __version__ = '0.1.0'
 
-# Import key functions needed at the top level
-from angela.api.cli import app
-from angela.core.registry import registry
 
+def __getattr__(name: str) -> Any:
+    """Load the CLI application on first access instead of at import time."""
+    if name == "app":
+        from angela.api.cli import app
+        return app
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
-def init_application():
-    """Initialize all application components."""
 
-    from angela.components.safety import register_safety_functions
-    register_safety_functions()   
+def init_application(command: Optional[str] = None):
+    """
+    Initialize application components.
     
-    # Import and register core components
-    from angela.api.cli import get_app
-    from angela.api.execution import get_execution_engine, get_adaptive_engine
-    from angela.api.safety import get_command_validator
-    from angela.api.context import get_context_manager, get_semantic_context_manager
-    from angela.orchestrator import orchestrator
+    Core services are registered as lazy registry factories and created on
+    first use. Only the startup work that ``command`` needs is run eagerly.
     
-    # Register critical components
-    registry.register("app", get_app())
-    registry.register("execution_engine", get_execution_engine())
-    registry.register("adaptive_engine", get_adaptive_engine())
-    registry.register("orchestrator", orchestrator)
+    Args:
+        command: The top-level subcommand being run. None performs the full
+            initialization (used by the resident daemon and embedders).
+    """
+    from angela.startup import register_service_factories, get_startup_profile, run_startup_steps
     
-    # Initialize toolchain components
-    from angela.api.toolchain import get_universal_cli_translator, get_enhanced_universal_cli
-    from angela.api.toolchain import get_cross_tool_workflow_engine, get_ci_cd_integration
+    # Register factories for all core services (nothing is imported yet)
+    register_service_factories()
     
-    # Register toolchain components
-    registry.register("universal_cli_translator", get_universal_cli_translator())
-    registry.register("enhanced_universal_cli", get_enhanced_universal_cli())
-    registry.register("cross_tool_workflow_engine", get_cross_tool_workflow_engine())
-    registry.register("ci_cd_integration", get_ci_cd_integration())
-    
-    # Initialize monitoring components
-    from angela.api.monitoring import get_proactive_assistant
-    proactive_assistant = get_proactive_assistant()
-    registry.register("proactive_assistant", proactive_assistant)
-    
-    # Start proactive assistant
-    try:
-        proactive_assistant.start()
-    except Exception as e:
-        from angela.utils.logging import get_logger
-        logger = get_logger(__name__)
-        logger.error(f"Failed to start proactive assistant: {str(e)}")
-    
-    # Initialize context and semantic context
-    context_manager = get_context_manager()
-    semantic_context_manager = get_semantic_context_manager()
-    
-    # Initialize project inference
-    from angela.api.context import initialize_project_inference
-    initialize_project_inference()
+    # Run only the startup side effects this command needs
+    run_startup_steps(get_startup_profile(command))
     
     # Log initialization completion
     from angela.utils.logging import get_logger
     logger = get_logger(__name__)
-    logger.info("Application initialization completed")
+    logger.debug(f"Application initialization completed for command: {command or 'all'}")
@@ -2,12 +2,7 @@
 """
 Entry point for Angela CLI.
 """
-from angela.components.cli import app
-from angela import init_application
+from angela.startup import main
 
 if __name__ == "__main__":
-    # Initialize all application components
-    init_application()
-    
-    # CLI application
-    app()
+    main()
@@ -6,20 +6,10 @@ This module provides a clean, stable interface to access all Angela CLI componen
 Each sub-module provides access to a specific category of functionality.
 """
 
-# Import all API modules to make them available through the API package
-from angela.api import cli
-from angela.api import ai
-from angela.api import context
-from angela.api import execution
-from angela.api import generation
-from angela.api import intent
-from angela.api import monitoring
-from angela.api import review
-from angela.api import safety
-from angela.api import shell
-from angela.api import toolchain
-from angela.api import workflows
-from angela.api import interfaces
+# API modules are imported on first attribute access so that importing one of
+# them (e.g. ``angela.api.context``) does not load the whole application
+import importlib
+from typing import Any
 
 # Define the public API
 __all__ = [
@@ -37,3 +27,10 @@ __all__ = [
     'toolchain',
     'workflows'
 ]
+
+
+def __getattr__(name: str) -> Any:
+    """Import API sub-modules on first access."""
+    if name in __all__:
+        return importlib.import_module(f"{__name__}.{name}")
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -6,9 +6,25 @@ This module provides functions to access AI components with lazy initialization.
 from typing import Optional, Type, Any, Callable
 
 from angela.core.registry import registry
-from angela.components.ai.client import gemini_client, GeminiRequest
-from angela.components.ai.parser import parse_ai_response, CommandSuggestion
-from angela.components.ai.prompts import build_prompt
+
+# Names re-exported from the AI components. They are resolved on first access
+# so that importing this API module does not load the Gemini SDK.
+_LAZY_EXPORTS = {
+    "gemini_client": "angela.components.ai.client",
+    "GeminiRequest": "angela.components.ai.client",
+    "parse_ai_response": "angela.components.ai.parser",
+    "CommandSuggestion": "angela.components.ai.parser",
+    "build_prompt": "angela.components.ai.prompts",
+}
+
+
+def __getattr__(name: str) -> Any:
+    """Resolve lazily re-exported component names."""
+    module_path = _LAZY_EXPORTS.get(name)
+    if module_path is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    import importlib
+    return getattr(importlib.import_module(module_path), name)
 
 
 # Gemini Client API
@@ -17,6 +33,24 @@ def get_gemini_client():
     from angela.components.ai.client import GeminiClient, gemini_client 
     return registry.get_or_create("gemini_client", GeminiClient, factory=lambda: gemini_client)
 
+def get_response_cache():
+    """Get the Gemini response cache, or None if response caching is disabled."""
+    return get_gemini_client().response_cache
+
+def get_request_scheduler():
+    """Get the scheduler all Gemini API calls are dispatched through."""
+    return get_gemini_client().scheduler
+
+def get_llm_priority_enum() -> Type[Any]:
+    """Get the Priority enum for LLM calls."""
+    from angela.components.ai.scheduler import Priority
+    return Priority
+
+def get_llm_priority_func() -> Callable:
+    """Get the llm_priority context manager."""
+    from angela.components.ai.scheduler import llm_priority
+    return llm_priority
+
 def get_gemini_request_class() -> Type[Any]: 
     """Get the GeminiRequest class."""
     from angela.components.ai.client import GeminiRequest 
@@ -33,6 +67,11 @@ def get_parse_ai_response_func() -> Callable:
     from angela.components.ai.parser import parse_ai_response 
     return parse_ai_response
 
+def get_streaming_response_parser_class() -> Type[Any]:
+    """Get the StreamingResponseParser class."""
+    from angela.components.ai.parser import StreamingResponseParser
+    return StreamingResponseParser
+
 # Prompt API
 def get_build_prompt_func() -> Callable:
     """Get the build_prompt function."""
@@ -68,3 +107,8 @@ def get_semantic_analyzer():
     """Get the semantic analyzer instance."""
     from angela.components.ai.semantic_analyzer import SemanticAnalyzer, semantic_analyzer 
     return registry.get_or_create("semantic_analyzer", SemanticAnalyzer, factory=lambda: semantic_analyzer)
+
+def get_symbol_index_class() -> Type[Any]:
+    """Get the SymbolIndex class."""
+    from angela.components.ai.symbol_index import SymbolIndex
+    return SymbolIndex
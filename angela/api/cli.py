@@ -14,6 +14,7 @@ from angela.components.cli.files import app as files_app
 from angela.components.cli.workflows import app as workflows_app
 from angela.components.cli.generation import app as generation_app
 from angela.components.cli.docker import app as docker_app
+from angela.components.cli.daemon import app as daemon_app
 from angela.components.execution.rollback_commands import app as rollback_app
 
 # Main CLI App
@@ -37,6 +38,10 @@ def get_docker_app():
     """Get the docker CLI app instance."""
     return registry.get_or_create("docker_app", typer.Typer, factory=lambda: docker_app)
 
+def get_daemon_app():
+    """Get the daemon CLI app instance."""
+    return registry.get_or_create("daemon_app", typer.Typer, factory=lambda: daemon_app)
+
 def get_rollback_app():
     """Get the rollback commands CLI app instance."""
     return registry.get_or_create("rollback_app", typer.Typer, factory=lambda: rollback_app)
@@ -69,6 +74,7 @@ def _ensure_subcommands_registered(app):
     generation = get_generation_app()
     docker = get_docker_app()
     rollback = get_rollback_app()
+    daemon = get_daemon_app()
     
     # Check if subcommands are already registered
     registered_commands = getattr(app, "registered_commands", {})
@@ -88,6 +94,9 @@ def _ensure_subcommands_registered(app):
     
     if "docker" not in registered_commands:
         app.add_typer(docker, name="docker", help="Docker and Docker Compose operations")
+
+    if "daemon" not in registered_commands:
+        app.add_typer(daemon, name="daemon", help="Resident daemon management")
         
         
 app = get_app()        
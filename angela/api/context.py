@@ -81,12 +81,43 @@ def get_project_inference():
     from angela.components.context.project_inference import ProjectInference, project_inference 
     return registry.get_or_create("project_inference", ProjectInference, factory=lambda: project_inference)
 
+# Project Index API
+def get_project_index_manager():
+    """Get the project index manager instance."""
+    from angela.components.context.project_index import ProjectIndexManager, project_index_manager
+    return registry.get_or_create("project_index_manager", ProjectIndexManager, factory=lambda: project_index_manager)
+
+def get_project_index(project_root: Union[str, Path], refresh: bool = True):
+    """Get the (refreshed) file index for a project root."""
+    return get_project_index_manager().get_index(project_root, refresh=refresh)
+
+async def get_project_index_async(project_root: Union[str, Path], refresh: bool = True):
+    """Get the (refreshed) file index for a project root, refreshing off the event loop."""
+    return await get_project_index_manager().get_index_async(project_root, refresh=refresh)
+
+# Context Pipeline API
+def get_context_pipeline():
+    """Get the incremental context pipeline instance."""
+    from angela.components.context.pipeline import ContextPipeline, context_pipeline
+    return registry.get_or_create("context_pipeline", ContextPipeline, factory=lambda: context_pipeline)
+
+def get_stage_timings_class():
+    """Get the StageTimings class for per-request timing breakdowns."""
+    from angela.components.context.pipeline import StageTimings
+    return StageTimings
+
 # Project State Analyzer API
 def get_project_state_analyzer():
     """Get the project state analyzer instance."""
     from angela.components.context.project_state_analyzer import ProjectStateAnalyzer, project_state_analyzer 
     return registry.get_or_create("project_state_analyzer", ProjectStateAnalyzer, factory=lambda: project_state_analyzer)
 
+# Git State API
+def get_git_state_provider():
+    """Get the Git state provider instance."""
+    from angela.components.context.git_state import GitStateProvider, git_state_provider
+    return registry.get_or_create("git_state_provider", GitStateProvider, factory=lambda: git_state_provider)
+
 # Semantic Context Manager API
 def get_semantic_context_manager():
     """Get the semantic context manager instance."""
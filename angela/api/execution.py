@@ -32,6 +32,29 @@ def get_rollback_manager():
     from angela.components.execution.rollback import RollbackManager, rollback_manager
     return registry.get_or_create("rollback_manager", RollbackManager, factory=lambda: rollback_manager)
 
+# Step Scheduler API
+def get_step_scheduler():
+    """Create a step scheduler for running a plan's steps as a DAG."""
+    from angela.components.execution.step_scheduler import create_step_scheduler
+    return create_step_scheduler()
+
+def get_scheduled_step_classes():
+    """Get the ScheduledStep and StepOutcome classes used to describe steps to a step scheduler."""
+    from angela.components.execution.step_scheduler import ScheduledStep, StepOutcome
+    return ScheduledStep, StepOutcome
+
+# Sandbox Pool API
+def get_sandbox_pool(language: str = "python"):
+    """Get the warm interpreter pool running sandboxed code in the given language."""
+    from angela.components.execution.sandbox_pool import SandboxPool, create_sandbox_pool
+    return registry.get_or_create(f"sandbox_pool_{language}", SandboxPool, factory=lambda: create_sandbox_pool(language))
+
+# Backup Store API
+def get_backup_store():
+    """Get the rollback backup store instance."""
+    from angela.components.execution.backup_store import BackupStore, create_backup_store
+    return registry.get_or_create("backup_store", BackupStore, factory=create_backup_store)
+
 # Execution Hooks API
 def get_execution_hooks():
     """Get the execution hooks instance."""
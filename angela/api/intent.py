@@ -14,6 +14,12 @@ def get_intent_model_classes():
     from angela.components.intent.models import Intent, IntentType, ActionPlan
     return Intent, IntentType, ActionPlan
 
+# Request Classifier API
+def get_request_classifier():
+    """Get the request classifier instance."""
+    from angela.components.intent.request_classifier import RequestClassifier, request_classifier
+    return registry.get_or_create("request_classifier", RequestClassifier, factory=lambda: request_classifier)
+
 # Task Planner API
 def get_task_planner():
     """Get the task planner instance."""
@@ -31,3 +31,20 @@ def get_proactive_assistant():
     """Get the proactive assistant instance."""
     from angela.components.monitoring.proactive_assistant import ProactiveAssistant, proactive_assistant 
     return registry.get_or_create("proactive_assistant", ProactiveAssistant, factory=lambda: proactive_assistant)
+
+# Daemon API
+def get_angela_daemon():
+    """Get the resident daemon instance."""
+    from angela.components.monitoring.daemon import AngelaDaemon, angela_daemon
+    return registry.get_or_create("angela_daemon", AngelaDaemon, factory=lambda: angela_daemon)
+
+def get_daemon_client():
+    """Get the daemon client module (notification sender and control requests)."""
+    from angela.components.monitoring import daemon_client
+    return daemon_client
+
+# File Watcher API
+def get_file_watcher():
+    """Get the file watcher instance."""
+    from angela.components.monitoring.file_watcher import FileWatcher, file_watcher
+    return registry.get_or_create("file_watcher", FileWatcher, factory=lambda: file_watcher)
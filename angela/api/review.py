@@ -11,8 +11,8 @@ from angela.core.registry import registry
 # Diff Manager API
 def get_diff_manager():
     """Get the diff manager instance."""
-    from angela.components.review.diff_manager import diff_manager
-    return registry.get_or_create("diff_manager", lambda: diff_manager)
+    from angela.components.review.diff_manager import DiffManager, diff_manager
+    return registry.get_or_create("diff_manager", DiffManager, factory=lambda: diff_manager)
 
 # Feedback Manager API
 def get_feedback_manager():
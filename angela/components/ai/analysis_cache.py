@@ -0,0 +1,254 @@
+# angela/components/ai/analysis_cache.py
+"""
+Persistent cache of semantic analysis results.
+
+Parsing a project's source files is the most expensive part of building
+semantic context, and every new Angela process used to repeat it. Analysis
+results (``Module.to_dict`` payloads) are stored in a SQLite database under
+``CONFIG_DIR/cache`` shared by all processes, one row per file.
+
+An entry is valid for a file while its size and mtime match. If they do not
+but the content hash still does (a checkout or touch that restored the same
+content), the entry is refreshed instead of re-parsing. Entries also record
+the analyzer version, so a change to the extraction logic invalidates them.
+
+Payloads are stored as zlib-compressed compact JSON. The database is opened
+on first use. Entries are evicted least recently used first once the total
+payload size exceeds the cap.
+"""
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+import zlib
+from pathlib import Path
+from typing import Any, Dict, Optional, Union
+
+from angela.constants import ANALYSIS_CACHE_FILE
+from angela.utils.logging import get_logger
+
+logger = get_logger(__name__)
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS analyses (
+    path TEXT PRIMARY KEY,
+    size INTEGER NOT NULL,
+    mtime_ns INTEGER NOT NULL,
+    content_hash TEXT NOT NULL,
+    version TEXT NOT NULL,
+    payload BLOB NOT NULL,
+    last_used REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS analyses_by_use ON analyses (last_used);
+"""
+
+# Evict down to this share of the size cap, so eviction does not run on every write
+EVICTION_TARGET = 0.9
+
+
+def hash_file(path: Union[str, Path]) -> str:
+    """
+    Hash a file's content.
+
+    Args:
+        path: The file
+
+    Returns:
+        Hex digest of the content
+    """
+    digest = hashlib.blake2b(digest_size=16)
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(1024 * 1024), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+class AnalysisCache:
+    """Semantic analysis results keyed by file path, stat and content hash."""
+
+    def __init__(self, db_path: Optional[Path] = None, max_bytes: int = 128 * 1024 * 1024):
+        """
+        Initialize the cache. The database is opened on first use.
+
+        Args:
+            db_path: Path to the SQLite database
+            max_bytes: Maximum total size of the stored payloads
+        """
+        self._logger = logger
+        self.db_path = Path(db_path or ANALYSIS_CACHE_FILE)
+        self.max_bytes = max_bytes
+        self._conn: Optional[sqlite3.Connection] = None
+        self._lock = threading.RLock()
+        self._total_bytes: Optional[int] = None
+
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def _connect(self) -> sqlite3.Connection:
+        if self._conn is None:
+            self.db_path.parent.mkdir(parents=True, exist_ok=True)
+            conn = sqlite3.connect(str(self.db_path), check_same_thread=False, isolation_level=None, timeout=5)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.executescript(SCHEMA)
+            self._conn = conn
+        return self._conn
+
+    def get(self, path: Union[str, Path], version: str) -> Optional[Dict[str, Any]]:
+        """
+        Look up the analysis of a file.
+
+        Args:
+            path: The analyzed file
+            version: Version of the analyzer that must have produced the entry
+
+        Returns:
+            The stored payload, or None if there is no valid entry
+        """
+        path = str(path)
+        try:
+            st = os.stat(path)
+            with self._lock:
+                conn = self._connect()
+                row = conn.execute(
+                    "SELECT size, mtime_ns, content_hash, version, payload FROM analyses WHERE path = ?", (path,)
+                ).fetchone()
+                if row is None or row[3] != version:
+                    self.misses += 1
+                    return None
+
+                size, mtime_ns, content_hash, _, payload = row
+                if (size, mtime_ns) != (st.st_size, st.st_mtime_ns):
+                    if size != st.st_size or hash_file(path) != content_hash:
+                        self.misses += 1
+                        return None
+                    # Same content under a new mtime
+                    conn.execute("UPDATE analyses SET mtime_ns = ? WHERE path = ?", (st.st_mtime_ns, path))
+
+                conn.execute("UPDATE analyses SET last_used = ? WHERE path = ?", (time.time(), path))
+                self.hits += 1
+            return json.loads(zlib.decompress(payload))
+        except (OSError, sqlite3.Error, ValueError, zlib.error) as e:
+            self._logger.debug(f"Analysis cache lookup failed for {path}: {str(e)}")
+            self.misses += 1
+            return None
+
+    def put(self, path: Union[str, Path], version: str, payload: Dict[str, Any],
+            analyzed_mtime_ns: Optional[int] = None) -> None:
+        """
+        Store the analysis of a file as of its current content.
+
+        Args:
+            path: The analyzed file
+            version: Version of the analyzer that produced the payload
+            payload: JSON-serializable analysis result
+            analyzed_mtime_ns: The file's mtime when analysis started; nothing
+                is stored if the file has changed since
+        """
+        path = str(path)
+        try:
+            st = os.stat(path)
+            if analyzed_mtime_ns is not None and st.st_mtime_ns != analyzed_mtime_ns:
+                return
+            content_hash = hash_file(path)
+            data = zlib.compress(json.dumps(payload, separators=(",", ":")).encode("utf-8"))
+            with self._lock:
+                conn = self._connect()
+                total = self._get_total_bytes(conn)
+                old = conn.execute("SELECT length(payload) FROM analyses WHERE path = ?", (path,)).fetchone()
+                conn.execute(
+                    "INSERT OR REPLACE INTO analyses VALUES (?, ?, ?, ?, ?, ?, ?)",
+                    (path, st.st_size, st.st_mtime_ns, content_hash, version, data, time.time())
+                )
+                self._total_bytes = total + len(data) - (old[0] if old else 0)
+                if self._total_bytes > self.max_bytes:
+                    self._evict(conn)
+        except (OSError, sqlite3.Error, TypeError, ValueError) as e:
+            self._logger.debug(f"Could not cache analysis of {path}: {str(e)}")
+
+    def invalidate(self, path: Union[str, Path]) -> None:
+        """
+        Drop the entry of a file.
+
+        Args:
+            path: The file
+        """
+        try:
+            with self._lock:
+                conn = self._connect()
+                row = conn.execute("SELECT length(payload) FROM analyses WHERE path = ?", (str(path),)).fetchone()
+                if row:
+                    conn.execute("DELETE FROM analyses WHERE path = ?", (str(path),))
+                    if self._total_bytes is not None:
+                        self._total_bytes -= row[0]
+        except sqlite3.Error as e:
+            self._logger.debug(f"Could not invalidate cached analysis of {path}: {str(e)}")
+
+    def _get_total_bytes(self, conn: sqlite3.Connection) -> int:
+        if self._total_bytes is None:
+            self._total_bytes = conn.execute("SELECT COALESCE(SUM(length(payload)), 0) FROM analyses").fetchone()[0]
+        return self._total_bytes
+
+    def _evict(self, conn: sqlite3.Connection) -> None:
+        """Remove least recently used entries until under the eviction target."""
+        target = self.max_bytes * EVICTION_TARGET
+        # Other processes write to the same database; start from the real total
+        total = conn.execute("SELECT COALESCE(SUM(length(payload)), 0) FROM analyses").fetchone()[0]
+        doomed = []
+        for path, size in conn.execute("SELECT path, length(payload) FROM analyses ORDER BY last_used"):
+            if total <= target:
+                break
+            doomed.append((path,))
+            total -= size
+        conn.executemany("DELETE FROM analyses WHERE path = ?", doomed)
+        self._total_bytes = total
+        self.evictions += len(doomed)
+
+    def clear(self) -> None:
+        """Remove all entries."""
+        with self._lock:
+            self._connect().execute("DELETE FROM analyses")
+            self._total_bytes = 0
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Get cache statistics.
+
+        Returns:
+            Dictionary with hit, miss, eviction and size counters
+        """
+        with self._lock:
+            conn = self._connect()
+            entries = conn.execute("SELECT COUNT(*) FROM analyses").fetchone()[0]
+            return {
+                "entries": entries,
+                "bytes": self._get_total_bytes(conn),
+                "max_bytes": self.max_bytes,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions
+            }
+
+    def close(self) -> None:
+        """Close the database connection."""
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
+
+
+def create_analysis_cache() -> Optional[AnalysisCache]:
+    """
+    Create the analysis cache from the application configuration.
+
+    Returns:
+        An AnalysisCache, or None if semantic analysis caching is disabled
+    """
+    from angela.config import config_manager
+    cache_config = config_manager.config.cache
+    if not cache_config.semantic_enabled:
+        return None
+    return AnalysisCache(max_bytes=cache_config.semantic_max_bytes)
@@ -0,0 +1,382 @@
+# angela/components/ai/backends.py
+"""
+Model backends behind GeminiClient.
+
+The client handles caching, scheduling, retries and response validation;
+a backend only turns a prompt into a response. Besides the live Gemini
+backend there are two offline backends, so request handling can be run
+and benchmarked without network access or an API key:
+
+- ``replay`` serves responses recorded in a JSONL fixture file, matched on
+  the prompt (exactly, or with whitespace and digits normalized). With a
+  recording source set, misses are forwarded to it and appended to the
+  file, which is how fixtures are captured.
+- ``synthetic`` answers every prompt after a configurable latency, with a
+  throughput-limited stream, using a canned response.
+
+The backend is selected with ``[llm] backend`` in the configuration or the
+``ANGELA_LLM_BACKEND`` environment variable.
+"""
+import hashlib
+import json
+import os
+import re
+import threading
+import time
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterator, List, Optional
+
+from angela.constants import GEMINI_MODEL
+from angela.utils.logging import get_logger
+
+try:
+    import google.generativeai as genai
+    from google.generativeai.types import GenerationConfig, HarmCategory, HarmBlockThreshold
+    _GENAI_AVAILABLE = True
+except ImportError:
+    genai = None
+    _GENAI_AVAILABLE = False
+
+logger = get_logger(__name__)
+
+
+class ReplayMissError(LookupError):
+    """No recorded response matches a prompt."""
+
+
+class BackendConfigurationError(ValueError):
+    """A backend cannot be used as configured (missing SDK, API key or fixtures)."""
+
+
+# Failures that a retry cannot fix
+NON_RETRYABLE_ERRORS = (BackendConfigurationError, ReplayMissError)
+
+
+class BackendPart:
+    """A text part of a backend response."""
+
+    def __init__(self, text: str):
+        self.text = text
+
+
+class BackendResponse:
+    """
+    Minimal response object with the attributes GeminiClient reads from SDK
+    responses (``text``, ``parts``, ``prompt_feedback`` and ``candidates``).
+    """
+
+    def __init__(self, text: str):
+        self.text = text
+        self.parts = [BackendPart(text)] if text else []
+        self.prompt_feedback = None
+        self.candidates: List[Any] = []
+
+
+class LLMBackend:
+    """
+    Interface of a model backend.
+
+    ``generate_content`` is called on a worker thread and may block. With
+    ``stream=True`` it returns an iterable of response chunks, otherwise a
+    single response.
+    """
+
+    name = "base"
+
+    @property
+    def model_name(self) -> str:
+        """Model identifier, part of the response cache key."""
+        return self.name
+
+    def generate_content(
+        self,
+        prompt: str,
+        stream: bool = False,
+        temperature: float = 0.0,
+        max_output_tokens: int = 0,
+        safety: str = "permissive"
+    ) -> Any:
+        """
+        Generate a response.
+
+        Args:
+            prompt: Full prompt text
+            stream: Return an iterable of chunks instead of one response
+            temperature: Sampling temperature
+            max_output_tokens: Output token limit
+            safety: ``permissive`` or ``api_default`` safety settings
+
+        Returns:
+            A response object, or an iterable of chunk responses when streaming
+        """
+        raise NotImplementedError
+
+
+class GeminiBackend(LLMBackend):
+    """The Google Gemini API."""
+
+    name = "gemini"
+
+    def __init__(self, model_name: str = GEMINI_MODEL):
+        """
+        Initialize the backend. The SDK is configured on first use.
+
+        Args:
+            model_name: Gemini model to use
+        """
+        self._model_name = model_name
+        self._model = None
+        self._lock = threading.Lock()
+
+    @property
+    def model_name(self) -> str:
+        return self._model_name
+
+    def generate_content(
+        self,
+        prompt: str,
+        stream: bool = False,
+        temperature: float = 0.0,
+        max_output_tokens: int = 0,
+        safety: str = "permissive"
+    ) -> Any:
+        kwargs: Dict[str, Any] = {
+            "generation_config": GenerationConfig(temperature=temperature, max_output_tokens=max_output_tokens),
+        }
+        if safety == "permissive":
+            kwargs["safety_settings"] = {
+                HarmCategory.HARM_CATEGORY_HARASSMENT: HarmBlockThreshold.BLOCK_NONE,
+                HarmCategory.HARM_CATEGORY_HATE_SPEECH: HarmBlockThreshold.BLOCK_NONE,
+                HarmCategory.HARM_CATEGORY_SEXUALLY_EXPLICIT: HarmBlockThreshold.BLOCK_NONE,
+                HarmCategory.HARM_CATEGORY_DANGEROUS_CONTENT: HarmBlockThreshold.BLOCK_NONE,
+            }
+        return self._get_model().generate_content(prompt, stream=stream, **kwargs)
+
+    def _get_model(self):
+        """Configure the SDK and create the model on first use."""
+        with self._lock:
+            if self._model is None:
+                if not _GENAI_AVAILABLE:
+                    raise BackendConfigurationError("google-generativeai is not installed; the Gemini backend is unavailable.")
+                from angela.config import config_manager
+                api_key = config_manager.config.api.gemini_api_key
+                if not api_key:
+                    logger.error("Gemini API key is not configured.")
+                    raise BackendConfigurationError("Gemini API key is not configured. Run 'angela init' to set it up.")
+                genai.configure(api_key=api_key)
+                self._model = genai.GenerativeModel(self._model_name)
+                logger.debug(f"Gemini API client initialized with model: {self._model_name}")
+            return self._model
+
+
+def _chunk_text(text: str, size: int) -> List[str]:
+    """Split text into pieces of at most ``size`` characters."""
+    size = max(1, size)
+    return [text[i:i + size] for i in range(0, len(text), size)] or [""]
+
+
+class ReplayBackend(LLMBackend):
+    """Serves recorded prompt → response fixtures."""
+
+    name = "replay"
+
+    def __init__(
+        self,
+        fixtures_path: Path,
+        record_from: Optional[LLMBackend] = None,
+        chunk_size: int = 64
+    ):
+        """
+        Load the fixtures.
+
+        Args:
+            fixtures_path: JSONL file with ``prompt`` and ``response`` fields
+            record_from: Backend to call and record on a miss; None makes misses errors
+            chunk_size: Characters per chunk when streaming a recorded response
+        """
+        self.fixtures_path = Path(fixtures_path)
+        self.record_from = record_from
+        self.chunk_size = chunk_size
+        self._exact: Dict[str, str] = {}
+        self._normalized: Dict[str, str] = {}
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self._load()
+
+    @staticmethod
+    def prompt_key(prompt: str) -> str:
+        """Key of a prompt for exact matching."""
+        return hashlib.sha256(prompt.encode("utf-8", errors="surrogatepass")).hexdigest()
+
+    @staticmethod
+    def normalized_key(prompt: str) -> str:
+        """
+        Key of a prompt with volatile details removed.
+
+        Collapses whitespace and replaces digit runs, so prompts that only
+        differ in timestamps, PIDs or sizes still match their recording.
+        """
+        normalized = re.sub(r"\d+", "0", " ".join(prompt.split()))
+        return hashlib.sha256(normalized.encode("utf-8", errors="surrogatepass")).hexdigest()
+
+    def generate_content(
+        self,
+        prompt: str,
+        stream: bool = False,
+        temperature: float = 0.0,
+        max_output_tokens: int = 0,
+        safety: str = "permissive"
+    ) -> Any:
+        text = self._lookup(prompt)
+        if text is None:
+            if self.record_from is None:
+                with self._lock:
+                    self.misses += 1
+                raise ReplayMissError(f"No recorded response for prompt {self.prompt_key(prompt)[:12]}")
+            text = self._record(prompt, temperature, max_output_tokens, safety)
+        if stream:
+            return [BackendResponse(chunk) for chunk in _chunk_text(text, self.chunk_size)]
+        return BackendResponse(text)
+
+    def add(self, prompt: str, response: str) -> None:
+        """
+        Record a response and append it to the fixture file.
+
+        Args:
+            prompt: Prompt text
+            response: Response text
+        """
+        with self._lock:
+            self._remember(prompt, response)
+            self.fixtures_path.parent.mkdir(parents=True, exist_ok=True)
+            with open(self.fixtures_path, "a", encoding="utf-8") as f:
+                f.write(json.dumps({"prompt": prompt, "response": response}) + "\n")
+
+    def _lookup(self, prompt: str) -> Optional[str]:
+        with self._lock:
+            text = self._exact.get(self.prompt_key(prompt))
+            if text is None:
+                text = self._normalized.get(self.normalized_key(prompt))
+            if text is not None:
+                self.hits += 1
+            return text
+
+    def _record(self, prompt: str, temperature: float, max_output_tokens: int, safety: str) -> str:
+        response = self.record_from.generate_content(
+            prompt, temperature=temperature, max_output_tokens=max_output_tokens, safety=safety
+        )
+        text = getattr(response, "text", "") or ""
+        if text:
+            self.add(prompt, text)
+        return text
+
+    def _remember(self, prompt: str, response: str) -> None:
+        self._exact[self.prompt_key(prompt)] = response
+        self._normalized[self.normalized_key(prompt)] = response
+
+    def _load(self) -> None:
+        if not self.fixtures_path.exists():
+            return
+        with open(self.fixtures_path, encoding="utf-8") as f:
+            for line_number, line in enumerate(f, 1):
+                if not line.strip():
+                    continue
+                try:
+                    entry = json.loads(line)
+                    self._remember(entry["prompt"], entry["response"])
+                except (ValueError, KeyError) as e:
+                    logger.warning(f"Skipping malformed fixture {self.fixtures_path}:{line_number}: {str(e)}")
+        logger.debug(f"Loaded {len(self._exact)} recorded responses from {self.fixtures_path}")
+
+
+DEFAULT_SYNTHETIC_RESPONSE = json.dumps({
+    "intent": "synthetic",
+    "command": "echo 'synthetic response'",
+    "explanation": "Canned response from the synthetic LLM backend.",
+    "additional_info": None,
+})
+
+
+class SyntheticBackend(LLMBackend):
+    """Answers every prompt with a canned response after a fixed latency."""
+
+    name = "synthetic"
+
+    def __init__(
+        self,
+        latency: float = 0.5,
+        tokens_per_second: float = 200.0,
+        responder: Optional[Callable[[str], str]] = None,
+        chunk_size: int = 16
+    ):
+        """
+        Initialize the backend.
+
+        Args:
+            latency: Seconds before the first output (time to first token)
+            tokens_per_second: Output rate after the first token; 0 for instant
+            responder: Builds the response for a prompt; defaults to a command suggestion
+            chunk_size: Characters per streamed chunk
+        """
+        self.latency = latency
+        self.tokens_per_second = tokens_per_second
+        self.responder = responder or (lambda prompt: DEFAULT_SYNTHETIC_RESPONSE)
+        self.chunk_size = chunk_size
+        self.calls = 0
+
+    def generate_content(
+        self,
+        prompt: str,
+        stream: bool = False,
+        temperature: float = 0.0,
+        max_output_tokens: int = 0,
+        safety: str = "permissive"
+    ) -> Any:
+        self.calls += 1
+        text = self.responder(prompt)
+        chunks = _chunk_text(text, self.chunk_size)
+        if stream:
+            return self._stream(chunks)
+        time.sleep(self.latency + sum(self._chunk_delay(chunk) for chunk in chunks))
+        return BackendResponse(text)
+
+    def _stream(self, chunks: List[str]) -> Iterator[BackendResponse]:
+        time.sleep(self.latency)
+        for chunk in chunks:
+            time.sleep(self._chunk_delay(chunk))
+            yield BackendResponse(chunk)
+
+    def _chunk_delay(self, chunk: str) -> float:
+        if self.tokens_per_second <= 0:
+            return 0.0
+        return (len(chunk) / 4) / self.tokens_per_second
+
+
+def create_backend(name: Optional[str] = None) -> LLMBackend:
+    """
+    Create the configured model backend.
+
+    Args:
+        name: Backend name; defaults to ``ANGELA_LLM_BACKEND`` or the configuration
+
+    Returns:
+        An LLMBackend
+    """
+    from angela.config import config_manager
+    llm_config = config_manager.config.llm
+    name = (name or os.getenv("ANGELA_LLM_BACKEND") or llm_config.backend).lower()
+
+    if name == "gemini":
+        return GeminiBackend()
+    if name == "replay":
+        if not llm_config.replay_path:
+            raise BackendConfigurationError("The replay backend needs [llm] replay_path to point at a fixture file.")
+        record_from = GeminiBackend() if llm_config.replay_record else None
+        return ReplayBackend(Path(llm_config.replay_path).expanduser(), record_from=record_from)
+    if name == "synthetic":
+        return SyntheticBackend(
+            latency=llm_config.synthetic_latency,
+            tokens_per_second=llm_config.synthetic_tokens_per_second,
+        )
+    raise BackendConfigurationError(f"Unknown LLM backend: {name}")
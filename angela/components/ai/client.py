@@ -1,15 +1,17 @@
 # angela/components/ai/client.py
 import asyncio
 import random # For jitter in retries
-from typing import Dict, Any, Optional, List
-
-import google.generativeai as genai
-from google.generativeai.types import GenerationConfig, HarmCategory, HarmBlockThreshold
+import threading
+from typing import Dict, Any, Optional, List, AsyncIterator, Callable
 
 from pydantic import BaseModel, Field
 
-from angela.config import config_manager
-from angela.constants import GEMINI_MODEL, GEMINI_MAX_TOKENS, GEMINI_TEMPERATURE
+from angela.constants import GEMINI_MAX_TOKENS, GEMINI_TEMPERATURE
+from angela.components.ai.backends import NON_RETRYABLE_ERRORS, LLMBackend, create_backend
+from angela.components.ai.response_cache import ResponseCache, create_response_cache
+from angela.components.ai.scheduler import (
+    Priority, RequestScheduler, create_request_scheduler, estimate_tokens, is_rate_limit_error
+)
 from angela.utils.logging import get_logger
 
 logger = get_logger(__name__)
@@ -26,31 +28,219 @@ class GeminiResponse(BaseModel):
     raw_response: Dict[str, Any]
 
 class GeminiClient:
-    def __init__(self):
-        self._setup_client()
-        # Define the default PERMISSIVE safety settings as an instance variable
-        self._default_permissive_safety_settings = {
-            HarmCategory.HARM_CATEGORY_HARASSMENT: HarmBlockThreshold.BLOCK_NONE,
-            HarmCategory.HARM_CATEGORY_HATE_SPEECH: HarmBlockThreshold.BLOCK_NONE,
-            HarmCategory.HARM_CATEGORY_SEXUALLY_EXPLICIT: HarmBlockThreshold.BLOCK_NONE,
-            HarmCategory.HARM_CATEGORY_DANGEROUS_CONTENT: HarmBlockThreshold.BLOCK_NONE,
+    def __init__(self, backend: Optional[LLMBackend] = None):
+        # The backend is created on first use, so importing the client never
+        # needs an API key (the Gemini backend checks for one when called)
+        self._backend = backend
+        self._response_cache: Optional[ResponseCache] = None
+        self._response_cache_loaded = False
+        self._scheduler: Optional[RequestScheduler] = None
+
+    @property
+    def backend(self) -> LLMBackend:
+        """The model backend requests are sent to."""
+        if self._backend is None:
+            self._backend = create_backend()
+        return self._backend
+
+    @backend.setter
+    def backend(self, backend: LLMBackend) -> None:
+        self._backend = backend
+
+    @property
+    def response_cache(self) -> Optional[ResponseCache]:
+        """The response cache, or None if response caching is disabled."""
+        if not self._response_cache_loaded:
+            self._response_cache = create_response_cache()
+            self._response_cache_loaded = True
+        return self._response_cache
+
+    @response_cache.setter
+    def response_cache(self, cache: Optional[ResponseCache]) -> None:
+        self._response_cache = cache
+        self._response_cache_loaded = True
+
+    @property
+    def scheduler(self) -> RequestScheduler:
+        """The scheduler every API call is dispatched through."""
+        if self._scheduler is None:
+            self._scheduler = create_request_scheduler()
+        return self._scheduler
+
+    @scheduler.setter
+    def scheduler(self, scheduler: RequestScheduler) -> None:
+        self._scheduler = scheduler
+
+    def _build_call_kwargs(self, request: GeminiRequest, use_api_default_safety: bool) -> Dict[str, Any]:
+        api_call_kwargs = {
+            "temperature": request.temperature,
+            "max_output_tokens": request.max_output_tokens,
         }
 
-    def _setup_client(self):
-        api_key = config_manager.config.api.gemini_api_key
-        if not api_key:
-            logger.error("Gemini API key is not configured.")
-            raise ValueError("Gemini API key is not configured. Run 'angela init' to set it up.")
-        
-        genai.configure(api_key=api_key)
-        self.model = genai.GenerativeModel(GEMINI_MODEL)
-        logger.debug(f"Gemini API client initialized with model: {GEMINI_MODEL}")
+        if not use_api_default_safety: # If False (default), apply PERMISSIVE settings
+            api_call_kwargs["safety"] = "permissive"
+            logger.info("Using custom PERMISSIVE safety settings (BLOCK_NONE for all categories).")
+        else: # If True, use API's own default safety settings
+            api_call_kwargs["safety"] = "api_default"
+            logger.info("Using Google Gemini API's DEFAULT safety settings.")
+        return api_call_kwargs
+
+    def _cache_key(self, cache: ResponseCache, request: GeminiRequest, use_api_default_safety: bool) -> str:
+        return cache.make_key(
+            self.backend.model_name,
+            request.prompt,
+            request.temperature,
+            request.max_output_tokens,
+            "api_default" if use_api_default_safety else "permissive",
+        )
+
+    def cache_stats(self) -> Dict[str, Any]:
+        """Get response cache hit/miss counters."""
+        cache = self.response_cache
+        if cache is None:
+            return {"enabled": False}
+        return {"enabled": True, **cache.stats()}
 
     async def generate_text(
         self,
         request: GeminiRequest,
-        use_api_default_safety: bool = False # New parameter, DEFAULTS TO FALSE
+        use_api_default_safety: bool = False, # New parameter, DEFAULTS TO FALSE
+        bypass_cache: bool = False,
+        on_chunk: Optional[Callable[[str], None]] = None,
+        priority: Optional[Priority] = None
     ) -> GeminiResponse:
+        if on_chunk is not None:
+            # Stream the completion, handing each piece to the caller as it arrives
+            parts = []
+            async for chunk in self.generate_text_stream(request, use_api_default_safety, bypass_cache, priority):
+                parts.append(chunk)
+                on_chunk(chunk)
+            text = "".join(parts)
+            return GeminiResponse(text=text, generated_text=text, raw_response={"text_content_from_api": text})
+
+        cache = self.response_cache
+        if cache is None or bypass_cache:
+            return await self._generate_uncached(request, use_api_default_safety, priority)
+
+        key = self._cache_key(cache, request, use_api_default_safety)
+        cached = cache.get(key)
+        if cached is not None:
+            logger.debug(f"Gemini response served from cache ({key[:12]})")
+            return GeminiResponse(**cached)
+
+        if request.temperature == 0:
+            # Deterministic requests: let one task/process make the call and
+            # have concurrent identical requests reuse its stored response
+            async with cache.inflight(key):
+                cached = cache.get(key, record_stats=False)
+                if cached is not None:
+                    logger.debug(f"Gemini response generated concurrently, served from cache ({key[:12]})")
+                    return GeminiResponse(**cached)
+                result = await self._generate_uncached(request, use_api_default_safety, priority)
+                cache.put(key, result.model_dump())
+                return result
+
+        result = await self._generate_uncached(request, use_api_default_safety, priority)
+        cache.put(key, result.model_dump())
+        return result
+
+    async def generate_text_stream(
+        self,
+        request: GeminiRequest,
+        use_api_default_safety: bool = False,
+        bypass_cache: bool = False,
+        priority: Optional[Priority] = None
+    ) -> AsyncIterator[str]:
+        """
+        Generate text, yielding pieces of the completion as they arrive.
+
+        The blocking SDK stream is consumed on a worker thread and handed to
+        the event loop through a queue. A cached response is yielded as a
+        single chunk; a completed stream is stored in the response cache.
+        """
+        cache = None if bypass_cache else self.response_cache
+        key = None
+        if cache is not None:
+            key = self._cache_key(cache, request, use_api_default_safety)
+            cached = cache.get(key)
+            if cached is not None:
+                logger.debug(f"Gemini response served from cache ({key[:12]})")
+                yield cached["text"]
+                return
+
+        logger.debug(f"GEMINI API STREAM REQUEST PROMPT ({len(request.prompt)} chars)")
+        api_call_kwargs = self._build_call_kwargs(request, use_api_default_safety)
+
+        loop = asyncio.get_running_loop()
+        queue: asyncio.Queue = asyncio.Queue()
+        finished = object()
+        stop = threading.Event()
+
+        def emit(item: Any) -> None:
+            try:
+                loop.call_soon_threadsafe(queue.put_nowait, item)
+            except RuntimeError:
+                stop.set()  # Event loop already closed; nobody is listening
+
+        def produce() -> None:
+            try:
+                response_obj = self.backend.generate_content(request.prompt, stream=True, **api_call_kwargs)
+                for chunk in response_obj:
+                    if stop.is_set():
+                        break
+                    feedback = getattr(chunk, "prompt_feedback", None)
+                    if feedback and feedback.block_reason:
+                        raise ValueError(f"Prompt blocked by API safety filters: {feedback.block_reason}.")
+                    text = ""
+                    if getattr(chunk, "parts", None):
+                        text = "".join(part.text for part in chunk.parts if hasattr(part, 'text'))
+                    if text:
+                        emit(text)
+            except Exception as e:
+                emit(e)
+            finally:
+                emit(finished)
+
+        parts = []
+        # The slot is held for the whole stream, like a regular call
+        async with self.scheduler.slot(priority, estimate_tokens(request.prompt)):
+            producer = loop.run_in_executor(None, produce)
+            try:
+                while True:
+                    item = await queue.get()
+                    if item is finished:
+                        break
+                    if isinstance(item, (ValueError,) + NON_RETRYABLE_ERRORS):
+                        raise item
+                    if isinstance(item, Exception):
+                        logger.exception(f"Gemini API stream failed: {str(item)}")
+                        raise RuntimeError(f"Failed to stream text from Gemini API: {str(item)}")
+                    parts.append(item)
+                    yield item
+            finally:
+                # Stops the worker early if the consumer stopped iterating
+                stop.set()
+
+            await producer
+        text = "".join(parts)
+        if not text:
+            raise ValueError("Empty response from Gemini API (no text or parts with text).")
+        logger.debug(f"Gemini API stream completed. Length: {len(text)}")
+        if cache is not None:
+            cache.put(key, GeminiResponse(
+                text=text,
+                generated_text=text,
+                raw_response={"text_content_from_api": text},
+            ).model_dump())
+
+    async def _generate_uncached(
+        self,
+        request: GeminiRequest,
+        use_api_default_safety: bool = False,
+        priority: Optional[Priority] = None
+    ) -> GeminiResponse:
+        # Rate limit (429) retries are handled by the scheduler; this loop
+        # retries other transient failures once
         max_retries = 1
         base_delay = 2
         last_exception = None
@@ -65,26 +255,16 @@ class GeminiClient:
                     f"Temperature: {request.temperature}, Max Tokens: {request.max_output_tokens}"
                 )
                 
-                generation_config = GenerationConfig(
-                    temperature=request.temperature,
-                    max_output_tokens=request.max_output_tokens,
-                )
+                api_call_kwargs = self._build_call_kwargs(request, use_api_default_safety)
 
-                api_call_kwargs = {
-                    "generation_config": generation_config,
-                }
-
-                if not use_api_default_safety: # If False (default), apply PERMISSIVE settings
-                    api_call_kwargs["safety_settings"] = self._default_permissive_safety_settings
-                    logger.info("Using custom PERMISSIVE safety settings (BLOCK_NONE for all categories).")
-                else: # If True, use API's own default safety settings
-                    logger.info("Using Google Gemini API's DEFAULT safety settings.")
-                    # No 'safety_settings' key is added to api_call_kwargs, so API defaults apply
-
-                response_obj = await asyncio.to_thread(
-                    self.model.generate_content,
-                    request.prompt,
-                    **api_call_kwargs
+                response_obj = await self.scheduler.run(
+                    lambda: asyncio.to_thread(
+                        self.backend.generate_content,
+                        request.prompt,
+                        **api_call_kwargs
+                    ),
+                    priority=priority,
+                    tokens=estimate_tokens(request.prompt),
                 )
                 
                 if hasattr(response_obj, 'prompt_feedback') and response_obj.prompt_feedback:
@@ -129,6 +309,11 @@ class GeminiClient:
                 logger.debug(f"Gemini API response received. Length: {len(result.text)}")
                 return result
 
+            except NON_RETRYABLE_ERRORS as e:
+                # Configuration problems and replay misses fail the same way every time
+                logger.error(f"Gemini API call cannot succeed: {type(e).__name__} - {e}")
+                raise
+
             except ValueError as ve:
                 logger.warning(f"ValueError during Gemini API call (Attempt {attempt + 1}/{max_retries + 1}): {ve}")
                 last_exception = ve
@@ -138,7 +323,7 @@ class GeminiClient:
             except Exception as e:
                 logger.warning(f"Error calling Gemini API (Attempt {attempt + 1}/{max_retries + 1}): {type(e).__name__} - {e}")
                 last_exception = e
-                if attempt == max_retries:
+                if attempt == max_retries or is_rate_limit_error(e):
                     logger.exception(f"Final attempt failed calling Gemini API: {str(e)}")
                     raise RuntimeError(f"Failed to generate text with Gemini API after {max_retries + 1} attempts: {str(e)}")
 
@@ -1,6 +1,7 @@
 # angela/ai/parser.py
 import json
-from typing import Dict, Any, Optional
+import re
+from typing import Dict, Any, Optional, AsyncIterable, Callable, List, Tuple
 
 from pydantic import BaseModel, Field, ValidationError
 
@@ -67,3 +68,183 @@ def parse_ai_response(response_text: str) -> CommandSuggestion:
             logger.error(f"Regex extraction also failed: {str(regex_error)}")
         
         raise ValueError(f"Could not parse AI response: {str(e)}")
+
+
+class StreamingResponseParser:
+    """
+    Incremental parser for a JSON object response that arrives in pieces.
+
+    Top-level fields become available as soon as their value is complete,
+    so a caller can act on ``command`` while ``explanation`` is still
+    streaming, and the string value currently being received can be read
+    with :meth:`partial_value`. Text before the opening brace (such as a
+    markdown code fence) is skipped.
+    """
+
+    def __init__(self):
+        """Initialize an empty parser."""
+        self.text = ""
+        self.fields: Dict[str, Any] = {}
+        self.complete = False
+        self._pos = 0
+        self._depth = 0
+        self._in_string = False
+        self._escape = False
+        self._expect = "key"  # key, key_string, colon, value, value_body
+        self._key: Optional[str] = None
+        self._token_start = 0
+
+    def feed(self, chunk: str) -> List[Tuple[str, Any]]:
+        """
+        Add a piece of the response.
+
+        Args:
+            chunk: Newly received text
+
+        Returns:
+            (key, value) pairs of the top-level fields completed by this chunk
+        """
+        self.text += chunk
+        completed: List[Tuple[str, Any]] = []
+        text = self.text
+        i = self._pos
+
+        while i < len(text) and not self.complete:
+            ch = text[i]
+
+            if self._depth == 0:
+                if ch == "{":
+                    self._depth = 1
+                    self._expect = "key"
+            elif self._in_string:
+                if self._escape:
+                    self._escape = False
+                elif ch == "\\":
+                    self._escape = True
+                elif ch == '"':
+                    self._in_string = False
+                    if self._depth == 1 and self._expect == "key_string":
+                        self._key = self._decode(text[self._token_start:i + 1])
+                        self._expect = "colon"
+            elif ch == '"':
+                self._in_string = True
+                if self._depth == 1 and self._expect == "key":
+                    self._expect = "key_string"
+                    self._token_start = i
+                elif self._depth == 1 and self._expect == "value":
+                    self._expect = "value_body"
+                    self._token_start = i
+            elif ch in "{[":
+                if self._depth == 1 and self._expect == "value":
+                    self._expect = "value_body"
+                    self._token_start = i
+                self._depth += 1
+            elif ch in "}]":
+                if self._depth == 1:
+                    self._finish_value(i, completed)
+                    self._depth = 0
+                    self.complete = True
+                else:
+                    self._depth -= 1
+            elif self._depth == 1:
+                if ch == ",":
+                    self._finish_value(i, completed)
+                    self._expect = "key"
+                elif ch == ":" and self._expect == "colon":
+                    self._expect = "value"
+                elif not ch.isspace() and self._expect == "value":
+                    # Number, true, false or null
+                    self._expect = "value_body"
+                    self._token_start = i
+            i += 1
+
+        self._pos = i
+        return completed
+
+    def partial_value(self, key: str) -> Optional[str]:
+        """
+        Get a field's value as far as it has been received.
+
+        Args:
+            key: Top-level field name
+
+        Returns:
+            The complete value as a string, the partial string value if it is
+            currently streaming, or None if it has not started yet
+        """
+        if key in self.fields:
+            value = self.fields[key]
+            return value if isinstance(value, str) else json.dumps(value)
+        if self._key != key or self._expect != "value_body" or self._depth != 1:
+            return None
+        if self.text[self._token_start] != '"':
+            return None
+        raw = self.text[self._token_start + 1:]
+        if not self._in_string:
+            raw = raw.rstrip()[:-1]  # String finished; drop the closing quote
+        elif self._escape:
+            raw = raw[:-1]  # Drop a dangling backslash
+        else:
+            # Drop a unicode escape that was cut off mid-way
+            raw = re.sub(r'\\u[0-9a-fA-F]{0,3}$', "", raw)
+        try:
+            return json.loads(f'"{raw}"')
+        except ValueError:
+            return raw
+
+    def finish(self) -> "CommandSuggestion":
+        """
+        Build the command suggestion from the complete response.
+
+        Returns:
+            The parsed CommandSuggestion
+        """
+        if self.complete:
+            try:
+                return CommandSuggestion(**self.fields)
+            except ValidationError:
+                pass
+        return parse_ai_response(self.text)
+
+    def _finish_value(self, end: int, completed: List[Tuple[str, Any]]) -> None:
+        """Record the value ending at ``end`` if one was being read."""
+        if self._expect != "value_body" or self._key is None:
+            return
+        raw = self.text[self._token_start:end].strip()
+        try:
+            value = json.loads(raw)
+        except ValueError:
+            logger.debug(f"Could not decode streamed value for {self._key!r}: {raw[:50]}")
+            return
+        self.fields[self._key] = value
+        completed.append((self._key, value))
+
+    @staticmethod
+    def _decode(token: str) -> str:
+        """Decode a complete JSON string token."""
+        try:
+            return json.loads(token)
+        except ValueError:
+            return token.strip('"')
+
+
+async def parse_ai_response_stream(
+    chunks: AsyncIterable[str],
+    on_field: Optional[Callable[[str, Any], None]] = None
+) -> CommandSuggestion:
+    """
+    Parse a streamed AI response into a command suggestion.
+
+    Args:
+        chunks: The response text as it arrives
+        on_field: Called with each top-level field as soon as it is complete
+
+    Returns:
+        The parsed CommandSuggestion
+    """
+    parser = StreamingResponseParser()
+    async for chunk in chunks:
+        for key, value in parser.feed(chunk):
+            if on_field:
+                on_field(key, value)
+    return parser.finish()
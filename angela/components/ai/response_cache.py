@@ -0,0 +1,402 @@
+# angela/components/ai/response_cache.py
+"""
+Content-addressed cache for LLM responses.
+
+Many prompts repeat verbatim across requests and processes: project type,
+name and framework inference during generation, CLI help parsing in the
+universal translator, error recovery suggestions. The cache stores Gemini
+responses keyed on a hash of everything that determines the output (model,
+prompt, temperature, output token limit and safety mode).
+
+Entries live in a small in-memory LRU and in an on-disk store under
+``CONFIG_DIR/cache/responses`` that is shared by all Angela processes. Both
+are bounded by entry count, size and age. On disk, an entry's modification
+time is when it was written and its access time when it was last used, so
+pruning evicts expired entries and then the least recently used. Deterministic (temperature 0)
+requests are additionally deduplicated while in flight: the first process
+to ask holds a lock file for the key, and concurrent askers wait for it and
+then read its result instead of making a second API call.
+
+The cache is opt-in via the ``[cache]`` section of the configuration.
+"""
+import asyncio
+import hashlib
+import json
+import os
+import threading
+import time
+from collections import OrderedDict
+from contextlib import asynccontextmanager
+from pathlib import Path
+from typing import Any, AsyncIterator, Dict, Optional, Tuple
+
+from angela.constants import RESPONSE_CACHE_DIR
+from angela.utils.logging import get_logger
+
+try:
+    import fcntl
+    _FCNTL_AVAILABLE = True
+except ImportError:
+    fcntl = None
+    _FCNTL_AVAILABLE = False
+
+logger = get_logger(__name__)
+
+CACHE_FORMAT_VERSION = 1
+
+# Keep at most this many entries in memory, regardless of the disk limits
+MEMORY_ENTRIES = 256
+
+# Bounds of the interval between attempts to take a key's lock file
+LOCK_POLL_MIN = 0.005
+LOCK_POLL_MAX = 0.1
+
+
+class ResponseCache:
+    """
+    Two-level (memory + disk) response cache with size and TTL eviction.
+
+    Payloads are JSON-serializable dictionaries. Keys are produced by
+    :meth:`make_key`; the disk store uses them directly as file names.
+    """
+
+    def __init__(
+        self,
+        storage_dir: Optional[Path] = None,
+        ttl: float = 7 * 24 * 3600,
+        max_entries: int = 2000,
+        max_bytes: int = 64 * 1024 * 1024
+    ):
+        """
+        Initialize the cache.
+
+        Args:
+            storage_dir: Directory for the on-disk store
+            ttl: Seconds an entry stays valid
+            max_entries: Maximum number of entries on disk
+            max_bytes: Maximum total size of the on-disk store
+        """
+        self._logger = logger
+        self.storage_dir = Path(storage_dir or RESPONSE_CACHE_DIR)
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+
+        self._memory: "OrderedDict[str, Tuple[float, Dict[str, Any]]]" = OrderedDict()
+        self._lock = threading.RLock()
+        self._inflight: Dict[str, Tuple[asyncio.Lock, int]] = {}
+        self._writes_since_prune = 0
+
+        self.hits = 0
+        self.misses = 0
+        self.disk_hits = 0
+        self.evictions = 0
+
+    @staticmethod
+    def make_key(
+        model: str,
+        prompt: str,
+        temperature: float,
+        max_output_tokens: int,
+        safety_mode: str
+    ) -> str:
+        """
+        Build the cache key for a request.
+
+        Args:
+            model: Model name
+            prompt: Full prompt text
+            temperature: Sampling temperature
+            max_output_tokens: Output token limit
+            safety_mode: Safety settings identifier
+
+        Returns:
+            Hex digest identifying the request
+        """
+        prompt_hash = hashlib.sha256(prompt.encode("utf-8", errors="surrogatepass")).hexdigest()
+        material = json.dumps(
+            [CACHE_FORMAT_VERSION, model, prompt_hash, float(temperature), int(max_output_tokens), safety_mode]
+        )
+        return hashlib.sha256(material.encode("utf-8")).hexdigest()
+
+    def get(self, key: str, record_stats: bool = True) -> Optional[Dict[str, Any]]:
+        """
+        Look up a cached payload.
+
+        Args:
+            key: Cache key from :meth:`make_key`
+            record_stats: Count the lookup in the hit/miss counters
+
+        Returns:
+            The cached payload, or None on a miss
+        """
+        now = time.time()
+        payload = None
+        with self._lock:
+            entry = self._memory.get(key)
+            if entry is not None:
+                created, payload = entry
+                if now - created <= self.ttl:
+                    self._memory.move_to_end(key)
+                    if record_stats:
+                        self.hits += 1
+                else:
+                    del self._memory[key]
+                    payload = None
+        if payload is not None:
+            self._touch(key)
+            return payload
+
+        entry = self._read_disk(key, now)
+        with self._lock:
+            if entry is None:
+                if record_stats:
+                    self.misses += 1
+                return None
+            created, payload = entry
+            self._remember(key, created, payload)
+            if record_stats:
+                self.hits += 1
+                self.disk_hits += 1
+        self._touch(key)
+        return payload
+
+    def put(self, key: str, payload: Dict[str, Any]) -> None:
+        """
+        Store a payload.
+
+        Args:
+            key: Cache key from :meth:`make_key`
+            payload: JSON-serializable response data
+        """
+        created = time.time()
+        with self._lock:
+            self._remember(key, created, payload)
+
+        path = self._path(key)
+        try:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            data = json.dumps({"version": CACHE_FORMAT_VERSION, "created": created, "payload": payload}, default=str)
+            tmp_path = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+            tmp_path.write_text(data, encoding="utf-8")
+            os.replace(tmp_path, path)
+        except (OSError, TypeError, ValueError) as e:
+            self._logger.debug(f"Could not persist cached response {key[:12]}: {str(e)}")
+            return
+
+        self._writes_since_prune += 1
+        if self._writes_since_prune >= max(1, self.max_entries // 20):
+            self.prune()
+
+    @asynccontextmanager
+    async def inflight(self, key: str) -> AsyncIterator[None]:
+        """
+        Serialize generation of one key across tasks and processes.
+
+        Callers should re-check :meth:`get` after entering, since another
+        task or process may have stored the response while they waited.
+
+        Args:
+            key: Cache key from :meth:`make_key`
+        """
+        with self._lock:
+            task_lock, waiters = self._inflight.get(key, (None, 0))
+            if task_lock is None:
+                task_lock = asyncio.Lock()
+            self._inflight[key] = (task_lock, waiters + 1)
+
+        try:
+            async with task_lock:
+                lock_file = self._lock_file(key)
+                try:
+                    if lock_file:
+                        await self._acquire(lock_file)
+                    yield
+                finally:
+                    if lock_file:
+                        lock_file.close()  # Closing the descriptor releases the flock
+        finally:
+            with self._lock:
+                task_lock, waiters = self._inflight[key]
+                if waiters <= 1:
+                    del self._inflight[key]
+                else:
+                    self._inflight[key] = (task_lock, waiters - 1)
+
+    @staticmethod
+    async def _acquire(lock_file) -> None:
+        """
+        Take the flock on a key's lock file.
+
+        The lock is polled without blocking rather than waited for on a worker
+        thread, so a cancelled waiter never leaves a thread blocked on a
+        descriptor that is about to be closed.
+        """
+        delay = LOCK_POLL_MIN
+        while True:
+            try:
+                fcntl.flock(lock_file.fileno(), fcntl.LOCK_EX | fcntl.LOCK_NB)
+                return
+            except BlockingIOError:
+                await asyncio.sleep(delay)
+                delay = min(delay * 2, LOCK_POLL_MAX)
+
+    def prune(self) -> int:
+        """
+        Evict expired entries, then the least recently used until within limits.
+
+        Returns:
+            Number of entries removed from disk
+        """
+        self._writes_since_prune = 0
+        now = time.time()
+        entries = []
+        expired = []
+        try:
+            for path in self.storage_dir.glob("??/*.json"):
+                try:
+                    st = path.stat()
+                except OSError:
+                    continue
+                if now - st.st_mtime > self.ttl:
+                    expired.append(path)
+                else:
+                    entries.append((max(st.st_atime, st.st_mtime), st.st_size, path))
+        except OSError:
+            return 0
+
+        removed = 0
+        for path in expired:
+            try:
+                path.unlink()
+                removed += 1
+            except OSError:
+                continue
+
+        entries.sort()
+        total = sum(size for _, size, _ in entries)
+        count = len(entries)
+        for _, size, path in entries:
+            if count <= self.max_entries and total <= self.max_bytes:
+                break
+            try:
+                path.unlink()
+            except OSError:
+                continue
+            count -= 1
+            total -= size
+            removed += 1
+
+        # Lock files are only needed while a response is being generated; an
+        # old one being removed under a waiter costs at most a duplicate call
+        try:
+            for lock_path in (self.storage_dir / "locks").glob("*.lock"):
+                try:
+                    if now - lock_path.stat().st_mtime > 3600:
+                        lock_path.unlink()
+                except OSError:
+                    continue
+        except OSError:
+            pass
+
+        if removed:
+            with self._lock:
+                self.evictions += removed
+            self._logger.debug(f"Evicted {removed} cached responses")
+        return removed
+
+    def clear(self) -> None:
+        """Remove every cached response from memory and disk."""
+        with self._lock:
+            self._memory.clear()
+        for path in self.storage_dir.glob("??/*.json"):
+            try:
+                path.unlink()
+            except OSError:
+                pass
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Get cache counters.
+
+        Returns:
+            Dictionary with hit, miss, disk hit and eviction counts
+        """
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "disk_hits": self.disk_hits,
+                "evictions": self.evictions,
+                "memory_entries": len(self._memory),
+                "hit_rate": self.hits / lookups if lookups else 0.0,
+            }
+
+    def _remember(self, key: str, created: float, payload: Dict[str, Any]) -> None:
+        """Insert into the memory LRU (lock must be held)."""
+        self._memory[key] = (created, payload)
+        self._memory.move_to_end(key)
+        while len(self._memory) > min(MEMORY_ENTRIES, self.max_entries):
+            self._memory.popitem(last=False)
+
+    def _touch(self, key: str) -> None:
+        """Record a use of an on-disk entry in its access time, keeping its write time."""
+        path = self._path(key)
+        try:
+            os.utime(path, ns=(time.time_ns(), path.stat().st_mtime_ns))
+        except OSError:
+            pass
+
+    def _lock_file(self, key: str):
+        """Open the cross-process lock file for a key, or None if locking is unavailable."""
+        if not _FCNTL_AVAILABLE:
+            return None
+        try:
+            lock_path = self.storage_dir / "locks" / f"{key}.lock"
+            lock_path.parent.mkdir(parents=True, exist_ok=True)
+            return open(lock_path, "a")
+        except OSError as e:
+            self._logger.debug(f"Could not open lock file for cache key {key[:12]}: {str(e)}")
+            return None
+
+    def _path(self, key: str) -> Path:
+        """On-disk location of an entry."""
+        return self.storage_dir / key[:2] / f"{key}.json"
+
+    def _read_disk(self, key: str, now: float) -> Optional[Tuple[float, Dict[str, Any]]]:
+        """Read an entry from disk, dropping it if it is expired or unreadable."""
+        path = self._path(key)
+        try:
+            data = json.loads(path.read_text(encoding="utf-8"))
+        except FileNotFoundError:
+            return None
+        except (OSError, ValueError) as e:
+            self._logger.debug(f"Discarding unreadable cached response {key[:12]}: {str(e)}")
+            data = None
+
+        if not data or data.get("version") != CACHE_FORMAT_VERSION or now - data.get("created", 0) > self.ttl:
+            try:
+                path.unlink()
+            except OSError:
+                pass
+            return None
+        return data["created"], data["payload"]
+
+
+def create_response_cache() -> Optional[ResponseCache]:
+    """
+    Create the response cache from the application configuration.
+
+    Returns:
+        A ResponseCache, or None if response caching is disabled
+    """
+    from angela.config import config_manager
+    cache_config = config_manager.config.cache
+    if not cache_config.responses_enabled:
+        return None
+    return ResponseCache(
+        ttl=cache_config.response_ttl,
+        max_entries=cache_config.response_max_entries,
+        max_bytes=cache_config.response_max_bytes,
+    )
@@ -0,0 +1,402 @@
+# angela/components/ai/scheduler.py
+"""
+Central scheduler for LLM API calls.
+
+Every Gemini call goes through a single scheduler that enforces the API
+quota instead of each caller guessing at safe batch sizes:
+
+- token buckets for requests per minute and (estimated) tokens per minute
+- bounded concurrency, shrunk multiplicatively when the API answers with
+  429 / RESOURCE_EXHAUSTED and grown back one slot at a time on success
+- a global backoff window after a rate limit, honouring the server's
+  retry delay when it provides one
+- priority classes, so an interactive request waiting behind a large
+  background generation is dispatched first
+- queue depth and wait time metrics
+
+Callers mark bulk work with :func:`llm_priority`; the priority is carried
+in a context variable, so tasks spawned inside the block inherit it.
+"""
+import asyncio
+import contextvars
+import heapq
+import itertools
+import random
+import re
+import time
+from contextlib import asynccontextmanager, contextmanager
+from enum import IntEnum
+from typing import Any, AsyncIterator, Awaitable, Callable, Dict, Iterator, List, Optional, TypeVar
+
+from angela.utils.logging import get_logger
+
+logger = get_logger(__name__)
+
+T = TypeVar("T")
+
+
+class Priority(IntEnum):
+    """Scheduling priority of an LLM call; lower values are dispatched first."""
+    INTERACTIVE = 0
+    NORMAL = 1
+    BACKGROUND = 2
+
+
+_current_priority: contextvars.ContextVar[Priority] = contextvars.ContextVar(
+    "angela_llm_priority", default=Priority.NORMAL
+)
+
+
+@contextmanager
+def llm_priority(priority: Priority) -> Iterator[None]:
+    """
+    Set the default priority of LLM calls made inside the block.
+
+    Args:
+        priority: Priority for calls that do not pass one explicitly
+    """
+    token = _current_priority.set(priority)
+    try:
+        yield
+    finally:
+        _current_priority.reset(token)
+
+
+def current_priority() -> Priority:
+    """Get the priority LLM calls made in the current context default to."""
+    return _current_priority.get()
+
+
+def estimate_tokens(text: str) -> int:
+    """Rough token count of a prompt (about four characters per token)."""
+    return len(text) // 4 + 1
+
+
+def is_rate_limit_error(error: BaseException) -> bool:
+    """
+    Check whether an exception is an API rate limit (HTTP 429) error.
+
+    Args:
+        error: The exception raised by the API call
+
+    Returns:
+        True if the call was rejected for exceeding the quota
+    """
+    if type(error).__name__ in ("ResourceExhausted", "TooManyRequests"):
+        return True
+    if getattr(error, "code", None) == 429:
+        return True
+    message = str(error)
+    return "429" in message or "RESOURCE_EXHAUSTED" in message or "quota" in message.lower()
+
+
+def _retry_hint(error: BaseException) -> Optional[float]:
+    """Extract the server-suggested retry delay in seconds from a rate limit error."""
+    match = re.search(r"retry[_ ]delay\s*\{\s*seconds:\s*(\d+)", str(error)) or \
+        re.search(r"retry (?:in|after) ([\d.]+)\s*s", str(error), re.IGNORECASE)
+    if match:
+        try:
+            return float(match.group(1))
+        except ValueError:
+            return None
+    return None
+
+
+class TokenBucket:
+    """Token bucket refilled continuously at a per-minute rate."""
+
+    def __init__(self, per_minute: float, capacity: Optional[float] = None):
+        """
+        Initialize a full bucket.
+
+        Args:
+            per_minute: Refill rate per minute; 0 disables the limit
+            capacity: Burst size, defaults to one minute worth of tokens
+        """
+        self.rate = per_minute / 60.0
+        self.capacity = capacity if capacity is not None else float(per_minute)
+        self._tokens = self.capacity
+        self._updated = time.monotonic()
+
+    def delay(self, amount: float) -> float:
+        """
+        Seconds until ``amount`` tokens are available.
+
+        Requests larger than the bucket only wait for a full bucket, so they
+        are throttled rather than blocked forever.
+        """
+        if self.rate <= 0:
+            return 0.0
+        self._refill()
+        needed = min(amount, self.capacity) - self._tokens
+        return max(0.0, needed / self.rate)
+
+    def consume(self, amount: float) -> None:
+        """Take ``amount`` tokens (the balance may go negative for oversized requests)."""
+        if self.rate <= 0:
+            return
+        self._refill()
+        self._tokens -= amount
+
+    def _refill(self) -> None:
+        now = time.monotonic()
+        self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+
+class RequestScheduler:
+    """
+    Priority queue in front of the LLM API with rate and concurrency limits.
+
+    Waiting calls are ordered by priority, then arrival. The head of the
+    queue is dispatched once a concurrency slot is free, both token buckets
+    allow it and no rate limit backoff is in effect.
+    """
+
+    def __init__(
+        self,
+        max_concurrency: int = 8,
+        requests_per_minute: float = 60,
+        tokens_per_minute: float = 1_000_000,
+        max_retries: int = 5,
+        base_backoff: float = 2.0,
+        max_backoff: float = 60.0
+    ):
+        """
+        Initialize the scheduler.
+
+        Args:
+            max_concurrency: Upper bound on simultaneous API calls
+            requests_per_minute: Request quota; 0 disables the limit
+            tokens_per_minute: Input token quota; 0 disables the limit
+            max_retries: Times a rate limited call is re-queued before failing
+            base_backoff: First backoff delay after a rate limit, in seconds
+            max_backoff: Upper bound on the backoff delay, in seconds
+        """
+        self._logger = logger
+        self.max_concurrency = max(1, max_concurrency)
+        self.max_retries = max_retries
+        self.base_backoff = base_backoff
+        self.max_backoff = max_backoff
+
+        self._requests = TokenBucket(requests_per_minute)
+        self._tokens = TokenBucket(tokens_per_minute)
+
+        self._limit = self.max_concurrency
+        self._successes_since_increase = 0
+        self._consecutive_rate_limits = 0
+        self._backoff_until = 0.0
+
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._cond: Optional[asyncio.Condition] = None
+        self._queue: List[List[Any]] = []
+        self._seq = itertools.count()
+        self._active = 0
+
+        self._submitted = 0
+        self._completed = 0
+        self._failed = 0
+        self._rate_limited = 0
+        self._retries = 0
+        self._max_queue_depth = 0
+        self._total_wait = 0.0
+
+    @asynccontextmanager
+    async def slot(self, priority: Optional[Priority] = None, tokens: int = 0) -> AsyncIterator[None]:
+        """
+        Hold a dispatch slot for the duration of an API call.
+
+        Rate limit errors raised inside the block shrink the concurrency
+        limit and start a backoff window; they are re-raised unchanged.
+
+        Args:
+            priority: Call priority, defaults to the current context's priority
+            tokens: Estimated input tokens of the call
+        """
+        await self._acquire(current_priority() if priority is None else priority, tokens)
+        try:
+            yield
+        except Exception as e:
+            self._failed += 1
+            if is_rate_limit_error(e):
+                self.report_rate_limited(e)
+            raise
+        else:
+            self._completed += 1
+            self._report_success()
+        finally:
+            await self._release()
+
+    async def run(
+        self,
+        call: Callable[[], Awaitable[T]],
+        priority: Optional[Priority] = None,
+        tokens: int = 0
+    ) -> T:
+        """
+        Run an API call through the scheduler, re-queueing it on rate limits.
+
+        Args:
+            call: Zero-argument factory for the call's awaitable
+            priority: Call priority, defaults to the current context's priority
+            tokens: Estimated input tokens of the call
+
+        Returns:
+            The call's result
+        """
+        priority = current_priority() if priority is None else priority
+        for attempt in range(self.max_retries + 1):
+            try:
+                async with self.slot(priority, tokens):
+                    return await call()
+            except Exception as e:
+                if not is_rate_limit_error(e) or attempt == self.max_retries:
+                    raise
+                self._retries += 1
+                self._logger.info(
+                    f"LLM call rate limited, re-queued (retry {attempt + 1}/{self.max_retries})"
+                )
+        raise RuntimeError("unreachable")
+
+    def report_rate_limited(self, error: Optional[BaseException] = None) -> float:
+        """
+        Record a rate limit response from the API.
+
+        Halves the concurrency limit and pushes back all dispatching by an
+        exponentially growing, jittered delay (or the server's retry hint).
+
+        Args:
+            error: The rate limit error, used for its retry hint
+
+        Returns:
+            The backoff delay in seconds
+        """
+        self._rate_limited += 1
+        self._consecutive_rate_limits += 1
+        self._successes_since_increase = 0
+        self._limit = max(1, self._limit // 2)
+
+        hint = _retry_hint(error) if error is not None else None
+        if hint is None:
+            delay = min(self.max_backoff, self.base_backoff * (2 ** (self._consecutive_rate_limits - 1)))
+            delay += random.uniform(0, delay * 0.25)
+        else:
+            delay = min(self.max_backoff, hint)
+        self._backoff_until = max(self._backoff_until, time.monotonic() + delay)
+
+        self._logger.warning(
+            f"LLM API rate limit hit; backing off {delay:.1f}s, concurrency limit now {self._limit}"
+        )
+        return delay
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Get scheduler metrics.
+
+        Returns:
+            Dictionary with queue depth, concurrency and call counters
+        """
+        by_priority = {priority.name.lower(): 0 for priority in Priority}
+        for entry in self._queue:
+            by_priority[Priority(entry[0]).name.lower()] += 1
+        dispatched = self._completed + self._failed + self._active
+        return {
+            "queue_depth": len(self._queue),
+            "queue_depth_by_priority": by_priority,
+            "max_queue_depth": self._max_queue_depth,
+            "active": self._active,
+            "concurrency_limit": self._limit,
+            "submitted": self._submitted,
+            "completed": self._completed,
+            "failed": self._failed,
+            "rate_limited": self._rate_limited,
+            "retries": self._retries,
+            "avg_wait_ms": round(self._total_wait / dispatched * 1000, 2) if dispatched else 0.0,
+            "backoff_remaining_s": round(max(0.0, self._backoff_until - time.monotonic()), 2),
+        }
+
+    def _condition(self) -> asyncio.Condition:
+        """The condition for the running event loop (recreated if the loop changed)."""
+        loop = asyncio.get_running_loop()
+        if self._cond is None or self._loop is not loop:
+            # A new event loop (e.g. another asyncio.run) cannot be waiting on
+            # anything from the previous one
+            self._loop = loop
+            self._cond = asyncio.Condition()
+            self._queue = []
+            self._active = 0
+        return self._cond
+
+    async def _acquire(self, priority: Priority, tokens: int) -> None:
+        """Wait until this call is at the head of the queue and may be dispatched."""
+        cond = self._condition()
+        entry = [int(priority), next(self._seq)]
+        enqueued = time.monotonic()
+
+        async with cond:
+            heapq.heappush(self._queue, entry)
+            self._submitted += 1
+            self._max_queue_depth = max(self._max_queue_depth, len(self._queue))
+            try:
+                while True:
+                    if self._queue[0] is entry and self._active < self._limit:
+                        delay = max(
+                            self._backoff_until - time.monotonic(),
+                            self._requests.delay(1),
+                            self._tokens.delay(tokens),
+                        )
+                        if delay <= 0:
+                            break
+                        try:
+                            await asyncio.wait_for(cond.wait(), timeout=delay)
+                        except asyncio.TimeoutError:
+                            pass
+                    else:
+                        await cond.wait()
+            except BaseException:
+                self._queue.remove(entry)
+                heapq.heapify(self._queue)
+                cond.notify_all()
+                raise
+
+            heapq.heappop(self._queue)
+            self._requests.consume(1)
+            self._tokens.consume(tokens)
+            self._active += 1
+            self._total_wait += time.monotonic() - enqueued
+            # The next call in line may be dispatchable right away
+            cond.notify_all()
+
+    async def _release(self) -> None:
+        """Give back a dispatch slot."""
+        cond = self._condition()
+        async with cond:
+            self._active = max(0, self._active - 1)
+            cond.notify_all()
+
+    def _report_success(self) -> None:
+        """Grow the concurrency limit back after a run of successful calls."""
+        self._consecutive_rate_limits = 0
+        if self._limit >= self.max_concurrency:
+            return
+        self._successes_since_increase += 1
+        if self._successes_since_increase >= self._limit:
+            self._limit += 1
+            self._successes_since_increase = 0
+
+
+def create_request_scheduler() -> RequestScheduler:
+    """
+    Create the request scheduler from the application configuration.
+
+    Returns:
+        A RequestScheduler
+    """
+    from angela.config import config_manager
+    llm_config = config_manager.config.llm
+    return RequestScheduler(
+        max_concurrency=llm_config.max_concurrency,
+        requests_per_minute=llm_config.requests_per_minute,
+        tokens_per_minute=llm_config.tokens_per_minute,
+        max_retries=llm_config.max_retries,
+    )
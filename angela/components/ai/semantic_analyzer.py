@@ -9,18 +9,39 @@ import os
 import re
 import ast
 import json
+import time
 import asyncio
 import importlib.util
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
-from typing import Dict, Any, List, Tuple, Optional, Set, Union, NamedTuple
+from typing import Dict, Any, Callable, List, Tuple, Optional, Set, Union, NamedTuple
 from collections import defaultdict
 
 from angela.utils.logging import get_logger
+from angela.components.ai.symbol_index import SymbolIndex
 from angela.api.context import get_file_detector_func
 from angela.api.ai import get_gemini_client, get_gemini_request_class
 
 logger = get_logger(__name__)
 
+# Bump when extraction changes, so persisted analyses are redone
+ANALYZER_VERSION = "1"
+
+# Languages analyzed without the LLM; their files can be parsed in worker processes
+LOCAL_LANGUAGES = ("python", "javascript", "typescript")
+
+# Default budget of a project analysis: seconds and total bytes of source
+PROJECT_TIME_BUDGET = 30.0
+PROJECT_SIZE_BUDGET = 32 * 1024 * 1024
+
+# Files handed to a worker process per task
+CHUNK_MAX_FILES = 32
+CHUNK_MAX_BYTES = 512 * 1024
+
+# Fewer files than this are parsed in this process; starting workers costs more
+MIN_PARALLEL_FILES = 16
+
 class CodeEntity:
     """Base class for code entities like functions, classes, and variables."""
     
@@ -44,6 +65,11 @@ class CodeEntity:
             "dependencies": self.dependencies
         }
     
+    def _restore(self, data: Dict[str, Any]) -> None:
+        """Restore the fields set after construction from ``to_dict`` output."""
+        self.references = [tuple(ref) for ref in data.get("references", [])]
+        self.dependencies = list(data.get("dependencies", []))
+    
     def __str__(self) -> str:
         return f"{self.__class__.__name__}(name={self.name}, file={Path(self.filename).name}:{self.line_start}-{self.line_end})"
 
@@ -79,6 +105,20 @@ class Function(CodeEntity):
             "complexity": self.complexity
         })
         return result
+    
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> 'Function':
+        """Create a function from a dictionary."""
+        function = cls(
+            data["name"], data["line_start"], data["line_end"], data["filename"],
+            params=data["params"], docstring=data.get("docstring"), is_method=data.get("is_method", False),
+            decorators=data.get("decorators"), return_type=data.get("return_type"),
+            class_name=data.get("class_name")
+        )
+        function._restore(data)
+        function.called_functions = list(data.get("called_functions", []))
+        function.complexity = data.get("complexity")
+        return function
 
 
 class Class(CodeEntity):
@@ -107,6 +147,20 @@ class Class(CodeEntity):
             "nested_classes": {name: cls.to_dict() for name, cls in self.nested_classes.items()}
         })
         return result
+    
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> 'Class':
+        """Create a class from a dictionary."""
+        class_entity = cls(
+            data["name"], data["line_start"], data["line_end"], data["filename"],
+            docstring=data.get("docstring"), base_classes=data.get("base_classes"),
+            decorators=data.get("decorators")
+        )
+        class_entity._restore(data)
+        class_entity.methods = {name: Function.from_dict(d) for name, d in data.get("methods", {}).items()}
+        class_entity.attributes = {name: Variable.from_dict(d) for name, d in data.get("attributes", {}).items()}
+        class_entity.nested_classes = {name: cls.from_dict(d) for name, d in data.get("nested_classes", {}).items()}
+        return class_entity
 
 
 class Variable(CodeEntity):
@@ -134,6 +188,17 @@ class Variable(CodeEntity):
             "is_constant": self.is_constant
         })
         return result
+    
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> 'Variable':
+        """Create a variable from a dictionary."""
+        variable = cls(
+            data["name"], data["line_start"], data["line_end"], data["filename"],
+            var_type=data.get("var_type"), value=data.get("value"), is_attribute=data.get("is_attribute", False),
+            class_name=data.get("class_name"), is_constant=data.get("is_constant", False)
+        )
+        variable._restore(data)
+        return variable
 
 
 class Import(CodeEntity):
@@ -155,6 +220,16 @@ class Import(CodeEntity):
             "alias": self.alias
         })
         return result
+    
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> 'Import':
+        """Create an import from a dictionary."""
+        imp = cls(
+            data["name"], data["line_start"], data["line_end"], data["filename"],
+            import_path=data["import_path"], is_from=data.get("is_from", False), alias=data.get("alias")
+        )
+        imp._restore(data)
+        return imp
 
 
 class Module:
@@ -186,6 +261,27 @@ class Module:
             "last_modified": self.last_modified,
             "code_metrics": self.code_metrics
         }
+    
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> 'Module':
+        """Create a module from a dictionary."""
+        module = cls(data["filename"])
+        module.imports = {name: Import.from_dict(d) for name, d in data.get("imports", {}).items()}
+        module.functions = {name: Function.from_dict(d) for name, d in data.get("functions", {}).items()}
+        module.classes = {name: Class.from_dict(d) for name, d in data.get("classes", {}).items()}
+        module.variables = {name: Variable.from_dict(d) for name, d in data.get("variables", {}).items()}
+        module.docstring = data.get("docstring")
+        module.language = data.get("language")
+        module.dependencies = list(data.get("dependencies", []))
+        module.last_modified = data.get("last_modified")
+        module.code_metrics = dict(data.get("code_metrics", {}))
+        
+        # Nested classes are the same objects as the module-level entries
+        for class_entity in module.classes.values():
+            for name in class_entity.nested_classes:
+                if name in module.classes:
+                    class_entity.nested_classes[name] = module.classes[name]
+        return module
 
     def get_summary(self) -> Dict[str, Any]:
         """Get a simplified summary of the module."""
@@ -203,6 +299,306 @@ class Module:
         }
 
 
+def _last_line(node) -> int:
+    """Get the last line number of an AST node."""
+    # If the node has an end_lineno attribute (Python 3.8+), use it
+    if getattr(node, 'end_lineno', None) is not None:
+        return node.end_lineno
+    
+    # Otherwise, find the maximum lineno in the node and its children
+    max_lineno = node.lineno
+    for child in ast.iter_child_nodes(node):
+        if hasattr(child, 'lineno'):
+            max_lineno = max(max_lineno, _last_line(child))
+    return max_lineno
+
+
+def _dotted_name(node: ast.AST) -> Optional[str]:
+    """Get ``a.b.c`` for a Name/Attribute chain, or None for other expressions."""
+    parts = []
+    while isinstance(node, ast.Attribute):
+        parts.append(node.attr)
+        node = node.value
+    if not isinstance(node, ast.Name):
+        return None
+    parts.append(node.id)
+    return ".".join(reversed(parts))
+
+
+def _type_annotation(annotation) -> Optional[str]:
+    """Extract type annotation string from AST node."""
+    if isinstance(annotation, ast.Name):
+        return annotation.id
+    elif isinstance(annotation, ast.Attribute):
+        if isinstance(annotation.value, ast.Name):
+            return f"{annotation.value.id}.{annotation.attr}"
+        return annotation.attr
+    elif isinstance(annotation, ast.Subscript):
+        if isinstance(annotation.value, ast.Name):
+            if isinstance(annotation.slice, ast.Name):
+                return f"{annotation.value.id}[{annotation.slice.id}]"
+            elif isinstance(annotation.slice, ast.Constant):
+                return f"{annotation.value.id}[{annotation.slice.value}]"
+            return f"{annotation.value.id}[...]"
+        return "..."
+    return None
+
+
+def _constant_value(node: Optional[ast.AST]) -> Optional[str]:
+    """Get a constant's value as a string, or None for other expressions."""
+    return str(node.value) if isinstance(node, ast.Constant) else None
+
+
+class PythonEntityExtractor(ast.NodeVisitor):
+    """
+    Extracts the entities of a Python module in a single AST traversal.
+    
+    The enclosing classes and functions are tracked on a scope stack. Calls
+    and branches are credited to every function on the stack, so the calls
+    and complexity of a function include those of its nested functions.
+    Imports are collected at any depth; variables only at module level.
+    """
+    
+    def __init__(self, module: Module):
+        """
+        Initialize the extractor.
+        
+        Args:
+            module: Module object to populate
+        """
+        self.module = module
+        self._scopes: List[Union[Class, Function]] = []
+        self._functions: List[Function] = []
+    
+    def visit_Module(self, node: ast.Module) -> None:
+        self.module.docstring = ast.get_docstring(node)
+        self.generic_visit(node)
+    
+    def visit_Import(self, node: ast.Import) -> None:
+        for name in node.names:
+            import_name = name.asname or name.name
+            self.module.imports[import_name] = Import(
+                name=import_name,
+                line_start=node.lineno,
+                line_end=node.lineno,
+                filename=self.module.filename,
+                import_path=name.name,
+                is_from=False,
+                alias=name.asname
+            )
+            self.module.dependencies.append(name.name)
+    
+    def visit_ImportFrom(self, node: ast.ImportFrom) -> None:
+        module_name = node.module or ""
+        for name in node.names:
+            import_name = name.asname or name.name
+            full_path = f"{module_name}.{name.name}" if module_name else name.name
+            self.module.imports[import_name] = Import(
+                name=import_name,
+                line_start=node.lineno,
+                line_end=node.lineno,
+                filename=self.module.filename,
+                import_path=full_path,
+                is_from=True,
+                alias=name.asname
+            )
+            self.module.dependencies.append(full_path)
+    
+    def visit_FunctionDef(self, node: Union[ast.FunctionDef, ast.AsyncFunctionDef]) -> None:
+        parent = self._scopes[-1] if self._scopes else None
+        parent_class = parent if isinstance(parent, Class) else None
+        
+        decorators = []
+        for decorator in node.decorator_list:
+            name = _dotted_name(decorator.func if isinstance(decorator, ast.Call) else decorator)
+            if name:
+                decorators.append(name)
+        
+        function = Function(
+            name=node.name,
+            line_start=node.lineno,
+            line_end=_last_line(node),
+            filename=self.module.filename,
+            params=[arg.arg for arg in node.args.args],
+            docstring=ast.get_docstring(node),
+            is_method=parent_class is not None,
+            decorators=decorators,
+            return_type=_type_annotation(node.returns) if node.returns else None,
+            class_name=parent_class.name if parent_class else None
+        )
+        function.complexity = 1  # Start with 1 (default path)
+        
+        if parent_class:
+            parent_class.methods[node.name] = function
+        else:
+            self.module.functions[node.name] = function
+        
+        self._scopes.append(function)
+        self._functions.append(function)
+        self.generic_visit(node)
+        self._functions.pop()
+        self._scopes.pop()
+    
+    visit_AsyncFunctionDef = visit_FunctionDef
+    
+    def visit_ClassDef(self, node: ast.ClassDef) -> None:
+        base_classes = [name for name in map(_dotted_name, node.bases) if name]
+        decorators = [name for name in map(_dotted_name, node.decorator_list) if name]
+        
+        class_entity = Class(
+            name=node.name,
+            line_start=node.lineno,
+            line_end=_last_line(node),
+            filename=self.module.filename,
+            docstring=ast.get_docstring(node),
+            base_classes=base_classes,
+            decorators=decorators
+        )
+        
+        # Class attributes are the assignments directly in the class body
+        for child in node.body:
+            if isinstance(child, ast.Assign):
+                targets = [target.id for target in child.targets if isinstance(target, ast.Name)]
+                var_type, value = None, _constant_value(child.value)
+            elif isinstance(child, ast.AnnAssign) and isinstance(child.target, ast.Name):
+                targets = [child.target.id]
+                var_type, value = _type_annotation(child.annotation), _constant_value(child.value)
+            else:
+                continue
+            for target in targets:
+                class_entity.attributes[target] = Variable(
+                    name=target,
+                    line_start=child.lineno,
+                    line_end=child.lineno,
+                    filename=self.module.filename,
+                    var_type=var_type,
+                    value=value,
+                    is_attribute=True,
+                    class_name=node.name
+                )
+        
+        parent = self._scopes[-1] if self._scopes else None
+        if isinstance(parent, Class):
+            parent.nested_classes[node.name] = class_entity
+        self.module.classes[node.name] = class_entity
+        
+        self._scopes.append(class_entity)
+        self.generic_visit(node)
+        self._scopes.pop()
+    
+    def visit_Assign(self, node: ast.Assign) -> None:
+        if not self._scopes and all(isinstance(target, ast.Name) for target in node.targets):
+            for target in node.targets:
+                self._add_variable(target.id, node, None, node.value)
+        self.generic_visit(node)
+    
+    def visit_AnnAssign(self, node: ast.AnnAssign) -> None:
+        if not self._scopes and isinstance(node.target, ast.Name):
+            self._add_variable(node.target.id, node, _type_annotation(node.annotation), node.value)
+        self.generic_visit(node)
+    
+    def _add_variable(self, name: str, node: ast.AST, var_type: Optional[str], value: Optional[ast.AST]) -> None:
+        # Skip private variables
+        if name.startswith('_'):
+            return
+        self.module.variables[name] = Variable(
+            name=name,
+            line_start=node.lineno,
+            line_end=node.lineno,
+            filename=self.module.filename,
+            var_type=var_type,
+            value=_constant_value(value),
+            is_constant=name.isupper()
+        )
+    
+    def visit_Call(self, node: ast.Call) -> None:
+        if self._functions:
+            called = None
+            if isinstance(node.func, ast.Name):
+                called = node.func.id
+            elif isinstance(node.func, ast.Attribute) and isinstance(node.func.value, ast.Name):
+                called = f"{node.func.value.id}.{node.func.attr}"
+            if called:
+                for function in self._functions:
+                    function.called_functions.append(called)
+        self.generic_visit(node)
+    
+    def _add_complexity(self, amount: int) -> None:
+        for function in self._functions:
+            function.complexity += amount
+    
+    def visit_If(self, node: ast.AST) -> None:
+        self._add_complexity(1)
+        self.generic_visit(node)
+    
+    visit_While = visit_For = visit_IfExp = visit_If
+    
+    def visit_BoolOp(self, node: ast.BoolOp) -> None:
+        self._add_complexity(len(node.values) - 1)
+        self.generic_visit(node)
+    
+    def visit_Try(self, node: ast.Try) -> None:
+        # Count except blocks
+        self._add_complexity(len(node.handlers))
+        self.generic_visit(node)
+
+
+
+# Analyzer of a worker process, created by its first task
+_worker_analyzer: Optional['SemanticAnalyzer'] = None
+
+
+def _worker_context():
+    """
+    Multiprocessing context for analysis workers.
+
+    Workers are never forked straight from this process: it runs an event
+    loop and executor threads, and a fork taken while one of them holds a
+    lock can deadlock the child.
+    """
+    method = "forkserver" if "forkserver" in multiprocessing.get_all_start_methods() else "spawn"
+    return multiprocessing.get_context(method)
+
+
+def _analyze_files_chunk(jobs: List[Tuple[str, str]]) -> List[Tuple[str, Optional[int], Optional[Dict[str, Any]]]]:
+    """
+    Analyze a chunk of files in a worker process.
+    
+    Args:
+        jobs: (path, language) pairs, with languages from LOCAL_LANGUAGES
+        
+    Returns:
+        (path, mtime_ns, payload) per file, with the ``Module.to_dict`` payload
+        or None if the analysis failed
+    """
+    global _worker_analyzer
+    if _worker_analyzer is None:
+        _worker_analyzer = SemanticAnalyzer()
+    results = asyncio.run(_worker_analyzer._analyze_chunk(jobs))
+    return [(path, mtime_ns, module.to_dict() if module else None) for path, mtime_ns, module in results]
+
+
+def _make_chunks(files: List[Tuple[str, str, int]]) -> List[List[Tuple[str, str]]]:
+    """
+    Group (path, language, size) files into worker tasks, largest files first.
+    
+    Starting with the largest files keeps one big file from finishing last
+    while the other workers are idle.
+    """
+    chunks = []
+    chunk: List[Tuple[str, str]] = []
+    chunk_bytes = 0
+    for path, language, size in sorted(files, key=lambda f: f[2], reverse=True):
+        if chunk and (len(chunk) >= CHUNK_MAX_FILES or chunk_bytes + size > CHUNK_MAX_BYTES):
+            chunks.append(chunk)
+            chunk, chunk_bytes = [], 0
+        chunk.append((path, language))
+        chunk_bytes += size
+    if chunk:
+        chunks.append(chunk)
+    return chunks
+
+
 class SemanticAnalyzer:
     """
     Semantic code analyzer that extracts deeper meaning from source files.
@@ -229,49 +625,79 @@ class SemanticAnalyzer:
             "rust": self._analyze_with_llm
         }
         self._cache_valid_time = 300  # Seconds before a cached analysis is considered stale
+        self._analysis_cache = None  # Persistent cache, created on first use
+        self._analysis_cache_created = False
+        self._symbol_index = None  # Symbol index of the last analyzed set of modules
+        self._symbol_index_key = None
     
-    async def analyze_file(self, file_path: Union[str, Path]) -> Optional[Module]:
+    def _get_analysis_cache(self):
+        """Get the persistent analysis cache, or None if it is disabled."""
+        if not self._analysis_cache_created:
+            self._analysis_cache_created = True
+            try:
+                from angela.components.ai.analysis_cache import create_analysis_cache
+                self._analysis_cache = create_analysis_cache()
+            except Exception as e:
+                self._logger.warning(f"Semantic analysis cache unavailable: {str(e)}")
+        return self._analysis_cache
+    
+    def _get_unchanged_module(self, path_obj: Path, stat: os.stat_result) -> Optional[Module]:
         """
-        Analyze a source code file to extract semantic information.
+        Get an analysis of a file that is still valid, from memory or from an earlier run.
         
         Args:
-            file_path: Path to the file to analyze
+            path_obj: The file
+            stat: The file's current stat result
             
         Returns:
-            Module object with semantic information or None if analysis failed
+            The analysis, or None if the file must be analyzed again
         """
-        path_obj = Path(file_path)
-        
         # Check if we have a recent cached analysis
-        if str(path_obj) in self._modules:
-            module = self._modules[str(path_obj)]
-            if module.last_modified and path_obj.stat().st_mtime <= module.last_modified:
-                self._logger.debug(f"Using cached analysis for {path_obj}")
+        module = self._modules.get(str(path_obj))
+        if module and module.last_modified and stat.st_mtime <= module.last_modified:
+            self._logger.debug(f"Using cached analysis for {path_obj}")
+            return module
+        
+        # Reuse an analysis of the same content from an earlier run
+        analysis_cache = self._get_analysis_cache()
+        if analysis_cache is not None:
+            data = analysis_cache.get(path_obj, ANALYZER_VERSION)
+            if data is not None:
+                module = Module.from_dict(data)
+                module.last_modified = stat.st_mtime
+                self._modules[str(path_obj)] = module
+                self._logger.debug(f"Using persisted analysis for {path_obj}")
                 return module
         
-        # Check if file exists
-        if not path_obj.exists():
-            self._logger.warning(f"File not found for semantic analysis: {path_obj}")
-            return None
-        
-        # Detect file type using the API layer
-        detect_file_type = get_file_detector_func()
-        file_info = detect_file_type(path_obj)
-        language = file_info.get("language", "").lower()
-        
-        # Skip if this isn't a supported code file
-        if not language or language.lower() not in self._language_analyzers:
-            self._logger.debug(f"Unsupported language for semantic analysis: {language} in {path_obj}")
-            return None
+        return None
+    
+    def _remember(self, path_obj: Path, module: Module, mtime_ns: Optional[int],
+                  payload: Optional[Dict[str, Any]] = None) -> None:
+        """Keep a new analysis in memory and in the persistent cache."""
+        self._modules[str(path_obj)] = module
+        analysis_cache = self._get_analysis_cache()
+        if analysis_cache is not None:
+            analysis_cache.put(path_obj, ANALYZER_VERSION, payload or module.to_dict(), analyzed_mtime_ns=mtime_ns)
+    
+    async def _run_analyzer(self, path_obj: Path, language: str, stat: os.stat_result) -> Optional[Module]:
+        """
+        Analyze a file with the analyzer of its language.
         
-        # Create a new module
+        Args:
+            path_obj: The file
+            language: Lowercase language of the file
+            stat: The file's stat result before analysis
+            
+        Returns:
+            The analysis, or None if it failed
+        """
         module = Module(str(path_obj))
         module.language = language
-        module.last_modified = path_obj.stat().st_mtime
+        module.last_modified = stat.st_mtime
         
         try:
             # Call the appropriate analyzer based on language
-            analyzer = self._language_analyzers.get(language.lower(), self._analyze_with_llm)
+            analyzer = self._language_analyzers.get(language, self._analyze_with_llm)
             
             if asyncio.iscoroutinefunction(analyzer):
                 result = await analyzer(path_obj, module)
@@ -279,34 +705,163 @@ class SemanticAnalyzer:
                 result = analyzer(path_obj, module)
             
             if result:
-                self._modules[str(path_obj)] = module
-                self._logger.info(f"Completed semantic analysis of {path_obj}")
                 return module
         except Exception as e:
             self._logger.exception(f"Error analyzing {path_obj}: {str(e)}")
         
         return None
     
-    async def analyze_project_files(self, project_root: Union[str, Path], max_files: int = 100) -> Dict[str, Module]:
+    async def _analyze_chunk(self, jobs: List[Tuple[str, str]]) -> List[Tuple[str, Optional[int], Optional[Module]]]:
+        """
+        Analyze (path, language) pairs without caching the results.
+        
+        Returns:
+            (path, mtime_ns before analysis, analysis or None) per file
+        """
+        results = []
+        for path, language in jobs:
+            path_obj = Path(path)
+            try:
+                stat = path_obj.stat()
+            except OSError as e:
+                self._logger.warning(f"Cannot analyze {path}: {str(e)}")
+                results.append((path, None, None))
+                continue
+            module = await self._run_analyzer(path_obj, language, stat)
+            results.append((path, stat.st_mtime_ns, module))
+        return results
+    
+    async def analyze_file(self, file_path: Union[str, Path]) -> Optional[Module]:
+        """
+        Analyze a source code file to extract semantic information.
+        
+        Args:
+            file_path: Path to the file to analyze
+            
+        Returns:
+            Module object with semantic information or None if analysis failed
+        """
+        path_obj = Path(file_path)
+        
+        # Check if file exists
+        if not path_obj.exists():
+            self._logger.warning(f"File not found for semantic analysis: {path_obj}")
+            return None
+        
+        stat = path_obj.stat()
+        module = self._get_unchanged_module(path_obj, stat)
+        if module:
+            return module
+        
+        # Detect file type using the API layer
+        detect_file_type = get_file_detector_func()
+        file_info = detect_file_type(path_obj)
+        language = file_info.get("language", "").lower()
+        
+        # Skip if this isn't a supported code file
+        if not language or language.lower() not in self._language_analyzers:
+            self._logger.debug(f"Unsupported language for semantic analysis: {language} in {path_obj}")
+            return None
+        
+        module = await self._run_analyzer(path_obj, language, stat)
+        if module:
+            self._remember(path_obj, module, stat.st_mtime_ns)
+            self._logger.info(f"Completed semantic analysis of {path_obj}")
+        return module
+    
+    async def analyze_project_files(
+        self,
+        project_root: Union[str, Path],
+        time_budget: Optional[float] = PROJECT_TIME_BUDGET,
+        size_budget: Optional[int] = PROJECT_SIZE_BUDGET,
+        max_workers: Optional[int] = None,
+        progress_callback: Optional[Callable[[int, int], None]] = None
+    ) -> Dict[str, Module]:
         """
-        Analyze multiple source files within a project.
+        Analyze the source files of a project.
+        
+        Files analyzed before, in this process or an earlier run, are reused.
+        Python, JavaScript and TypeScript files are parsed in a pool of worker
+        processes; files of other languages are then analyzed with the LLM,
+        one at a time.
         
         Args:
             project_root: Root directory of the project
-            max_files: Maximum number of files to analyze
+            time_budget: Seconds to spend; files not analyzed by then are left
+                out. None for no limit
+            size_budget: Total size in bytes of the files to analyze; files
+                beyond it are left out. None for no limit
+            max_workers: Number of worker processes, by default one per CPU
+            progress_callback: Called with the number of files done and the
+                total as the analysis proceeds
             
         Returns:
             Dictionary of file paths to Module objects
         """
-        root_path = Path(project_root)
+        deadline = time.monotonic() + time_budget if time_budget is not None else None
+        # Listing uses the project index, whose refresh walks the tree
+        source_files = await asyncio.to_thread(self._find_source_files, Path(project_root), size_budget)
+        
+        analysis_results: Dict[str, Module] = {}
+        progress = {"done": 0}
+        
+        def report(count: int) -> None:
+            progress["done"] += count
+            if progress_callback and count:
+                progress_callback(progress["done"], len(source_files))
+        
+        # Reuse analyses of unchanged files
+        local_files, other_files = [], []
+        for path, language, size in source_files:
+            path_obj = Path(path)
+            try:
+                module = self._get_unchanged_module(path_obj, path_obj.stat())
+            except OSError:
+                # Deleted since the project index was refreshed
+                report(1)
+                continue
+            if module:
+                analysis_results[path] = module
+            elif language in LOCAL_LANGUAGES:
+                local_files.append((path, language, size))
+            else:
+                other_files.append(path)
+        report(len(analysis_results))
         
-        # Find source code files
-        source_files = []
+        if local_files:
+            await self._analyze_local_files(local_files, analysis_results, deadline, max_workers, report)
+        
+        for path in other_files:
+            if deadline is not None and time.monotonic() >= deadline:
+                break
+            module = await self.analyze_file(path)
+            if module:
+                analysis_results[path] = module
+            report(1)
+        
+        if progress["done"] < len(source_files):
+            self._logger.info(
+                f"Time budget exhausted after analyzing {progress['done']} of {len(source_files)} files in {project_root}"
+            )
+        
+        # Keep the listing order, whatever order the files were analyzed in
+        analysis_results = {path: analysis_results[path] for path, _, _ in source_files if path in analysis_results}
         
-        for language, _ in self._language_analyzers.items():
-            extensions = self._get_extensions_for_language(language)
-            for ext in extensions:
-                source_files.extend(list(root_path.glob(f"**/*{ext}")))
+        # Analyze references between modules
+        self._analyze_cross_module_references(analysis_results)
+        
+        return analysis_results
+    
+    def _find_source_files(self, root_path: Path, size_budget: Optional[int]) -> List[Tuple[str, str, int]]:
+        """
+        List the source files of a project that fit in a size budget.
+        
+        Returns:
+            (path, language, size) per file
+        """
+        # Find source code files using the shared project index
+        from angela.api.context import get_project_index
+        index = get_project_index(root_path)
         
         # Exclude files that shouldn't be analyzed
         exclude_patterns = [
@@ -315,24 +870,94 @@ class SemanticAnalyzer:
             "**/__pycache__/**", "**/.pytest_cache/**"
         ]
         
-        for pattern in exclude_patterns:
-            source_files = [f for f in source_files if not self._matches_glob_pattern(str(f), pattern)]
-        
-        # Limit to max files
-        source_files = source_files[:max_files]
-        
-        # Analyze each file
-        analysis_results = {}
+        source_files = []
+        total_size = 0
+        for language in self._language_analyzers:
+            for entry in index.iter_files(extensions=self._get_extensions_for_language(language)):
+                path = str(index.absolute(entry))
+                if any(self._matches_glob_pattern(path, pattern) for pattern in exclude_patterns):
+                    continue
+                if size_budget is not None and total_size + entry.size > size_budget:
+                    continue
+                total_size += entry.size
+                source_files.append((path, language, entry.size))
         
-        for file_path in source_files:
-            module = await self.analyze_file(file_path)
-            if module:
-                analysis_results[str(file_path)] = module
+        return source_files
+    
+    async def _analyze_local_files(
+        self,
+        files: List[Tuple[str, str, int]],
+        analysis_results: Dict[str, Module],
+        deadline: Optional[float],
+        max_workers: Optional[int],
+        report: Callable[[int], None]
+    ) -> None:
+        """
+        Parse (path, language, size) files of LOCAL_LANGUAGES, in worker processes if there are enough.
         
-        # Analyze references between modules
-        self._analyze_cross_module_references(analysis_results)
+        Chunks are submitted a few per worker at a time, so that running out
+        of time leaves little queued work to cancel.
+        """
+        def collect(results: List[Tuple[str, Optional[int], Any]]) -> None:
+            for path, mtime_ns, analysis in results:
+                if analysis is None:
+                    continue
+                if isinstance(analysis, Module):
+                    module, payload = analysis, None
+                else:
+                    module, payload = Module.from_dict(analysis), analysis
+                self._remember(Path(path), module, mtime_ns, payload)
+                analysis_results[path] = module
+            report(len(results))
+        
+        workers = min(max_workers or os.cpu_count() or 1, len(files))
+        if workers <= 1 or len(files) < MIN_PARALLEL_FILES:
+            for path, language, _ in files:
+                if deadline is not None and time.monotonic() >= deadline:
+                    return
+                collect(await self._analyze_chunk([(path, language)]))
+            return
+        
+        loop = asyncio.get_running_loop()
+        chunks = iter(_make_chunks(files))
+        in_flight: Dict[asyncio.Future, int] = {}
+        executor = ProcessPoolExecutor(max_workers=workers, mp_context=_worker_context())
+        try:
+            while True:
+                while len(in_flight) < workers * 2 and (deadline is None or time.monotonic() < deadline):
+                    chunk = next(chunks, None)
+                    if chunk is None:
+                        break
+                    in_flight[loop.run_in_executor(executor, _analyze_files_chunk, chunk)] = len(chunk)
+                if not in_flight:
+                    return
+                
+                timeout = None if deadline is None else max(0.0, deadline - time.monotonic())
+                finished, _ = await asyncio.wait(in_flight, timeout=timeout, return_when=asyncio.FIRST_COMPLETED)
+                if not finished:
+                    return
+                for future in finished:
+                    count = in_flight.pop(future)
+                    try:
+                        collect(future.result())
+                    except Exception as e:
+                        self._logger.error(f"Worker failed to analyze {count} files: {str(e)}")
+                        report(count)
+        finally:
+            for future in in_flight:
+                future.cancel()
+            executor.shutdown(wait=False, cancel_futures=True)
+    
+    def invalidate_files(self, file_paths: List[Union[str, Path]]) -> None:
+        """
+        Forget cached analysis results for changed files.
         
-        return analysis_results
+        Args:
+            file_paths: Paths of changed or deleted files
+        """
+        for file_path in file_paths:
+            self._modules.pop(str(file_path), None)
+            self._modules.pop(str(Path(file_path).resolve()), None)
     
     def _get_extensions_for_language(self, language: str) -> List[str]:
         """Get file extensions for a given language."""
@@ -374,251 +999,28 @@ class SemanticAnalyzer:
             self._logger.error(f"Error reading Python file {file_path}: {str(e)}")
             return False
         
-        # Parse the AST
+        # Parse the AST and extract its entities in one traversal
         try:
             tree = ast.parse(content, filename=str(file_path))
-            
-            # Get module docstring
-            module.docstring = ast.get_docstring(tree)
-            
-            # Visit all nodes in the AST to extract information
-            for node in ast.walk(tree):
-                # Extract imports
-                if isinstance(node, ast.Import):
-                    for name in node.names:
-                        import_name = name.asname or name.name
-                        module.imports[import_name] = Import(
-                            name=import_name,
-                            line_start=node.lineno,
-                            line_end=node.lineno,
-                            filename=str(file_path),
-                            import_path=name.name,
-                            is_from=False,
-                            alias=name.asname
-                        )
-                        module.dependencies.append(name.name)
-                
-                elif isinstance(node, ast.ImportFrom):
-                    module_name = node.module or ""
-                    for name in node.names:
-                        import_name = name.asname or name.name
-                        full_path = f"{module_name}.{name.name}" if module_name else name.name
-                        module.imports[import_name] = Import(
-                            name=import_name,
-                            line_start=node.lineno,
-                            line_end=node.lineno,
-                            filename=str(file_path),
-                            import_path=full_path,
-                            is_from=True,
-                            alias=name.asname
-                        )
-                        module.dependencies.append(full_path)
-                
-                # Extract functions
-                elif isinstance(node, ast.FunctionDef) or isinstance(node, ast.AsyncFunctionDef):
-                    # Check if we're inside a class
-                    parent_class = None
-                    for ancestor in ast.walk(tree):
-                        if isinstance(ancestor, ast.ClassDef):
-                            # Check if node is in the body of this class
-                            if any(node is child for child in ancestor.body):
-                                parent_class = ancestor.name
-                                break
-                    
-                    # Get function parameters
-                    params = []
-                    for arg in node.args.args:
-                        params.append(arg.arg)
-                    
-                    # Get decorators
-                    decorators = []
-                    for decorator in node.decorator_list:
-                        if isinstance(decorator, ast.Name):
-                            decorators.append(decorator.id)
-                        elif isinstance(decorator, ast.Attribute):
-                            decorators.append(f"{decorator.value.id}.{decorator.attr}")
-                        elif isinstance(decorator, ast.Call):
-                            if isinstance(decorator.func, ast.Name):
-                                decorators.append(decorator.func.id)
-                            elif isinstance(decorator.func, ast.Attribute):
-                                decorators.append(f"{decorator.func.value.id}.{decorator.func.attr}")
-                    
-                    # Get return type annotation if available
-                    return_type = None
-                    if node.returns:
-                        return_type = self._get_type_annotation(node.returns)
-                    
-                    # Create function entity
-                    function = Function(
-                        name=node.name,
-                        line_start=node.lineno,
-                        line_end=self._get_last_line(node),
-                        filename=str(file_path),
-                        params=params,
-                        docstring=ast.get_docstring(node),
-                        is_method=parent_class is not None,
-                        decorators=decorators,
-                        return_type=return_type,
-                        class_name=parent_class
-                    )
-                    
-                    # Extract called functions
-                    for child in ast.walk(node):
-                        if isinstance(child, ast.Call):
-                            if isinstance(child.func, ast.Name):
-                                function.called_functions.append(child.func.id)
-                            elif isinstance(child.func, ast.Attribute):
-                                if isinstance(child.func.value, ast.Name):
-                                    function.called_functions.append(f"{child.func.value.id}.{child.func.attr}")
-                    
-                    # Calculate cyclomatic complexity
-                    function.complexity = self._calculate_complexity(node)
-                    
-                    # Store the function in the appropriate place
-                    if parent_class and parent_class in module.classes:
-                        module.classes[parent_class].methods[node.name] = function
-                    else:
-                        module.functions[node.name] = function
-                
-                # Extract classes
-                elif isinstance(node, ast.ClassDef):
-                    # Get base classes
-                    base_classes = []
-                    for base in node.bases:
-                        if isinstance(base, ast.Name):
-                            base_classes.append(base.id)
-                        elif isinstance(base, ast.Attribute):
-                            base_classes.append(f"{base.value.id}.{base.attr}")
-                    
-                    # Get decorators
-                    decorators = []
-                    for decorator in node.decorator_list:
-                        if isinstance(decorator, ast.Name):
-                            decorators.append(decorator.id)
-                    
-                    # Create class entity
-                    class_entity = Class(
-                        name=node.name,
-                        line_start=node.lineno,
-                        line_end=self._get_last_line(node),
-                        filename=str(file_path),
-                        docstring=ast.get_docstring(node),
-                        base_classes=base_classes,
-                        decorators=decorators
-                    )
-                    
-                    # Look for class attributes
-                    for child in node.body:
-                        if isinstance(child, ast.Assign):
-                            for target in child.targets:
-                                if isinstance(target, ast.Name):
-                                    # Get value as string
-                                    value = None
-                                    if isinstance(child.value, ast.Constant):
-                                        value = str(child.value.value)
-                                    
-                                    # Create attribute entity
-                                    attribute = Variable(
-                                        name=target.id,
-                                        line_start=child.lineno,
-                                        line_end=child.lineno,
-                                        filename=str(file_path),
-                                        var_type=None,  # No type annotation in assign
-                                        value=value,
-                                        is_attribute=True,
-                                        class_name=node.name
-                                    )
-                                    
-                                    class_entity.attributes[target.id] = attribute
-                        
-                        elif isinstance(child, ast.AnnAssign) and isinstance(child.target, ast.Name):
-                            # Get type annotation
-                            var_type = self._get_type_annotation(child.annotation)
-                            
-                            # Get value as string
-                            value = None
-                            if child.value and isinstance(child.value, ast.Constant):
-                                value = str(child.value.value)
-                            
-                            # Create attribute entity
-                            attribute = Variable(
-                                name=child.target.id,
-                                line_start=child.lineno,
-                                line_end=child.lineno,
-                                filename=str(file_path),
-                                var_type=var_type,
-                                value=value,
-                                is_attribute=True,
-                                class_name=node.name
-                            )
-                            
-                            class_entity.attributes[child.target.id] = attribute
-                    
-                    module.classes[node.name] = class_entity
-                
-                # Extract global variables
-                elif isinstance(node, ast.Assign) and all(isinstance(target, ast.Name) for target in node.targets):
-                    for target in node.targets:
-                        # Skip private variables
-                        if target.id.startswith('_'):
-                            continue
-                        
-                        # Get value as string
-                        value = None
-                        if isinstance(node.value, ast.Constant):
-                            value = str(node.value.value)
-                        
-                        # Check if this is a constant
-                        is_constant = target.id.isupper()
-                        
-                        # Create variable entity
-                        variable = Variable(
-                            name=target.id,
-                            line_start=node.lineno,
-                            line_end=node.lineno,
-                            filename=str(file_path),
-                            var_type=None,  # No type annotation in assign
-                            value=value,
-                            is_constant=is_constant
-                        )
-                        
-                        module.variables[target.id] = variable
-                
-                elif isinstance(node, ast.AnnAssign) and isinstance(node.target, ast.Name):
-                    # Skip private variables
-                    if node.target.id.startswith('_'):
-                        continue
-                    
-                    # Get type annotation
-                    var_type = self._get_type_annotation(node.annotation)
-                    
-                    # Get value as string
-                    value = None
-                    if node.value and isinstance(node.value, ast.Constant):
-                        value = str(node.value.value)
-                    
-                    # Check if this is a constant
-                    is_constant = node.target.id.isupper()
-                    
-                    # Create variable entity
-                    variable = Variable(
-                        name=node.target.id,
-                        line_start=node.lineno,
-                        line_end=node.lineno,
-                        filename=str(file_path),
-                        var_type=var_type,
-                        value=value,
-                        is_constant=is_constant
-                    )
-                    
-                    module.variables[node.target.id] = variable
+            PythonEntityExtractor(module).visit(tree)
             
             # Calculate code metrics
+            total_lines = code_lines = comment_lines = blank_lines = 0
+            for line in content.splitlines():
+                total_lines += 1
+                stripped = line.strip()
+                if not stripped:
+                    blank_lines += 1
+                elif stripped.startswith('#'):
+                    comment_lines += 1
+                else:
+                    code_lines += 1
+            
             module.code_metrics = {
-                "total_lines": len(content.splitlines()),
-                "code_lines": len([line for line in content.splitlines() if line.strip() and not line.strip().startswith('#')]),
-                "comment_lines": len([line for line in content.splitlines() if line.strip().startswith('#')]),
-                "blank_lines": len([line for line in content.splitlines() if not line.strip()]),
+                "total_lines": total_lines,
+                "code_lines": code_lines,
+                "comment_lines": comment_lines,
+                "blank_lines": blank_lines,
                 "function_count": len(module.functions),
                 "class_count": len(module.classes),
                 "import_count": len(module.imports),
@@ -636,53 +1038,6 @@ class SemanticAnalyzer:
             self._logger.error(f"Error parsing Python file {file_path}: {str(e)}")
             return False
     
-    def _get_type_annotation(self, annotation) -> Optional[str]:
-        """Extract type annotation string from AST node."""
-        if isinstance(annotation, ast.Name):
-            return annotation.id
-        elif isinstance(annotation, ast.Attribute):
-            if isinstance(annotation.value, ast.Name):
-                return f"{annotation.value.id}.{annotation.attr}"
-            return annotation.attr
-        elif isinstance(annotation, ast.Subscript):
-            if isinstance(annotation.value, ast.Name):
-                if isinstance(annotation.slice, ast.Name):
-                    return f"{annotation.value.id}[{annotation.slice.id}]"
-                elif isinstance(annotation.slice, ast.Constant):
-                    return f"{annotation.value.id}[{annotation.slice.value}]"
-                return f"{annotation.value.id}[...]"
-            return "..."
-        return None
-    
-    def _get_last_line(self, node) -> int:
-        """Get the last line number of an AST node."""
-        # If the node has an end_lineno attribute (Python 3.8+), use it
-        if hasattr(node, 'end_lineno'):
-            return node.end_lineno
-        
-        # Otherwise, find the maximum lineno in the node and its children
-        max_lineno = node.lineno
-        for child in ast.iter_child_nodes(node):
-            max_lineno = max(max_lineno, self._get_last_line(child))
-        return max_lineno
-    
-    def _calculate_complexity(self, node) -> int:
-        """Calculate cyclomatic complexity of a function."""
-        complexity = 1  # Start with 1 (default path)
-        
-        # Count branches
-        for child in ast.walk(node):
-            if isinstance(child, (ast.If, ast.While, ast.For, ast.IfExp)):
-                complexity += 1
-            elif isinstance(child, ast.BoolOp) and isinstance(child.op, ast.And):
-                complexity += len(child.values) - 1
-            elif isinstance(child, ast.BoolOp) and isinstance(child.op, ast.Or):
-                complexity += len(child.values) - 1
-            elif isinstance(child, ast.Try):
-                complexity += len(child.handlers)  # Count except blocks
-        
-        return complexity
-    
     async def _analyze_javascript_file(self, file_path: Path, module: Module) -> bool:
         """
         Analyze a JavaScript file using a simple regex-based approach or LLM.
@@ -1169,6 +1524,30 @@ Ensure your JSON is valid. Don't include any comments or explanations outside th
                             cls.dependencies.append(base_class)
                             
     
+    def get_symbol_index(self, project_files: Dict[str, Module],
+                         project_root: Optional[Union[str, Path]] = None) -> SymbolIndex:
+        """
+        Get the symbol index of a set of analyzed modules.
+        
+        The index is built once per analysis generation: it is reused while
+        the same module objects are passed, and rebuilt once any of them has
+        been analyzed again.
+        
+        Args:
+            project_files: Dictionary of modules in the project
+            project_root: Root directory of the project, for module paths
+            
+        Returns:
+            SymbolIndex over the modules
+        """
+        key = tuple((path, id(module)) for path, module in project_files.items())
+        index = self._symbol_index
+        if index is None or self._symbol_index_key != key or (
+                project_root is not None and str(project_root) != str(index.root)):
+            self._symbol_index = SymbolIndex(project_files, project_root)
+            self._symbol_index_key = key
+        return self._symbol_index
+    
     def find_related_entities(self, entity_name: str, project_files: Dict[str, Module]) -> List[Dict[str, Any]]:
         """
         Find entities related to a given entity in the project.
@@ -1180,72 +1559,30 @@ Ensure your JSON is valid. Don't include any comments or explanations outside th
         Returns:
             List of related entities with relationship information
         """
+        index = self.get_symbol_index(project_files)
+        
+        def related(symbol, relationship: str) -> Dict[str, Any]:
+            return {
+                "name": symbol.qualified_name,
+                "type": symbol.kind,
+                "relationship": relationship,
+                "filename": symbol.filename,
+                "line": symbol.line_start
+            }
+        
         related_entities = []
         
-        # Look for entities that reference or are referenced by the target entity
-        for module_path, module in project_files.items():
-            # Check functions
-            for func_name, func in module.functions.items():
-                # Check if this is our target entity
-                if func_name == entity_name:
-                    # Find functions that call this one
-                    for other_module_path, other_module in project_files.items():
-                        for other_func_name, other_func in other_module.functions.items():
-                            if entity_name in other_func.called_functions:
-                                related_entities.append({
-                                    "name": other_func_name,
-                                    "type": "function",
-                                    "relationship": "calls",
-                                    "filename": other_module_path,
-                                    "line": other_func.line_start
-                                })
-                
-                # Check if this function calls our target entity
-                if entity_name in func.called_functions:
-                    related_entities.append({
-                        "name": func_name,
-                        "type": "function",
-                        "relationship": "called_by",
-                        "filename": module_path,
-                        "line": func.line_start
-                    })
-            
-            # Check classes
-            for class_name, cls in module.classes.items():
-                # Check if this is our target entity
-                if class_name == entity_name:
-                    # Find classes that inherit from this one
-                    for other_module_path, other_module in project_files.items():
-                        for other_class_name, other_class in other_module.classes.items():
-                            if entity_name in other_class.base_classes:
-                                related_entities.append({
-                                    "name": other_class_name,
-                                    "type": "class",
-                                    "relationship": "inherits_from",
-                                    "filename": other_module_path,
-                                    "line": other_class.line_start
-                                })
-                
-                # Check if this class inherits from our target entity
-                if entity_name in cls.base_classes:
-                    related_entities.append({
-                        "name": class_name,
-                        "type": "class",
-                        "relationship": "extended_by",
-                        "filename": module_path,
-                        "line": cls.line_start
-                    })
-                
-                # Check class methods
-                for method_name, method in cls.methods.items():
-                    if entity_name in method.called_functions:
-                        related_entities.append({
-                            "name": f"{class_name}.{method_name}",
-                            "type": "method",
-                            "relationship": "called_by",
-                            "filename": module_path,
-                            "line": method.line_start
-                        })
+        # Functions and methods that call the target entity
+        callers = index.callers(entity_name)
+        for _ in index.definitions(entity_name, kinds=("function",)):
+            related_entities.extend(related(s, "calls") for s in callers if s.kind == "function")
+        related_entities.extend(related(s, "called_by") for s in callers)
+        
+        # Classes that inherit from the target entity
+        subclasses = index.subclasses(entity_name)
+        for _ in index.definitions(entity_name, kinds=("class",)):
+            related_entities.extend(related(s, "inherits_from") for s in subclasses)
+        related_entities.extend(related(s, "extended_by") for s in subclasses)
         
         return related_entities
     
@@ -1271,46 +1608,13 @@ Ensure your JSON is valid. Don't include any comments or explanations outside th
         entity_module = None
         entity_type = None
         
-        for module_path, module in project_files.items():
-            # Check functions
-            if entity_name in module.functions:
-                entity_info = module.functions[entity_name].to_dict()
-                entity_module = module
-                entity_type = "function"
-                break
-            
-            # Check classes
-            if entity_name in module.classes:
-                entity_info = module.classes[entity_name].to_dict()
-                entity_module = module
-                entity_type = "class"
-                break
-            
-            # Check variables
-            if entity_name in module.variables:
-                entity_info = module.variables[entity_name].to_dict()
-                entity_module = module
-                entity_type = "variable"
-                break
-            
-            # Check for class methods
-            for class_name, cls in module.classes.items():
-                if entity_name in cls.methods:
-                    entity_info = cls.methods[entity_name].to_dict()
-                    entity_info["class_name"] = class_name
-                    entity_module = module
-                    entity_type = "method"
-                    break
-                
-                # Check for full qualified method name (class.method)
-                if "." in entity_name:
-                    class_part, method_part = entity_name.split(".", 1)
-                    if class_name == class_part and method_part in cls.methods:
-                        entity_info = cls.methods[method_part].to_dict()
-                        entity_info["class_name"] = class_name
-                        entity_module = module
-                        entity_type = "method"
-                        break
+        symbol = self.get_symbol_index(project_files, root_path).find(entity_name)
+        if symbol:
+            entity_info = symbol.entity.to_dict()
+            entity_module = project_files[symbol.filename]
+            entity_type = symbol.kind
+            if symbol.kind == "method":
+                entity_info["class_name"] = symbol.class_name
         
         if not entity_info:
             return {
@@ -1544,16 +1848,15 @@ focused and to-the-point - ideally 3-5 sentences.
         Returns:
             String with the entity's source code or None if not found
         """
-        # First, get the entity usage information
-        usage_info = await self.analyze_entity_usage(entity_name, project_root)
-        
-        if not usage_info.get("found", False):
+        project_files = await self.analyze_project_files(project_root)
+        symbol = self.get_symbol_index(project_files, project_root).find(entity_name)
+        if not symbol:
             return None
         
         # Get the file path and line range
-        filename = usage_info.get("filename")
-        start_line = usage_info.get("line_start", 1)
-        end_line = usage_info.get("line_end", start_line)
+        filename = symbol.filename
+        start_line = symbol.line_start
+        end_line = symbol.line_end
         
         # Read the file content
         try:
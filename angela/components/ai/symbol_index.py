@@ -0,0 +1,277 @@
+# angela/components/ai/symbol_index.py
+"""
+Project-wide symbol table over semantic analysis results.
+
+Finding an entity used to mean scanning every function, class and method of
+every analyzed module, and finding its uses meant scanning them all again.
+A SymbolIndex is built once from one generation of analyzed modules and
+answers these as dictionary lookups:
+
+- definitions by name, qualified name ("Class.method") and full name
+  ("package.module.Class.method")
+- reverse references: callers, subclasses and importers of a name
+- keyword search over the words of entity names and docstrings
+
+The index refers to the analyzed entities themselves. It is not updated in
+place; a new analysis of any module means building a new index.
+"""
+import bisect
+import heapq
+import re
+from collections import defaultdict
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Mapping, NamedTuple, Optional, Sequence, Set, Tuple, Union
+
+# Which definition of an ambiguous name wins within a module
+KIND_PRIORITY = {"function": 0, "class": 1, "variable": 2, "method": 3}
+
+# Kinds of definitions returned by keyword search
+SEARCHABLE_KINDS = ("function", "class", "method")
+
+# Score of a keyword equal to a word of an entity name, a prefix of one,
+# and a prefix of a word of its docstring
+EXACT_NAME_SCORE = 1.0
+PARTIAL_NAME_SCORE = 0.5
+DOCSTRING_SCORE = 0.3
+
+_DOC_WORD = re.compile(r"[a-z0-9_]+")
+# Words of an identifier, split on underscores and case changes ("getHTTPServer" -> get, HTTP, Server)
+_NAME_WORD = re.compile(r"[A-Z]?[a-z0-9]+|[A-Z]+(?![a-z])")
+
+
+class Symbol(NamedTuple):
+    """A definition in the symbol table."""
+    qualified_name: str    # "name", or "Class.method" for methods
+    kind: str              # function, class, method or variable
+    filename: str
+    line_start: int
+    line_end: int
+    module_name: str       # Dotted module path, e.g. "angela.api.ai"
+    entity: Any            # The analyzed Function, Class or Variable
+    order: int             # Position in the analysis
+
+    @property
+    def name(self) -> str:
+        return self.entity.name
+
+    @property
+    def full_name(self) -> str:
+        return f"{self.module_name}.{self.qualified_name}"
+
+    @property
+    def class_name(self) -> Optional[str]:
+        return self.qualified_name.rsplit(".", 1)[0] if self.kind == "method" else None
+
+
+class Reference(NamedTuple):
+    """A use of a name."""
+    kind: str                   # call, inherit or import
+    filename: str
+    line: int
+    symbol: Optional[Symbol]    # The calling function or the subclass; None for imports
+
+
+def module_name(filename: str, root: Optional[Union[str, Path]] = None) -> str:
+    """
+    Get the dotted module path of a source file.
+
+    Args:
+        filename: The file
+        root: Project root the module path is relative to
+
+    Returns:
+        Module path, or the file's stem if it is not under the root
+    """
+    path = Path(filename)
+    if root is not None:
+        try:
+            parts = list(path.relative_to(root).with_suffix("").parts)
+        except ValueError:
+            parts = [path.stem]
+    else:
+        parts = [path.stem]
+    if len(parts) > 1 and parts[-1] == "__init__":
+        parts.pop()
+    return ".".join(parts)
+
+
+class SymbolIndex:
+    """Definitions, references and keywords of a set of analyzed modules."""
+
+    def __init__(self, modules: Mapping[str, Any], root: Optional[Union[str, Path]] = None):
+        """
+        Build the index.
+
+        Args:
+            modules: Analyzed modules by file path
+            root: Project root, for module paths
+        """
+        self.modules = dict(modules)
+        self.root = root
+        self.symbols: List[Symbol] = []
+
+        self._definitions: Dict[str, List[Symbol]] = defaultdict(list)
+        self._callers: Dict[str, List[Symbol]] = defaultdict(list)
+        self._subclasses: Dict[str, List[Symbol]] = defaultdict(list)
+        self._imports: Dict[str, List[Reference]] = defaultdict(list)
+        self._file_order: Dict[str, int] = {}
+
+        # word -> positions of the searchable symbols with that word, once per occurrence
+        self._name_words: Dict[str, List[int]] = defaultdict(list)
+        self._doc_words: Dict[str, Set[int]] = defaultdict(set)
+
+        for file_order, (filename, module) in enumerate(self.modules.items()):
+            self._file_order[filename] = file_order
+            self._add_module(filename, module, module_name(filename, root))
+
+        self._name_vocabulary = sorted(self._name_words)
+        self._doc_vocabulary = sorted(self._doc_words)
+
+    def __len__(self) -> int:
+        return len(self.symbols)
+
+    def _add_module(self, filename: str, module: Any, mod_name: str) -> None:
+        for name, function in module.functions.items():
+            symbol = self._add(name, "function", filename, mod_name, function)
+            self._add_calls(symbol)
+
+        for class_name, cls in module.classes.items():
+            symbol = self._add(class_name, "class", filename, mod_name, cls)
+            for base in dict.fromkeys(cls.base_classes):
+                self._subclasses[base].append(symbol)
+            for method_name, method in cls.methods.items():
+                method_symbol = self._add(f"{class_name}.{method_name}", "method", filename, mod_name, method)
+                self._add_calls(method_symbol)
+
+        for name, variable in module.variables.items():
+            self._add(name, "variable", filename, mod_name, variable)
+
+        for name, imp in module.imports.items():
+            reference = Reference("import", filename, imp.line_start, None)
+            path = imp.import_path or name
+            for key in {name, path, path.rsplit(".", 1)[-1]}:
+                self._imports[key].append(reference)
+
+    def _add(self, qualified_name: str, kind: str, filename: str, mod_name: str, entity: Any) -> Symbol:
+        symbol = Symbol(qualified_name, kind, filename, entity.line_start, entity.line_end,
+                        mod_name, entity, len(self.symbols))
+        self.symbols.append(symbol)
+
+        keys = {qualified_name, symbol.full_name, entity.name}
+        for key in keys:
+            self._definitions[key].append(symbol)
+
+        if kind in SEARCHABLE_KINDS:
+            for word in _NAME_WORD.findall(entity.name):
+                self._name_words[word.lower()].append(symbol.order)
+            if entity.docstring:
+                for word in set(_DOC_WORD.findall(entity.docstring.lower())):
+                    self._doc_words[word].add(symbol.order)
+        return symbol
+
+    def _add_calls(self, symbol: Symbol) -> None:
+        for called in dict.fromkeys(symbol.entity.called_functions):
+            self._callers[called].append(symbol)
+
+    def definitions(self, name: str, kinds: Optional[Sequence[str]] = None) -> List[Symbol]:
+        """
+        Get the definitions of a name.
+
+        Args:
+            name: Plain, qualified ("Class.method") or full name
+            kinds: Only definitions of these kinds
+
+        Returns:
+            Matching symbols in analysis order
+        """
+        symbols = self._definitions.get(name, [])
+        if kinds is not None:
+            symbols = [s for s in symbols if s.kind in kinds]
+        return list(symbols)
+
+    def find(self, name: str) -> Optional[Symbol]:
+        """
+        Get the definition a name most likely refers to.
+
+        The first analyzed module defining the name wins; within a module,
+        functions are preferred over classes, variables and methods.
+
+        Args:
+            name: Plain, qualified or full name
+
+        Returns:
+            The symbol, or None if the name is not defined
+        """
+        symbols = self._definitions.get(name)
+        if not symbols:
+            return None
+        return min(symbols, key=lambda s: (self._file_order[s.filename], KIND_PRIORITY[s.kind], s.order))
+
+    def callers(self, name: str) -> List[Symbol]:
+        """Get the functions and methods calling a name, as written at the call site."""
+        return list(self._callers.get(name, []))
+
+    def subclasses(self, name: str) -> List[Symbol]:
+        """Get the classes listing a name among their base classes."""
+        return list(self._subclasses.get(name, []))
+
+    def importers(self, name: str) -> List[Reference]:
+        """Get the imports of a name, by imported name, import path or its last part."""
+        return list(self._imports.get(name, []))
+
+    def references(self, name: str) -> List[Reference]:
+        """
+        Get all uses of a name: calls, inheritance and imports.
+
+        Args:
+            name: The name as used in the code
+
+        Returns:
+            References ordered by file and line
+        """
+        references = [Reference("call", s.filename, s.line_start, s) for s in self.callers(name)]
+        references += [Reference("inherit", s.filename, s.line_start, s) for s in self.subclasses(name)]
+        references += self.importers(name)
+        references.sort(key=lambda r: (self._file_order.get(r.filename, 0), r.line))
+        return references
+
+    def search(self, keywords: Iterable[str], limit: int = 5) -> List[Tuple[Symbol, float]]:
+        """
+        Find functions, classes and methods matching keywords.
+
+        A keyword scores for each word of an entity's name (split on
+        underscores and case changes) it equals or begins, and once if it begins a word of
+        the entity's docstring.
+
+        Args:
+            keywords: Lowercase query words
+            limit: Maximum number of results
+
+        Returns:
+            (symbol, score) pairs, best first
+        """
+        scores: Dict[int, float] = defaultdict(float)
+        for keyword in keywords:
+            if not keyword:
+                continue
+            for word in self._prefixed(self._name_vocabulary, keyword):
+                score = EXACT_NAME_SCORE if word == keyword else PARTIAL_NAME_SCORE
+                for order in self._name_words[word]:
+                    scores[order] += score
+
+            documented: Set[int] = set()
+            for word in self._prefixed(self._doc_vocabulary, keyword):
+                documented.update(self._doc_words[word])
+            for order in documented:
+                scores[order] += DOCSTRING_SCORE
+
+        best = heapq.nsmallest(limit, scores.items(), key=lambda item: (-item[1], item[0]))
+        return [(self.symbols[order], score) for order, score in best]
+
+    @staticmethod
+    def _prefixed(vocabulary: List[str], prefix: str) -> Iterable[str]:
+        """Words of a sorted vocabulary starting with a prefix."""
+        i = bisect.bisect_left(vocabulary, prefix)
+        while i < len(vocabulary) and vocabulary[i].startswith(prefix):
+            yield vocabulary[i]
+            i += 1
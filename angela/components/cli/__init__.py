@@ -11,6 +11,7 @@ from angela.components.cli.workflows import app as workflows_app
 from angela.components.cli.generation import app as generation_app
 from angela.components.execution.rollback_commands import app as rollback_app
 from angela.components.cli.docker import app as docker_app
+from angela.components.cli.daemon import app as daemon_app
 
 # Add subcommands to the main app
 main_app.add_typer(files_app, name="files", help="File and directory operations")
@@ -18,6 +19,7 @@ main_app.add_typer(workflows_app, name="workflows", help="Workflow management")
 main_app.add_typer(generation_app, name="generate", help="Code generation")
 main_app.add_typer(rollback_app, name="rollback", help="Rollback operations and transactions")
 main_app.add_typer(docker_app, name="docker", help="Docker and Docker Compose operations")
+main_app.add_typer(daemon_app, name="daemon", help="Resident daemon management")
 
 # Export the main app
 app = main_app
@@ -0,0 +1,117 @@
+# angela/components/cli/daemon.py
+"""
+CLI commands for managing the resident Angela daemon.
+
+The daemon keeps Angela's services loaded so that shell hooks can send
+notifications over a Unix socket instead of starting Python for every
+command typed.
+"""
+import asyncio
+import subprocess
+import sys
+import time
+
+import typer
+from rich.console import Console
+from rich.table import Table
+
+from angela.constants import LOG_DIR, DAEMON_SOCKET_PATH
+from angela.components.monitoring import daemon_client
+from angela.utils.logging import get_logger
+
+logger = get_logger(__name__)
+console = Console()
+
+# Create the Typer app for daemon commands
+app = typer.Typer(help="Manage the resident Angela daemon")
+
+
+@app.command("start")
+def start_daemon(
+    monitor: bool = typer.Option(
+        False, "--monitor", "-m", help="Run background monitoring inside the daemon"
+    ),
+    wait: float = typer.Option(
+        5.0, "--wait", help="Seconds to wait for the daemon to come up"
+    ),
+):
+    """Start the daemon in the background."""
+    if daemon_client.is_daemon_running():
+        console.print("[green]Angela daemon is already running.[/green]")
+        return
+
+    LOG_DIR.mkdir(parents=True, exist_ok=True)
+    command = [sys.executable, "-m", "angela", "daemon", "run"]
+    if monitor:
+        command.append("--monitor")
+
+    with open(LOG_DIR / "daemon.log", "ab") as log_file:
+        subprocess.Popen(
+            command,
+            stdin=subprocess.DEVNULL,
+            stdout=log_file,
+            stderr=log_file,
+            start_new_session=True,
+            close_fds=True,
+        )
+
+    deadline = time.monotonic() + wait
+    while time.monotonic() < deadline:
+        if daemon_client.is_daemon_running():
+            console.print(f"[green]Angela daemon started[/green] ({DAEMON_SOCKET_PATH})")
+            return
+        time.sleep(0.1)
+
+    console.print("[red]Angela daemon did not start. See the daemon log for details.[/red]")
+    raise typer.Exit(1)
+
+
+@app.command("run")
+def run_daemon(
+    monitor: bool = typer.Option(
+        False, "--monitor", "-m", help="Run background monitoring inside the daemon"
+    ),
+):
+    """Run the daemon in the foreground."""
+    from angela.api.monitoring import get_angela_daemon
+
+    try:
+        asyncio.run(get_angela_daemon().serve(initialize=True, monitor=monitor))
+    except RuntimeError as e:
+        console.print(f"[red]{str(e)}[/red]")
+        raise typer.Exit(1)
+
+
+@app.command("stop")
+def stop_daemon():
+    """Stop the running daemon."""
+    reply = daemon_client.request_control("shutdown")
+    if reply and reply.get("ok"):
+        console.print("[green]Angela daemon stopped.[/green]")
+    else:
+        console.print("[yellow]Angela daemon is not running.[/yellow]")
+
+
+@app.command("status")
+def daemon_status():
+    """Show daemon status and notification statistics."""
+    reply = daemon_client.request_control("stats")
+    if not reply or not reply.get("ok"):
+        console.print("[yellow]Angela daemon is not running.[/yellow]")
+        raise typer.Exit(1)
+
+    stats = reply["stats"]
+    table = Table(title="Angela Daemon")
+    table.add_column("Metric", style="cyan")
+    table.add_column("Value", style="green")
+
+    table.add_row("PID", str(stats["pid"]))
+    table.add_row("Uptime", f"{stats['uptime']:.0f}s")
+    table.add_row("Notifications received", str(stats["received"]))
+    table.add_row("Notifications handled", str(stats["handled"]))
+    table.add_row("Dropped (queue full)", str(stats["dropped"]))
+    table.add_row("Handler errors", str(stats["errors"]))
+    table.add_row("Queue depth", str(stats["queue_depth"]))
+    table.add_row("Average handle time", f"{stats['avg_handle_ms']:.2f} ms")
+
+    console.print(table)
@@ -34,6 +34,7 @@ from angela.api.toolchain import (
     get_ci_cd_integration
 )
 from angela.api.review import get_diff_manager, get_feedback_manager
+from angela.api.shell import get_terminal_formatter
 from angela.api.context import (
     get_context_manager,
     get_context_enhancer,
@@ -453,13 +454,15 @@ async def refine_code(
         # Process feedback
         console.print("\n[bold]Processing feedback...[/bold]")
         
-        with console.status("[bold green]Generating improvements...[/bold green]"):
+        # Show the response while it is generated instead of a bare spinner
+        with get_terminal_formatter().streaming_panel("Generating improvements", transient=True) as panel:
             feedback_manager = get_feedback_manager()
             result = await feedback_manager.process_feedback(
                 feedback=feedback,
                 original_code=original_code,
                 file_path=str(file),
-                context=context
+                context=context,
+                on_chunk=panel.append
             )
         
         # Display diff
@@ -121,6 +121,13 @@ def request(
     full_request = " ".join(request_text)
     
     try:
+        # Continue the session held by the resident daemon, if any, so that
+        # requests like "fix the last command" see what the shell hooks saw
+        from angela.components.monitoring import daemon_client
+        daemon_session = daemon_client.fetch_session_context()
+        if daemon_session:
+            session_manager.load_context(daemon_session)
+        
         # If forcing execution, set this in the session
         if force:
             session_manager.add_entity("force_execution", "preference", "true")
@@ -134,6 +141,10 @@ def request(
             full_request, execute=execute, dry_run=dry_run
         ))
         
+        # Hand the session, now including this request, back to the daemon
+        if daemon_session:
+            daemon_client.push_session_context(session_manager.get_context())
+        
         
         # In debug mode, show context information
         if config_manager.config.debug:
@@ -141,6 +152,14 @@ def request(
             rich_print("[bold blue]Context:[/bold blue]")
             rich_print(context_text)
             
+            if result.get("timings"):
+                timing_text = "\n".join(
+                    f"{stage['name']}: {stage['ms']:.1f} ms{' (cached)' if stage['cached'] else ''}"
+                    for stage in result["timings"]["stages"]
+                )
+                rich_print("[bold blue]Timings:[/bold blue]")
+                rich_print(f"{timing_text}\ntotal: {result['timings']['total_ms']:.1f} ms")
+            
     except Exception as e:
         logger.exception("Error processing request")
         console.print(f"[bold red]Error:[/bold red] {str(e)}")
@@ -315,12 +334,20 @@ def notify(
     Handle notifications from shell hooks.
     This is an internal command not meant to be called directly by users.
     """
+    from angela.components.monitoring import daemon_client
+    
+    args = args or []
+    
+    # Hand the notification to the resident daemon if one is listening
+    if daemon_client.send_notification(notification_type, *args):
+        return
+    
     # Import here to avoid circular imports
-    from angela.monitoring.notification_handler import notification_handler
+    from angela.api.monitoring import get_notification_handler
     
     try:
         # Run the notification handler asynchronously
-        asyncio.run(notification_handler.handle_notification(notification_type, *args))
+        asyncio.run(get_notification_handler().handle_notification(notification_type, *args))
     except Exception as e:
         logger.exception(f"Error handling notification: {str(e)}")
         # Swallow the exception to avoid disrupting the shell
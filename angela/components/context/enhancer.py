@@ -57,47 +57,7 @@ class ContextEnhancer:
             await self._add_file_reference_context(enriched)
             
             # Add enhanced file activity information 
-            file_activity_tracker = get_file_activity_tracker()
-            
-            try:
-                # Get ActivityType enum
-                from angela.api.context import get_activity_type
-                ActivityType = get_activity_type()
-                
-                # Get recent file activities by types
-                viewed_activities = file_activity_tracker.get_recent_activities(
-                    limit=5, 
-                    activity_types=[ActivityType.VIEWED]
-                )
-                modified_activities = file_activity_tracker.get_recent_activities(
-                    limit=5, 
-                    activity_types=[ActivityType.MODIFIED]
-                )
-                created_activities = file_activity_tracker.get_recent_activities(
-                    limit=5, 
-                    activity_types=[ActivityType.CREATED]
-                )
-                
-                # Extract paths from activities
-                viewed_files = [activity.get('path', '') for activity in viewed_activities if 'path' in activity]
-                modified_files = [activity.get('path', '') for activity in modified_activities if 'path' in activity]
-                created_files = [activity.get('path', '') for activity in created_activities if 'path' in activity]
-                
-                # Update or create recent_files
-                if "recent_files" not in enriched:
-                    enriched["recent_files"] = {}
-                    
-                enriched["recent_files"].update({
-                    "accessed": viewed_files,
-                    "modified": modified_files,
-                    "created": created_files,
-                })
-                
-                # Get most active files
-                most_active = file_activity_tracker.get_most_active_files(limit=5)
-                enriched["active_files"] = most_active
-            except Exception as e:
-                self._logger.warning(f"Error getting file activity: {str(e)}")
+            await self._add_tracked_file_activity(enriched)
             
             # Add file resolver information if available
             if "requested_file" in context:
@@ -116,13 +76,7 @@ class ContextEnhancer:
                     self._logger.warning(f"Error resolving file references: {str(e)}")
             
             # Run all registered enhancers
-            for enhancer in self._enhancers:
-                try:
-                    result = await enhancer(enriched)
-                    if result:
-                        enriched.update(result)
-                except Exception as e:
-                    self._logger.error(f"Error in enhancer {getattr(enhancer, '__name__', 'anonymous')}: {str(e)}")
+            enriched = await self.run_enhancers(enriched)
             
             self._logger.debug(f"Context enriched with {len(enriched) - len(context)} additional keys")
         except Exception as e:
@@ -131,13 +85,14 @@ class ContextEnhancer:
         
         return enriched
     
-    async def _add_project_info(self, context: Dict[str, Any], project_root: str) -> None:
+    async def _add_project_info(self, context: Dict[str, Any], project_root: str, refresh: bool = False) -> None:
         """
         Add enhanced project information to the context.
         
         Args:
             context: The context to enrich
             project_root: The path to the project root
+            refresh: Re-infer project information even if it is cached
         """
         # Get project_inference from API
         project_inference = get_project_inference()
@@ -146,6 +101,8 @@ class ContextEnhancer:
         
         try:
             # Check cache first
+            if refresh:
+                self._project_info_cache.pop(project_root, None)
             if project_root in self._project_info_cache:
                 project_info = self._project_info_cache[project_root]
                 self._logger.debug(f"Using cached project info for {project_root}")
@@ -312,18 +269,68 @@ class ContextEnhancer:
                 "count": 0
             }
     
-    async def _add_file_reference_context(self, context: Dict[str, Any]) -> None:
+    async def _add_tracked_file_activity(self, context: Dict[str, Any]) -> None:
+        """
+        Add viewed, modified and created files from the file activity tracker.
+        
+        Args:
+            context: The context to enrich
+        """
+        file_activity_tracker = get_file_activity_tracker()
+        
+        try:
+            # Get ActivityType enum
+            from angela.api.context import get_activity_type
+            ActivityType = get_activity_type()
+            
+            # Get recent file activities by types
+            viewed_activities = file_activity_tracker.get_recent_activities(
+                limit=5, 
+                activity_types=[ActivityType.VIEWED]
+            )
+            modified_activities = file_activity_tracker.get_recent_activities(
+                limit=5, 
+                activity_types=[ActivityType.MODIFIED]
+            )
+            created_activities = file_activity_tracker.get_recent_activities(
+                limit=5, 
+                activity_types=[ActivityType.CREATED]
+            )
+            
+            # Extract paths from activities
+            viewed_files = [activity.get('path', '') for activity in viewed_activities if 'path' in activity]
+            modified_files = [activity.get('path', '') for activity in modified_activities if 'path' in activity]
+            created_files = [activity.get('path', '') for activity in created_activities if 'path' in activity]
+            
+            # Update or create recent_files
+            if "recent_files" not in context:
+                context["recent_files"] = {}
+                
+            context["recent_files"].update({
+                "accessed": viewed_files,
+                "modified": modified_files,
+                "created": created_files,
+            })
+            
+            # Get most active files
+            most_active = file_activity_tracker.get_most_active_files(limit=5)
+            context["active_files"] = most_active
+        except Exception as e:
+            self._logger.warning(f"Error getting file activity: {str(e)}")
+    
+    async def _add_file_reference_context(self, context: Dict[str, Any], cwd: Optional[str] = None) -> None:
         """
         Add file reference context information.
         
         Args:
             context: The context to enrich
+            cwd: Directory to list, defaults to the context's cwd
         """
         self._logger.debug("Adding file reference context")
         
         try:
             # Get current working directory
-            cwd = context.get("cwd", "")
+            cwd = cwd or context.get("cwd", "")
             if not cwd:
                 return
             
@@ -345,6 +352,59 @@ class ContextEnhancer:
         except Exception as e:
             self._logger.error(f"Error adding file reference context: {str(e)}")
     
+    # Individual enrichment steps, used by the context pipeline to cache and
+    # recompute each part of the context independently
+    
+    async def add_project_info(self, context: Dict[str, Any], project_root: str, refresh: bool = False) -> None:
+        """
+        Add enhanced project information (``enhanced_project``) to the context.
+        
+        Args:
+            context: The context to enrich
+            project_root: The path to the project root
+            refresh: Re-infer project information even if it is cached
+        """
+        await self._add_project_info(context, project_root, refresh=refresh)
+    
+    async def add_file_activity(self, context: Dict[str, Any]) -> None:
+        """
+        Add session and tracker file activity (``recent_files``, ``active_files``).
+        
+        Args:
+            context: The context to enrich
+        """
+        await self._add_recent_file_activity(context)
+        await self._add_tracked_file_activity(context)
+    
+    async def add_file_reference_context(self, context: Dict[str, Any], cwd: Optional[str] = None) -> None:
+        """
+        Add a listing of the working directory (``file_reference``).
+        
+        Args:
+            context: The context to enrich
+            cwd: Directory to list, defaults to the context's cwd
+        """
+        await self._add_file_reference_context(context, cwd=cwd)
+    
+    async def run_enhancers(self, context: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Run all registered enhancer functions.
+        
+        Args:
+            context: The context to enrich
+            
+        Returns:
+            The context updated with the enhancers' results
+        """
+        for enhancer in self._enhancers:
+            try:
+                result = await enhancer(context)
+                if result:
+                    context.update(result)
+            except Exception as e:
+                self._logger.error(f"Error in enhancer {getattr(enhancer, '__name__', 'anonymous')}: {str(e)}")
+        return context
+    
     def clear_cache(self) -> None:
         """Clear the context enhancer cache."""
         self._logger.debug("Clearing context enhancer cache")
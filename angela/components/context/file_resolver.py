@@ -5,12 +5,14 @@ import re
 import time
 import difflib
 import fnmatch
+import heapq
 from enum import Enum
 from dataclasses import dataclass
 from pathlib import Path
 from typing import Dict, Any, Optional, List, Tuple, Union, Set, NamedTuple, Iterator, Callable
 
 from angela.api.context import get_context_manager, get_session_manager, get_file_activity_tracker
+from angela.components.context.path_index import MIN_NAME_SCORE, trigram_similarity
 from angela.utils.logging import get_logger
 
 logger = get_logger(__name__)
@@ -910,8 +912,8 @@ class FileResolver:
         """
         matches = []
         
-        # Get paths to check based on search scope
-        paths_to_check = await self._get_paths_to_check(context, search_scope)
+        # Get the best candidates by name from the path index
+        paths_to_check = await self._get_fuzzy_candidates(reference, context, search_scope)
         
         # Skip if no paths to check
         if not paths_to_check:
@@ -921,14 +923,10 @@ class FileResolver:
         reference_path = Path(reference)
         specific_extension = reference_path.suffix if reference_path.suffix else None
         
-        # Calculate match scores with enhanced scoring
+        # Rescore the candidates with enhanced scoring
         for path in paths_to_check:
-            # Skip directories unless explicitly looking for one
-            if path.is_dir() and not reference.endswith('/'):
-                continue
-                
             # Skip files with wrong extension if we're looking for a specific one
-            if specific_extension and path.is_file() and path.suffix != specific_extension:
+            if specific_extension and not reference.endswith('/') and path.suffix != specific_extension:
                 continue
             
             # Calculate base similarity score
@@ -1042,8 +1040,8 @@ class FileResolver:
             
             for pattern in patterns_to_try:
                 try:
-                    # Use glob to find matching files
-                    found_matches = list(base_path.glob(pattern))
+                    # Use the project index to find matching files
+                    found_matches = self._glob(base_path, pattern, context)
                     
                     # Score and add matches
                     for path in found_matches:
@@ -1433,7 +1431,7 @@ class FileResolver:
                     module_path = base_path / module_name
                     if module_path.exists() and module_path.is_dir():
                         # Look for files within the module
-                        for file_path in module_path.glob('**/*'):
+                        for file_path in self._glob(module_path, '**/*', context):
                             if file_path.is_file():
                                 # Check if any part of the reference matches
                                 if any(part.lower() in file_path.name.lower() for part in reference.split('.')):
@@ -1525,6 +1523,95 @@ class FileResolver:
         
         return base_paths
     
+    def _get_project_index(self, context: Dict[str, Any]):
+        """
+        Get the file index of the context's project.
+        
+        Args:
+            context: Context information
+            
+        Returns:
+            The refreshed ProjectIndex, or None outside a project
+        """
+        if not context.get("project_root"):
+            return None
+        try:
+            from angela.api.context import get_project_index
+            return get_project_index(context["project_root"])
+        except Exception as e:
+            self._logger.debug(f"Project index unavailable: {str(e)}")
+            return None
+    
+    def _relative_to_index(self, index, path: Path) -> Optional[str]:
+        """Get a path relative to an index root, or None if it is outside."""
+        try:
+            relative = path.resolve().relative_to(index.root).as_posix()
+        except (ValueError, OSError):
+            return None
+        return "" if relative == "." else relative
+    
+    def _glob(self, base_path: Path, pattern: str, context: Dict[str, Any]) -> List[Path]:
+        """
+        Glob below a base path, through the project index when it covers it.
+        
+        Args:
+            base_path: Directory the pattern is relative to
+            pattern: Glob pattern
+            context: Context information
+            
+        Returns:
+            Matching files and directories
+        """
+        index = self._get_project_index(context)
+        relative = self._relative_to_index(index, base_path) if index else None
+        if relative is None:
+            return list(base_path.glob(pattern))
+        return index.glob(f"{relative}/{pattern}" if relative else pattern, directories=True)
+    
+    async def _get_fuzzy_candidates(
+        self, 
+        reference: str, 
+        context: Dict[str, Any],
+        search_scope: Optional[str] = None
+    ) -> List[Path]:
+        """
+        Get the paths whose names best match a reference.
+        
+        Candidates come from the project's path index, which covers the whole
+        tree. Locations outside the project fall back to a directory listing.
+        
+        Args:
+            reference: The reference to resolve
+            context: Context information
+            search_scope: Optional scope for the search
+            
+        Returns:
+            Up to a few times ``_max_candidates`` paths, best first
+        """
+        limit = self._max_candidates * 5
+        directories = reference.endswith('/')
+        cwd_path = Path(context["cwd"])
+        index = self._get_project_index(context)
+        cwd_relative = self._relative_to_index(index, cwd_path) if index else None
+        
+        scored: Dict[Path, float] = {}
+        if index is not None and (search_scope != "directory" or cwd_relative is not None):
+            under = cwd_relative if search_scope == "directory" else None
+            for candidate in index.search_paths(reference, limit=limit, under=under, directories=directories):
+                # The directory scope only covers direct children
+                if under is not None and "/" in candidate.path[len(under):].lstrip("/"):
+                    continue
+                scored[index.absolute(candidate.path)] = candidate.score
+        
+        if cwd_relative is None and search_scope != "project":
+            name = reference.rstrip('/').rsplit('/', 1)[-1]
+            for path in cwd_path.glob("*"):
+                score = trigram_similarity(name, path.name)
+                if score >= MIN_NAME_SCORE and path.is_dir() == directories:
+                    scored[path] = max(score, scored.get(path, 0.0))
+        
+        return heapq.nlargest(limit, scored, key=scored.get)
+    
     async def _get_paths_to_check(
         self, 
         context: Dict[str, Any],
@@ -1634,6 +1721,17 @@ class FileResolver:
         except Exception as e:
             self._logger.error(f"Error recording resolution: {str(e)}")
     
+    def handle_file_changes(self, batch) -> None:
+        """
+        Drop cached resolutions invalidated by a file watcher change batch.
+        
+        Args:
+            batch: A FileChangeBatch from the file watcher
+        """
+        if batch.structure_changed:
+            # New or removed files can change the best match for any reference
+            self._cache.clear()
+    
     def _get_from_cache(self, key: str) -> Optional[Path]:
         """
         Get a value from the cache.
@@ -0,0 +1,506 @@
+# angela/components/context/git_state.py
+"""
+Git repository state for project context.
+
+Project state analysis and the background Git monitor used to run one git
+command after another (current branch, status, stash list, status again for
+ahead/behind, log) through the execution engine, each in a new shell and
+each recorded as a rollback operation. GitStateProvider instead:
+
+- gets the branch, upstream, ahead/behind counts and file states from a
+  single ``git status --porcelain=v2 --branch -z``
+- runs the remaining git commands concurrently with it, directly and
+  without optional locks, so they never contend with the user's own git
+- reads HEAD, refs and the stash reflog from the Git directory itself
+- caches results per repository while the index, HEAD and the refs they
+  point to are unchanged, for at most ``max_age`` seconds (edits to the
+  working tree do not touch the Git directory)
+"""
+import asyncio
+import os
+import re
+import time
+from pathlib import Path
+from typing import Any, Dict, List, NamedTuple, Optional, Tuple, Union
+
+from angela.utils.logging import get_logger
+
+logger = get_logger(__name__)
+
+# Seconds a cached state is used while the repository's index and refs are unchanged
+STATE_MAX_AGE = 5.0
+
+# Seconds a git command may run
+GIT_TIMEOUT = 15.0
+
+RECENT_COMMITS = 5
+
+
+class GitFileStatus(NamedTuple):
+    """A changed, untracked or ignored file."""
+    path: str
+    index: str                           # Status in the index: ".", "M", "A", "D", "R", "C", "U", "?" or "!"
+    worktree: str                        # Status in the working tree, same codes
+    original_path: Optional[str] = None  # Source of a rename or copy
+
+
+def find_git_dir(root: Union[str, Path]) -> Optional[Path]:
+    """
+    Get the Git directory of a repository root, following ``.git`` files of
+    worktrees and submodules.
+
+    Args:
+        root: The repository root
+
+    Returns:
+        Path to the Git directory, or None if root is not a repository root
+    """
+    dot_git = Path(root) / ".git"
+    if dot_git.is_dir():
+        return dot_git
+    if dot_git.is_file():
+        try:
+            content = dot_git.read_text(encoding="utf-8").strip()
+        except OSError:
+            return None
+        if content.startswith("gitdir:"):
+            git_dir = Path(content[len("gitdir:"):].strip())
+            return git_dir if git_dir.is_absolute() else (Path(root) / git_dir).resolve()
+    return None
+
+
+def common_dir(git_dir: Path) -> Path:
+    """Get the directory holding refs: the main repository's for a linked worktree."""
+    try:
+        common = (git_dir / "commondir").read_text(encoding="utf-8").strip()
+    except OSError:
+        return git_dir
+    path = Path(common)
+    return path if path.is_absolute() else (git_dir / path).resolve()
+
+
+def resolve_ref(git_dir: Path, ref: str) -> Optional[str]:
+    """
+    Resolve a ref from its loose file or packed-refs.
+
+    Args:
+        git_dir: The Git directory
+        ref: Full ref name, e.g. "refs/heads/main"
+
+    Returns:
+        Object id, or None if the ref does not exist
+    """
+    refs_dir = common_dir(git_dir)
+    for _ in range(5):
+        try:
+            value = (refs_dir / ref).read_text(encoding="utf-8").strip()
+        except OSError:
+            break
+        if not value.startswith("ref: "):
+            return value or None
+        ref = value[5:]
+
+    try:
+        with open(refs_dir / "packed-refs", encoding="utf-8") as f:
+            for line in f:
+                if line.startswith(("#", "^")):
+                    continue
+                oid, _, name = line.rstrip("\n").partition(" ")
+                if name == ref:
+                    return oid
+    except OSError:
+        pass
+    return None
+
+
+def read_head(git_dir: Path) -> Tuple[Optional[str], Optional[str]]:
+    """
+    Read HEAD.
+
+    Args:
+        git_dir: The Git directory
+
+    Returns:
+        (branch, commit): branch is None when HEAD is detached, commit is
+        None on an unborn branch
+    """
+    try:
+        head = (git_dir / "HEAD").read_text(encoding="utf-8").strip()
+    except OSError:
+        return None, None
+    if not head.startswith("ref: "):
+        return None, head or None
+    ref = head[5:]
+    branch = ref[len("refs/heads/"):] if ref.startswith("refs/heads/") else None
+    return branch, resolve_ref(git_dir, ref)
+
+
+def parse_status_v2(output: str) -> Dict[str, Any]:
+    """
+    Parse ``git status --porcelain=v2 --branch -z`` output.
+
+    Args:
+        output: The command output
+
+    Returns:
+        Dictionary with oid, branch, upstream, ahead, behind and files
+        (a list of GitFileStatus)
+    """
+    status: Dict[str, Any] = {
+        "oid": None, "branch": None, "upstream": None, "ahead": 0, "behind": 0, "files": []
+    }
+    tokens = output.split("\0")
+    i = 0
+    while i < len(tokens):
+        token = tokens[i]
+        i += 1
+        if not token:
+            continue
+        kind = token[0]
+        if kind == "#":
+            key, _, value = token[2:].partition(" ")
+            if key == "branch.oid":
+                status["oid"] = None if value == "(initial)" else value
+            elif key == "branch.head":
+                status["branch"] = None if value == "(detached)" else value
+            elif key == "branch.upstream":
+                status["upstream"] = value
+            elif key == "branch.ab":
+                ahead, _, behind = value.partition(" ")
+                status["ahead"], status["behind"] = int(ahead), abs(int(behind))
+        elif kind == "1":
+            fields = token.split(" ", 8)
+            status["files"].append(GitFileStatus(fields[8], fields[1][0], fields[1][1]))
+        elif kind == "2":
+            # Renames and copies are followed by the original path
+            fields = token.split(" ", 9)
+            original = tokens[i] if i < len(tokens) else None
+            i += 1
+            status["files"].append(GitFileStatus(fields[9], fields[1][0], fields[1][1], original))
+        elif kind == "u":
+            fields = token.split(" ", 10)
+            status["files"].append(GitFileStatus(fields[10], fields[1][0], fields[1][1]))
+        elif kind in "?!":
+            status["files"].append(GitFileStatus(token[2:], kind, kind))
+    return status
+
+
+async def run_git(root: Union[str, Path], *args: str, timeout: float = GIT_TIMEOUT) -> Optional[str]:
+    """
+    Run a git command in a repository.
+
+    Args:
+        root: Working directory
+        *args: Arguments to git
+        timeout: Seconds before the command is killed
+
+    Returns:
+        The command's stdout, or None if it failed
+    """
+    env = dict(os.environ, GIT_OPTIONAL_LOCKS="0", GIT_TERMINAL_PROMPT="0")
+    try:
+        process = await asyncio.create_subprocess_exec(
+            "git", *args,
+            stdout=asyncio.subprocess.PIPE,
+            stderr=asyncio.subprocess.PIPE,
+            stdin=asyncio.subprocess.DEVNULL,
+            cwd=str(root),
+            env=env
+        )
+    except OSError as e:
+        logger.debug(f"Could not run git {args[0]}: {str(e)}")
+        return None
+
+    try:
+        stdout, stderr = await asyncio.wait_for(process.communicate(), timeout)
+    except asyncio.TimeoutError:
+        process.kill()
+        await process.wait()
+        logger.warning(f"git {args[0]} in {root} timed out after {timeout}s")
+        return None
+
+    if process.returncode != 0:
+        logger.debug(f"git {args[0]} in {root} failed: {stderr.decode('utf-8', errors='replace').strip()}")
+        return None
+    return stdout.decode("utf-8", errors="replace")
+
+
+class GitStateProvider:
+    """Cached Git state of repositories."""
+
+    def __init__(self, max_age: float = STATE_MAX_AGE):
+        """
+        Initialize the provider.
+
+        Args:
+            max_age: Seconds a state is reused while the repository's index and refs are unchanged
+        """
+        self._logger = logger
+        self.max_age = max_age
+        # (kind, root) -> (fingerprint, time, result)
+        self._cache: Dict[Tuple[str, str], Tuple[Tuple, float, Dict[str, Any]]] = {}
+
+    @staticmethod
+    def _mtime(path: Path) -> int:
+        try:
+            return os.stat(path).st_mtime_ns
+        except OSError:
+            return 0
+
+    def _fingerprint(self, git_dir: Path, *extra: Path) -> Tuple:
+        """Modification times of the index, HEAD and the refs they depend on."""
+        refs_dir = common_dir(git_dir)
+        paths = [git_dir / "index", git_dir / "HEAD", refs_dir / "packed-refs", refs_dir / "refs" / "stash"]
+        try:
+            head = (git_dir / "HEAD").read_text(encoding="utf-8").strip()
+            if head.startswith("ref: "):
+                paths.append(refs_dir / head[5:])
+        except OSError:
+            pass
+        paths.extend(extra)
+        return tuple(self._mtime(path) for path in paths)
+
+    def _get_cached(self, kind: str, root: Path, fingerprint: Tuple) -> Optional[Dict[str, Any]]:
+        entry = self._cache.get((kind, str(root)))
+        if entry is None:
+            return None
+        cached_fingerprint, cached_time, result = entry
+        if cached_fingerprint != fingerprint or time.monotonic() - cached_time > self.max_age:
+            return None
+        return result
+
+    def _put_cached(self, kind: str, root: Path, fingerprint: Tuple, result: Dict[str, Any]) -> None:
+        self._cache[(kind, str(root))] = (fingerprint, time.monotonic(), result)
+
+    def invalidate(self, project_root: Optional[Union[str, Path]] = None) -> None:
+        """
+        Drop cached states.
+
+        Args:
+            project_root: Repository to drop, or None for all
+        """
+        if project_root is None:
+            self._cache.clear()
+            return
+        for key in [key for key in self._cache if key[1] == str(Path(project_root))]:
+            del self._cache[key]
+
+    async def get_state(self, project_root: Union[str, Path]) -> Dict[str, Any]:
+        """
+        Get the Git state of a repository.
+
+        Args:
+            project_root: The repository root
+
+        Returns:
+            Dictionary with the current branch, changed files, stashes,
+            remote tracking state and recent commits
+        """
+        root = Path(project_root)
+        result: Dict[str, Any] = {
+            "is_git_repo": False,
+            "current_branch": None,
+            "head": None,
+            "has_changes": False,
+            "untracked_files": [],
+            "modified_files": [],
+            "staged_files": [],
+            "deleted_files": [],
+            "files": [],
+            "stashes": [],
+            "remote_state": {},
+            "recent_commits": []
+        }
+
+        git_dir = find_git_dir(root)
+        if git_dir is None:
+            return result
+        result["is_git_repo"] = True
+
+        fingerprint = self._fingerprint(git_dir)
+        cached = self._get_cached("state", root, fingerprint)
+        if cached is not None:
+            return dict(cached)
+
+        branch, head = read_head(git_dir)
+        result["current_branch"] = branch
+        result["head"] = head
+
+        stashes = self._read_stashes(git_dir)
+        status_output, log_output, stash_output = await asyncio.gather(
+            run_git(root, "status", "--porcelain=v2", "--branch", "-z"),
+            run_git(root, "log", f"-n{RECENT_COMMITS}", "--pretty=format:%h|%an|%s|%cr") if head else _none(),
+            run_git(root, "stash", "list") if stashes is None else _none()
+        )
+
+        if status_output is not None:
+            status = parse_status_v2(status_output)
+            files = [f for f in status["files"] if f.index != "!"]
+            result["files"] = files
+            result["has_changes"] = bool(files)
+            for f in files:
+                if f.index == "?":
+                    result["untracked_files"].append(f.path)
+                    continue
+                if "M" in (f.index, f.worktree):
+                    result["modified_files"].append(f.path)
+                if f.index in ("A", "R"):
+                    result["staged_files"].append(f.path)
+                if "D" in (f.index, f.worktree):
+                    result["deleted_files"].append(f.path)
+            result["remote_state"] = {
+                "tracking": status["upstream"] is not None,
+                "upstream": status["upstream"],
+                "ahead": status["ahead"],
+                "behind": status["behind"]
+            }
+
+        if stashes is None:
+            stashes = []
+            for line in (stash_output or "").splitlines():
+                name, _, description = line.partition(": ")
+                if name.startswith("stash@{") and name.endswith("}"):
+                    stashes.append({"id": name[7:-1], "description": description})
+        result["stashes"] = stashes
+
+        for line in (log_output or "").splitlines():
+            parts = line.split("|", 3)
+            if len(parts) == 4:
+                commit_hash, author, message, commit_time = parts
+                result["recent_commits"].append({
+                    "hash": commit_hash,
+                    "author": author,
+                    "message": message,
+                    "time": commit_time
+                })
+
+        # A failed status is not cached so that the next call retries it
+        if status_output is not None:
+            self._put_cached("state", root, fingerprint, result)
+        return dict(result)
+
+    def _read_stashes(self, git_dir: Path) -> Optional[List[Dict[str, str]]]:
+        """
+        Read the stash list from the stash reflog.
+
+        Returns:
+            The stashes, newest first, or None if only git can list them
+        """
+        refs_dir = common_dir(git_dir)
+        try:
+            with open(refs_dir / "logs" / "refs" / "stash", encoding="utf-8", errors="replace") as f:
+                lines = [line.rstrip("\n") for line in f if line.strip()]
+        except FileNotFoundError:
+            return [] if resolve_ref(git_dir, "refs/stash") is None else None
+        except OSError:
+            return None
+
+        stashes = []
+        for n, line in enumerate(reversed(lines)):
+            _, _, message = line.partition("\t")
+            stashes.append({"id": str(n), "description": message})
+        return stashes
+
+    async def get_details(self, project_root: Union[str, Path]) -> Dict[str, Any]:
+        """
+        Get the log graph, branches, remotes and local configuration of a repository.
+
+        Args:
+            project_root: The repository root
+
+        Returns:
+            Dictionary with log_graph, branches, remotes and config for the
+            parts that could be read
+        """
+        root = Path(project_root)
+        git_dir = find_git_dir(root)
+        if git_dir is None:
+            return {}
+
+        fingerprint = self._fingerprint(git_dir, common_dir(git_dir) / "config")
+        cached = self._get_cached("details", root, fingerprint)
+        if cached is not None:
+            return dict(cached)
+
+        graph, branch_output, remote_output, config_output = await asyncio.gather(
+            run_git(root, "log", "--graph", "--oneline", "--decorate", "-n", "10"),
+            run_git(root, "branch", "-vv"),
+            run_git(root, "remote", "-v"),
+            run_git(root, "config", "--local", "--list")
+        )
+
+        result: Dict[str, Any] = {}
+        if graph and graph.strip():
+            result["log_graph"] = graph.strip()
+        if branch_output and branch_output.strip():
+            result["branches"] = self._parse_branches(branch_output)
+        if remote_output and remote_output.strip():
+            result["remotes"] = self._parse_remotes(remote_output)
+        if config_output and config_output.strip():
+            result["config"] = self._parse_config(config_output)
+
+        self._put_cached("details", root, fingerprint, result)
+        return dict(result)
+
+    @staticmethod
+    def _parse_branches(output: str) -> List[Dict[str, Any]]:
+        """Parse ``git branch -vv`` output."""
+        branches = []
+        for line in output.splitlines():
+            if not line.strip():
+                continue
+
+            is_current = line.startswith('*')
+            name, _, info = line[2:].strip().partition(' ')
+            if not info:
+                continue
+            info = info.strip()
+
+            # Tracking info is the bracketed part, e.g. [origin/main: ahead 1]
+            tracking_match = re.search(r'\[(.*?)\]', info)
+            tracking_info = tracking_match.group(1) if tracking_match else None
+
+            branches.append({
+                "name": name,
+                "is_current": is_current,
+                "tracking_info": tracking_info,
+                "info": info
+            })
+        return branches
+
+    @staticmethod
+    def _parse_remotes(output: str) -> Dict[str, Dict[str, str]]:
+        """Parse ``git remote -v`` output."""
+        remotes: Dict[str, Dict[str, str]] = {}
+        for line in output.splitlines():
+            parts = line.split()
+            if len(parts) >= 2:
+                remote_type = parts[2][1:-1] if len(parts) >= 3 else "fetch"
+                remotes.setdefault(parts[0], {})[remote_type] = parts[1]
+        return remotes
+
+    @staticmethod
+    def _parse_config(output: str) -> Dict[str, str]:
+        """Extract the useful values of ``git config --list`` output."""
+        git_config = {}
+        for line in output.splitlines():
+            if '=' in line:
+                key, value = line.split('=', 1)
+                git_config[key.strip().lower()] = value.strip()
+
+        config = {}
+        for key, name in (("user.name", "user.name"), ("user.email", "user.email"),
+                          ("init.defaultbranch", "default_branch")):
+            if key in git_config:
+                config[name] = git_config[key]
+        if "pull.rebase" in git_config:
+            config["pull_strategy"] = "rebase" if git_config["pull.rebase"] == "true" else "merge"
+        return config
+
+
+async def _none() -> None:
+    return None
+
+
+# Global Git state provider instance
+git_state_provider = GitStateProvider()
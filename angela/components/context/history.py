@@ -1,17 +1,14 @@
 # angela/context/history.py
 
 import json
-import os
-import re
-import shlex
 from pathlib import Path
 from typing import Dict, Any, Optional, List, Tuple
-from datetime import datetime, timedelta
-from collections import Counter, defaultdict
+from datetime import datetime
 
 from angela.config import config_manager
 from angela.utils.logging import get_logger
 from angela.api.context import get_preferences_manager
+from angela.components.context.history_store import HistoryStore, extract_base_command
 
 logger = get_logger(__name__)
 
@@ -95,69 +92,44 @@ class CommandPattern:
 class HistoryManager:
     """Manager for command history and pattern analysis."""
     
-    def __init__(self):
-        """Initialize the history manager."""
-        self._history_file = config_manager.CONFIG_DIR / "command_history.json"
-        self._patterns_file = config_manager.CONFIG_DIR / "command_patterns.json"
-        self._history: List[CommandRecord] = []
-        self._patterns: Dict[str, CommandPattern] = {}
-        self._load_history()
-        self._load_patterns()
+    def __init__(self, db_path: Optional[Path] = None):
+        """
+        Initialize the history manager.
+        
+        History and patterns live in a SQLite database; nothing is loaded
+        into memory here.
+        
+        Args:
+            db_path: History database, defaults to the config directory
+        """
+        self._store = HistoryStore(db_path or config_manager.CONFIG_DIR / "command_history.db")
+        self._migrate_legacy_files(
+            self._store.db_path.parent / "command_history.json",
+            self._store.db_path.parent / "command_patterns.json"
+        )
     
-    def _load_history(self) -> None:
-        """Load history from file."""
+    def _migrate_legacy_files(self, history_file: Path, patterns_file: Path) -> None:
+        """Move history and patterns from the JSON files used before the database."""
         try:
-            if self._history_file.exists():
-                with open(self._history_file, "r") as f:
+            if history_file.exists() and not len(self._store):
+                with open(history_file, "r") as f:
                     data = json.load(f)
-                    self._history = [CommandRecord.from_dict(item) for item in data]
-                logger.debug(f"Loaded {len(self._history)} history items")
-                
-                # Trim history if needed
-                preferences_manager = get_preferences_manager()
-                max_items = preferences_manager.preferences.context.max_history_items
-                if len(self._history) > max_items:
-                    self._history = self._history[-max_items:]
-                    self._save_history()  # Save the trimmed history
-            else:
-                logger.debug("No history file found")
-        except Exception as e:
-            logger.error(f"Error loading history: {e}")
-            self._history = []
-    
-    def _load_patterns(self) -> None:
-        """Load command patterns from file."""
-        try:
-            if self._patterns_file.exists():
-                with open(self._patterns_file, "r") as f:
+                # Patterns are imported from their own file below
+                self._store.add_records(data, learn_patterns=False, max_items=self._max_items())
+                history_file.rename(history_file.with_suffix(".json.migrated"))
+                logger.info(f"Migrated {len(data)} history items to {self._store.db_path}")
+            
+            if patterns_file.exists():
+                with open(patterns_file, "r") as f:
                     data = json.load(f)
-                    self._patterns = {k: CommandPattern.from_dict(v) for k, v in data.items()}
-                logger.debug(f"Loaded {len(self._patterns)} command patterns")
-            else:
-                logger.debug("No patterns file found")
+                self._store.import_patterns(data.values())
+                patterns_file.rename(patterns_file.with_suffix(".json.migrated"))
+                logger.info(f"Migrated {len(data)} command patterns to {self._store.db_path}")
         except Exception as e:
-            logger.error(f"Error loading patterns: {e}")
-            self._patterns = {}
+            logger.error(f"Error migrating command history: {e}")
     
-    def _save_history(self) -> None:
-        """Save history to file."""
-        try:
-            self._history_file.parent.mkdir(parents=True, exist_ok=True)
-            with open(self._history_file, "w") as f:
-                json.dump([item.to_dict() for item in self._history], f, indent=2)
-            logger.debug(f"Saved history with {len(self._history)} items")
-        except Exception as e:
-            logger.error(f"Error saving history: {e}")
-    
-    def _save_patterns(self) -> None:
-        """Save command patterns to file."""
-        try:
-            self._patterns_file.parent.mkdir(parents=True, exist_ok=True)
-            with open(self._patterns_file, "w") as f:
-                json.dump({k: v.to_dict() for k, v in self._patterns.items()}, f, indent=2)
-            logger.debug(f"Saved {len(self._patterns)} command patterns")
-        except Exception as e:
-            logger.error(f"Error saving patterns: {e}")
+    def _max_items(self) -> int:
+        return get_preferences_manager().preferences.context.max_history_items
     
     def add_command(
         self, 
@@ -179,7 +151,6 @@ class HistoryManager:
             error: Command error (if any)
             risk_level: Risk level of the command
         """
-        # Create and add the record
         record = CommandRecord(
             command=command,
             natural_request=natural_request,
@@ -188,15 +159,16 @@ class HistoryManager:
             error=error,
             risk_level=risk_level
         )
-        self._history.append(record)
         
-        # Save the updated history
-        self._save_history()
-        
-        # Update patterns if enabled
-        preferences_manager = get_preferences_manager()
-        if preferences_manager.preferences.context.auto_learn_patterns:
-            self._update_patterns(record)
+        preferences = get_preferences_manager().preferences.context
+        try:
+            self._store.add_records(
+                [record.to_dict()],
+                learn_patterns=preferences.auto_learn_patterns,
+                max_items=preferences.max_history_items
+            )
+        except Exception as e:
+            logger.error(f"Error saving history: {e}")
     
     def _extract_base_command(self, command: str) -> str:
         """
@@ -208,60 +180,32 @@ class HistoryManager:
         Returns:
             The base command
         """
-        # Extract the first word (command name)
-        base = command.strip().split()[0]
-        
-        # For some commands, include the first argument if it's an operation
-        if base in ["git", "docker", "npm", "pip", "apt", "apt-get"]:
-            parts = command.strip().split()
-            if len(parts) > 1 and not parts[1].startswith("-"):
-                base = f"{base} {parts[1]}"
-        
-        return base
+        return extract_base_command(command)
     
-    def _update_patterns(self, record: CommandRecord) -> None:
+    def get_recent_commands(self, limit: int = 10) -> List[CommandRecord]:
         """
-        Update command patterns based on a new record.
+        Get the most recent commands.
         
         Args:
-            record: The command record
-        """
-        base_command = self._extract_base_command(record.command)
-        
-        if base_command in self._patterns:
-            # Update existing pattern
-            pattern = self._patterns[base_command]
-            pattern.count += 1
-            pattern.last_used = record.timestamp
+            limit: Maximum number of commands to return
             
-            # Update success rate
-            success_weight = 1.0 / pattern.count  # Weight of the new record
-            pattern.success_rate = (
-                (pattern.success_rate * (1 - success_weight)) + 
-                (1.0 if record.success else 0.0) * success_weight
-            )
-        else:
-            # Create new pattern
-            self._patterns[base_command] = CommandPattern(
-                base_command=base_command,
-                count=1,
-                success_rate=1.0 if record.success else 0.0
-            )
-        
-        # Save updated patterns
-        self._save_patterns()
+        Returns:
+            List of recent CommandRecord objects
+        """
+        return [CommandRecord.from_dict(item) for item in self._store.recent(limit)]
     
-    def get_recent_commands(self, limit: int = 10) -> List[CommandRecord]:
+    def get_pattern(self, base_command: str) -> Optional[CommandPattern]:
         """
-        Get the most recent commands.
+        Get the usage pattern of a base command.
         
         Args:
-            limit: Maximum number of commands to return
+            base_command: The base command
             
         Returns:
-            List of recent CommandRecord objects
+            The CommandPattern, or None if the command was never recorded
         """
-        return self._history[-limit:]
+        data = self._store.get_pattern(base_command)
+        return CommandPattern.from_dict(data) if data else None
     
     def get_command_frequency(self, command: str) -> int:
         """
@@ -273,8 +217,7 @@ class HistoryManager:
         Returns:
             The number of times the command has been executed
         """
-        base_command = self._extract_base_command(command)
-        pattern = self._patterns.get(base_command)
+        pattern = self.get_pattern(self._extract_base_command(command))
         return pattern.count if pattern else 0
     
     def get_command_success_rate(self, command: str) -> float:
@@ -287,8 +230,7 @@ class HistoryManager:
         Returns:
             The success rate (0.0-1.0) or 0.0 if command not found
         """
-        base_command = self._extract_base_command(command)
-        pattern = self._patterns.get(base_command)
+        pattern = self.get_pattern(self._extract_base_command(command))
         return pattern.success_rate if pattern else 0.0
     
     def search_similar_command(self, request: str) -> Optional[str]:
@@ -299,29 +241,10 @@ class HistoryManager:
             request: The natural language request
             
         Returns:
-            A similar command if found, None otherwise
+            The most recent command whose request has a Jaccard similarity
+            above 0.6 with this one, None otherwise
         """
-        # Simple similarity: lowercase and remove punctuation
-        request = re.sub(r'[^\w\s]', '', request.lower())
-        
-        for record in reversed(self._history):  # Start from most recent
-            historical_request = re.sub(r'[^\w\s]', '', record.natural_request.lower())
-            
-            # Check for significant overlap in words
-            request_words = set(request.split())
-            historical_words = set(historical_request.split())
-            
-            # Calculate Jaccard similarity
-            if request_words and historical_words:
-                intersection = request_words.intersection(historical_words)
-                union = request_words.union(historical_words)
-                similarity = len(intersection) / len(union)
-                
-                # If similarity is high enough, return this command
-                if similarity > 0.6:
-                    return record.command
-        
-        return None
+        return self._store.find_similar(request)
     
     def find_error_patterns(self, error: str) -> List[Tuple[str, str]]:
         """
@@ -333,18 +256,7 @@ class HistoryManager:
         Returns:
             List of (failed_command, successful_fix) tuples
         """
-        error_patterns = []
-        
-        # Find failed commands with this error
-        for i, record in enumerate(self._history):
-            if not record.success and record.error and error in record.error:
-                # Look ahead for successful fixes
-                for j in range(i+1, min(i+5, len(self._history))):
-                    if self._history[j].success:
-                        error_patterns.append((record.command, self._history[j].command))
-                        break
-        
-        return error_patterns
+        return self._store.find_error_fixes(error)
     
     def get_common_command_contexts(self) -> Dict[str, List[str]]:
         """
@@ -353,21 +265,7 @@ class HistoryManager:
         Returns:
             Dict mapping commands to commonly following commands
         """
-        context_map = defaultdict(Counter)
-        
-        # Analyze command sequences
-        for i in range(1, len(self._history)):
-            prev_cmd = self._extract_base_command(self._history[i-1].command)
-            curr_cmd = self._extract_base_command(self._history[i].command)
-            context_map[prev_cmd][curr_cmd] += 1
-        
-        # Convert to more usable format
-        result = {}
-        for cmd, followers in context_map.items():
-            # Get the most common followers
-            result[cmd] = [cmd for cmd, count in followers.most_common(3)]
-        
-        return result
+        return self._store.following_commands(3)
 
     def get_favorite_commands(self, limit: int = 5) -> List[str]:
         """Get a list of favorite/most frequently successful commands."""
@@ -375,33 +273,11 @@ class HistoryManager:
         MIN_FREQUENCY = 3
         MIN_SUCCESS_RATE = 0.8
         
-        candidates = []
-        for base_cmd, pattern_obj in self._patterns.items():
-            if pattern_obj.count >= MIN_FREQUENCY and pattern_obj.success_rate >= MIN_SUCCESS_RATE:
-                # Score could be count * success_rate
-                candidates.append((base_cmd, pattern_obj.count * pattern_obj.success_rate))
-        
-        candidates.sort(key=lambda x: x[1], reverse=True)
-        return [cmd for cmd, score in candidates[:limit]]
+        return self._store.top_patterns(MIN_FREQUENCY, MIN_SUCCESS_RATE, limit)
 
     def get_common_flags_for_command(self, base_command_to_check: str, limit: int = 3) -> List[str]:
         """Get most commonly used flags for a given base command."""
-        flag_counts = {}
-        for record in self._history:
-            if self._extract_base_command(record.command) == base_command_to_check:
-                try:
-                    tokens = shlex.split(record.command)
-                    flags_in_record = [t for t in tokens if t.startswith('-')]
-                    for flag in flags_in_record:
-                        flag_counts[flag] = flag_counts.get(flag, 0) + 1
-                except ValueError: # shlex parsing error
-                    continue
-        
-        if not flag_counts:
-            return []
-            
-        sorted_flags = sorted(flag_counts.items(), key=lambda x: x[1], reverse=True)
-        return [flag for flag, count in sorted_flags[:limit]]
+        return self._store.common_flags(base_command_to_check, limit)
 
 
 # Global history manager instance
@@ -0,0 +1,519 @@
+# angela/components/context/history_store.py
+"""
+SQLite storage for the command history.
+
+Commands are inserted one row at a time into a WAL-mode database, so recording
+a command does not rewrite the history and nothing is held in memory beyond
+SQLite's page cache.
+
+Everything the history manager derives from the history is maintained
+incrementally as rows are inserted and trimmed:
+
+- an inverted index from request tokens to the distinct token sets of past
+  requests, with per-token document frequencies, for similarity lookup
+- per-command usage patterns (count, success rate, last use)
+- counts of which command follows which
+- counts of the flags used with each command
+
+Similarity lookup uses prefix filtering: a request with ``n`` tokens can only
+reach a Jaccard similarity above ``t`` with entries that share at least
+``floor(t * n) + 1`` of its tokens, so every match contains one of its
+``n - floor(t * n)`` rarest tokens. Only the postings of those tokens are read.
+"""
+import atexit
+import math
+import re
+import shlex
+import sqlite3
+import threading
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Sequence, Tuple
+
+from angela.utils.logging import get_logger
+
+logger = get_logger(__name__)
+
+SCHEMA_VERSION = 1
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS commands (
+    id INTEGER PRIMARY KEY,
+    command TEXT NOT NULL,
+    natural_request TEXT NOT NULL,
+    success INTEGER NOT NULL,
+    timestamp TEXT NOT NULL,
+    output TEXT,
+    error TEXT,
+    risk_level INTEGER NOT NULL DEFAULT 0,
+    base_command TEXT NOT NULL,
+    request_id INTEGER
+);
+CREATE INDEX IF NOT EXISTS commands_failed ON commands (id) WHERE success = 0;
+CREATE TABLE IF NOT EXISTS requests (
+    id INTEGER PRIMARY KEY,
+    tokens TEXT NOT NULL UNIQUE,
+    token_count INTEGER NOT NULL,
+    uses INTEGER NOT NULL,
+    last_command_id INTEGER NOT NULL
+);
+CREATE TABLE IF NOT EXISTS request_tokens (
+    token TEXT NOT NULL,
+    request_id INTEGER NOT NULL,
+    PRIMARY KEY (token, request_id)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS request_tokens_by_request ON request_tokens (request_id, token);
+CREATE TABLE IF NOT EXISTS token_stats (
+    token TEXT PRIMARY KEY,
+    df INTEGER NOT NULL
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS patterns (
+    base_command TEXT PRIMARY KEY,
+    count INTEGER NOT NULL,
+    success_rate REAL NOT NULL,
+    last_used TEXT NOT NULL
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS transitions (
+    prev_base TEXT NOT NULL,
+    next_base TEXT NOT NULL,
+    count INTEGER NOT NULL,
+    PRIMARY KEY (prev_base, next_base)
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS flags (
+    base_command TEXT NOT NULL,
+    flag TEXT NOT NULL,
+    count INTEGER NOT NULL,
+    PRIMARY KEY (base_command, flag)
+) WITHOUT ROWID;
+"""
+
+# Jaccard similarity a past request must exceed to count as similar
+SIMILARITY_THRESHOLD = 0.6
+
+# Commands whose first argument is an operation, e.g. "git commit"
+SUBCOMMAND_TOOLS = {"git", "docker", "npm", "pip", "apt", "apt-get"}
+
+_PUNCTUATION = re.compile(r"[^\w\s]")
+
+COMMAND_COLUMNS = "command, natural_request, success, timestamp, output, error, risk_level"
+
+
+def tokenize_request(request: str) -> List[str]:
+    """
+    Split a natural language request into its distinct, sorted tokens.
+
+    Args:
+        request: The natural language request
+
+    Returns:
+        Sorted list of lowercase words without punctuation
+    """
+    return sorted(set(_PUNCTUATION.sub("", request.lower()).split()))
+
+
+def extract_base_command(command: str) -> str:
+    """
+    Extract the base command without arguments.
+
+    Args:
+        command: The full command string
+
+    Returns:
+        The base command, or an empty string for an empty command
+    """
+    parts = command.strip().split()
+    if not parts:
+        return ""
+    base = parts[0]
+
+    # For some commands, include the first argument if it's an operation
+    if base in SUBCOMMAND_TOOLS and len(parts) > 1 and not parts[1].startswith("-"):
+        base = f"{base} {parts[1]}"
+
+    return base
+
+
+def extract_flags(command: str) -> List[str]:
+    """
+    Extract the flags used in a command.
+
+    Args:
+        command: The full command string
+
+    Returns:
+        List of flags, empty if the command cannot be parsed
+    """
+    try:
+        return [token for token in shlex.split(command) if token.startswith("-")]
+    except ValueError:
+        return []
+
+
+def _placeholders(values: Sequence[Any]) -> str:
+    return ",".join("?" * len(values))
+
+
+class HistoryStore:
+    """Command history and its aggregates in a SQLite database."""
+
+    def __init__(self, db_path: Path):
+        """
+        Open (or create) the history database.
+
+        Args:
+            db_path: Path to the SQLite database file
+        """
+        self.db_path = Path(db_path)
+        self._lock = threading.RLock()
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        self._conn = sqlite3.connect(str(self.db_path), check_same_thread=False, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        if self._conn.execute("PRAGMA user_version").fetchone()[0] < SCHEMA_VERSION:
+            self._conn.executescript(f"BEGIN; {SCHEMA} PRAGMA user_version = {SCHEMA_VERSION}; COMMIT;")
+        atexit.register(self.close)
+
+    @contextmanager
+    def _transaction(self) -> Iterator[sqlite3.Connection]:
+        """Run a block in one write transaction."""
+        with self._lock:
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                yield self._conn
+            except BaseException:
+                self._conn.execute("ROLLBACK")
+                raise
+            self._conn.execute("COMMIT")
+
+    def _query(self, sql: str, params: Sequence[Any] = ()) -> List[tuple]:
+        with self._lock:
+            return self._conn.execute(sql, params).fetchall()
+
+    def close(self) -> None:
+        """Close the database connection."""
+        with self._lock:
+            try:
+                self._conn.close()
+            except sqlite3.Error:
+                pass
+
+    def __len__(self) -> int:
+        return self._query("SELECT COUNT(*) FROM commands")[0][0]
+
+    # Writing
+
+    def add_records(
+        self,
+        records: Iterable[Dict[str, Any]],
+        learn_patterns: bool = True,
+        max_items: Optional[int] = None
+    ) -> None:
+        """
+        Append command records and update the derived indexes.
+
+        Args:
+            records: Records as produced by ``CommandRecord.to_dict``
+            learn_patterns: Whether to update the command patterns
+            max_items: Trim the history to this many records afterwards
+        """
+        with self._transaction() as conn:
+            row = conn.execute("SELECT base_command FROM commands ORDER BY id DESC LIMIT 1").fetchone()
+            prev_base = row[0] if row else None
+            for record in records:
+                prev_base = self._insert(conn, record, prev_base, learn_patterns)
+            if max_items is not None:
+                self._trim(conn, max_items)
+
+    def _insert(self, conn: sqlite3.Connection, record: Dict[str, Any], prev_base: Optional[str],
+                learn_patterns: bool) -> str:
+        base = extract_base_command(record["command"])
+        cursor = conn.execute(
+            f"INSERT INTO commands ({COMMAND_COLUMNS}, base_command) VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+            (record["command"], record["natural_request"], int(bool(record["success"])), record["timestamp"],
+             record.get("output"), record.get("error"), record.get("risk_level", 0), base)
+        )
+        command_id = cursor.lastrowid
+
+        tokens = tokenize_request(record["natural_request"])
+        if tokens:
+            request_id = self._add_request(conn, tokens, command_id)
+            conn.execute("UPDATE commands SET request_id = ? WHERE id = ?", (request_id, command_id))
+
+        if prev_base is not None:
+            conn.execute(
+                "INSERT INTO transitions VALUES (?, ?, 1) "
+                "ON CONFLICT (prev_base, next_base) DO UPDATE SET count = count + 1",
+                (prev_base, base)
+            )
+        for flag in extract_flags(record["command"]):
+            conn.execute(
+                "INSERT INTO flags VALUES (?, ?, 1) ON CONFLICT (base_command, flag) DO UPDATE SET count = count + 1",
+                (base, flag)
+            )
+        if learn_patterns and base:
+            self._update_pattern(conn, base, bool(record["success"]), record["timestamp"])
+        return base
+
+    def _add_request(self, conn: sqlite3.Connection, tokens: List[str], command_id: int) -> int:
+        key = " ".join(tokens)
+        row = conn.execute("SELECT id FROM requests WHERE tokens = ?", (key,)).fetchone()
+        if row:
+            conn.execute(
+                "UPDATE requests SET uses = uses + 1, last_command_id = ? WHERE id = ?", (command_id, row[0])
+            )
+            return row[0]
+
+        request_id = conn.execute(
+            "INSERT INTO requests (tokens, token_count, uses, last_command_id) VALUES (?, ?, 1, ?)",
+            (key, len(tokens), command_id)
+        ).lastrowid
+        conn.executemany("INSERT INTO request_tokens VALUES (?, ?)", [(t, request_id) for t in tokens])
+        conn.executemany(
+            "INSERT INTO token_stats VALUES (?, 1) ON CONFLICT (token) DO UPDATE SET df = df + 1",
+            [(t,) for t in tokens]
+        )
+        return request_id
+
+    def _update_pattern(self, conn: sqlite3.Connection, base: str, success: bool, timestamp: str) -> None:
+        row = conn.execute("SELECT count, success_rate FROM patterns WHERE base_command = ?", (base,)).fetchone()
+        if row is None:
+            conn.execute(
+                "INSERT INTO patterns VALUES (?, 1, ?, ?)", (base, 1.0 if success else 0.0, timestamp)
+            )
+            return
+
+        count = row[0] + 1
+        success_weight = 1.0 / count  # Weight of the new record
+        success_rate = row[1] * (1 - success_weight) + (1.0 if success else 0.0) * success_weight
+        conn.execute(
+            "UPDATE patterns SET count = ?, success_rate = ?, last_used = ? WHERE base_command = ?",
+            (count, success_rate, timestamp, base)
+        )
+
+    def _trim(self, conn: sqlite3.Connection, max_items: int) -> None:
+        """Drop the oldest records beyond ``max_items`` and their index entries."""
+        first, last = conn.execute("SELECT MIN(id), MAX(id) FROM commands").fetchone()
+        if first is None or last - first + 1 <= max_items:
+            return
+        cutoff = last - max(max_items, 0)
+
+        rows = conn.execute(
+            "SELECT id, command, base_command, request_id FROM commands WHERE id <= ? + 1 ORDER BY id", (cutoff,)
+        ).fetchall()
+        for index, (command_id, command, base, request_id) in enumerate(rows):
+            if command_id > cutoff:
+                break
+            if index + 1 < len(rows):
+                self._decrement(conn, "transitions", "prev_base = ? AND next_base = ?", (base, rows[index + 1][2]))
+            for flag in extract_flags(command):
+                self._decrement(conn, "flags", "base_command = ? AND flag = ?", (base, flag))
+            if request_id is not None:
+                self._release_request(conn, request_id)
+
+        conn.execute("DELETE FROM commands WHERE id <= ?", (cutoff,))
+
+    def _decrement(self, conn: sqlite3.Connection, table: str, where: str, params: Tuple[Any, ...]) -> None:
+        conn.execute(f"UPDATE {table} SET count = count - 1 WHERE {where}", params)
+        conn.execute(f"DELETE FROM {table} WHERE {where} AND count <= 0", params)
+
+    def _release_request(self, conn: sqlite3.Connection, request_id: int) -> None:
+        conn.execute("UPDATE requests SET uses = uses - 1 WHERE id = ?", (request_id,))
+        row = conn.execute("SELECT uses, tokens FROM requests WHERE id = ?", (request_id,)).fetchone()
+        if row is None or row[0] > 0:
+            return
+
+        tokens = [(t,) for t in row[1].split()]
+        conn.execute("DELETE FROM requests WHERE id = ?", (request_id,))
+        conn.execute("DELETE FROM request_tokens WHERE request_id = ?", (request_id,))
+        conn.executemany("UPDATE token_stats SET df = df - 1 WHERE token = ?", tokens)
+        conn.executemany("DELETE FROM token_stats WHERE token = ? AND df <= 0", tokens)
+
+    def import_patterns(self, patterns: Iterable[Dict[str, Any]]) -> None:
+        """
+        Insert or replace command patterns.
+
+        Args:
+            patterns: Patterns as produced by ``CommandPattern.to_dict``
+        """
+        with self._transaction() as conn:
+            conn.executemany(
+                "INSERT OR REPLACE INTO patterns VALUES (?, ?, ?, ?)",
+                [(p["base_command"], p["count"], p["success_rate"], p["last_used"]) for p in patterns]
+            )
+
+    # Reading
+
+    def recent(self, limit: int) -> List[Dict[str, Any]]:
+        """
+        Get the most recent records, oldest first.
+
+        Args:
+            limit: Maximum number of records to return
+
+        Returns:
+            List of record dictionaries
+        """
+        rows = self._query(f"SELECT {COMMAND_COLUMNS} FROM commands ORDER BY id DESC LIMIT ?", (max(limit, 0),))
+        return [self._row_to_record(row) for row in reversed(rows)]
+
+    @staticmethod
+    def _row_to_record(row: tuple) -> Dict[str, Any]:
+        command, natural_request, success, timestamp, output, error, risk_level = row
+        return {
+            "command": command,
+            "natural_request": natural_request,
+            "success": bool(success),
+            "timestamp": timestamp,
+            "output": output,
+            "error": error,
+            "risk_level": risk_level
+        }
+
+    def get_pattern(self, base_command: str) -> Optional[Dict[str, Any]]:
+        """
+        Get the usage pattern of a base command.
+
+        Args:
+            base_command: The base command
+
+        Returns:
+            Pattern dictionary, or None if the command was never recorded
+        """
+        rows = self._query(
+            "SELECT base_command, count, success_rate, last_used FROM patterns WHERE base_command = ?", (base_command,)
+        )
+        if not rows:
+            return None
+        base, count, success_rate, last_used = rows[0]
+        return {"base_command": base, "count": count, "success_rate": success_rate, "last_used": last_used}
+
+    def top_patterns(self, min_count: int, min_success_rate: float, limit: int) -> List[str]:
+        """
+        Get the base commands with the best count-weighted success rate.
+
+        Args:
+            min_count: Minimum number of uses
+            min_success_rate: Minimum success rate
+            limit: Maximum number of commands to return
+
+        Returns:
+            List of base commands, best first
+        """
+        rows = self._query(
+            "SELECT base_command FROM patterns WHERE count >= ? AND success_rate >= ? "
+            "ORDER BY count * success_rate DESC LIMIT ?",
+            (min_count, min_success_rate, limit)
+        )
+        return [row[0] for row in rows]
+
+    def find_similar(self, request: str, threshold: float = SIMILARITY_THRESHOLD) -> Optional[str]:
+        """
+        Find the most recent command whose request is similar to ``request``.
+
+        Args:
+            request: The natural language request
+            threshold: Jaccard similarity the past request must exceed
+
+        Returns:
+            The command, or None if no past request is similar enough
+        """
+        tokens = tokenize_request(request)
+        n = len(tokens)
+        if not n:
+            return None
+
+        # Every match shares at least min_overlap tokens, so it shares one of
+        # the n - min_overlap + 1 rarest ones
+        min_overlap = math.floor(threshold * n) + 1
+        if min_overlap > n:
+            return None
+        with self._lock:
+            frequencies = dict(self._conn.execute(
+                f"SELECT token, df FROM token_stats WHERE token IN ({_placeholders(tokens)})", tokens
+            ).fetchall())
+            prefix = sorted(tokens, key=lambda t: frequencies.get(t, 0))[:n - min_overlap + 1]
+            prefix = [t for t in prefix if t in frequencies]
+            if not prefix:
+                return None
+
+            rows = self._conn.execute(
+                f"""
+                SELECT r.token_count, r.last_command_id,
+                       (SELECT COUNT(*) FROM request_tokens x
+                        WHERE x.request_id = r.id AND x.token IN ({_placeholders(tokens)}))
+                FROM requests r
+                WHERE r.id IN (SELECT request_id FROM request_tokens WHERE token IN ({_placeholders(prefix)}))
+                  AND r.token_count > ? AND r.token_count < ?
+                """,
+                (*tokens, *prefix, threshold * n, n / threshold)
+            ).fetchall()
+
+            best = None
+            for token_count, last_command_id, overlap in rows:
+                if overlap / (n + token_count - overlap) > threshold and (best is None or last_command_id > best):
+                    best = last_command_id
+            if best is None:
+                return None
+            return self._conn.execute("SELECT command FROM commands WHERE id = ?", (best,)).fetchone()[0]
+
+    def find_error_fixes(self, error: str, lookahead: int = 4) -> List[Tuple[str, str]]:
+        """
+        Find failed commands with ``error`` and the successful command after each.
+
+        Args:
+            error: Text the error output must contain
+            lookahead: How many following records to search for a fix
+
+        Returns:
+            List of (failed_command, successful_fix) tuples
+        """
+        with self._lock:
+            failures = self._conn.execute(
+                "SELECT id, command FROM commands WHERE success = 0 AND error IS NOT NULL AND instr(error, ?) > 0 "
+                "ORDER BY id",
+                (error,)
+            ).fetchall()
+            fixes = []
+            for command_id, command in failures:
+                row = self._conn.execute(
+                    "SELECT command FROM commands WHERE id > ? AND id <= ? AND success = 1 ORDER BY id LIMIT 1",
+                    (command_id, command_id + lookahead)
+                ).fetchone()
+                if row:
+                    fixes.append((command, row[0]))
+            return fixes
+
+    def following_commands(self, limit: int = 3) -> Dict[str, List[str]]:
+        """
+        Get the commands that most often follow each base command.
+
+        Args:
+            limit: Maximum number of followers per command
+
+        Returns:
+            Dict mapping base commands to their most common followers
+        """
+        result: Dict[str, List[str]] = {}
+        for prev_base, next_base in self._query(
+            "SELECT prev_base, next_base FROM transitions ORDER BY prev_base, count DESC"
+        ):
+            followers = result.setdefault(prev_base, [])
+            if len(followers) < limit:
+                followers.append(next_base)
+        return result
+
+    def common_flags(self, base_command: str, limit: int = 3) -> List[str]:
+        """
+        Get the flags most often used with a base command.
+
+        Args:
+            base_command: The base command
+            limit: Maximum number of flags to return
+
+        Returns:
+            List of flags, most common first
+        """
+        rows = self._query(
+            "SELECT flag FROM flags WHERE base_command = ? ORDER BY count DESC LIMIT ?", (base_command, limit)
+        )
+        return [row[0] for row in rows]
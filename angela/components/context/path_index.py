@@ -0,0 +1,284 @@
+# angela/components/context/path_index.py
+"""
+Trigram index over the paths of a :class:`ProjectIndex`.
+
+File references like "the user model" or "utils/helpers" are resolved by
+fuzzy name matching. Instead of scoring every path in the tree, the resolver
+asks this index for a short list of candidates and only rescores those.
+
+Trigrams are taken from distinct base names and distinct directory names, so
+a name shared by many files (``__init__.py``, ``index.js``) is indexed once.
+Names are padded with ``^`` and ``$`` so that references shorter than three
+characters still produce trigrams and matching prefixes/suffixes weigh more.
+
+The index is kept in sync with its project index by diffing the set of
+entries whenever the project index generation changes; only added and
+removed paths are tokenized again.
+"""
+import heapq
+import re
+from collections import Counter
+from typing import Dict, List, Mapping, NamedTuple, Optional, Set, Tuple
+
+# Minimum Dice coefficient between name trigrams for a candidate
+MIN_NAME_SCORE = 0.2
+
+# Trigrams in more than this share of the names (and at least this many)
+# do not generate candidates on their own
+COMMON_TRIGRAM_SHARE = 0.05
+COMMON_TRIGRAM_MIN = 500
+
+# Weight of matching directory segments relative to the base name
+SEGMENT_WEIGHT = 0.25
+
+_GLOB_METACHARACTERS = re.compile(r"\*\*?|\?|\[[^\]]*\]")
+
+
+def trigrams(text: str) -> Set[str]:
+    """
+    Get the padded trigrams of a lowercase name.
+
+    Args:
+        text: The name
+
+    Returns:
+        Set of trigrams
+    """
+    padded = f"^{text.lower()}$"
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+
+def trigram_similarity(query: str, name: str) -> float:
+    """
+    Get the Dice coefficient of the trigrams of two names.
+
+    Args:
+        query: The reference
+        name: The candidate name
+
+    Returns:
+        Similarity between 0.0 and 1.0
+    """
+    a, b = trigrams(query), trigrams(name)
+    return 2 * len(a & b) / (len(a) + len(b)) if a and b else 0.0
+
+
+class PathCandidate(NamedTuple):
+    """A path proposed by :meth:`PathTrigramIndex.search`."""
+    path: str          # Relative POSIX path from the project root
+    score: float
+    is_dir: bool
+
+
+class PathTrigramIndex:
+    """Trigram postings over the base names and directory names of a tree."""
+
+    def __init__(self):
+        """Initialize an empty index."""
+        # path -> (is_dir, ignored)
+        self._entries: Dict[str, Tuple[bool, bool]] = {}
+        # name -> paths with that base name
+        self._paths_by_name: Dict[str, Set[str]] = {}
+        # lowercase name -> names, lowercase name -> trigram count
+        self._names_by_key: Dict[str, Set[str]] = {}
+        self._trigram_counts: Dict[str, int] = {}
+        # trigram -> lowercase names containing it
+        self._postings: Dict[str, Set[str]] = {}
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def sync(self, entries: Mapping[str, Tuple[bool, bool]]) -> Tuple[int, int]:
+        """
+        Make the index match a set of entries.
+
+        Args:
+            entries: Relative path -> (is_dir, ignored)
+
+        Returns:
+            Number of (added, removed) entries
+        """
+        removed = [p for p, flags in self._entries.items() if entries.get(p) != flags]
+        for path in removed:
+            self._remove(path)
+        added = [p for p in entries if p not in self._entries]
+        for path in added:
+            self._add(path, entries[path])
+        return len(added), len(removed)
+
+    def _add(self, path: str, flags: Tuple[bool, bool]) -> None:
+        self._entries[path] = flags
+        name = path.rsplit("/", 1)[-1]
+        paths = self._paths_by_name.setdefault(name, set())
+        paths.add(path)
+        if len(paths) > 1:
+            return
+
+        key = name.lower()
+        names = self._names_by_key.setdefault(key, set())
+        names.add(name)
+        if len(names) > 1:
+            return
+        grams = trigrams(key)
+        self._trigram_counts[key] = len(grams)
+        for gram in grams:
+            self._postings.setdefault(gram, set()).add(key)
+
+    def _remove(self, path: str) -> None:
+        del self._entries[path]
+        name = path.rsplit("/", 1)[-1]
+        paths = self._paths_by_name[name]
+        paths.discard(path)
+        if paths:
+            return
+        del self._paths_by_name[name]
+
+        key = name.lower()
+        names = self._names_by_key[key]
+        names.discard(name)
+        if names:
+            return
+        del self._names_by_key[key]
+        del self._trigram_counts[key]
+        for gram in trigrams(key):
+            posting = self._postings.get(gram)
+            if posting is not None:
+                posting.discard(key)
+                if not posting:
+                    del self._postings[gram]
+
+    def _score_names(self, query: str, min_score: float) -> Dict[str, float]:
+        """
+        Dice coefficient of the indexed names that best share trigrams with ``query``.
+
+        Candidates are collected from the postings of the query's rarer
+        trigrams only; trigrams shared by a large part of the names (".py",
+        "py$") would make every name a candidate. Their contribution is
+        added back for the candidates found.
+        """
+        grams = trigrams(query)
+        common_size = max(COMMON_TRIGRAM_MIN, len(self._trigram_counts) * COMMON_TRIGRAM_SHARE)
+        rare = [g for g in grams if len(self._postings.get(g, ())) <= common_size]
+        common = grams.difference(rare) if rare else set()
+
+        hits: Counter = Counter()
+        for gram in (rare if rare else grams):
+            posting = self._postings.get(gram)
+            if posting:
+                hits.update(posting)
+
+        scores = {}
+        for key, shared in hits.items():
+            if common:
+                shared += len(common & trigrams(key))
+            score = 2 * shared / (len(grams) + self._trigram_counts[key])
+            if score >= min_score:
+                scores[key] = score
+        return scores
+
+    def search(
+        self,
+        reference: str,
+        limit: int = 50,
+        under: Optional[str] = None,
+        directories: bool = False,
+        include_ignored: bool = False
+    ) -> List[PathCandidate]:
+        """
+        Get the paths whose names best match a reference.
+
+        The base name of the reference is matched against base names. If the
+        reference has directory parts, the best match of each against the
+        candidate's directory names adds to its score.
+
+        Args:
+            reference: The file reference, e.g. "config" or "src/utls.py"
+            limit: Maximum number of candidates
+            under: Only paths below this relative directory
+            directories: Return directories instead of files
+            include_ignored: Include paths in ignored locations
+
+        Returns:
+            Candidates, best first
+        """
+        parts = [p for p in reference.strip().lower().split("/") if p]
+        if not parts:
+            return []
+        name_query, segment_queries = parts[-1], parts[:-1]
+        prefix = under.strip("/") + "/" if under else None
+
+        candidates = []
+        for key, name_score in self._score_names(name_query, MIN_NAME_SCORE).items():
+            for name in self._names_by_key[key]:
+                for path in self._paths_by_name[name]:
+                    is_dir, ignored = self._entries[path]
+                    if is_dir != directories or (ignored and not include_ignored):
+                        continue
+                    if prefix is not None and not path.startswith(prefix):
+                        continue
+                    candidates.append((path, name_score))
+
+        if segment_queries:
+            candidates = [
+                (path, score + SEGMENT_WEIGHT * self._segment_score(path, segment_queries))
+                for path, score in candidates
+            ]
+
+        best = heapq.nlargest(limit, candidates, key=lambda c: (c[1], -len(c[0])))
+        return [PathCandidate(path, score, directories) for path, score in best]
+
+    @staticmethod
+    def _segment_score(path: str, segment_queries: List[str]) -> float:
+        """Average best similarity of each query segment to the path's directories."""
+        segments = path.lower().split("/")[:-1]
+        if not segments:
+            return 0.0
+        return sum(
+            max(trigram_similarity(query, segment) for segment in segments)
+            for query in segment_queries
+        ) / len(segment_queries)
+
+    def glob_candidates(self, pattern: str) -> Optional[List[str]]:
+        """
+        Get the paths whose base name can match a glob pattern.
+
+        Uses the literal runs of the pattern's last component: a matching
+        name must contain all of their trigrams. The result is a superset
+        of the matches (case is ignored) and must still be checked against
+        the pattern.
+
+        Args:
+            pattern: Glob pattern relative to the root
+
+        Returns:
+            Candidate relative paths, or None if the pattern has no literal
+            run long enough to narrow the search
+        """
+        name_pattern = pattern.rsplit("/", 1)[-1].lower()
+        literals = [run for run in _GLOB_METACHARACTERS.split(name_pattern) if run]
+        if name_pattern and not name_pattern.startswith(("*", "?", "[")):
+            literals[0] = "^" + literals[0]
+        if name_pattern and not name_pattern.endswith(("*", "?", "]")):
+            literals[-1] = literals[-1] + "$"
+
+        grams: Set[str] = set()
+        for run in literals:
+            grams.update(run[i:i + 3] for i in range(len(run) - 2))
+        if not grams:
+            return None
+
+        keys: Optional[Set[str]] = None
+        for gram in sorted(grams, key=lambda g: len(self._postings.get(g, ()))):
+            posting = self._postings.get(gram)
+            if not posting:
+                return []
+            keys = set(posting) if keys is None else keys & posting
+            if not keys:
+                return []
+
+        return [
+            path
+            for key in keys
+            for name in self._names_by_key[key]
+            for path in self._paths_by_name[name]
+        ]
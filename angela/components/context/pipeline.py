@@ -0,0 +1,382 @@
+# angela/components/context/pipeline.py
+"""
+Incremental context pipeline for request processing.
+
+Building the request context used to redo everything on every request:
+refresh the context manager, rebuild the context dictionary, infer project
+information and run every registered context enhancer (including semantic
+analysis), before the request type was even known.
+
+The pipeline splits that work into named stages. Every stage declares the
+invalidation keys it depends on (cwd, project root mtime, git HEAD, project
+index generation, ...) and the stages it requires. A stage's output is cached
+together with the key values it was computed under and is only recomputed
+when one of them changes. Stages marked lazy are only evaluated when the
+request handler asks for them.
+"""
+import os
+import time
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any, Awaitable, Callable, Dict, Iterable, Iterator, List, NamedTuple, Optional, Set, Tuple
+
+from angela.utils.logging import get_logger
+
+logger = get_logger(__name__)
+
+
+class ContextStage(NamedTuple):
+    """A named unit of context computation."""
+    name: str
+    compute: Callable[[Dict[str, Any]], Awaitable[Dict[str, Any]]]
+    keys: Optional[Tuple[str, ...]]  # Invalidation keys; None recomputes on every request
+    requires: Tuple[str, ...] = ()
+    lazy: bool = False
+
+
+class StageTimings:
+    """
+    Per-stage wall clock timings for a single request.
+
+    Stages are recorded in the order they finished; stages served from
+    the pipeline cache are flagged so the breakdown shows what was skipped.
+    """
+
+    def __init__(self):
+        """Initialize an empty timing record."""
+        self._start = time.perf_counter()
+        self._stages: List[Tuple[str, float, bool]] = []
+
+    @contextmanager
+    def stage(self, name: str) -> Iterator[None]:
+        """
+        Time a block of work as a stage.
+
+        Args:
+            name: Stage name
+        """
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.record(name, time.perf_counter() - start)
+
+    def record(self, name: str, seconds: float, cached: bool = False) -> None:
+        """
+        Record a stage duration.
+
+        Args:
+            name: Stage name
+            seconds: Duration in seconds
+            cached: Whether the stage was served from cache
+        """
+        self._stages.append((name, seconds * 1000, cached))
+
+    @property
+    def total_ms(self) -> float:
+        """Milliseconds since the record was created."""
+        return (time.perf_counter() - self._start) * 1000
+
+    def as_dict(self) -> Dict[str, Any]:
+        """
+        Get the breakdown as a dictionary.
+
+        Returns:
+            Dictionary with per-stage milliseconds and the total
+        """
+        return {
+            "stages": [
+                {"name": name, "ms": round(ms, 2), "cached": cached}
+                for name, ms, cached in self._stages
+            ],
+            "total_ms": round(self.total_ms, 2),
+        }
+
+    def summary(self) -> str:
+        """Get a one-line, human readable breakdown."""
+        parts = [
+            f"{name}={ms:.1f}ms{' (cached)' if cached else ''}"
+            for name, ms, cached in self._stages
+        ]
+        return f"total={self.total_ms:.1f}ms " + " ".join(parts)
+
+
+def _stat_mtime(path: Optional[str]) -> Optional[int]:
+    """Get the mtime of a path in nanoseconds, or None if it cannot be stat'ed."""
+    if not path:
+        return None
+    try:
+        return os.stat(path).st_mtime_ns
+    except OSError:
+        return None
+
+
+def _read_git_head(project_root: Optional[str]) -> Optional[str]:
+    """
+    Read the commit HEAD points at without spawning git.
+
+    Returns the contents of ``.git/HEAD`` plus, for a symbolic ref, the
+    contents of the ref file (or its packed-refs mtime when it is packed).
+    """
+    if not project_root:
+        return None
+    git_dir = Path(project_root) / ".git"
+    try:
+        head = (git_dir / "HEAD").read_text().strip()
+    except OSError:
+        return None
+    if head.startswith("ref: "):
+        ref = head[5:]
+        try:
+            return f"{head}@{(git_dir / ref).read_text().strip()}"
+        except OSError:
+            return f"{head}@packed:{_stat_mtime(str(git_dir / 'packed-refs'))}"
+    return head
+
+
+class ContextPipeline:
+    """
+    Cached, stage-based builder for the request context.
+
+    Stages are evaluated in registration order. A stage is recomputed only
+    when the values of its invalidation keys differ from the ones it was last
+    computed under; otherwise its cached output is merged into the context.
+    """
+
+    def __init__(self):
+        """Initialize the pipeline with the default context stages."""
+        self._logger = logger
+        self._stages: Dict[str, ContextStage] = {}
+        self._key_functions: Dict[str, Callable[[Dict[str, Any]], Any]] = {}
+        self._cache: Dict[str, Tuple[Tuple[Any, ...], Dict[str, Any]]] = {}
+
+        self._register_default_keys()
+        self._register_default_stages()
+
+    def register_key(self, name: str, func: Callable[[Dict[str, Any]], Any]) -> None:
+        """
+        Register an invalidation key.
+
+        Args:
+            name: Key name used in stage definitions
+            func: Function computing the key's current value from the context built so far
+        """
+        self._key_functions[name] = func
+
+    def register_stage(
+        self,
+        name: str,
+        compute: Callable[[Dict[str, Any]], Awaitable[Dict[str, Any]]],
+        keys: Optional[Iterable[str]] = None,
+        requires: Iterable[str] = (),
+        lazy: bool = False
+    ) -> None:
+        """
+        Register a context stage.
+
+        Args:
+            name: Unique stage name
+            compute: Async function returning the context fields the stage produces
+            keys: Invalidation keys, or None to recompute on every request
+            requires: Stages that must be evaluated first
+            lazy: Only evaluate when explicitly requested
+        """
+        keys = tuple(keys) if keys is not None else None
+        for key in keys or ():
+            if key not in self._key_functions:
+                raise ValueError(f"Unknown invalidation key: {key}")
+        self._stages[name] = ContextStage(name, compute, keys, tuple(requires), lazy)
+        self._cache.pop(name, None)
+
+    @property
+    def stage_names(self) -> List[str]:
+        """Names of all registered stages, in evaluation order."""
+        return list(self._stages)
+
+    async def build(
+        self,
+        evaluated: Optional[Set[str]] = None,
+        timings: Optional[StageTimings] = None
+    ) -> Dict[str, Any]:
+        """
+        Build the context from all non-lazy stages.
+
+        Args:
+            evaluated: Set that receives the names of the evaluated stages
+            timings: Optional timing record to add stage durations to
+
+        Returns:
+            The context dictionary
+        """
+        context: Dict[str, Any] = {}
+        eager = [stage.name for stage in self._stages.values() if not stage.lazy]
+        await self.complete(context, eager, evaluated, timings)
+        return context
+
+    async def complete(
+        self,
+        context: Dict[str, Any],
+        stages: Optional[Iterable[str]] = None,
+        evaluated: Optional[Set[str]] = None,
+        timings: Optional[StageTimings] = None
+    ) -> Dict[str, Any]:
+        """
+        Evaluate further stages into an existing context.
+
+        Args:
+            context: The context to update in place
+            stages: Stage names to evaluate, or None for all stages
+            evaluated: Stages already evaluated into this context; updated in place
+            timings: Optional timing record to add stage durations to
+
+        Returns:
+            The updated context
+        """
+        wanted = set(self._stages) if stages is None else self._with_requirements(stages)
+        if evaluated is None:
+            evaluated = set()
+
+        for stage in self._stages.values():
+            if stage.name not in wanted or stage.name in evaluated:
+                continue
+            await self._evaluate(stage, context, timings)
+            evaluated.add(stage.name)
+
+        return context
+
+    def invalidate(self, stage: Optional[str] = None) -> None:
+        """
+        Drop cached stage output.
+
+        Args:
+            stage: Stage to invalidate, or None for all
+        """
+        if stage is None:
+            self._cache.clear()
+        else:
+            self._cache.pop(stage, None)
+
+    def _with_requirements(self, stages: Iterable[str]) -> Set[str]:
+        """Expand a set of stage names with everything they require."""
+        wanted = set()
+        pending = list(stages)
+        while pending:
+            name = pending.pop()
+            if name in wanted or name not in self._stages:
+                continue
+            wanted.add(name)
+            pending.extend(self._stages[name].requires)
+        return wanted
+
+    async def _evaluate(self, stage: ContextStage, context: Dict[str, Any], timings: Optional[StageTimings]) -> None:
+        """Evaluate one stage, reusing its cached output if its keys are unchanged."""
+        start = time.perf_counter()
+
+        key_values = None
+        if stage.keys is not None:
+            key_values = tuple(self._key_value(key, context) for key in stage.keys)
+            cached = self._cache.get(stage.name)
+            if cached is not None and cached[0] == key_values:
+                context.update(cached[1])
+                if timings:
+                    timings.record(f"context.{stage.name}", time.perf_counter() - start, cached=True)
+                return
+
+        try:
+            produced = await stage.compute(context) or {}
+        except Exception as e:
+            self._logger.error(f"Error in context stage {stage.name}: {str(e)}")
+            produced = {}
+        else:
+            if key_values is not None:
+                self._cache[stage.name] = (key_values, produced)
+
+        context.update(produced)
+        if timings:
+            timings.record(f"context.{stage.name}", time.perf_counter() - start)
+
+    def _key_value(self, key: str, context: Dict[str, Any]) -> Any:
+        """Compute an invalidation key, treating failures as 'always stale'."""
+        try:
+            return self._key_functions[key](context)
+        except Exception as e:
+            self._logger.debug(f"Invalidation key {key} failed: {str(e)}")
+            return object()
+
+    def _register_default_keys(self) -> None:
+        """Register the built-in invalidation keys."""
+        from angela.api.context import get_context_manager, get_project_index
+
+        def project_root(context: Dict[str, Any]) -> Optional[str]:
+            if "project_root" in context:
+                return context["project_root"]
+            root = get_context_manager().project_root
+            return str(root) if root else None
+
+        def index_generation(context: Dict[str, Any]) -> Optional[Tuple[str, int]]:
+            root = project_root(context)
+            if not root:
+                return None
+            return root, get_project_index(root).generation
+
+        self.register_key("cwd", lambda context: os.getcwd())
+        self.register_key("cwd_mtime", lambda context: _stat_mtime(os.getcwd()))
+        self.register_key("current_file", lambda context: str(get_context_manager().current_file))
+        self.register_key("project_root", project_root)
+        self.register_key("project_root_mtime", lambda context: _stat_mtime(project_root(context)))
+        self.register_key("git_head", lambda context: _read_git_head(project_root(context)))
+        self.register_key("index_generation", index_generation)
+
+    def _register_default_stages(self) -> None:
+        """Register the stages that make up the standard request context."""
+        from angela.api.context import get_context_manager, get_session_manager, get_context_enhancer
+
+        async def base(context: Dict[str, Any]) -> Dict[str, Any]:
+            context_manager = get_context_manager()
+            context_manager.refresh_context()
+            return context_manager.get_context_dict()
+
+        async def session(context: Dict[str, Any]) -> Dict[str, Any]:
+            return {"session": get_session_manager().get_context()}
+
+        async def project(context: Dict[str, Any]) -> Dict[str, Any]:
+            if not context.get("project_root"):
+                return {}
+            produced: Dict[str, Any] = {}
+            await get_context_enhancer().add_project_info(produced, context["project_root"], refresh=True)
+            return produced
+
+        async def recent_files(context: Dict[str, Any]) -> Dict[str, Any]:
+            produced: Dict[str, Any] = {}
+            await get_context_enhancer().add_file_activity(produced)
+            return produced
+
+        async def file_reference(context: Dict[str, Any]) -> Dict[str, Any]:
+            produced: Dict[str, Any] = {}
+            await get_context_enhancer().add_file_reference_context(produced, cwd=context.get("cwd"))
+            return produced
+
+        async def enhancers(context: Dict[str, Any]) -> Dict[str, Any]:
+            # Cache only what the registered enhancers added or replaced, so a
+            # cache hit never overwrites fields owned by other stages
+            enriched = await get_context_enhancer().run_enhancers(dict(context))
+            return {
+                key: value for key, value in enriched.items()
+                if key not in context or context[key] is not value
+            }
+
+        self.register_stage("base", base, keys=("cwd", "cwd_mtime", "project_root_mtime", "current_file"))
+        self.register_stage("session", session)
+        self.register_stage("project", project,
+                            keys=("project_root", "project_root_mtime", "index_generation"),
+                            requires=("base",), lazy=True)
+        self.register_stage("recent_files", recent_files, requires=("base",), lazy=True)
+        self.register_stage("file_reference", file_reference,
+                            keys=("cwd", "cwd_mtime"), requires=("base",), lazy=True)
+        self.register_stage("enhancers", enhancers,
+                            keys=("project_root", "current_file", "git_head", "index_generation"),
+                            requires=("base",), lazy=True)
+
+
+# Global context pipeline instance
+context_pipeline = ContextPipeline()
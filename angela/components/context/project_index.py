@@ -0,0 +1,783 @@
+# angela/components/context/project_index.py
+"""
+Persistent, incremental file index shared by all context components.
+
+Project inference, state analysis, semantic analysis and the Docker
+integration all need to know which files exist in a project. Instead of each
+of them walking the tree with ``Path.glob("**/...")``, they query one
+:class:`ProjectIndex` per project root.
+
+The index records path, size, mtime, inode, extension and ignore status of
+every file. It is refreshed incrementally: every indexed directory keeps the
+mtime and inode it had when it was listed, and only directories whose stamp
+changed are listed again. The index is persisted under ``CONFIG_DIR/index`` so
+a new process starts from the previous snapshot instead of a full walk; the
+snapshot is only rewritten when it changed, at most every ``SAVE_INTERVAL``
+seconds and once more at exit.
+"""
+import asyncio
+import atexit
+import fnmatch
+import functools
+import hashlib
+import json
+import os
+import re
+import threading
+import time
+import weakref
+from pathlib import Path
+from typing import Dict, List, Optional, Iterable, Iterator, NamedTuple, Pattern, Set, Tuple, Union
+
+from angela.constants import CONFIG_DIR
+from angela.components.context.path_index import PathCandidate, PathTrigramIndex
+from angela.utils.logging import get_logger
+
+logger = get_logger(__name__)
+
+INDEX_DIR = CONFIG_DIR / "index"
+INDEX_FORMAT_VERSION = 1
+
+# Minimum seconds between snapshot writes triggered by refreshes
+SAVE_INTERVAL = 30.0
+
+# Directories that are never descended into
+PRUNED_DIRECTORIES = {
+    ".git", ".hg", ".svn", "node_modules", "__pycache__", "venv", ".venv",
+    ".tox", ".nox", ".mypy_cache", ".pytest_cache", ".ruff_cache",
+}
+
+# Directories whose contents are indexed but marked as ignored
+IGNORED_DIRECTORIES = {
+    "build", "dist", "target", "env", "bin", "obj", "coverage", ".next",
+}
+
+
+class IndexedFile(NamedTuple):
+    """A file entry in the project index."""
+    path: str          # Relative POSIX path from the project root
+    size: int
+    mtime: float
+    inode: int
+    extension: str     # Lower-cased suffix including the dot, or ""
+    ignored: bool
+
+    @property
+    def name(self) -> str:
+        """The file's base name."""
+        return self.path.rsplit("/", 1)[-1]
+
+
+class _DirRecord(NamedTuple):
+    """Snapshot of a directory listing."""
+    mtime_ns: int
+    inode: int
+    ignored: bool
+    subdirs: Tuple[str, ...]
+    files: Tuple[str, ...]
+
+
+def _extension(name: str) -> str:
+    return os.path.splitext(name)[1].lower()
+
+
+@functools.lru_cache(maxsize=256)
+def _compile_glob(pattern: str) -> Pattern[str]:
+    """Translate a ``Path.glob`` style pattern into a regular expression."""
+    parts = []
+    i = 0
+    while i < len(pattern):
+        if pattern.startswith("**/", i):
+            parts.append("(?:.*/)?")
+            i += 3
+        elif pattern.startswith("**", i):
+            parts.append(".*")
+            i += 2
+        elif pattern[i] == "*":
+            parts.append("[^/]*")
+            i += 1
+        elif pattern[i] == "?":
+            parts.append("[^/]")
+            i += 1
+        elif pattern[i] == "[" and "]" in pattern[i + 1:]:
+            end = pattern.index("]", i + 1)
+            body = pattern[i + 1:end]
+            if body.startswith("!"):
+                body = "^" + body[1:]
+            parts.append(f"[{body}]")
+            i = end + 1
+        else:
+            parts.append(re.escape(pattern[i]))
+            i += 1
+    return re.compile("".join(parts) + r"\Z")
+
+
+def _join(parent: str, name: str) -> str:
+    return f"{parent}/{name}" if parent else name
+
+
+class ProjectIndex:
+    """
+    Incremental file index for a single project root.
+
+    All query methods work on the in-memory snapshot; call :meth:`refresh`
+    (or go through :class:`ProjectIndexManager`) to bring it up to date.
+    """
+
+    def __init__(self, root: Union[str, Path], storage_dir: Optional[Path] = None):
+        """
+        Initialize the index.
+
+        Args:
+            root: The project root directory
+            storage_dir: Directory for the persisted index (defaults to CONFIG_DIR/index)
+        """
+        self.root = Path(root).resolve()
+        self._storage_dir = Path(storage_dir) if storage_dir else INDEX_DIR
+        self._lock = threading.RLock()
+        self._files: Dict[str, IndexedFile] = {}
+        self._dirs: Dict[str, _DirRecord] = {}
+        self._gitignore_stamp: Optional[int] = None
+        self._gitignore_patterns: List[str] = []
+        self._by_name: Optional[Dict[str, List[str]]] = None
+        self._by_name_generation = -1
+        self._path_index = PathTrigramIndex()
+        self._path_index_generation = -1
+        self.generation = 0
+        self.last_refresh = 0.0
+        self._loaded = False
+        self._saved_generation: Optional[int] = None
+        self._last_save = 0.0
+        # Deferred changes are written when the process exits
+        _live_indexes.add(self)
+
+    @property
+    def storage_path(self) -> Path:
+        """Path of the persisted index file for this root."""
+        digest = hashlib.sha1(str(self.root).encode("utf-8")).hexdigest()[:16]
+        return self._storage_dir / f"{digest}.json"
+
+    # ------------------------------------------------------------------
+    # Refresh
+    # ------------------------------------------------------------------
+
+    def refresh(self, stat_files: bool = False) -> bool:
+        """
+        Bring the index up to date with the file system.
+
+        Only directories whose mtime or inode changed are listed again.
+        Modifying a file in place does not change its directory's mtime, so
+        pass ``stat_files=True`` to re-stat every file as well (or feed the
+        changed paths to :meth:`update_paths`).
+
+        Args:
+            stat_files: Also re-stat files in unchanged directories
+
+        Returns:
+            True if anything changed
+        """
+        with self._lock:
+            if not self._loaded:
+                self.load()
+
+            changed = self._check_gitignore()
+            seen: Set[str] = set()
+            stack = [""]
+
+            while stack:
+                rel_dir = stack.pop()
+                abs_dir = self.root / rel_dir if rel_dir else self.root
+                try:
+                    st = os.stat(abs_dir)
+                except OSError:
+                    continue
+
+                seen.add(rel_dir)
+                record = self._dirs.get(rel_dir)
+                if record and record.mtime_ns == st.st_mtime_ns and record.inode == st.st_ino:
+                    if stat_files:
+                        changed |= self._restat_files(rel_dir, record.files)
+                    stack.extend(_join(rel_dir, d) for d in record.subdirs)
+                    continue
+
+                changed = True
+                record = self._scan_directory(rel_dir, st)
+                stack.extend(_join(rel_dir, d) for d in record.subdirs)
+
+            # Drop directories (and their files) that no longer exist
+            for rel_dir in [d for d in self._dirs if d not in seen]:
+                self._drop_directory(rel_dir)
+                changed = True
+
+            self.last_refresh = time.time()
+            if changed:
+                self.generation += 1
+            if self.dirty and self.last_refresh - self._last_save >= SAVE_INTERVAL:
+                self.save()
+            return changed
+
+    def update_paths(self, paths: Iterable[Union[str, Path]]) -> bool:
+        """
+        Re-stat specific paths, e.g. ones reported by a file watcher.
+
+        Args:
+            paths: Absolute or root-relative paths that may have changed
+
+        Returns:
+            True if anything changed
+        """
+        with self._lock:
+            changed = False
+            for path in paths:
+                rel = self._relative(path)
+                if rel is None:
+                    continue
+                parent = rel.rsplit("/", 1)[0] if "/" in rel else ""
+                if parent not in self._dirs:
+                    continue
+
+                abs_path = self.root / rel
+                try:
+                    st = os.stat(abs_path)
+                except OSError:
+                    st = None
+
+                if st is None or not os.path.isfile(abs_path):
+                    if rel in self._files:
+                        del self._files[rel]
+                        self._replace_dir_files(parent, remove=rel.rsplit("/", 1)[-1])
+                        changed = True
+                    continue
+
+                old = self._files.get(rel)
+                entry = self._make_entry(rel, st, self._dirs[parent].ignored)
+                if old != entry:
+                    self._files[rel] = entry
+                    if old is None:
+                        self._replace_dir_files(parent, add=entry.name)
+                    changed = True
+
+            if changed:
+                self.generation += 1
+            return changed
+
+    def _scan_directory(self, rel_dir: str, st: os.stat_result) -> _DirRecord:
+        """List one directory and replace its direct entries."""
+        parent_ignored = False
+        if rel_dir:
+            parent = rel_dir.rsplit("/", 1)[0] if "/" in rel_dir else ""
+            parent_record = self._dirs.get(parent)
+            parent_ignored = parent_record.ignored if parent_record else False
+        ignored = parent_ignored or (bool(rel_dir) and self._is_ignored_dir(rel_dir))
+
+        old = self._dirs.get(rel_dir)
+        subdirs: List[str] = []
+        files: List[str] = []
+
+        try:
+            with os.scandir(self.root / rel_dir if rel_dir else self.root) as it:
+                for entry in it:
+                    try:
+                        if entry.is_dir(follow_symlinks=False):
+                            if entry.name not in PRUNED_DIRECTORIES:
+                                subdirs.append(entry.name)
+                        elif entry.is_file(follow_symlinks=False):
+                            rel = _join(rel_dir, entry.name)
+                            file_ignored = ignored or self._matches_gitignore(rel, entry.name, False)
+                            self._files[rel] = self._make_entry(rel, entry.stat(follow_symlinks=False), file_ignored)
+                            files.append(entry.name)
+                    except OSError:
+                        continue
+        except OSError as e:
+            logger.debug(f"Cannot list {rel_dir or '.'}: {e}")
+
+        # Forget files and subdirectories that disappeared from this listing
+        if old:
+            current_files = set(files)
+            for name in old.files:
+                if name not in current_files:
+                    self._files.pop(_join(rel_dir, name), None)
+            current_dirs = set(subdirs)
+            for name in old.subdirs:
+                if name not in current_dirs:
+                    self._drop_directory(_join(rel_dir, name))
+            if old.ignored != ignored:
+                # Ignore status changed; the subtree is re-scanned with the new status
+                for name in old.subdirs:
+                    self._drop_directory(_join(rel_dir, name))
+
+        record = _DirRecord(st.st_mtime_ns, st.st_ino, ignored, tuple(subdirs), tuple(files))
+        self._dirs[rel_dir] = record
+        return record
+
+    def _restat_files(self, rel_dir: str, names: Tuple[str, ...]) -> bool:
+        """Re-stat files of an unchanged directory."""
+        changed = False
+        for name in names:
+            rel = _join(rel_dir, name)
+            old = self._files.get(rel)
+            try:
+                st = os.stat(self.root / rel)
+            except OSError:
+                continue
+            if old is None or old.mtime != st.st_mtime or old.size != st.st_size:
+                ignored = old.ignored if old else self._dirs[rel_dir].ignored
+                self._files[rel] = self._make_entry(rel, st, ignored)
+                changed = True
+        return changed
+
+    def _drop_directory(self, rel_dir: str) -> None:
+        """Remove a directory subtree from the index."""
+        record = self._dirs.pop(rel_dir, None)
+        if record is None:
+            return
+        for name in record.files:
+            self._files.pop(_join(rel_dir, name), None)
+        for name in record.subdirs:
+            self._drop_directory(_join(rel_dir, name))
+
+    def _replace_dir_files(self, rel_dir: str, add: Optional[str] = None, remove: Optional[str] = None) -> None:
+        """Adjust the file list of a directory record in place."""
+        record = self._dirs[rel_dir]
+        files = [f for f in record.files if f != remove]
+        if add and add not in files:
+            files.append(add)
+        self._dirs[rel_dir] = record._replace(files=tuple(files))
+
+    @staticmethod
+    def _make_entry(rel: str, st: os.stat_result, ignored: bool) -> IndexedFile:
+        return IndexedFile(rel, st.st_size, st.st_mtime, st.st_ino, _extension(rel), ignored)
+
+    def _relative(self, path: Union[str, Path]) -> Optional[str]:
+        """Convert a path to a root-relative POSIX path, or None if outside."""
+        path = Path(path)
+        if not path.is_absolute():
+            return path.as_posix()
+        try:
+            return path.relative_to(self.root).as_posix()
+        except ValueError:
+            try:
+                return path.resolve().relative_to(self.root).as_posix()
+            except (ValueError, OSError):
+                return None
+
+    # ------------------------------------------------------------------
+    # Ignore rules
+    # ------------------------------------------------------------------
+
+    def _check_gitignore(self) -> bool:
+        """Reload root .gitignore patterns; reset the index if they changed."""
+        gitignore = self.root / ".gitignore"
+        try:
+            stamp = gitignore.stat().st_mtime_ns
+        except OSError:
+            stamp = None
+
+        if stamp == self._gitignore_stamp:
+            return False
+
+        patterns = []
+        if stamp is not None:
+            try:
+                for line in gitignore.read_text(encoding="utf-8", errors="ignore").splitlines():
+                    line = line.strip()
+                    # Negations and escaped patterns are not supported
+                    if line and not line.startswith(("#", "!", "\\")):
+                        patterns.append(line)
+            except OSError:
+                pass
+
+        self._gitignore_stamp = stamp
+        self._gitignore_patterns = patterns
+        if self._dirs:
+            # Ignore status of every entry may differ: rebuild from scratch
+            self._dirs.clear()
+            self._files.clear()
+        return True
+
+    def _is_ignored_dir(self, rel_dir: str) -> bool:
+        name = rel_dir.rsplit("/", 1)[-1]
+        if name.startswith(".") or name in IGNORED_DIRECTORIES:
+            return True
+        return self._matches_gitignore(rel_dir, name, True)
+
+    def _matches_gitignore(self, rel: str, name: str, is_dir: bool) -> bool:
+        """Match a simple subset of .gitignore syntax."""
+        for pattern in self._gitignore_patterns:
+            dir_only = pattern.endswith("/")
+            pat = pattern.rstrip("/")
+            if dir_only and not is_dir:
+                continue
+            if "/" in pat:
+                if fnmatch.fnmatchcase(rel, pat.lstrip("/")):
+                    return True
+            elif fnmatch.fnmatchcase(name, pat):
+                return True
+        return False
+
+    # ------------------------------------------------------------------
+    # Persistence
+    # ------------------------------------------------------------------
+
+    def load(self) -> bool:
+        """
+        Load the persisted snapshot for this root, if any.
+
+        Returns:
+            True if a snapshot was loaded
+        """
+        with self._lock:
+            self._loaded = True
+            path = self.storage_path
+            if not path.exists():
+                return False
+            try:
+                with open(path, "r", encoding="utf-8") as f:
+                    data = json.load(f)
+                if data.get("version") != INDEX_FORMAT_VERSION or data.get("root") != str(self.root):
+                    return False
+
+                self._dirs = {
+                    rel: _DirRecord(d[0], d[1], d[2], tuple(d[3]), tuple(d[4]))
+                    for rel, d in data["dirs"].items()
+                }
+                self._files = {
+                    rel: IndexedFile(rel, f[0], f[1], f[2], _extension(rel), f[3])
+                    for rel, f in data["files"].items()
+                }
+                self._gitignore_stamp = data.get("gitignore_stamp")
+                self._gitignore_patterns = data.get("gitignore_patterns", [])
+                self.generation = data.get("generation", 0)
+                self._saved_generation = self.generation
+                return True
+            except (OSError, ValueError, KeyError, IndexError, TypeError) as e:
+                logger.warning(f"Discarding unreadable project index {path}: {str(e)}")
+                self._dirs.clear()
+                self._files.clear()
+                return False
+
+    @property
+    def dirty(self) -> bool:
+        """Whether the snapshot changed since it was loaded or saved."""
+        return self.generation != self._saved_generation
+
+    def save(self) -> None:
+        """Persist the snapshot atomically, if it changed."""
+        with self._lock:
+            if not self.dirty:
+                return
+            data = {
+                "version": INDEX_FORMAT_VERSION,
+                "root": str(self.root),
+                "generation": self.generation,
+                "gitignore_stamp": self._gitignore_stamp,
+                "gitignore_patterns": self._gitignore_patterns,
+                "dirs": {rel: [d.mtime_ns, d.inode, d.ignored, d.subdirs, d.files] for rel, d in self._dirs.items()},
+                "files": {rel: [f.size, f.mtime, f.inode, f.ignored] for rel, f in self._files.items()},
+            }
+            path = self.storage_path
+            try:
+                path.parent.mkdir(parents=True, exist_ok=True)
+                tmp_path = path.with_suffix(".tmp")
+                with open(tmp_path, "w", encoding="utf-8") as f:
+                    json.dump(data, f, separators=(",", ":"))
+                os.replace(tmp_path, path)
+                self._saved_generation = self.generation
+                self._last_save = time.time()
+            except OSError as e:
+                logger.warning(f"Could not save project index: {str(e)}")
+
+    # ------------------------------------------------------------------
+    # Queries
+    # ------------------------------------------------------------------
+
+    @property
+    def file_count(self) -> int:
+        """Number of indexed files (including ignored ones)."""
+        return len(self._files)
+
+    def get(self, path: Union[str, Path]) -> Optional[IndexedFile]:
+        """
+        Look up a single file.
+
+        Args:
+            path: Absolute or root-relative path
+
+        Returns:
+            The index entry, or None if not indexed
+        """
+        rel = self._relative(path)
+        return self._files.get(rel) if rel is not None else None
+
+    def absolute(self, entry: Union[IndexedFile, str]) -> Path:
+        """Get the absolute path of an entry or relative path."""
+        return self.root / (entry.path if isinstance(entry, IndexedFile) else entry)
+
+    def iter_files(self, extensions: Optional[Iterable[str]] = None,
+                   include_ignored: bool = False, under: Optional[str] = None) -> Iterator[IndexedFile]:
+        """
+        Iterate over indexed files.
+
+        Args:
+            extensions: Only files with one of these extensions (e.g. ".py")
+            include_ignored: Include files in ignored locations
+            under: Only files below this root-relative directory
+
+        Yields:
+            Matching index entries
+        """
+        ext_set = {e.lower() for e in extensions} if extensions is not None else None
+        prefix = under.strip("/") + "/" if under else None
+        for entry in list(self._files.values()):
+            if entry.ignored and not include_ignored:
+                continue
+            if ext_set is not None and entry.extension not in ext_set:
+                continue
+            if prefix is not None and not entry.path.startswith(prefix):
+                continue
+            yield entry
+
+    def glob(self, pattern: str, include_ignored: bool = False, directories: bool = False) -> List[Path]:
+        """
+        Match files with a glob pattern.
+
+        Follows ``Path.glob`` semantics: ``*`` and ``?`` do not cross
+        directory separators and ``**/`` matches zero or more directories.
+
+        Args:
+            pattern: Glob pattern relative to the root
+            include_ignored: Include files in ignored locations
+            directories: Match directories too, as ``Path.glob`` does
+
+        Returns:
+            Absolute paths of matching files (and directories)
+        """
+        # Fast path for "**/name" lookups
+        name = pattern[3:] if pattern.startswith("**/") else None
+        if name and not any(c in name for c in "*?[/"):
+            matches = [rel for rel in self._names().get(name, [])
+                       if include_ignored or not self._files[rel].ignored]
+            if directories:
+                matches.extend(rel for rel, record in self._dirs.items()
+                               if rel and rel.rsplit("/", 1)[-1] == name and (include_ignored or not record.ignored))
+            return [self.root / rel for rel in matches]
+
+        regex = _compile_glob(pattern)
+        candidates = self._paths().glob_candidates(pattern)
+        if candidates is None:
+            candidates = list(self._files) + (list(self._dirs) if directories else [])
+
+        matches = []
+        for rel in candidates:
+            entry = self._files.get(rel)
+            if entry is None and directories and rel:
+                entry = self._dirs.get(rel)
+            if entry is not None and (include_ignored or not entry.ignored) and regex.match(rel):
+                matches.append(self.root / rel)
+        return matches
+
+    def search_paths(self, reference: str, limit: int = 50, under: Optional[str] = None,
+                     directories: bool = False, include_ignored: bool = False) -> List[PathCandidate]:
+        """
+        Find the paths whose names best match a fuzzy file reference.
+
+        Args:
+            reference: The file reference, e.g. "config" or "src/utls.py"
+            limit: Maximum number of candidates
+            under: Only paths below this root-relative directory
+            directories: Return directories instead of files
+            include_ignored: Include paths in ignored locations
+
+        Returns:
+            Candidates with root-relative paths, best first
+        """
+        return self._paths().search(reference, limit=limit, under=under, directories=directories,
+                                    include_ignored=include_ignored)
+
+    def find_by_name(self, name: str, include_ignored: bool = False) -> List[Path]:
+        """
+        Find files with an exact base name anywhere in the project.
+
+        Args:
+            name: The file name
+            include_ignored: Include files in ignored locations
+
+        Returns:
+            Absolute paths of matching files
+        """
+        return self.glob(f"**/{name}", include_ignored=include_ignored)
+
+    def count_by_extension(self, include_ignored: bool = False) -> Dict[str, int]:
+        """
+        Count files per extension.
+
+        Args:
+            include_ignored: Include files in ignored locations
+
+        Returns:
+            Dictionary of extension to file count
+        """
+        counts: Dict[str, int] = {}
+        for entry in self.iter_files(include_ignored=include_ignored):
+            if entry.extension:
+                counts[entry.extension] = counts.get(entry.extension, 0) + 1
+        return counts
+
+    def _names(self) -> Dict[str, List[str]]:
+        """Base name -> relative paths, rebuilt once per generation."""
+        if self._by_name is None or self._by_name_generation != self.generation:
+            by_name: Dict[str, List[str]] = {}
+            for rel in self._files:
+                by_name.setdefault(rel.rsplit("/", 1)[-1], []).append(rel)
+            self._by_name = by_name
+            self._by_name_generation = self.generation
+        return self._by_name
+
+    def _paths(self) -> PathTrigramIndex:
+        """Trigram index over file and directory names, synced once per generation."""
+        with self._lock:
+            if self._path_index_generation != self.generation:
+                entries = {rel: (False, entry.ignored) for rel, entry in self._files.items()}
+                entries.update((rel, (True, record.ignored)) for rel, record in self._dirs.items() if rel)
+                self._path_index.sync(entries)
+                self._path_index_generation = self.generation
+            return self._path_index
+
+
+# Indexes whose deferred changes are saved at exit; weak so that the exit
+# hook does not keep discarded indexes alive
+_live_indexes: "weakref.WeakSet[ProjectIndex]" = weakref.WeakSet()
+
+
+def _save_live_indexes() -> None:
+    """Write the deferred changes of every index still alive."""
+    for index in list(_live_indexes):
+        index.save()
+
+
+atexit.register(_save_live_indexes)
+
+
+class ProjectIndexManager:
+    """
+    Keeps one :class:`ProjectIndex` per project root.
+
+    Indexes are loaded from disk on first use and refreshed at most once
+    per ``refresh_interval`` seconds, so several consumers handling the same
+    request share a single refresh.
+    """
+
+    def __init__(self, refresh_interval: float = 2.0, storage_dir: Optional[Path] = None):
+        """
+        Initialize the manager.
+
+        Args:
+            refresh_interval: Minimum seconds between automatic refreshes
+            storage_dir: Directory for persisted indexes
+        """
+        self._logger = logger
+        self._indexes: Dict[str, ProjectIndex] = {}
+        self._lock = threading.RLock()
+        self.refresh_interval = refresh_interval
+        self._storage_dir = storage_dir
+
+    def get_index(self, project_root: Union[str, Path], refresh: bool = True) -> ProjectIndex:
+        """
+        Get the index for a project root.
+
+        Args:
+            project_root: The project root directory
+            refresh: Refresh the index if it is older than the refresh interval
+
+        Returns:
+            The project index
+        """
+        key = str(Path(project_root).resolve())
+        with self._lock:
+            index = self._indexes.get(key)
+            if index is None:
+                index = ProjectIndex(key, storage_dir=self._storage_dir)
+                self._indexes[key] = index
+
+        if refresh and time.time() - index.last_refresh > self.refresh_interval:
+            start = time.perf_counter()
+            index.refresh()
+            self._logger.debug(
+                f"Refreshed project index for {key} ({index.file_count} files) "
+                f"in {(time.perf_counter() - start) * 1000:.1f} ms"
+            )
+        return index
+
+    async def get_index_async(self, project_root: Union[str, Path], refresh: bool = True) -> ProjectIndex:
+        """
+        Get the index for a project root from async code.
+
+        A due refresh runs on a worker thread instead of blocking the event loop.
+
+        Args:
+            project_root: The project root directory
+            refresh: Refresh the index if it is older than the refresh interval
+
+        Returns:
+            The project index
+        """
+        with self._lock:
+            index = self._indexes.get(str(Path(project_root).resolve()))
+        if index is not None and (not refresh or time.time() - index.last_refresh <= self.refresh_interval):
+            return index
+        return await asyncio.to_thread(self.get_index, project_root, refresh)
+
+    def notify_changes(self, paths: Iterable[Union[str, Path]]) -> None:
+        """
+        Apply changed paths to every index that contains them.
+
+        Args:
+            paths: Absolute paths reported as changed
+        """
+        paths = [Path(p) for p in paths]
+        with self._lock:
+            indexes = list(self._indexes.values())
+        for index in indexes:
+            relevant = [p for p in paths if str(p).startswith(str(index.root))]
+            if relevant:
+                index.update_paths(relevant)
+
+    def handle_file_changes(self, batch) -> None:
+        """
+        Apply a file watcher change batch.
+
+        Modified files are re-stat'ed directly. Additions and removals change
+        their directory's mtime, so the affected indexes are simply marked
+        stale and the next access does an incremental refresh.
+
+        Args:
+            batch: A FileChangeBatch from the file watcher
+        """
+        if batch.structure_changed:
+            with self._lock:
+                indexes = list(self._indexes.values())
+            for index in indexes:
+                if index.root == batch.root or batch.root in index.root.parents or index.root in batch.root.parents:
+                    index.last_refresh = 0.0
+        if batch.modified:
+            self.notify_changes(batch.modified)
+
+    def invalidate(self, project_root: Optional[Union[str, Path]] = None) -> None:
+        """
+        Force the next access to refresh.
+
+        Args:
+            project_root: Root to invalidate, or None for all
+        """
+        with self._lock:
+            if project_root is None:
+                targets = list(self._indexes.values())
+            else:
+                index = self._indexes.get(str(Path(project_root).resolve()))
+                targets = [index] if index else []
+            for index in targets:
+                index.last_refresh = 0.0
+
+
+# Global project index manager instance
+project_index_manager = ProjectIndexManager()
@@ -1,6 +1,5 @@
 # angela/context/project_inference.py
 
-import os
 import glob
 import json
 import re
@@ -113,6 +112,11 @@ class ProjectInference:
         self._logger = logger
         self._cache = {}  # Cache inference results
     
+    async def _get_index(self, project_root: Path):
+        """Get the shared file index for a project root."""
+        from angela.api.context import get_project_index_async
+        return await get_project_index_async(project_root)
+    
     async def infer_project_info(self, project_root: Path) -> Dict[str, Any]:
         """
         Infer detailed information about a project.
@@ -123,6 +127,9 @@ class ProjectInference:
         Returns:
             Dictionary with project information
         """
+        # The project index reports resolved paths
+        project_root = Path(project_root).resolve()
+        
         # Check cache first
         cache_key = str(project_root)
         if cache_key in self._cache:
@@ -158,6 +165,9 @@ class ProjectInference:
         Returns:
             Project type string
         """
+        index = await self._get_index(project_root)
+        extension_counts = index.count_by_extension(include_ignored=True)
+
         # Count signature matches for each project type
         scores = {}
         
@@ -168,7 +178,7 @@ class ProjectInference:
             for file_pattern in signature.get("files", []):
                 # Handle glob patterns
                 if "*" in file_pattern:
-                    matches = list(project_root.glob(file_pattern))
+                    matches = index.glob(file_pattern, include_ignored=True)
                     score += len(matches)
                 else:
                     if (project_root / file_pattern).exists():
@@ -187,7 +197,7 @@ class ProjectInference:
             # Check for file extensions
             for ext in signature.get("extensions", []):
                 # Count files with this extension
-                count = len(list(project_root.glob(f"**/*{ext}")))
+                count = extension_counts.get(ext, 0)
                 score += min(count, 10)  # Cap at 10 to avoid skewing
             
             scores[project_type] = score
@@ -233,12 +243,13 @@ class ProjectInference:
         
         # Get signatures for this project type
         signature = self.PROJECT_SIGNATURES.get(project_type, {})
+        index = await self._get_index(project_root)
         
         # Check for signature files
         for file_pattern in signature.get("files", []):
             # Handle glob patterns
             if "*" in file_pattern:
-                for file_path in project_root.glob(file_pattern):
+                for file_path in index.glob(file_pattern, include_ignored=True):
                     if file_path.is_file():
                         important_files.append({
                             "path": str(file_path.relative_to(project_root)),
@@ -267,7 +278,7 @@ class ProjectInference:
         # Add project-specific logic
         if project_type == "python":
             # Look for main Python modules
-            for file_path in project_root.glob("**/*.py"):
+            for file_path in index.find_by_name("__main__.py") + index.find_by_name("main.py"):
                 if file_path.name == "__main__.py" or file_path.name == "main.py":
                     important_files.append({
                         "path": str(file_path.relative_to(project_root)),
@@ -277,7 +288,7 @@ class ProjectInference:
         elif project_type == "node":
             # Look for main JavaScript/TypeScript files
             for pattern in ["index.js", "main.js", "server.js", "app.js", "index.ts", "main.ts"]:
-                for file_path in project_root.glob(f"**/{pattern}"):
+                for file_path in index.find_by_name(pattern):
                     # Skip node_modules
                     if "node_modules" not in str(file_path):
                         important_files.append({
@@ -309,6 +320,8 @@ class ProjectInference:
                 frameworks.update(await self._detect_frameworks(project_root, pt))
             return frameworks
         
+        index = await self._get_index(project_root)
+
         # Get framework signatures for this project type
         if project_type in self.FRAMEWORK_SIGNATURES:
             for framework, patterns in self.FRAMEWORK_SIGNATURES[project_type].items():
@@ -318,13 +331,13 @@ class ProjectInference:
                 for pattern in patterns:
                     # Handle glob patterns
                     if "*" in pattern:
-                        files = list(project_root.glob(f"**/{pattern}"))
+                        files = index.glob(f"**/{pattern}", include_ignored=True)
                         if files:
                             matches += 1
                     else:
                         # Check for exact file match
-                        for file_path in project_root.glob("**/*"):
-                            if pattern in file_path.name or pattern in str(file_path):
+                        for entry in index.iter_files(include_ignored=True):
+                            if pattern in entry.path:
                                 matches += 1
                                 break
                 
@@ -405,21 +418,11 @@ class ProjectInference:
         Returns:
             Dictionary with structure information
         """
-        # Count files by type
-        file_counts = {}
-        
-        # Walk the directory tree
-        for root, dirs, files in os.walk(project_root):
-            # Skip hidden directories and common exclude patterns
-            dirs[:] = [d for d in dirs if not d.startswith(".") and d not in ["node_modules", "venv", "__pycache__", "build", "dist"]]
-            
-            for file in files:
-                # Get file extension
-                _, ext = os.path.splitext(file)
-                if ext:
-                    if ext not in file_counts:
-                        file_counts[ext] = 0
-                    file_counts[ext] += 1
+        index = await self._get_index(project_root)
+
+        # Count files by type (hidden, vendored and build directories are
+        # marked as ignored in the index)
+        file_counts = index.count_by_extension()
         
         # Identify main directories
         main_dirs = []
@@ -428,7 +431,7 @@ class ProjectInference:
                 main_dirs.append({
                     "name": item.name,
                     "path": str(item.relative_to(project_root)),
-                    "file_count": sum(1 for _ in item.glob("**/*") if _.is_file())
+                    "file_count": sum(1 for _ in index.iter_files(include_ignored=True, under=item.name))
                 })
         
         # Sort by file count
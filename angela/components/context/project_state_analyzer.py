@@ -16,7 +16,7 @@ from typing import Dict, Any, List, Optional, Tuple, Set, Union
 from datetime import datetime
 
 from angela.utils.logging import get_logger
-from angela.api.context import get_project_inference
+from angela.api.context import get_project_inference, get_git_state_provider
 from angela.api.execution import get_execution_engine
 
 logger = get_logger(__name__)
@@ -134,126 +134,11 @@ class ProjectStateAnalyzer:
         Returns:
             Dictionary with Git state information
         """
-        result = {
-            "is_git_repo": False,
-            "current_branch": None,
-            "has_changes": False,
-            "untracked_files": [],
-            "modified_files": [],
-            "staged_files": [],
-            "stashes": [],
-            "remote_state": {},
-            "recent_commits": []
-        }
-        
-        # Check if this is a Git repository
-        git_dir = project_root / ".git"
-        if not git_dir.exists():
-            return result
-        
-        result["is_git_repo"] = True
-        
         try:
-            execution_engine = get_execution_engine()
-            
-            # Get current branch
-            stdout, stderr, return_code = await execution_engine.execute_command(
-                command=f"cd {project_root} && git branch --show-current",
-                check_safety=False
-            )
-            
-            if return_code == 0 and stdout.strip():
-                result["current_branch"] = stdout.strip()
-            
-            # Get git status
-            stdout, stderr, return_code = await execution_engine.execute_command(
-                command=f"cd {project_root} && git status --porcelain",
-                check_safety=False
-            )
-            
-            if return_code == 0:
-                result["has_changes"] = bool(stdout.strip())
-                
-                # Parse status output
-                for line in stdout.splitlines():
-                    if not line.strip():
-                        continue
-                    
-                    # Parse status code and filename
-                    status_code = line[:2]
-                    file_path = line[3:].strip()
-                    
-                    if status_code.startswith('??'):
-                        # Untracked file
-                        result["untracked_files"].append(file_path)
-                    elif status_code.startswith('M'):
-                        # Modified file
-                        result["modified_files"].append(file_path)
-                    elif status_code.startswith('A') or status_code.startswith('R'):
-                        # Staged file (added or renamed)
-                        result["staged_files"].append(file_path)
-            
-            # Get stash list
-            stdout, stderr, return_code = await execution_engine.execute_command(
-                command=f"cd {project_root} && git stash list",
-                check_safety=False
-            )
-            
-            if return_code == 0 and stdout.strip():
-                # Parse stash list
-                for line in stdout.splitlines():
-                    match = re.match(r'stash@{(\d+)}: (.*)', line)
-                    if match:
-                        stash_id = match.group(1)
-                        stash_description = match.group(2)
-                        result["stashes"].append({
-                            "id": stash_id,
-                            "description": stash_description
-                        })
-            
-            # Check remote state
-            stdout, stderr, return_code = await execution_engine.execute_command(
-                command=f"cd {project_root} && git status -sb",
-                check_safety=False
-            )
-            
-            if return_code == 0 and stdout.strip():
-                # Parse first line for branch and tracking info
-                first_line = stdout.splitlines()[0]
-                
-                # Check for ahead/behind information
-                ahead_match = re.search(r'ahead (\d+)', first_line)
-                behind_match = re.search(r'behind (\d+)', first_line)
-                
-                result["remote_state"] = {
-                    "tracking": "origin" in first_line,
-                    "ahead": int(ahead_match.group(1)) if ahead_match else 0,
-                    "behind": int(behind_match.group(1)) if behind_match else 0
-                }
-            
-            # Get recent commits
-            stdout, stderr, return_code = await execution_engine.execute_command(
-                command=f"cd {project_root} && git log -n 5 --pretty=format:'%h|%an|%s|%cr'",
-                check_safety=False
-            )
-            
-            if return_code == 0 and stdout.strip():
-                for line in stdout.splitlines():
-                    parts = line.split('|', 3)
-                    if len(parts) == 4:
-                        commit_hash, author, message, time = parts
-                        result["recent_commits"].append({
-                            "hash": commit_hash,
-                            "author": author,
-                            "message": message,
-                            "time": time
-                        })
-            
-            return result
-            
+            return await get_git_state_provider().get_state(project_root)
         except Exception as e:
             self._logger.error(f"Error analyzing Git state: {str(e)}")
-            return result
+            return {"is_git_repo": (project_root / ".git").exists()}
     
     async def _analyze_test_status(self, project_root: Path, project_type: str) -> Dict[str, Any]:
         """
@@ -276,18 +161,21 @@ class ProjectStateAnalyzer:
             "performance_issues": []
         }
         
+        from angela.api.context import get_project_index_async
+        index = await get_project_index_async(project_root)
+        
         # Look for test frameworks based on project type
         if "python" in project_type:
             # Check for pytest
             pytest_file = project_root / "pytest.ini"
             conftest_file = project_root / "conftest.py"
             
-            if pytest_file.exists() or conftest_file.exists() or list(project_root.glob("**/test_*.py")):
+            if pytest_file.exists() or conftest_file.exists() or index.glob("**/test_*.py"):
                 result["test_framework_detected"] = True
                 result["framework"] = "pytest"
                 
                 # Count test files
-                test_files = list(project_root.glob("**/test_*.py"))
+                test_files = index.glob("**/test_*.py")
                 result["test_files_count"] = len(test_files)
                 
                 # Look for coverage file
@@ -314,12 +202,12 @@ class ProjectStateAnalyzer:
                             self._logger.error(f"Error parsing coverage XML: {str(e)}")
             
             # Check for unittest
-            elif list(project_root.glob("**/test*.py")):
+            elif index.glob("**/test*.py"):
                 result["test_framework_detected"] = True
                 result["framework"] = "unittest"
                 
                 # Count test files
-                test_files = list(project_root.glob("**/test*.py"))
+                test_files = index.glob("**/test*.py")
                 result["test_files_count"] = len(test_files)
         
         elif "node" in project_type or "javascript" in project_type or "typescript" in project_type:
@@ -332,7 +220,7 @@ class ProjectStateAnalyzer:
                 result["framework"] = "jest"
                 
                 # Count test files
-                test_files = list(project_root.glob("**/*.test.js")) + list(project_root.glob("**/*.test.ts"))
+                test_files = index.glob("**/*.test.js") + index.glob("**/*.test.ts")
                 result["test_files_count"] = len(test_files)
                 
                 # Look for coverage directory
@@ -359,17 +247,17 @@ class ProjectStateAnalyzer:
                 result["framework"] = "mocha"
                 
                 # Count test files
-                test_files = list(project_root.glob("**/test/**/*.js")) + list(project_root.glob("**/test/**/*.ts"))
+                test_files = index.glob("**/test/**/*.js") + index.glob("**/test/**/*.ts")
                 result["test_files_count"] = len(test_files)
         
         elif "java" in project_type:
             # Check for JUnit
-            if list(project_root.glob("**/src/test/**/*.java")):
+            if index.glob("**/src/test/**/*.java"):
                 result["test_framework_detected"] = True
                 result["framework"] = "junit"
                 
                 # Count test files
-                test_files = list(project_root.glob("**/src/test/**/*.java"))
+                test_files = index.glob("**/src/test/**/*.java")
                 result["test_files_count"] = len(test_files)
         
         return result
@@ -1152,14 +1040,17 @@ class ProjectStateAnalyzer:
         # Result list
         todo_items = []
         
+        from angela.api.context import get_project_index_async
+        index = await get_project_index_async(project_root)
+        
         # Find files to search
         for ext in extensions:
             files = []
-            for file in project_root.glob(f"**/*{ext}"):
+            for entry in index.iter_files(extensions=[ext]):
                 # Skip excluded directories
-                if any(excl in str(file) for excl in exclude_patterns):
+                if any(excl in entry.path for excl in exclude_patterns):
                     continue
-                files.append(file)
+                files.append(index.absolute(entry))
             
             # Limit to 1000 files to avoid excessive processing
             if len(files) > 1000:
@@ -1230,112 +1121,7 @@ class ProjectStateAnalyzer:
         result = dict(git_state)
         
         try:
-            execution_engine = get_execution_engine()
-            
-            # Get the git log graph
-            stdout, stderr, return_code = await execution_engine.execute_command(
-                command=f"cd {path_obj} && git log --graph --oneline --decorate -n 10",
-                check_safety=False
-            )
-            
-            if return_code == 0 and stdout.strip():
-                result["log_graph"] = stdout.strip()
-            
-            # Get branch info
-            stdout, stderr, return_code = await execution_engine.execute_command(
-                command=f"cd {path_obj} && git branch -vv",
-                check_safety=False
-            )
-            
-            if return_code == 0 and stdout.strip():
-                branches = []
-                for line in stdout.splitlines():
-                    if not line.strip():
-                        continue
-                    
-                    # Parse branch line
-                    is_current = line.startswith('*')
-                    branch_line = line[2:].strip()
-                    
-                    # Extract branch name and info
-                    parts = branch_line.split(' ', 1)
-                    if len(parts) == 2:
-                        branch_name = parts[0]
-                        branch_info = parts[1].strip()
-                        
-                        # Extract tracking info
-                        tracking_match = re.search(r'\[(.*?)\]', branch_info)
-                        tracking_info = tracking_match.group(1) if tracking_match else None
-                        
-                        branches.append({
-                            "name": branch_name,
-                            "is_current": is_current,
-                            "tracking_info": tracking_info,
-                            "info": branch_info
-                        })
-                
-                result["branches"] = branches
-            
-            # Get remote info
-            stdout, stderr, return_code = await execution_engine.execute_command(
-                command=f"cd {path_obj} && git remote -v",
-                check_safety=False
-            )
-            
-            if return_code == 0 and stdout.strip():
-                remotes = {}
-                for line in stdout.splitlines():
-                    if not line.strip():
-                        continue
-                    
-                    # Parse remote line
-                    parts = line.split()
-                    if len(parts) >= 2:
-                        remote_name = parts[0]
-                        remote_url = parts[1]
-                        remote_type = parts[2][1:-1] if len(parts) >= 3 else "fetch"
-                        
-                        if remote_name not in remotes:
-                            remotes[remote_name] = {}
-                        
-                        remotes[remote_name][remote_type] = remote_url
-                
-                result["remotes"] = remotes
-            
-            # Get git config for the repo
-            stdout, stderr, return_code = await execution_engine.execute_command(
-                command=f"cd {path_obj} && git config --local --list",
-                check_safety=False
-            )
-            
-            if return_code == 0 and stdout.strip():
-                git_config = {}
-                for line in stdout.splitlines():
-                    if not line.strip() or '=' not in line:
-                        continue
-                    
-                    key, value = line.split('=', 1)
-                    git_config[key.strip()] = value.strip()
-                
-                # Extract useful config values
-                config_extract = {}
-                
-                # User info
-                if "user.name" in git_config:
-                    config_extract["user.name"] = git_config["user.name"]
-                if "user.email" in git_config:
-                    config_extract["user.email"] = git_config["user.email"]
-                
-                # Branch default
-                if "init.defaultBranch" in git_config:
-                    config_extract["default_branch"] = git_config["init.defaultBranch"]
-                
-                # Pull strategy
-                if "pull.rebase" in git_config:
-                    config_extract["pull_strategy"] = "rebase" if git_config["pull.rebase"] == "true" else "merge"
-                
-                result["config"] = config_extract
-            
+            result.update(await get_git_state_provider().get_details(path_obj))
             return result
             
         except Exception as e:
@@ -16,7 +16,7 @@ from datetime import datetime
 from angela.utils.logging import get_logger
 from angela.api.context import get_context_manager, get_file_activity_tracker
 from angela.api.context import get_project_state_analyzer 
-from angela.api.ai import get_semantic_analyzer
+from angela.api.ai import get_semantic_analyzer, get_symbol_index_class
 from angela.core.registry import registry
 
 logger = get_logger(__name__)
@@ -46,8 +46,8 @@ class SemanticContextManager:
         # Project module cache - maps project root to module info
         self._project_modules = {}
         
-        # Map of file paths to functions and classes
-        self._entity_map = {}  # Maps "function_name" -> file_path
+        # Symbol index of the analyzed modules, per project root
+        self._symbol_indexes = {}
         self._recent_entity_usages = []  # List of recently used entities
         
         # Register this service
@@ -133,6 +133,21 @@ class SemanticContextManager:
         finally:
             self._active_analyses.remove(project_root)
     
+    def handle_file_changes(self, batch) -> None:
+        """
+        Invalidate semantic caches affected by a file watcher change batch.
+        
+        Args:
+            batch: A FileChangeBatch from the file watcher
+        """
+        get_semantic_analyzer().invalidate_files(list(batch.modified | batch.deleted))
+        
+        # Let the next refresh re-analyze projects containing changed files
+        for project_root in list(self._last_analysis_time):
+            root = Path(project_root)
+            if root == batch.root or root in batch.root.parents or batch.root in root.parents:
+                del self._last_analysis_time[project_root]
+    
     async def _analyze_key_files(self, project_root: Path) -> Dict[str, Any]:
         """
         Analyze the key files in the project.
@@ -159,8 +174,9 @@ class SemanticContextManager:
             except Exception as e:
                 self._logger.error(f"Error analyzing file {file_path}: {str(e)}")
         
-        # Update the entity map
-        self._update_entity_map(modules)
+        # Index the entities of this analysis
+        SymbolIndex = get_symbol_index_class()
+        self._symbol_indexes[str(project_root)] = SymbolIndex(modules, project_root)
         
         # Store the modules for this project
         self._project_modules[str(project_root)] = modules
@@ -180,26 +196,29 @@ class SemanticContextManager:
             "key_files": [str(f) for f in key_files[:10]]  # Include only the first 10 for brevity
         }
     
-    def _update_entity_map(self, modules: Dict[str, Any]) -> None:
+    def _lookup_entity(self, entity_name: str, project_root: Optional[Union[str, Path]] = None):
         """
-        Update the entity map with the analyzed modules.
+        Find the function, class or method with a qualified name.
         
         Args:
-            modules: Dictionary of modules
-        """
-        for file_path, module in modules.items():
-            # Add functions
-            for func_name, func in module.functions.items():
-                self._entity_map[func_name] = file_path
+            entity_name: Name of a function or class, or "Class.method"
+            project_root: Only look in this project; all analyzed projects if None
             
-            # Add classes
-            for class_name, cls in module.classes.items():
-                self._entity_map[class_name] = file_path
-                
-                # Add methods with class prefix
-                for method_name in cls.methods:
-                    qualified_name = f"{class_name}.{method_name}"
-                    self._entity_map[qualified_name] = file_path
+        Returns:
+            The entity's Symbol, or None if it is not known
+        """
+        if project_root is not None:
+            indexes = [self._symbol_indexes.get(str(project_root))]
+        else:
+            indexes = list(self._symbol_indexes.values())
+        
+        for index in indexes:
+            if index is None:
+                continue
+            for symbol in index.definitions(entity_name, kinds=("function", "class", "method")):
+                if symbol.qualified_name == entity_name:
+                    return symbol
+        return None
     
     async def _identify_key_files(self, project_root: Path) -> List[Path]:
         """
@@ -242,10 +261,11 @@ class SemanticContextManager:
             "index.ts", "App.tsx", "App.jsx", "Main.java", "Program.cs"
         ]
         
+        from angela.api.context import get_project_index_async
+        index = await get_project_index_async(project_root)
+        
         for pattern in entry_point_patterns:
-            for file_path in project_root.glob(f"**/{pattern}"):
-                if file_path.exists() and file_path.is_file():
-                    key_files.add(file_path)
+            key_files.update(index.find_by_name(pattern))
         
         # Find config and initialization files
         config_patterns = [
@@ -255,9 +275,7 @@ class SemanticContextManager:
         ]
         
         for pattern in config_patterns:
-            for file_path in project_root.glob(f"**/{pattern}"):
-                if file_path.exists() and file_path.is_file():
-                    key_files.add(file_path)
+            key_files.update(index.find_by_name(pattern))
         
         # Limit to 100 files to avoid excessive analysis
         return list(key_files)[:100]
@@ -358,9 +376,11 @@ class SemanticContextManager:
         if not entity_name:
             return
         
-        # If file_path is not provided, try to find it from the entity map
-        if not file_path and entity_name in self._entity_map:
-            file_path = Path(self._entity_map[entity_name])
+        # If file_path is not provided, try to find it from the symbol indexes
+        if not file_path:
+            symbol = self._lookup_entity(entity_name)
+            if symbol:
+                file_path = Path(symbol.filename)
         
         if not file_path:
             return
@@ -405,44 +425,32 @@ class SemanticContextManager:
         # Ensure the context is refreshed
         await self.refresh_context()
         
-        # Check if the entity exists in our map
-        if entity_name not in self._entity_map:
+        symbol = self._lookup_entity(entity_name, project_root)
+        if not symbol:
             return None
         
-        file_path = self._entity_map[entity_name]
+        file_path = symbol.filename
         
         # Track this entity access
         await self.track_entity_access(entity_name, Path(file_path))
         
-        # Get the module
-        if str(project_root) not in self._project_modules or file_path not in self._project_modules[str(project_root)]:
-            return None
-        
-        module = self._project_modules[str(project_root)][file_path]
-        
-        # Check if it's a function, class, or class method
-        if "." in entity_name:
-            # Class method
-            class_name, method_name = entity_name.split(".", 1)
-            
-            if class_name in module.classes and method_name in module.classes[class_name].methods:
-                method = module.classes[class_name].methods[method_name]
-                return {
-                    "type": "method",
-                    "name": method_name,
-                    "class_name": class_name,
-                    "file_path": file_path,
-                    "line_start": method.line_start,
-                    "line_end": method.line_end,
-                    "params": method.params,
-                    "docstring": method.docstring,
-                    "return_type": method.return_type,
-                    "complexity": method.complexity
-                }
+        if symbol.kind == "method":
+            method = symbol.entity
+            return {
+                "type": "method",
+                "name": method.name,
+                "class_name": symbol.class_name,
+                "file_path": file_path,
+                "line_start": method.line_start,
+                "line_end": method.line_end,
+                "params": method.params,
+                "docstring": method.docstring,
+                "return_type": method.return_type,
+                "complexity": method.complexity
+            }
         
-        elif entity_name in module.functions:
-            # Function
-            function = module.functions[entity_name]
+        elif symbol.kind == "function":
+            function = symbol.entity
             return {
                 "type": "function",
                 "name": entity_name,
@@ -456,22 +464,18 @@ class SemanticContextManager:
                 "called_functions": function.called_functions
             }
         
-        elif entity_name in module.classes:
-            # Class
-            cls = module.classes[entity_name]
-            return {
-                "type": "class",
-                "name": entity_name,
-                "file_path": file_path,
-                "line_start": cls.line_start,
-                "line_end": cls.line_end,
-                "docstring": cls.docstring,
-                "base_classes": cls.base_classes,
-                "methods": list(cls.methods.keys()),
-                "attributes": list(cls.attributes.keys())
-            }
-        
-        return None
+        cls = symbol.entity
+        return {
+            "type": "class",
+            "name": entity_name,
+            "file_path": file_path,
+            "line_start": cls.line_start,
+            "line_end": cls.line_end,
+            "docstring": cls.docstring,
+            "base_classes": cls.base_classes,
+            "methods": list(cls.methods.keys()),
+            "attributes": list(cls.attributes.keys())
+        }
     
     async def find_related_code(self, query: str, limit: int = 5) -> List[Dict[str, Any]]:
         """
@@ -494,88 +498,25 @@ class SemanticContextManager:
         # Ensure the context is refreshed
         await self.refresh_context()
         
-        if str(project_root) not in self._project_modules:
+        index = self._symbol_indexes.get(str(project_root))
+        if index is None:
             return []
         
-        # Simple keyword matching for now
+        # Keyword matching against entity names and docstrings
         # In a real implementation, you might use embedding-based similarity
-        keywords = query.lower().split()
         matches = []
-        
-        # Search through all modules
-        for file_path, module in self._project_modules[str(project_root)].items():
-            # Search functions
-            for func_name, func in module.functions.items():
-                score = self._calculate_match_score(func, keywords)
-                if score > 0:
-                    matches.append({
-                        "entity_name": func_name,
-                        "type": "function",
-                        "file_path": file_path,
-                        "score": score,
-                        "preview": func.docstring[:100] + "..." if func.docstring and len(func.docstring) > 100 else func.docstring,
-                        "line": func.line_start
-                    })
-            
-            # Search classes
-            for class_name, cls in module.classes.items():
-                score = self._calculate_match_score(cls, keywords)
-                if score > 0:
-                    matches.append({
-                        "entity_name": class_name,
-                        "type": "class",
-                        "file_path": file_path,
-                        "score": score,
-                        "preview": cls.docstring[:100] + "..." if cls.docstring and len(cls.docstring) > 100 else cls.docstring,
-                        "line": cls.line_start
-                    })
-                
-                # Search class methods
-                for method_name, method in cls.methods.items():
-                    score = self._calculate_match_score(method, keywords)
-                    if score > 0:
-                        matches.append({
-                            "entity_name": f"{class_name}.{method_name}",
-                            "type": "method",
-                            "file_path": file_path,
-                            "score": score,
-                            "preview": method.docstring[:100] + "..." if method.docstring and len(method.docstring) > 100 else method.docstring,
-                            "line": method.line_start
-                        })
-        
-        # Sort by score
-        matches.sort(key=lambda x: x["score"], reverse=True)
-        
-        # Return top results
-        return matches[:limit]
-    
-    def _calculate_match_score(self, entity: Any, keywords: List[str]) -> float:
-        """
-        Calculate a match score between an entity and keywords.
-        
-        Args:
-            entity: Code entity (function, class, etc.)
-            keywords: List of keywords to match
-            
-        Returns:
-            Score value where higher is better
-        """
-        score = 0.0
-        
-        # Check entity name
-        name_words = entity.name.lower().split('_')
-        for word in name_words:
-            for keyword in keywords:
-                if keyword in word:
-                    score += 1.0 if keyword == word else 0.5
-        
-        # Check docstring
-        if entity.docstring:
-            for keyword in keywords:
-                if keyword in entity.docstring.lower():
-                    score += 0.3
-        
-        return score
+        for symbol, score in index.search(query.lower().split(), limit):
+            docstring = symbol.entity.docstring
+            matches.append({
+                "entity_name": symbol.qualified_name,
+                "type": symbol.kind,
+                "file_path": symbol.filename,
+                "score": score,
+                "preview": docstring[:100] + "..." if docstring and len(docstring) > 100 else docstring,
+                "line": symbol.line_start
+            })
+        
+        return matches
     
     async def get_recent_entity_usages(self, limit: int = 10) -> List[Dict[str, Any]]:
         """
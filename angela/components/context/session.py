@@ -220,6 +220,20 @@ class SessionManager:
         self.refresh_session()
         return self._current_session.get_context_dict()
     
+    def load_context(self, data: Dict[str, Any]) -> None:
+        """
+        Replace the current session with one exported by ``get_context``.
+
+        Used to continue the session held by the resident daemon.
+
+        Args:
+            data: A dictionary produced by ``get_context``
+        """
+        try:
+            self._current_session = SessionMemory.from_dict(data)
+        except (KeyError, TypeError, ValueError) as e:
+            self._logger.debug(f"Ignoring invalid session data: {str(e)}")
+
     def clear_session(self) -> None:
         """Clear the current session."""
         self._current_session = SessionMemory()
@@ -0,0 +1,653 @@
+# angela/components/execution/backup_store.py
+"""
+Content-addressed, deduplicating store for rollback backups.
+
+A backup is a snapshot manifest: a small JSON file listing the entries of
+the backed-up file or directory, with the mode, modification time and
+content of each file. File content is split into content-defined chunks
+(cut after a line whose hash matches a mask, within size bounds), and each
+chunk is stored once, compressed, under its SHA-256 digest. Editing a large
+file and backing it up again therefore only stores the chunks around the
+change.
+
+Large files are linked into the store instead of chunked when that costs
+nothing: a reflink (copy-on-write clone) where the filesystem supports it,
+or a hardlink for files that are about to be deleted anyway. A hardlinked
+object must not keep sharing its inode with a file that survived: once the
+deletion is done, finish_detach() replaces every object that is still
+shared by a private copy.
+
+Retention is by age and number of snapshots, except for snapshots that
+recorded operations still reference: those are named by keep sources (the
+rollback manager's operation log) and survive until the operation is gone.
+Garbage collection counts the references to every object from the remaining
+manifests and removes the objects nobody references.
+"""
+import hashlib
+import io
+import json
+import os
+import shutil
+import stat
+import threading
+import time
+import uuid
+import zlib
+from collections import Counter
+from datetime import datetime
+from pathlib import Path
+from typing import Any, BinaryIO, Callable, Dict, Iterable, Iterator, List, Optional, Set
+
+from angela.utils.logging import get_logger
+
+try:
+    import fcntl
+    _FCNTL_AVAILABLE = True
+except ImportError:
+    fcntl = None
+    _FCNTL_AVAILABLE = False
+
+logger = get_logger(__name__)
+
+MANIFEST_VERSION = 1
+
+# ioctl request cloning one file's extents into another (Linux FICLONE)
+FICLONE = 0x40049409
+
+# Chunk payload markers
+_COMPRESSED = b"z"
+_STORED = b"s"
+
+READ_SIZE = 1024 * 1024
+
+# Objects this young are never collected, so a snapshot being written by
+# another process keeps the chunks it is about to reference
+GC_GRACE_SECONDS = 3600
+
+
+class BackupStoreError(Exception):
+    """A snapshot cannot be read or restored."""
+
+
+def find_chunk_boundary(data: bytes, min_size: int, max_size: int, mask: int) -> int:
+    """
+    Find the end of the first chunk of ``data``.
+
+    The chunk ends after the first line, past ``min_size`` bytes, whose
+    CRC-32 has no bits of ``mask`` set. Boundaries depend on line content
+    rather than offsets, so an insertion only changes the chunks around it.
+    Data without suitable lines is cut at ``max_size``.
+
+    Args:
+        data: Data starting at a chunk boundary
+        min_size: Minimum chunk size
+        max_size: Maximum chunk size
+        mask: Boundary mask; the average chunk is about ``mask + 1`` lines past the minimum
+
+    Returns:
+        Length of the first chunk
+    """
+    limit = min(len(data), max_size)
+    view = memoryview(data)
+    pos = 0
+    while True:
+        newline = data.find(b"\n", pos, limit)
+        if newline < 0:
+            return limit
+        end = newline + 1
+        if end >= min_size and zlib.crc32(view[pos:end]) & mask == 0:
+            return end
+        pos = end
+
+
+class BackupStore:
+    """Chunked, compressed, deduplicating snapshot store."""
+
+    def __init__(
+        self,
+        root: Path,
+        min_chunk_size: int = 16 * 1024,
+        max_chunk_size: int = 256 * 1024,
+        boundary_mask: int = 0x3FF,
+        link_threshold: int = 1024 * 1024,
+        compression_level: int = 1,
+        retention_days: float = 30,
+        max_snapshots: int = 1000,
+        gc_every: int = 50
+    ):
+        """
+        Initialize the store.
+
+        Args:
+            root: Store directory
+            min_chunk_size: Minimum chunk size in bytes
+            max_chunk_size: Maximum chunk size in bytes
+            boundary_mask: Content-defined boundary mask
+            link_threshold: Files at least this large are reflinked or hardlinked when possible
+            compression_level: zlib level for chunks
+            retention_days: Snapshots older than this are collected (0 keeps them)
+            max_snapshots: Only this many of the newest snapshots are kept (0 for no limit)
+            gc_every: Collect garbage after this many new snapshots (0 to disable)
+        """
+        self.root = Path(root)
+        self.objects_dir = self.root / "objects"
+        self.manifests_dir = self.root / "manifests"
+        self.min_chunk_size = min_chunk_size
+        self.max_chunk_size = max(max_chunk_size, min_chunk_size)
+        self.boundary_mask = boundary_mask
+        self.link_threshold = link_threshold
+        self.compression_level = compression_level
+        self.retention_days = retention_days
+        self.max_snapshots = max_snapshots
+        self.gc_every = gc_every
+        self._lock = threading.RLock()
+        self._snapshots_since_gc = 0
+        # Callables naming snapshots that must survive the retention policy
+        self._keep_sources: List[Callable[[], Iterable[Path]]] = []
+        # Devices on which reflinking failed
+        self._no_reflink: Set[int] = set()
+
+    # --- Snapshots ---
+
+    def snapshot(self, path: Path, detach: bool = False) -> Path:
+        """
+        Back up a file or directory.
+
+        Args:
+            path: File or directory to back up
+            detach: The path is about to be deleted, so large files may be hardlinked;
+                call finish_detach() with the manifest once the deletion was attempted
+
+        Returns:
+            Path of the snapshot manifest, which identifies the backup
+        """
+        path = Path(path)
+        with self._lock:
+            self.objects_dir.mkdir(parents=True, exist_ok=True)
+            self.manifests_dir.mkdir(parents=True, exist_ok=True)
+
+            st = os.lstat(path)
+            if stat.S_ISDIR(st.st_mode):
+                kind = "directory"
+                entries = list(self._directory_entries(path, detach))
+            else:
+                kind = "file"
+                entries = [self._file_entry(path, st, "", detach)]
+
+            manifest_path = self._write_manifest(kind, path, stat.S_IMODE(st.st_mode), entries)
+            logger.debug(f"Created backup of {path} at {manifest_path}")
+            return manifest_path
+
+    def snapshot_content(self, data: bytes, source: Path, mode: int = 0o644) -> Path:
+        """
+        Back up file content that is no longer on disk.
+
+        Args:
+            data: Content to back up
+            source: File the content belongs to, where it is restored by default
+            mode: Permission bits to restore the file with
+
+        Returns:
+            Path of the snapshot manifest
+        """
+        source = Path(source)
+        with self._lock:
+            self.objects_dir.mkdir(parents=True, exist_ok=True)
+            self.manifests_dir.mkdir(parents=True, exist_ok=True)
+            entry = {
+                "path": "",
+                "type": "file",
+                "mode": mode,
+                "mtime": time.time(),
+                "size": len(data),
+                "chunks": [self._put_chunk(chunk) for chunk in self._iter_chunks(io.BytesIO(data))],
+            }
+            return self._write_manifest("file", source, mode, [entry])
+
+    def _write_manifest(self, kind: str, source: Path, mode: int, entries: List[Dict[str, Any]]) -> Path:
+        manifest = {
+            "version": MANIFEST_VERSION,
+            "kind": kind,
+            "source": str(source),
+            "created": datetime.now().isoformat(),
+            "mode": mode,
+            "entries": entries,
+        }
+        name = f"{datetime.now().strftime('%Y%m%d_%H%M%S_%f')}_{uuid.uuid4().hex[:8]}_{source.name}.json"
+        manifest_path = self.manifests_dir / name
+        self._write_atomic(manifest_path, json.dumps(manifest).encode("utf-8"))
+
+        self._snapshots_since_gc += 1
+        if self.gc_every and self._snapshots_since_gc >= self.gc_every:
+            self.gc()
+        return manifest_path
+
+    def is_manifest(self, path: Path) -> bool:
+        """Check whether a backup path is a snapshot of this store."""
+        path = Path(path)
+        return path.suffix == ".json" and path.parent == self.manifests_dir
+
+    def load_manifest(self, manifest_path: Path) -> Dict[str, Any]:
+        """
+        Read a snapshot manifest.
+
+        Args:
+            manifest_path: Path returned by ``snapshot``
+
+        Returns:
+            The manifest
+        """
+        try:
+            with open(manifest_path, "rb") as f:
+                return json.load(f)
+        except FileNotFoundError:
+            raise BackupStoreError(f"Backup not found: {manifest_path}")
+        except ValueError as e:
+            raise BackupStoreError(f"Corrupt backup manifest {manifest_path}: {str(e)}")
+
+    def restore(self, manifest_path: Path, destination: Optional[Path] = None) -> Path:
+        """
+        Restore a snapshot, replacing whatever is at the destination.
+
+        The snapshot is rebuilt next to the destination and then renamed
+        over it, so a failed restore leaves the destination untouched.
+
+        Args:
+            manifest_path: Path returned by ``snapshot``
+            destination: Where to restore; defaults to the original location
+
+        Returns:
+            The restored path
+        """
+        manifest = self.load_manifest(manifest_path)
+        destination = Path(destination or manifest["source"])
+        destination.parent.mkdir(parents=True, exist_ok=True)
+        staging = destination.with_name(f".{destination.name}.{uuid.uuid4().hex[:8]}.restore")
+
+        try:
+            if manifest["kind"] == "directory":
+                self._restore_directory(manifest, staging)
+                if destination.is_dir() and not destination.is_symlink():
+                    shutil.rmtree(destination)
+            else:
+                self._restore_entry(manifest["entries"][0], staging)
+                if destination.is_dir() and not destination.is_symlink():
+                    shutil.rmtree(destination)
+            os.replace(staging, destination)
+        except BaseException:
+            if staging.is_dir() and not staging.is_symlink():
+                shutil.rmtree(staging, ignore_errors=True)
+            elif os.path.lexists(staging):
+                staging.unlink()
+            raise
+
+        logger.debug(f"Restored {destination} from {manifest_path}")
+        return destination
+
+    def _directory_entries(self, root: Path, detach: bool) -> Iterator[Dict[str, Any]]:
+        for dirpath, dirnames, filenames in os.walk(root):
+            dirnames.sort()
+            base = Path(dirpath)
+            for name in list(dirnames):
+                child = base / name
+                rel = child.relative_to(root).as_posix()
+                if child.is_symlink():
+                    # os.walk does not descend into symlinked directories
+                    yield {"path": rel, "type": "symlink", "target": os.readlink(child)}
+                else:
+                    yield {"path": rel, "type": "dir", "mode": stat.S_IMODE(os.lstat(child).st_mode)}
+            for name in sorted(filenames):
+                child = base / name
+                rel = child.relative_to(root).as_posix()
+                st = os.lstat(child)
+                if stat.S_ISLNK(st.st_mode):
+                    yield {"path": rel, "type": "symlink", "target": os.readlink(child)}
+                elif stat.S_ISREG(st.st_mode):
+                    yield self._file_entry(child, st, rel, detach)
+                else:
+                    logger.debug(f"Not backing up special file {child}")
+
+    def _file_entry(self, path: Path, st: os.stat_result, rel: str, detach: bool) -> Dict[str, Any]:
+        if stat.S_ISLNK(st.st_mode):
+            return {"path": rel, "type": "symlink", "target": os.readlink(path)}
+
+        entry: Dict[str, Any] = {
+            "path": rel,
+            "type": "file",
+            "mode": stat.S_IMODE(st.st_mode),
+            "mtime": st.st_mtime,
+            "size": st.st_size,
+        }
+        if st.st_size >= self.link_threshold:
+            digest = self._hash_file(path)
+            if self._link_object(path, digest, st, detach):
+                entry["object"] = digest
+                return entry
+
+        with open(path, "rb") as f:
+            entry["chunks"] = [self._put_chunk(chunk) for chunk in self._iter_chunks(f)]
+        return entry
+
+    # --- Objects ---
+
+    def _object_path(self, digest: str, linked: bool = False) -> Path:
+        return self.objects_dir / digest[:2] / (digest + (".raw" if linked else ""))
+
+    def _iter_chunks(self, stream: BinaryIO) -> Iterator[bytes]:
+        """Split a stream into content-defined chunks."""
+        buffer = b""
+        eof = False
+        while True:
+            if not eof and len(buffer) < self.max_chunk_size:
+                block = stream.read(READ_SIZE)
+                eof = not block
+                buffer += block
+                continue
+            if not buffer:
+                return
+            cut = find_chunk_boundary(buffer, self.min_chunk_size, self.max_chunk_size, self.boundary_mask)
+            yield buffer[:cut]
+            buffer = buffer[cut:]
+
+    def _put_chunk(self, chunk: bytes) -> str:
+        """Store a chunk unless it is already present and return its digest."""
+        digest = hashlib.sha256(chunk).hexdigest()
+        path = self._object_path(digest)
+        if self._touch(path):
+            return digest
+        compressed = zlib.compress(chunk, self.compression_level)
+        payload = _COMPRESSED + compressed if len(compressed) < len(chunk) else _STORED + chunk
+        path.parent.mkdir(exist_ok=True)
+        self._write_atomic(path, payload)
+        return digest
+
+    def _get_chunk(self, digest: str) -> bytes:
+        try:
+            payload = self._object_path(digest).read_bytes()
+        except FileNotFoundError:
+            raise BackupStoreError(f"Backup chunk missing: {digest}")
+        data = zlib.decompress(payload[1:]) if payload[:1] == _COMPRESSED else payload[1:]
+        if hashlib.sha256(data).hexdigest() != digest:
+            raise BackupStoreError(f"Backup chunk corrupt: {digest}")
+        return data
+
+    def _link_object(self, path: Path, digest: str, st: os.stat_result, detach: bool) -> bool:
+        """Store a whole file by reflink, or by hardlink when it is being deleted."""
+        target = self._object_path(digest, linked=True)
+        if self._unshare(target, digest) and self._touch(target):
+            return True
+        target.parent.mkdir(exist_ok=True)
+        tmp_path = target.with_name(f"{target.name}.{uuid.uuid4().hex[:8]}.tmp")
+        if self._reflink(path, tmp_path, st.st_dev):
+            os.replace(tmp_path, target)
+            return True
+        # Deleting a file with other links frees nothing, so it would stay shared
+        if detach and st.st_nlink == 1:
+            try:
+                os.link(path, tmp_path)
+                os.replace(tmp_path, target)
+                return True
+            except OSError:
+                pass
+        return False
+
+    def _reflink(self, source: Path, target: Path, device: Optional[int] = None) -> bool:
+        """Clone a file copy-on-write if the filesystem supports it."""
+        if not _FCNTL_AVAILABLE or device in self._no_reflink:
+            return False
+        try:
+            with open(source, "rb") as src, open(target, "wb") as dst:
+                fcntl.ioctl(dst.fileno(), FICLONE, src.fileno())
+            return True
+        except OSError:
+            if device is not None:
+                self._no_reflink.add(device)
+            try:
+                target.unlink()
+            except OSError:
+                pass
+            return False
+
+    def finish_detach(self, manifest_path: Path) -> None:
+        """
+        Stop sharing hardlinked objects with files that were not deleted.
+
+        Call this after trying to delete the path of a ``detach=True``
+        snapshot. Objects whose deletion went through are left as they are;
+        those still linked to a file outside the store are replaced by a
+        copy, so later edits of the file cannot change the backup.
+
+        Args:
+            manifest_path: Manifest returned by snapshot()
+        """
+        with self._lock:
+            for entry in self.load_manifest(manifest_path).get("entries", []):
+                if "object" in entry:
+                    self._unshare(self._object_path(entry["object"], linked=True), entry["object"])
+
+    def _unshare(self, path: Path, digest: str) -> bool:
+        """
+        Give a linked object an inode of its own.
+
+        Returns:
+            True if the object exists and is private afterwards; an object
+            whose content no longer matches its digest is removed
+        """
+        try:
+            if os.stat(path).st_nlink == 1:
+                return True
+        except FileNotFoundError:
+            return False
+        tmp_path = path.with_name(f"{path.name}.{uuid.uuid4().hex[:8]}.tmp")
+        try:
+            if not self._reflink(path, tmp_path):
+                shutil.copyfile(path, tmp_path)
+            if self._hash_file(tmp_path) != digest:
+                # The file it was shared with has been modified since
+                logger.warning(f"Discarding backup object {digest[:12]} modified through a hardlink")
+                tmp_path.unlink()
+                path.unlink(missing_ok=True)
+                return False
+            os.replace(tmp_path, path)
+            return True
+        except OSError as e:
+            logger.warning(f"Could not unshare backup object {digest[:12]}: {str(e)}")
+            try:
+                tmp_path.unlink()
+            except OSError:
+                pass
+            return False
+
+    @staticmethod
+    def _touch(path: Path) -> bool:
+        """Refresh an existing object's mtime, which protects it from collection."""
+        try:
+            os.utime(path)
+            return True
+        except FileNotFoundError:
+            return False
+
+    @staticmethod
+    def _hash_file(path: Path) -> str:
+        digest = hashlib.sha256()
+        with open(path, "rb") as f:
+            for block in iter(lambda: f.read(READ_SIZE), b""):
+                digest.update(block)
+        return digest.hexdigest()
+
+    @staticmethod
+    def _write_atomic(path: Path, data: bytes) -> None:
+        tmp_path = path.with_name(f"{path.name}.{uuid.uuid4().hex[:8]}.tmp")
+        with open(tmp_path, "wb") as f:
+            f.write(data)
+        os.replace(tmp_path, path)
+
+    # --- Restore ---
+
+    def _restore_directory(self, manifest: Dict[str, Any], target: Path) -> None:
+        target.mkdir()
+        directories = [(target, manifest.get("mode"))]
+        for entry in manifest["entries"]:
+            path = target / entry["path"]
+            if entry["type"] == "dir":
+                path.mkdir()
+                directories.append((path, entry.get("mode")))
+            else:
+                self._restore_entry(entry, path)
+        # Restore directory permissions last, in case they are read-only
+        for path, mode in reversed(directories):
+            if mode is not None:
+                os.chmod(path, mode)
+
+    def _restore_entry(self, entry: Dict[str, Any], path: Path) -> None:
+        if entry["type"] == "symlink":
+            os.symlink(entry["target"], path)
+            return
+
+        if "object" in entry:
+            source = self._object_path(entry["object"], linked=True)
+            if not source.exists():
+                raise BackupStoreError(f"Backup object missing: {entry['object']}")
+            # Never hardlink back out of the store: editing the restored file would change the backup
+            if not self._reflink(source, path):
+                shutil.copyfile(source, path)
+        else:
+            with open(path, "wb") as f:
+                for digest in entry["chunks"]:
+                    f.write(self._get_chunk(digest))
+        os.chmod(path, entry["mode"])
+        os.utime(path, (entry["mtime"], entry["mtime"]))
+
+    # --- Retention ---
+
+    def add_keep_source(self, source: Callable[[], Iterable[Path]]) -> None:
+        """
+        Register a callable naming snapshots that are still referenced.
+
+        Every collection keeps the manifests it returns regardless of the
+        retention policy.
+
+        Args:
+            source: Returns the snapshot paths to keep
+        """
+        with self._lock:
+            self._keep_sources.append(source)
+
+    def gc(self, keep: Iterable[Path] = ()) -> Dict[str, int]:
+        """
+        Apply the retention policy and remove unreferenced objects.
+
+        Args:
+            keep: Manifests to keep regardless of the retention policy, in
+                addition to those named by the keep sources
+
+        Returns:
+            Counts of removed manifests and objects, and bytes freed
+        """
+        with self._lock:
+            self._snapshots_since_gc = 0
+            if not self.manifests_dir.exists():
+                return {"manifests_removed": 0, "objects_removed": 0, "bytes_freed": 0}
+
+            keep_names = {Path(path).name for path in keep}
+            retain_all = False
+            for source in self._keep_sources:
+                try:
+                    keep_names.update(Path(path).name for path in source())
+                except Exception as e:
+                    # Without the full list any expired snapshot may still be needed
+                    logger.warning(f"Keeping all snapshots, referenced snapshots unknown: {str(e)}")
+                    retain_all = True
+            now = time.time()
+            manifests = sorted(self.manifests_dir.glob("*.json"), key=lambda p: p.name, reverse=True)
+            live: List[Path] = []
+            manifests_removed = 0
+            for position, manifest_path in enumerate(manifests):
+                expired = bool(self.max_snapshots) and position >= self.max_snapshots
+                if self.retention_days:
+                    try:
+                        age = now - manifest_path.stat().st_mtime
+                    except FileNotFoundError:
+                        continue
+                    expired = expired or age > self.retention_days * 86400
+                if expired and not retain_all and manifest_path.name not in keep_names:
+                    manifest_path.unlink(missing_ok=True)
+                    manifests_removed += 1
+                else:
+                    live.append(manifest_path)
+
+            references = self._count_references(live)
+
+            objects_removed = 0
+            bytes_freed = 0
+            for object_path in self.objects_dir.glob("*/*"):
+                digest = object_path.name.split(".")[0]
+                if digest in references:
+                    continue
+                try:
+                    st = object_path.stat()
+                    if now - st.st_mtime < GC_GRACE_SECONDS:
+                        continue
+                    object_path.unlink()
+                except FileNotFoundError:
+                    continue
+                objects_removed += 1
+                bytes_freed += st.st_size
+
+            if manifests_removed or objects_removed:
+                logger.info(f"Backup store GC removed {manifests_removed} snapshots and "
+                            f"{objects_removed} objects ({bytes_freed} bytes)")
+            return {
+                "manifests_removed": manifests_removed,
+                "objects_removed": objects_removed,
+                "bytes_freed": bytes_freed,
+            }
+
+    def _count_references(self, manifests: Iterable[Path]) -> Counter:
+        references: Counter = Counter()
+        for manifest_path in manifests:
+            try:
+                manifest = self.load_manifest(manifest_path)
+            except BackupStoreError as e:
+                logger.warning(str(e))
+                continue
+            for entry in manifest.get("entries", []):
+                if "object" in entry:
+                    references[entry["object"]] += 1
+                references.update(entry.get("chunks", ()))
+        return references
+
+    def stats(self) -> Dict[str, int]:
+        """Number of snapshots and objects, and the bytes the objects use."""
+        objects = list(self.objects_dir.glob("*/*")) if self.objects_dir.exists() else []
+        return {
+            "snapshots": len(list(self.manifests_dir.glob("*.json"))) if self.manifests_dir.exists() else 0,
+            "objects": len(objects),
+            "bytes": sum(path.stat().st_size for path in objects if path.exists()),
+        }
+
+
+def create_backup_store() -> BackupStore:
+    """
+    Create the backup store from the application configuration.
+
+    Returns:
+        A BackupStore in the backup directory
+    """
+    from angela.config import config_manager
+    from angela.components.execution.filesystem import BACKUP_DIR
+    backup_config = config_manager.config.backup
+    store = BackupStore(
+        BACKUP_DIR / "store",
+        retention_days=backup_config.retention_days,
+        max_snapshots=backup_config.max_snapshots,
+        gc_every=backup_config.gc_every,
+    )
+    store.add_keep_source(_rollback_references)
+    return store
+
+
+def _rollback_references() -> List[Path]:
+    """Snapshots that operations in the rollback history can still be restored from."""
+    from angela.api.execution import get_rollback_manager
+    return get_rollback_manager().referenced_backups()
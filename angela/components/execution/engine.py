@@ -10,6 +10,7 @@ from typing import Dict, Any, List, Tuple, Optional, TYPE_CHECKING
 # Import through API layer
 from angela.utils.logging import get_logger
 from angela.core.registry import registry  # Fixed import
+from angela.components.execution.output_stream import CommandOutputStream, create_output_stream
 
 if TYPE_CHECKING:
     from angela.intent.models import ActionPlan
@@ -50,6 +51,10 @@ class ExecutionEngine:
         """
         Execute a shell command and return its output.
         
+        Output beyond the configured retention (``execution.max_retained_bytes``
+        per stream) is dropped from the middle of stdout and stderr; see
+        stream_command for the output as it is produced.
+        
         Args:
             command: The shell command to execute
             check_safety: Whether to perform safety checks
@@ -59,6 +64,79 @@ class ExecutionEngine:
         Returns:
             Tuple of (stdout, stderr, exit_code)
         """
+        stream = await self.stream_command(command, check_safety, dry_run, working_dir)
+        if stream.process is None:
+            # Not executed: interactive, refused, dry run or failed to start
+            await stream.wait()
+            return stream.stdout.text(), stream.stderr.text(), stream.returncode
+        
+        try:
+            # Wait for the command to complete
+            returncode = await stream.wait()
+            stdout = stream.stdout.text()
+            stderr = stream.stderr.text()
+            
+            self._logger.debug(f"Command completed with return code: {returncode}")
+            self._logger.debug(f"stdout: {stdout[:100]}{'...' if len(stdout) > 100 else ''}")
+            if stderr:
+                self._logger.debug(f"stderr: {stderr[:1000]}")
+            
+            # Record the operation for potential rollback
+            if not dry_run and returncode == 0:
+                # Get rollback_manager safely without circular imports
+                try:
+                    # Try getting from registry first 
+                    rollback_manager_instance = registry.get("rollback_manager")
+                    
+                    if rollback_manager_instance:
+                        params = {"command": command}
+                        for key, buffer in (("stdout_file", stream.stdout), ("stderr_file", stream.stderr)):
+                            if buffer.spill_path:
+                                params[key] = buffer.spill_path
+                        await rollback_manager_instance.record_operation(
+                            operation_type="execute_command",
+                            params=params,
+                            backup_path=None  # Commands don't have direct file backups
+                        )
+                except Exception as e:
+                    self._logger.warning(f"Could not record operation for rollback: {e}")
+            
+            return stdout, stderr, returncode
+        
+        except Exception as e:
+            self._logger.exception(f"Error executing command '{command}': {str(e)}")
+            await stream.aclose()
+            return "", str(e), -1
+        except BaseException:
+            # Cancelled (e.g. a failed sibling plan step) or interrupted: stop the command too
+            await stream.aclose()
+            raise
+    
+    async def stream_command(
+        self,
+        command: str,
+        check_safety: bool = True,
+        dry_run: bool = False,
+        working_dir: Optional[str] = None
+    ) -> CommandOutputStream:
+        """
+        Start a shell command and stream its output.
+        
+        Iterate over the returned stream for the output chunks as the command
+        produces them, then await its wait() for the exit code. The command is
+        held back while chunks are not consumed. Interactive, refused and dry
+        run commands are not started; their stream yields the message
+        execute_command would return, and has no process.
+        
+        Args:
+            command: The shell command to execute
+            check_safety: Whether to perform safety checks
+            dry_run: Whether to perform a dry run without execution
+            working_dir: Working directory for command execution
+            
+        Returns:
+            The command's output stream
+        """
         # Check for interactive commands first
         from angela.utils.command_utils import is_interactive_command, display_command_recommendation
         
@@ -67,7 +145,7 @@ class ExecutionEngine:
             # Display recommendation for interactive commands
             display_command_recommendation(command)
             # Return dummy result without execution
-            return (f"Interactive command '{base_cmd}' not executed - please run manually", "", 0)
+            return CommandOutputStream.finished(f"Interactive command '{base_cmd}' not executed - please run manually", "", 0)
             
         self._logger.info(f"Preparing to execute command: {command}")
         
@@ -78,18 +156,18 @@ class ExecutionEngine:
 
             if not check_command_safety_func:
                 self._logger.error("Safety check function not available")
-                return "", "Safety check function not configured", 1
+                return CommandOutputStream.finished("", "Safety check function not configured", 1)
 
             # Check if the command is safe to execute
             is_safe = await check_command_safety_func(command, dry_run)
             if not is_safe:
                 self._logger.warning(f"Command execution cancelled due to safety concerns: {command}")
-                return "", "Command execution cancelled due to safety concerns", 1
+                return CommandOutputStream.finished("", "Command execution cancelled due to safety concerns", 1)
 
             # For dry runs, return simulated results
             if dry_run:
                 self._logger.info(f"DRY RUN: Would execute command: {command}")
-                return f"[DRY RUN] Would execute: {command}", "", 0
+                return CommandOutputStream.finished(f"[DRY RUN] Would execute: {command}", "", 0)
         
         # Execute the command
         try:
@@ -128,37 +206,11 @@ class ExecutionEngine:
                         stderr=asyncio.subprocess.PIPE,
                     )
             
-            # Wait for the command to complete
-            stdout_bytes, stderr_bytes = await process.communicate()
-            stdout = stdout_bytes.decode('utf-8', errors='replace')
-            stderr = stderr_bytes.decode('utf-8', errors='replace')
-            
-            self._logger.debug(f"Command completed with return code: {process.returncode}")
-            self._logger.debug(f"stdout: {stdout[:100]}{'...' if len(stdout) > 100 else ''}")
-            if stderr:
-                self._logger.debug(f"stderr: {stderr}")
-            
-            # Record the operation for potential rollback
-            if not dry_run and process.returncode == 0:
-                # Get rollback_manager safely without circular imports
-                try:
-                    # Try getting from registry first 
-                    rollback_manager_instance = registry.get("rollback_manager")
-                    
-                    if rollback_manager_instance:
-                        await rollback_manager_instance.record_operation(
-                            operation_type="execute_command",
-                            params={"command": command},
-                            backup_path=None  # Commands don't have direct file backups
-                        )
-                except Exception as e:
-                    self._logger.warning(f"Could not record operation for rollback: {e}")
-            
-            return stdout, stderr, process.returncode
+            return create_output_stream(process)
         
         except Exception as e:
             self._logger.exception(f"Error executing command '{command}': {str(e)}")
-            return "", str(e), -1
+            return CommandOutputStream.finished("", str(e), -1)
     
     async def dry_run_command(self, command: str) -> Tuple[str, str, int]:
         """
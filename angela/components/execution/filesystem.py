@@ -7,9 +7,9 @@ and proper error handling.
 """
 import os
 import shutil
+import asyncio
 import tempfile
 from pathlib import Path
-from datetime import datetime
 from typing import Dict, Any, Optional, List, Tuple, Union, BinaryIO, TextIO
 
 # Import through API layer
@@ -44,12 +44,6 @@ class FileSystemError(Exception):
     pass
 
 
-# Ensure backup directory exists
-def _ensure_backup_dir():
-    """Create the backup directory if it doesn't exist."""
-    BACKUP_DIR.mkdir(parents=True, exist_ok=True)
-
-
 async def create_directory(
     path: Union[str, Path], 
     parents: bool = True,
@@ -149,8 +143,9 @@ async def delete_directory(
             return False
         
         # Create a backup for rollback if needed
+        backup_path = None
         if not dry_run and recursive:
-            await _backup_directory(path_obj)
+            backup_path = await _backup_directory(path_obj, detach=True)
         
         # If this is a dry run, stop here
         if dry_run:
@@ -159,7 +154,10 @@ async def delete_directory(
         
         # Delete the directory
         if recursive:
-            shutil.rmtree(path_obj)
+            try:
+                shutil.rmtree(path_obj)
+            finally:
+                await _finish_detach(backup_path)
             logger.info(f"Recursively deleted directory at {path_obj}")
         else:
             path_obj.rmdir()
@@ -401,8 +399,9 @@ async def delete_file(
             return False
         
         # Create a backup for rollback if needed
+        backup_path = None
         if not dry_run:
-            await _backup_file(path_obj)
+            backup_path = await _backup_file(path_obj, detach=True)
         
         # If this is a dry run, stop here
         if dry_run:
@@ -410,7 +409,10 @@ async def delete_file(
             return True
         
         # Delete the file
-        path_obj.unlink()
+        try:
+            path_obj.unlink()
+        finally:
+            await _finish_detach(backup_path)
         logger.info(f"Deleted file at {path_obj}")
         
         return True
@@ -572,26 +574,22 @@ async def move_file(
 
 # --- Helper functions for backups and rollbacks ---
 
-async def _backup_file(path: Path) -> Path:
+async def _backup_file(path: Path, detach: bool = False) -> Optional[Path]:
     """
     Create a backup of a file for potential rollback.
     
     Args:
         path: The path of the file to back up.
+        detach: Whether the file is about to be deleted.
         
     Returns:
-        The path of the backup file.
+        The path of the backup snapshot.
     """
     try:
-        _ensure_backup_dir()
-        
-        # Create a unique backup filename
-        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-        backup_name = f"{path.name}.{timestamp}.bak"
-        backup_path = BACKUP_DIR / backup_name
+        from angela.api.execution import get_backup_store
         
-        # Copy the file to the backup location
-        shutil.copy2(path, backup_path)
+        # Store the file in the deduplicating backup store
+        backup_path = await asyncio.to_thread(get_backup_store().snapshot, path, detach)
         logger.debug(f"Created backup of {path} at {backup_path}")
         
         return backup_path
@@ -602,26 +600,22 @@ async def _backup_file(path: Path) -> Path:
         return None # Explicitly return None on failure
 
 
-async def _backup_directory(path: Path) -> Path:
+async def _backup_directory(path: Path, detach: bool = False) -> Optional[Path]:
     """
     Create a backup of a directory for potential rollback.
     
     Args:
         path: The path of the directory to back up.
+        detach: Whether the directory is about to be deleted.
         
     Returns:
-        The path of the backup directory.
+        The path of the backup snapshot.
     """
     try:
-        _ensure_backup_dir()
+        from angela.api.execution import get_backup_store
         
-        # Create a unique backup directory name
-        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-        backup_name = f"{path.name}.{timestamp}.bak"
-        backup_path = BACKUP_DIR / backup_name
-        
-        # Copy the directory to the backup location
-        shutil.copytree(path, backup_path)
+        # Snapshot the directory as a manifest of deduplicated file contents
+        backup_path = await asyncio.to_thread(get_backup_store().snapshot, path, detach)
         logger.debug(f"Created backup of directory {path} at {backup_path}")
         
         return backup_path
@@ -630,3 +624,19 @@ async def _backup_directory(path: Path) -> Path:
         logger.warning(f"Failed to create backup of directory {path}: {str(e)}")
         # Not raising an exception here as this is a non-critical operation
         return None # Explicitly return None on failure
+
+
+async def _finish_detach(backup_path: Optional[Path]) -> None:
+    """
+    Unshare a detached backup from files its deletion did not remove.
+    
+    Args:
+        backup_path: The snapshot taken with detach=True, or None.
+    """
+    if backup_path is None:
+        return
+    try:
+        from angela.api.execution import get_backup_store
+        await asyncio.to_thread(get_backup_store().finish_detach, backup_path)
+    except Exception as e:
+        logger.warning(f"Failed to finish backup {backup_path}: {str(e)}")
@@ -0,0 +1,565 @@
+# angela/components/execution/journal.py
+"""
+Append-only journals backing the rollback history.
+
+Operations are written to a JSON-lines log, one line per operation, with a
+fixed-width offset index next to it. Recording an operation appends one line
+and one index entry instead of re-serializing the whole history. Opening the
+log only reads the index, and any operation is read with a single seek, so
+listing recent operations does not depend on the size of the history.
+
+Several processes may share both journals. Every access takes an exclusive
+``flock`` on a lock file next to the journal and first catches up with
+whatever other processes wrote, so operation IDs stay equal to log
+positions and no process appends to a transaction journal that another one
+has replaced.
+
+Transactions are kept in memory and journaled as state changes. Superseded
+entries are dropped by compaction, which writes a checkpoint of the live
+transactions and atomically replaces the journal. Only the most recent
+finished transactions are kept in the checkpoint.
+
+Writes are flushed to the OS immediately and fsynced in batches. On open, a
+torn tail left by a crash is cut off and the index is rebuilt from the last
+entry that still matches the log.
+"""
+import atexit
+import json
+import os
+import struct
+import threading
+import time
+from array import array
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional
+
+from angela.utils.logging import get_logger
+
+try:
+    import fcntl
+    _FCNTL_AVAILABLE = True
+except ImportError:
+    fcntl = None
+    _FCNTL_AVAILABLE = False
+
+logger = get_logger(__name__)
+
+# One little-endian unsigned 64-bit offset per operation
+INDEX_ENTRY = struct.Struct("<Q")
+
+
+def _encode(entry: Dict[str, Any]) -> bytes:
+    """Encode a journal entry as one line."""
+    return (json.dumps(entry, separators=(",", ":"), default=str) + "\n").encode("utf-8")
+
+
+def _fsync_directory(path: Path) -> None:
+    """Persist a rename in ``path`` where the platform allows it."""
+    try:
+        fd = os.open(path, os.O_RDONLY)
+    except OSError:
+        return
+    try:
+        os.fsync(fd)
+    except OSError:
+        pass
+    finally:
+        os.close(fd)
+
+
+class _AppendOnlyFile:
+    """A binary file opened for appending that tracks its own size."""
+
+    def __init__(self, path: Path):
+        self.path = path
+        self._file = open(path, "ab")
+        self.size = self._file.tell()
+        self.inode = os.fstat(self._file.fileno()).st_ino
+
+    def current_size(self) -> int:
+        """Size of the file on disk, including writes through other handles."""
+        return os.fstat(self._file.fileno()).st_size
+
+    def write(self, data: bytes) -> int:
+        """Append data and return the offset it was written at."""
+        offset = self.size
+        self._file.write(data)
+        self._file.flush()
+        self.size += len(data)
+        return offset
+
+    def truncate(self, size: int) -> None:
+        """Cut the file to ``size`` bytes."""
+        self._file.flush()
+        os.ftruncate(self._file.fileno(), size)
+        self.size = size
+
+    def sync(self) -> None:
+        """Flush and fsync the file."""
+        self._file.flush()
+        os.fsync(self._file.fileno())
+
+    def close(self) -> None:
+        if not self._file.closed:
+            self._file.close()
+
+
+class _Journal:
+    """Batched fsync policy shared by the journals."""
+
+    def __init__(self, sync_every: int, sync_interval: float):
+        """
+        Args:
+            sync_every: Fsync after this many unsynced entries
+            sync_interval: Fsync on the next write once this many seconds have passed
+        """
+        self.sync_every = max(1, sync_every)
+        self.sync_interval = sync_interval
+        self._lock = threading.RLock()
+        self._pending = 0
+        self._last_sync = time.monotonic()
+        self._lock_file = None
+        self._lock_depth = 0
+
+    def _open_lock(self, path: Path) -> None:
+        """Open the lock file shared with other processes, named after ``path``."""
+        if _FCNTL_AVAILABLE:
+            self._lock_file = open(path.with_suffix(path.suffix + ".lock"), "ab")
+
+    @contextmanager
+    def _exclusive(self) -> Iterator[None]:
+        """Hold the thread lock and the inter-process lock on the journal."""
+        with self._lock:
+            if self._lock_file is not None and self._lock_depth == 0:
+                fcntl.flock(self._lock_file.fileno(), fcntl.LOCK_EX)
+            self._lock_depth += 1
+            try:
+                yield
+            finally:
+                self._lock_depth -= 1
+                if self._lock_file is not None and self._lock_depth == 0:
+                    fcntl.flock(self._lock_file.fileno(), fcntl.LOCK_UN)
+
+    def _files(self) -> List[_AppendOnlyFile]:
+        raise NotImplementedError
+
+    def _wrote(self) -> None:
+        """Count an entry and fsync when the batch is due."""
+        self._pending += 1
+        if self._pending >= self.sync_every or time.monotonic() - self._last_sync >= self.sync_interval:
+            self.sync()
+
+    def sync(self) -> None:
+        """Fsync all pending writes."""
+        with self._lock:
+            if not self._pending:
+                return
+            try:
+                for file in self._files():
+                    file.sync()
+            except (OSError, ValueError) as e:
+                logger.error(f"Error syncing journal: {str(e)}")
+                return
+            self._pending = 0
+            self._last_sync = time.monotonic()
+
+    def close(self) -> None:
+        """Sync and close the journal files."""
+        with self._lock:
+            self.sync()
+            for file in self._files():
+                file.close()
+            if self._lock_file is not None:
+                self._lock_file.close()
+
+
+class OperationLog(_Journal):
+    """Append-only operation log with an offset index."""
+
+    def __init__(
+        self,
+        log_path: Path,
+        index_path: Optional[Path] = None,
+        sync_every: int = 32,
+        sync_interval: float = 1.0
+    ):
+        """
+        Open the log, recovering from an interrupted write if needed.
+
+        Args:
+            log_path: JSON-lines log of operations
+            index_path: Offset index; defaults to the log path with an ``.idx`` suffix
+            sync_every: Fsync after this many unsynced operations
+            sync_interval: Fsync on the next write once this many seconds have passed
+        """
+        super().__init__(sync_every, sync_interval)
+        self.log_path = Path(log_path)
+        self.index_path = Path(index_path) if index_path else self.log_path.with_suffix(".idx")
+        self.log_path.parent.mkdir(parents=True, exist_ok=True)
+        self._offsets = array("Q")
+        self._open_lock(self.log_path)
+        with self._exclusive():
+            self._recover()
+            self._log = _AppendOnlyFile(self.log_path)
+            self._index = _AppendOnlyFile(self.index_path)
+        self._reader = open(self.log_path, "rb")
+        atexit.register(self.close)
+
+    def __len__(self) -> int:
+        with self._exclusive():
+            self._refresh()
+            return len(self._offsets)
+
+    def _refresh(self) -> None:
+        """
+        Catch up with appends and truncations made by other processes.
+
+        Must be called with the lock held. If either file changed size, the
+        index is reloaded and its last entry checked against the log, so the
+        next ID is assigned after the last entry actually in the log.
+        """
+        log_size = self._log.current_size()
+        index_size = self._index.current_size()
+        if log_size == self._log.size and index_size == self._index.size:
+            return
+        self._offsets = array("Q")
+        self._recover()
+        self._log.size = self._log.current_size()
+        self._index.size = self._index.current_size()
+        # The reader may buffer bytes that were truncated or rewritten
+        self._reader.close()
+        self._reader = open(self.log_path, "rb")
+
+    def _files(self) -> List[_AppendOnlyFile]:
+        return [self._log, self._index]
+
+    def append(self, operation: Dict[str, Any]) -> int:
+        """
+        Append an operation.
+
+        Args:
+            operation: JSON-serializable operation record
+
+        Returns:
+            The operation ID (its position in the log)
+        """
+        with self._exclusive():
+            self._refresh()
+            operation_id = len(self._offsets)
+            offset = self._log.write(_encode({"id": operation_id, "op": operation}))
+            self._index.write(INDEX_ENTRY.pack(offset))
+            self._offsets.append(offset)
+            self._wrote()
+            return operation_id
+
+    def get(self, operation_id: int) -> Optional[Dict[str, Any]]:
+        """
+        Read one operation.
+
+        Args:
+            operation_id: ID returned by ``append``
+
+        Returns:
+            The operation record, or None if there is no such operation
+        """
+        with self._exclusive():
+            self._refresh()
+            if operation_id < 0 or operation_id >= len(self._offsets):
+                return None
+            self._reader.seek(self._offsets[operation_id])
+            return json.loads(self._reader.readline())["op"]
+
+    def read_range(self, start: int, stop: int) -> List[Dict[str, Any]]:
+        """
+        Read consecutive operations.
+
+        Args:
+            start: First operation ID
+            stop: Operation ID after the last one to read
+
+        Returns:
+            Operation records in ID order
+        """
+        with self._exclusive():
+            self._refresh()
+            start = max(0, start)
+            stop = min(stop, len(self._offsets))
+            if start >= stop:
+                return []
+            self._reader.seek(self._offsets[start])
+            return [json.loads(self._reader.readline())["op"] for _ in range(stop - start)]
+
+    def truncate(self, length: int) -> None:
+        """
+        Drop every operation from ``length`` onwards.
+
+        The log is cut before the index, so a crash in between leaves index
+        entries past the end of the log, which recovery discards.
+
+        Args:
+            length: Number of operations to keep
+        """
+        with self._exclusive():
+            self._refresh()
+            if length < 0 or length >= len(self._offsets):
+                return
+            self._log.truncate(self._offsets[length])
+            self._index.truncate(length * INDEX_ENTRY.size)
+            del self._offsets[length:]
+            self._pending += 1
+            self.sync()
+            # The reader may still buffer the dropped bytes
+            self._reader.close()
+            self._reader = open(self.log_path, "rb")
+
+    def _recover(self) -> None:
+        """Load the index and reconcile it with the log."""
+        if not self.log_path.exists():
+            self.log_path.touch()
+        log_size = self.log_path.stat().st_size
+
+        if self.index_path.exists():
+            data = self.index_path.read_bytes()
+            self._offsets.frombytes(data[:len(data) - len(data) % INDEX_ENTRY.size])
+        indexed = len(self._offsets)
+
+        with open(self.log_path, "rb") as log:
+            # Keep the longest index prefix whose last entry still matches the log
+            scan_from = 0
+            while self._offsets:
+                offset = self._offsets[-1]
+                if offset < log_size:
+                    log.seek(offset)
+                    line = log.readline()
+                    if self._entry_id(line) == len(self._offsets) - 1:
+                        scan_from = offset + len(line)
+                        break
+                self._offsets.pop()
+
+            # Index whatever was appended after it; a torn or corrupt line ends the log
+            log.seek(scan_from)
+            offset = scan_from
+            for line in log:
+                if self._entry_id(line) != len(self._offsets):
+                    break
+                self._offsets.append(offset)
+                offset += len(line)
+
+        if offset < log_size:
+            logger.warning(f"Discarding {log_size - offset} bytes of incomplete operation log {self.log_path}")
+            os.truncate(self.log_path, offset)
+        index_size = self.index_path.stat().st_size if self.index_path.exists() else -1
+        if len(self._offsets) != indexed or index_size != indexed * INDEX_ENTRY.size:
+            self._rewrite_index()
+
+    def _rewrite_index(self) -> None:
+        """
+        Rewrite the index from the in-memory offsets.
+
+        The index is rewritten in place rather than replaced, so other
+        processes keep appending to the same file. A crash midway is harmless:
+        recovery only trusts index entries that match the log.
+        """
+        with open(self.index_path, "r+b" if self.index_path.exists() else "wb") as f:
+            f.write(self._offsets.tobytes())
+            f.truncate()
+            f.flush()
+            os.fsync(f.fileno())
+        logger.debug(f"Rebuilt operation index with {len(self._offsets)} entries")
+
+    @staticmethod
+    def _entry_id(line: bytes) -> Optional[int]:
+        """ID of a complete log line, or None if the line is torn or corrupt."""
+        if not line.endswith(b"\n"):
+            return None
+        try:
+            entry = json.loads(line)
+            return entry["id"] if "op" in entry else None
+        except (ValueError, TypeError, KeyError):
+            return None
+
+    def close(self) -> None:
+        with self._lock:
+            super().close()
+            self._reader.close()
+
+
+class TransactionJournal(_Journal):
+    """Journal of transaction state changes with checkpointing compaction."""
+
+    def __init__(
+        self,
+        path: Path,
+        sync_every: int = 32,
+        sync_interval: float = 1.0,
+        compact_threshold: int = 1000,
+        max_finished: int = 500
+    ):
+        """
+        Open the journal and replay it.
+
+        Args:
+            path: JSON-lines journal file
+            sync_every: Fsync after this many unsynced entries
+            sync_interval: Fsync on the next write once this many seconds have passed
+            compact_threshold: Compact once this many entries are superseded
+            max_finished: Finished (no longer "started") transactions kept by
+                compaction, most recent first
+        """
+        super().__init__(sync_every, sync_interval)
+        self.path = Path(path)
+        self.compact_threshold = compact_threshold
+        self.max_finished = max_finished
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._transactions: Dict[str, Dict[str, Any]] = {}
+        self._entries = 0
+        self._open_lock(self.path)
+        with self._exclusive():
+            self._replay()
+            self._file = _AppendOnlyFile(self.path)
+        atexit.register(self.close)
+
+    @property
+    def transactions(self) -> Dict[str, Dict[str, Any]]:
+        """Copy of the current state of every transaction, with their operation IDs."""
+        with self._exclusive():
+            self._refresh()
+            return {
+                transaction_id: {**state, "operation_ids": list(state["operation_ids"])}
+                for transaction_id, state in self._transactions.items()
+            }
+
+    def _files(self) -> List[_AppendOnlyFile]:
+        return [self._file]
+
+    def record(self, transaction: Dict[str, Any]) -> None:
+        """
+        Record the state of a transaction. Operation IDs are journaled separately.
+
+        Args:
+            transaction: Transaction dictionary with a ``transaction_id``
+        """
+        state = {k: v for k, v in transaction.items() if k != "operation_ids"}
+        with self._exclusive():
+            self._refresh()
+            self._apply_state(state)
+            self._append({"k": "txn", "txn": state})
+
+    def record_operation(self, transaction_id: str, operation_id: int) -> None:
+        """
+        Record that an operation belongs to a transaction.
+
+        Args:
+            transaction_id: Transaction ID
+            operation_id: Operation ID in the operation log
+        """
+        with self._exclusive():
+            self._refresh()
+            self._apply_operation(transaction_id, operation_id)
+            self._append({"k": "op", "id": transaction_id, "op": operation_id})
+
+    def compact(self) -> None:
+        """Replace the journal with a checkpoint of the live transactions."""
+        with self._exclusive():
+            self._refresh()
+            self._prune_finished()
+            tmp_path = self.path.with_suffix(self.path.suffix + ".tmp")
+            with open(tmp_path, "wb") as f:
+                for transaction in self._transactions.values():
+                    f.write(_encode({"k": "txn", "txn": transaction}))
+                f.flush()
+                os.fsync(f.fileno())
+            self._file.close()
+            os.replace(tmp_path, self.path)
+            _fsync_directory(self.path.parent)
+            self._file = _AppendOnlyFile(self.path)
+            self._entries = len(self._transactions)
+            self._pending = 0
+            logger.debug(f"Compacted transaction journal to {self._entries} entries")
+
+    def _prune_finished(self) -> None:
+        """Forget the oldest finished transactions beyond ``max_finished``."""
+        finished = [
+            transaction_id for transaction_id, state in self._transactions.items()
+            if state.get("status", "started") != "started"
+        ]
+        if len(finished) <= self.max_finished:
+            return
+        # Timestamps are ISO strings; ties keep journal order
+        finished.sort(key=lambda t: str(self._transactions[t].get("timestamp", "")))
+        for transaction_id in finished[:len(finished) - self.max_finished]:
+            del self._transactions[transaction_id]
+
+    def _refresh(self) -> None:
+        """
+        Catch up with what other processes wrote. Must be called with the lock held.
+
+        Entries appended since the last access are replayed. If another
+        process compacted the journal, the file was replaced: the state is
+        rebuilt from the new file and appends go to it from now on.
+        """
+        try:
+            st = os.stat(self.path)
+        except FileNotFoundError:
+            st = None
+        if st is not None and st.st_ino == self._file.inode:
+            if st.st_size != self._file.size:
+                self._replay(self._file.size)
+                self._file.size = self._file.current_size()
+            return
+        self._file.close()
+        self._transactions = {}
+        self._entries = 0
+        self._replay()
+        self._file = _AppendOnlyFile(self.path)
+
+    def _append(self, entry: Dict[str, Any]) -> None:
+        self._file.write(_encode(entry))
+        self._entries += 1
+        self._wrote()
+        if self._entries - len(self._transactions) >= self.compact_threshold:
+            self.compact()
+
+    def _apply_state(self, state: Dict[str, Any]) -> None:
+        transaction = self._transactions.setdefault(state["transaction_id"], {"operation_ids": []})
+        operation_ids = state.get("operation_ids")
+        transaction.update(state)
+        # Checkpoints carry the operation IDs; state changes keep the existing ones
+        transaction["operation_ids"] = list(operation_ids) if operation_ids is not None \
+            else transaction.get("operation_ids", [])
+
+    def _apply_operation(self, transaction_id: str, operation_id: int) -> None:
+        transaction = self._transactions.get(transaction_id)
+        if transaction is not None:
+            transaction["operation_ids"].append(operation_id)
+
+    def _replay(self, start: int = 0) -> None:
+        """
+        Apply the journal to the transaction states.
+
+        Args:
+            start: Offset to read from; entries before it were already applied
+        """
+        if not self.path.exists():
+            return
+        valid_size = start
+        with open(self.path, "rb") as f:
+            f.seek(start)
+            for line in f:
+                if not line.endswith(b"\n"):
+                    break
+                valid_size += len(line)
+                try:
+                    entry = json.loads(line)
+                    if entry["k"] == "txn":
+                        self._apply_state(entry["txn"])
+                    elif entry["k"] == "op":
+                        self._apply_operation(entry["id"], entry["op"])
+                    self._entries += 1
+                except (ValueError, TypeError, KeyError) as e:
+                    logger.warning(f"Skipping corrupt transaction journal entry: {str(e)}")
+        size = self.path.stat().st_size
+        if valid_size < size:
+            logger.warning(f"Discarding {size - valid_size} bytes of incomplete transaction journal {self.path}")
+            os.truncate(self.path, valid_size)
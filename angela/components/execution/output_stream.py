@@ -0,0 +1,389 @@
+# angela/components/execution/output_stream.py
+"""
+Streaming capture of command output.
+
+Commands used to be run with ``communicate()``, which holds everything a
+command prints in memory, and then once more as decoded text, before the
+caller sees any of it. Output is now read in chunks while the command runs:
+
+- CommandOutputStream yields the chunks of stdout and stderr as an async
+  iterator. The queue between the pipe readers and the consumer is bounded,
+  so while the consumer is behind the pipes are not read, and a command
+  writing faster than it is consumed blocks on its full pipe.
+- Each stream's OutputBuffer retains what ends up in results, history and
+  rollback records: the first and the last bytes of the stream, at most
+  ``max_bytes`` in total, with a marker for what was dropped in between.
+- Optionally, once a stream outgrows its buffer, the complete stream is
+  spilled to a temporary file, which is then referenced by the marker.
+  Spill files are kept for a retention period and removed afterwards
+  (see remove_expired_spills).
+
+Memory used per command is bounded by the buffers and the queue no matter
+how much the command prints.
+"""
+import asyncio
+import codecs
+import os
+import tempfile
+import time
+from collections import deque
+from typing import Any, AsyncIterator, BinaryIO, Deque, Dict, List, NamedTuple, Optional
+
+from angela.utils.logging import get_logger
+
+logger = get_logger(__name__)
+
+# Bytes requested from a pipe per read
+READ_CHUNK_SIZE = 64 * 1024
+
+# Chunks waiting for the consumer before the pipes stop being read
+QUEUE_CHUNKS = 16
+
+# Default bytes of each stream retained in memory
+DEFAULT_MAX_RETAINED_BYTES = 1024 * 1024
+
+# Share of the retained bytes taken from the beginning of a stream
+HEAD_SHARE = 0.25
+
+# Spill file names are f"{SPILL_PREFIX}{stream}-<random>{SPILL_SUFFIX}"
+SPILL_PREFIX = "angela-"
+SPILL_SUFFIX = ".log"
+
+# Minimum seconds between sweeps of a spill directory for expired files
+SPILL_SWEEP_INTERVAL = 3600
+
+_EOF = object()
+_last_spill_sweep: Dict[str, float] = {}
+
+
+class OutputChunk(NamedTuple):
+    """A piece of a command's output."""
+    stream: str     # "stdout" or "stderr"
+    data: bytes
+    text: str       # data decoded, with multi-byte characters split across chunks kept whole
+
+
+class OutputBuffer:
+    """Bounded head and ring-buffered tail of an output stream."""
+
+    def __init__(
+        self,
+        max_bytes: int = DEFAULT_MAX_RETAINED_BYTES,
+        spill: bool = False,
+        spill_dir: Optional[str] = None,
+        name: str = "output"
+    ):
+        """
+        Initialize the buffer.
+
+        Args:
+            max_bytes: Maximum number of bytes retained in memory
+            spill: Write the complete stream to a temporary file once it exceeds max_bytes
+            spill_dir: Directory of the spill file (the system default if None)
+            name: Stream name, used in the spill file name
+        """
+        self.max_bytes = max(0, max_bytes)
+        self.spill = spill
+        self.spill_dir = spill_dir or None
+        self.name = name
+        self.total_bytes = 0
+        self.spill_path: Optional[str] = None
+
+        self._head_limit = int(self.max_bytes * HEAD_SHARE)
+        self._tail_limit = self.max_bytes - self._head_limit
+        self._head = bytearray()
+        self._tail: Deque[bytes] = deque()
+        self._tail_bytes = 0
+        self._spill_file: Optional[BinaryIO] = None
+
+    @property
+    def dropped_bytes(self) -> int:
+        """Bytes of the stream no longer held in memory."""
+        return self.total_bytes - len(self._head) - self._tail_bytes
+
+    @property
+    def truncated(self) -> bool:
+        return self.dropped_bytes > 0
+
+    def write(self, data: bytes) -> None:
+        """
+        Add the next bytes of the stream.
+
+        Args:
+            data: The bytes
+        """
+        if not data:
+            return
+        if self.spill and self._spill_file is None and self.total_bytes + len(data) > self.max_bytes:
+            # Nothing has been dropped yet, so the buffer still holds the whole stream
+            self._start_spill()
+        if self._spill_file is not None:
+            try:
+                self._spill_file.write(data)
+            except OSError as e:
+                logger.warning(f"Could not write {self.name} to {self.spill_path}: {str(e)}")
+                self._close_spill()
+        self.total_bytes += len(data)
+
+        room = self._head_limit - len(self._head)
+        if room > 0:
+            self._head += data[:room]
+            data = data[room:]
+            if not data:
+                return
+
+        self._tail.append(data)
+        self._tail_bytes += len(data)
+        while self._tail_bytes > self._tail_limit:
+            excess = self._tail_bytes - self._tail_limit
+            first = self._tail[0]
+            if len(first) <= excess:
+                self._tail.popleft()
+                self._tail_bytes -= len(first)
+            else:
+                self._tail[0] = first[excess:]
+                self._tail_bytes -= excess
+
+    def _start_spill(self) -> None:
+        try:
+            self._spill_file = tempfile.NamedTemporaryFile(
+                prefix=f"{SPILL_PREFIX}{self.name}-", suffix=SPILL_SUFFIX, dir=self.spill_dir, delete=False
+            )
+            self.spill_path = self._spill_file.name
+            self._spill_file.write(bytes(self._head))
+            for data in self._tail:
+                self._spill_file.write(data)
+        except OSError as e:
+            logger.warning(f"Could not spill {self.name} to a temporary file: {str(e)}")
+            self._close_spill()
+            self.spill = False
+
+    def _close_spill(self) -> None:
+        if self._spill_file is not None:
+            try:
+                self._spill_file.close()
+            except OSError:
+                pass
+            self._spill_file = None
+
+    def close(self) -> None:
+        """Finish the spill file, if any. The retained bytes stay readable."""
+        self._close_spill()
+
+    def getvalue(self) -> bytes:
+        """
+        Get the retained bytes.
+
+        Returns:
+            The whole stream, or its head and tail around an omission marker
+        """
+        if not self.truncated:
+            return bytes(self._head) + b"".join(self._tail)
+        marker = f"\n[... {self.dropped_bytes} bytes omitted"
+        if self.spill_path:
+            marker += f"; full output in {self.spill_path}"
+        marker += " ...]\n"
+        return bytes(self._head) + marker.encode("utf-8") + b"".join(self._tail)
+
+    def text(self) -> str:
+        """Get the retained bytes decoded as UTF-8."""
+        return self.getvalue().decode("utf-8", errors="replace")
+
+
+class CommandOutputStream:
+    """The output of a running process, as chunks and as bounded buffers."""
+
+    def __init__(
+        self,
+        process: Optional[asyncio.subprocess.Process],
+        max_retained_bytes: int = DEFAULT_MAX_RETAINED_BYTES,
+        spill: bool = False,
+        spill_dir: Optional[str] = None,
+        queue_chunks: int = QUEUE_CHUNKS,
+        read_size: int = READ_CHUNK_SIZE
+    ):
+        """
+        Start reading the output of a process.
+
+        Args:
+            process: Process started with stdout and stderr pipes, or None for a
+                stream over a result that is already known (see finished)
+            max_retained_bytes: Bytes of each stream retained in memory
+            spill: Spill streams exceeding max_retained_bytes to temporary files
+            spill_dir: Directory of the spill files
+            queue_chunks: Chunks read ahead of the consumer
+            read_size: Bytes requested from a pipe per read
+        """
+        self.process = process
+        self.stdout = OutputBuffer(max_retained_bytes, spill, spill_dir, "stdout")
+        self.stderr = OutputBuffer(max_retained_bytes, spill, spill_dir, "stderr")
+        self.returncode: Optional[int] = None
+        self._read_size = read_size
+        self._queue: asyncio.Queue = asyncio.Queue(maxsize=max(1, queue_chunks))
+
+        self._readers: List[asyncio.Task] = []
+        if process is not None:
+            for pipe, buffer in ((process.stdout, self.stdout), (process.stderr, self.stderr)):
+                if pipe is not None:
+                    self._readers.append(asyncio.create_task(self._read(pipe, buffer)))
+        self._open_streams = len(self._readers)
+
+    @classmethod
+    def finished(cls, stdout: str, stderr: str, returncode: int) -> "CommandOutputStream":
+        """
+        Get a stream over output that did not come from a running process,
+        such as a dry run or a refused command.
+
+        Args:
+            stdout: Standard output
+            stderr: Standard error
+            returncode: Exit code
+
+        Returns:
+            A stream yielding the output and then ending
+        """
+        stream = cls(None)
+        stream.returncode = returncode
+        for buffer, text in ((stream.stdout, stdout), (stream.stderr, stderr)):
+            if text:
+                data = text.encode("utf-8")
+                buffer.write(data)
+                stream._queue.put_nowait(OutputChunk(buffer.name, data, text))
+        return stream
+
+    async def _read(self, pipe: asyncio.StreamReader, buffer: OutputBuffer) -> None:
+        decoder = codecs.getincrementaldecoder("utf-8")(errors="replace")
+        try:
+            while True:
+                data = await pipe.read(self._read_size)
+                if not data:
+                    break
+                buffer.write(data)
+                # Blocks while the consumer is behind
+                await self._queue.put(OutputChunk(buffer.name, data, decoder.decode(data)))
+            rest = decoder.decode(b"", final=True)
+            if rest:
+                await self._queue.put(OutputChunk(buffer.name, b"", rest))
+        except (OSError, ValueError) as e:
+            logger.error(f"Error reading {buffer.name} of command: {str(e)}")
+        await self._queue.put(_EOF)
+
+    def __aiter__(self) -> AsyncIterator[OutputChunk]:
+        return self
+
+    async def __anext__(self) -> OutputChunk:
+        while self._open_streams or not self._queue.empty():
+            chunk = await self._queue.get()
+            if chunk is _EOF:
+                self._open_streams -= 1
+                continue
+            return chunk
+        raise StopAsyncIteration
+
+    async def wait(self) -> int:
+        """
+        Wait for the command to finish, discarding chunks not yet consumed.
+
+        Returns:
+            The exit code
+        """
+        async for _ in self:
+            pass
+        await asyncio.gather(*self._readers)
+        if self.process is not None:
+            self.returncode = await self.process.wait()
+        self.stdout.close()
+        self.stderr.close()
+        return self.returncode
+
+    async def aclose(self) -> None:
+        """Stop the command, if still running, and stop reading its output."""
+        if self.process is not None and self.process.returncode is None:
+            try:
+                self.process.kill()
+            except ProcessLookupError:
+                pass
+        for reader in self._readers:
+            reader.cancel()
+        await asyncio.gather(*self._readers, return_exceptions=True)
+        self._open_streams = 0
+        if self.process is not None:
+            self.returncode = await self.process.wait()
+        self.stdout.close()
+        self.stderr.close()
+
+    async def __aenter__(self) -> "CommandOutputStream":
+        return self
+
+    async def __aexit__(self, *exc_info: Any) -> None:
+        if self.returncode is None or self._open_streams:
+            await self.aclose()
+
+
+def remove_expired_spills(spill_dir: Optional[str], retention_days: float) -> int:
+    """
+    Delete spill files older than the retention period.
+
+    Spill files outlive their command on purpose: results, history and
+    rollback records point at them. They are removed once they expire.
+
+    Args:
+        spill_dir: Directory of the spill files (the system default if None)
+        retention_days: Age in days after which a spill file is deleted
+
+    Returns:
+        Number of files deleted
+    """
+    directory = spill_dir or tempfile.gettempdir()
+    prefixes = tuple(f"{SPILL_PREFIX}{name}-" for name in ("stdout", "stderr"))
+    cutoff = time.time() - retention_days * 86400
+    removed = 0
+    try:
+        with os.scandir(directory) as it:
+            for entry in it:
+                if not (entry.name.startswith(prefixes) and entry.name.endswith(SPILL_SUFFIX)):
+                    continue
+                try:
+                    if entry.is_file(follow_symlinks=False) and entry.stat(follow_symlinks=False).st_mtime < cutoff:
+                        os.unlink(entry.path)
+                        removed += 1
+                except OSError:
+                    continue
+    except OSError as e:
+        logger.debug(f"Could not sweep spill directory {directory}: {str(e)}")
+    if removed:
+        logger.debug(f"Removed {removed} expired spill files from {directory}")
+    return removed
+
+
+def _schedule_spill_sweep(spill_dir: Optional[str], retention_days: float) -> None:
+    """Sweep a spill directory in the background, at most once per SPILL_SWEEP_INTERVAL."""
+    key = spill_dir or ""
+    now = time.monotonic()
+    last = _last_spill_sweep.get(key)
+    if last is not None and now - last < SPILL_SWEEP_INTERVAL:
+        return
+    _last_spill_sweep[key] = now
+    asyncio.get_running_loop().run_in_executor(None, remove_expired_spills, spill_dir, retention_days)
+
+
+def create_output_stream(process: asyncio.subprocess.Process) -> CommandOutputStream:
+    """
+    Start reading the output of a process with the configured retention.
+
+    Args:
+        process: Process started with stdout and stderr pipes
+
+    Returns:
+        The process's CommandOutputStream
+    """
+    from angela.config import config_manager
+    execution_config = config_manager.config.execution
+    if execution_config.spill_output and execution_config.spill_retention_days > 0:
+        _schedule_spill_sweep(execution_config.spill_dir or None, execution_config.spill_retention_days)
+    return CommandOutputStream(
+        process,
+        max_retained_bytes=execution_config.max_retained_bytes,
+        spill=execution_config.spill_output,
+        spill_dir=execution_config.spill_dir or None
+    )
@@ -11,6 +11,7 @@ It supports rolling back different types of operations including:
 """
 import os
 import json
+import base64
 import shlex
 import uuid
 import shutil
@@ -23,14 +24,24 @@ from typing import Dict, Any, Optional, List, Tuple, Union, Set
 
 from angela.utils.logging import get_logger
 from angela.api.review import get_diff_manager
-from angela.api.execution import get_execution_engine, get_backup_dir
+from angela.api.execution import get_execution_engine, get_backup_dir, get_backup_store
+from angela.components.execution.journal import OperationLog, TransactionJournal
 
 logger = get_logger(__name__)
 
-# File to store operation history for rollback
+# Journals storing operation history and transactions for rollback
 BACKUP_DIR = get_backup_dir()
-HISTORY_FILE = BACKUP_DIR / "operation_history.json"
+HISTORY_LOG = BACKUP_DIR / "operation_history.log"
 TRANSACTION_DIR = BACKUP_DIR / "transactions"
+TRANSACTION_JOURNAL = TRANSACTION_DIR / "journal.log"
+
+# Content changes larger than this are backed up as snapshots instead of patches
+MAX_PATCH_INPUT_BYTES = 8 * 1024 * 1024
+# Patches may always be this large, even when larger than half the original
+MIN_SNAPSHOT_BYTES = 4096
+
+# Pre-journal storage, migrated on first start
+LEGACY_HISTORY_FILE = BACKUP_DIR / "operation_history.json"
 
 # Operation types
 OP_FILE_SYSTEM = "filesystem"     # File system operations (create, delete, etc.)
@@ -128,68 +139,82 @@ class Transaction:
 class RollbackManager:
     """Manager for operation history and rollback functionality."""
     
-    def __init__(self):
-        """Initialize the rollback manager."""
-        self._ensure_directories()
-        self._operations = self._load_history()
+    def __init__(
+        self,
+        history_log: Path = HISTORY_LOG,
+        transaction_journal: Path = TRANSACTION_JOURNAL
+    ):
+        """
+        Initialize the rollback manager.
+        
+        Only the operation index is read here; operation records are read
+        from the log when they are needed.
+        
+        Args:
+            history_log: Append-only operation log
+            transaction_journal: Transaction state journal
+        """
+        self._operations = OperationLog(history_log)
+        self._transaction_journal = TransactionJournal(transaction_journal)
+        self._migrate_legacy_history(history_log.parent / LEGACY_HISTORY_FILE.name,
+                                     transaction_journal.parent)
         self._transactions = self._load_transactions()
         self._active_transactions: Dict[str, Transaction] = {}
         self._command_compensations = self._load_command_compensations()
     
-    def _ensure_directories(self):
-        """Ensure the history file and transaction directory exist."""
-        BACKUP_DIR.mkdir(parents=True, exist_ok=True)
-        TRANSACTION_DIR.mkdir(parents=True, exist_ok=True)
-        if not HISTORY_FILE.exists():
-            self._save_history([])
-    
-    def _load_history(self) -> List[OperationRecord]:
-        """Load operation history from the history file."""
-        try:
-            with open(HISTORY_FILE, 'r') as f:
-                data = json.load(f)
-            
-            return [OperationRecord.from_dict(item) for item in data]
-        
-        except Exception as e:
-            logger.error(f"Error loading operation history: {str(e)}")
-            return []
-    
-    def _save_history(self, operations: List[OperationRecord]):
-        """Save operation history to the history file."""
+    def _migrate_legacy_history(self, history_file: Path, transaction_dir: Path):
+        """Move history from the JSON files used before the journals."""
         try:
-            with open(HISTORY_FILE, 'w') as f:
-                json.dump([op.to_dict() for op in operations], f, indent=2)
-        
+            if history_file.exists() and not len(self._operations):
+                with open(history_file, 'r') as f:
+                    data = json.load(f)
+                for item in data:
+                    self._operations.append(item)
+                self._operations.sync()
+                history_file.rename(history_file.with_suffix(".json.migrated"))
+                logger.info(f"Migrated {len(data)} operations to {self._operations.log_path}")
+            
+            if not self._transaction_journal.transactions:
+                legacy_files = list(transaction_dir.glob("*.json"))
+                for file in legacy_files:
+                    try:
+                        with open(file, 'r') as f:
+                            data = json.load(f)
+                        self._transaction_journal.record(data)
+                        for op_id in data.get("operation_ids", []):
+                            self._transaction_journal.record_operation(data["transaction_id"], op_id)
+                    except Exception as e:
+                        logger.error(f"Error migrating transaction {file}: {str(e)}")
+                if legacy_files:
+                    self._transaction_journal.compact()
+                    for file in legacy_files:
+                        file.rename(file.with_suffix(".json.migrated"))
         except Exception as e:
-            logger.error(f"Error saving operation history: {str(e)}")
+            logger.error(f"Error migrating operation history: {str(e)}")
     
     def _load_transactions(self) -> Dict[str, Transaction]:
-        """Load transactions from the transaction directory."""
+        """Load transactions from the transaction journal."""
         transactions = {}
-        try:
-            for file in TRANSACTION_DIR.glob("*.json"):
-                try:
-                    with open(file, 'r') as f:
-                        data = json.load(f)
-                        transaction = Transaction.from_dict(data)
-                        transactions[transaction.transaction_id] = transaction
-                except Exception as e:
-                    logger.error(f"Error loading transaction {file}: {str(e)}")
-        except Exception as e:
-            logger.error(f"Error loading transactions: {str(e)}")
+        for transaction_id, data in self._transaction_journal.transactions.items():
+            try:
+                transactions[transaction_id] = Transaction.from_dict(data)
+            except Exception as e:
+                logger.error(f"Error loading transaction {transaction_id}: {str(e)}")
         
         return transactions
     
     def _save_transaction(self, transaction: Transaction):
-        """Save a transaction to its file."""
+        """Journal the state of a transaction."""
         try:
-            file_path = TRANSACTION_DIR / f"{transaction.transaction_id}.json"
-            with open(file_path, 'w') as f:
-                json.dump(transaction.to_dict(), f, indent=2)
+            self._transaction_journal.record(transaction.to_dict())
         except Exception as e:
             logger.error(f"Error saving transaction {transaction.transaction_id}: {str(e)}")
     
+    def _get_operation(self, operation_id: int) -> Optional[OperationRecord]:
+        """Read an operation record from the operation log."""
+        data = self._operations.get(operation_id)
+        return OperationRecord.from_dict(data) if data is not None else None
+    
     def _load_command_compensations(self) -> Dict[str, str]:
         """Load command compensation rules from a file."""
         compensations = {}
@@ -306,24 +331,18 @@ class RollbackManager:
                 undo_info=undo_info or {}
             )
             
-            # Add to operations list
-            operation_id = len(self._operations)
-            self._operations.append(record)
+            # Append to the operation log
+            operation_id = self._operations.append(record.to_dict())
             
             # Update transaction if provided
             if transaction_id:
-                if transaction_id in self._active_transactions:
-                    self._active_transactions[transaction_id].operation_ids.append(operation_id)
-                    self._save_transaction(self._active_transactions[transaction_id])
-                elif transaction_id in self._transactions:
-                    self._transactions[transaction_id].operation_ids.append(operation_id)
-                    self._save_transaction(self._transactions[transaction_id])
+                transaction = self._active_transactions.get(transaction_id) or self._transactions.get(transaction_id)
+                if transaction:
+                    transaction.operation_ids.append(operation_id)
+                    self._transaction_journal.record_operation(transaction_id, operation_id)
                 else:
                     logger.warning(f"Transaction {transaction_id} not found when recording operation")
             
-            # Save updated history
-            self._save_history(self._operations)
-            
             logger.debug(f"Recorded operation: {operation_type} (ID: {operation_id})")
             return operation_id
         
@@ -387,8 +406,22 @@ class RollbackManager:
             Index of the operation in the history or None on error
         """
         try:
-            # Generate diff between original and modified content
-            diff = diff_manager.generate_diff(original_content, modified_content)
+            undo_info = {"has_changes": original_content != modified_content}
+            original_bytes = original_content.encode("utf-8", errors="surrogateescape")
+            modified_bytes = modified_content.encode("utf-8", errors="surrogateescape")
+            
+            # Store a patch from the modified back to the original content,
+            # or a snapshot of the original if the patch would not be small
+            patch = None
+            if len(original_bytes) + len(modified_bytes) <= MAX_PATCH_INPUT_BYTES:
+                patch = await asyncio.to_thread(get_diff_manager().generate_patch, modified_bytes, original_bytes)
+            if patch is not None and len(patch) <= max(MIN_SNAPSHOT_BYTES, len(original_bytes) // 2):
+                undo_info["patch"] = base64.b64encode(patch).decode("ascii")
+            else:
+                snapshot = await asyncio.to_thread(
+                    get_backup_store().snapshot_content, original_bytes, Path(file_path)
+                )
+                undo_info["snapshot"] = str(snapshot)
             
             # Record the operation
             return await self.record_operation(
@@ -399,10 +432,7 @@ class RollbackManager:
                 },
                 transaction_id=transaction_id,
                 step_id=step_id,
-                undo_info={
-                    "diff": diff,
-                    "has_changes": original_content != modified_content
-                }
+                undo_info=undo_info
             )
         
         except Exception as e:
@@ -501,6 +531,22 @@ class RollbackManager:
             logger.error(f"Error recording plan execution: {str(e)}")
             return None
     
+    def referenced_backups(self) -> List[Path]:
+        """
+        Get the backups that recorded operations reference.
+        
+        The backup store keeps these snapshots regardless of its retention
+        policy, so every operation in the history can still be rolled back.
+        
+        Returns:
+            Backup paths, in operation order
+        """
+        return [
+            Path(data["backup_path"])
+            for data in self._operations.read_range(0, len(self._operations))
+            if data.get("backup_path")
+        ]
+    
     async def get_recent_operations(self, limit: int = 10) -> List[Dict[str, Any]]:
         """
         Get a list of recent operations that can be rolled back.
@@ -512,8 +558,12 @@ class RollbackManager:
             A list of operation details.
         """
         try:
-            # Get the most recent operations, up to the limit
-            recent = self._operations[-limit:] if self._operations else []
+            # Read only the most recent operations, up to the limit
+            total = len(self._operations)
+            recent = [
+                OperationRecord.from_dict(data)
+                for data in self._operations.read_range(total - limit, total)
+            ]
             
             # Convert to a more user-friendly format
             result = []
@@ -543,7 +593,7 @@ class RollbackManager:
                         }
                 
                 result.append({
-                    "id": len(self._operations) - i - 1,  # Original index in the full list
+                    "id": total - i - 1,  # Original index in the full list
                     "timestamp": op.timestamp.strftime("%Y-%m-%d %H:%M:%S"),
                     "operation_type": op.operation_type,
                     "description": description,
@@ -738,14 +788,12 @@ class RollbackManager:
             True if the rollback was successful, False otherwise.
         """
         try:
-            # Validate the operation ID
-            if operation_id < 0 or operation_id >= len(self._operations):
+            # Get the operation record
+            op = self._get_operation(operation_id)
+            if op is None:
                 logger.error(f"Invalid operation ID: {operation_id}")
                 return False
             
-            # Get the operation record
-            op = self._operations[operation_id]
-            
             # Roll back based on operation type
             if op.operation_type == OP_FILE_SYSTEM:
                 success = await self._rollback_file_operation(op)
@@ -764,8 +812,7 @@ class RollbackManager:
                 # If this operation is part of a transaction, we don't remove it here
                 # Instead, we'll handle it in rollback_transaction
                 if not op.transaction_id:
-                    self._operations = self._operations[:operation_id]
-                    self._save_history(self._operations)
+                    self._operations.truncate(operation_id)
                 
                 logger.info(f"Successfully rolled back operation {operation_id}: {op.operation_type}")
                 return True
@@ -810,16 +857,10 @@ class RollbackManager:
                     logger.error(f"No backup path for {file_operation} operation")
                     return False
                 
-                backup_path_obj = Path(backup_path)
-                if not backup_path_obj.exists():
+                # Restore the file
+                if not await self._restore_backup(backup_path, path):
                     logger.error(f"Backup file not found: {backup_path}")
                     return False
-                
-                # Create parent directory if it doesn't exist
-                path.parent.mkdir(parents=True, exist_ok=True)
-                
-                # Restore the file
-                shutil.copy2(backup_path_obj, path)
                 logger.info(f"Restored file from backup: {path}")
                 return True
             
@@ -844,18 +885,10 @@ class RollbackManager:
                     logger.error(f"No backup path for {file_operation} operation")
                     return False
                 
-                backup_path_obj = Path(backup_path)
-                if not backup_path_obj.exists():
+                # Restore the directory, replacing any existing one
+                if not await self._restore_backup(backup_path, path):
                     logger.error(f"Backup directory not found: {backup_path}")
                     return False
-                
-                # Create parent directory if it doesn't exist
-                path.parent.mkdir(parents=True, exist_ok=True)
-                
-                # Restore the directory
-                if path.exists():
-                    shutil.rmtree(path)  # Remove existing directory first
-                shutil.copytree(backup_path_obj, path)
                 logger.info(f"Restored directory from backup: {path}")
                 return True
             
@@ -870,15 +903,8 @@ class RollbackManager:
                 
                 # Restore the destination if it was overwritten
                 if destination.exists() and backup_path:
-                    backup_path_obj = Path(backup_path)
-                    if backup_path_obj.exists():
-                        if backup_path_obj.is_file():
-                            shutil.copy2(backup_path_obj, destination)
-                            logger.info(f"Restored destination file: {destination}")
-                        else:
-                            shutil.rmtree(destination, ignore_errors=True)
-                            shutil.copytree(backup_path_obj, destination)
-                            logger.info(f"Restored destination directory: {destination}")
+                    if await self._restore_backup(backup_path, destination):
+                        logger.info(f"Restored destination: {destination}")
                 
                 # For move operations, also delete the destination
                 if file_operation == "move_file":
@@ -917,6 +943,39 @@ class RollbackManager:
             logger.exception(f"Error rolling back file operation: {str(e)}")
             return False
     
+    async def _restore_backup(self, backup_path: str, destination: Path) -> bool:
+        """
+        Restore a backup over a path.
+        
+        Args:
+            backup_path: Backup store snapshot, or a plain copy made by older versions.
+            destination: The path to restore.
+            
+        Returns:
+            True if the backup was restored, False if it does not exist.
+        """
+        backup_store = get_backup_store()
+        backup_path_obj = Path(backup_path)
+        
+        if backup_store.is_manifest(backup_path_obj):
+            if not backup_path_obj.exists():
+                return False
+            await asyncio.to_thread(backup_store.restore, backup_path_obj, destination)
+            return True
+        
+        if not backup_path_obj.exists():
+            return False
+        
+        # Create parent directory if it doesn't exist
+        destination.parent.mkdir(parents=True, exist_ok=True)
+        if backup_path_obj.is_dir():
+            if destination.exists():
+                shutil.rmtree(destination)  # Remove existing directory first
+            shutil.copytree(backup_path_obj, destination)
+        else:
+            shutil.copy2(backup_path_obj, destination)
+        return True
+    
     async def _rollback_content_manipulation(self, op: OperationRecord) -> bool:
         """
         Roll back a content manipulation operation.
@@ -938,7 +997,28 @@ class RollbackManager:
                 logger.error(f"File not found: {file_path}")
                 return False
             
-            # Check if there was a diff
+            # Restore the original content from a snapshot
+            if op.undo_info.get("snapshot"):
+                if not await self._restore_backup(op.undo_info["snapshot"], path_obj):
+                    logger.error(f"Backup not found: {op.undo_info['snapshot']}")
+                    return False
+                logger.info(f"Successfully rolled back content changes for {file_path}")
+                return True
+            
+            # Or apply the patch back to the original content
+            if op.undo_info.get("patch"):
+                current_data = path_obj.read_bytes()
+                result, success = get_diff_manager().apply_patch(
+                    current_data, base64.b64decode(op.undo_info["patch"])
+                )
+                if not success:
+                    logger.error("File changed since the operation; cannot apply the undo patch")
+                    return False
+                path_obj.write_bytes(result)
+                logger.info(f"Successfully rolled back content changes for {file_path}")
+                return True
+            
+            # Operations recorded by older versions store a unified diff
             diff = op.undo_info.get("diff")
             if not diff:
                 logger.error("No diff found in content manipulation undo info")
@@ -1091,7 +1171,8 @@ class RollbackManager:
             results = []
             
             for op_id in operation_ids:
-                if op_id >= len(self._operations):
+                op = self._get_operation(op_id)
+                if op is None:
                     logger.error(f"Invalid operation ID in transaction: {op_id}")
                     failed += 1
                     results.append({
@@ -1102,7 +1183,6 @@ class RollbackManager:
                     continue
                 
                 # Roll back this operation
-                op = self._operations[op_id]
                 description = self._get_operation_description(op)
                 
                 success = await self.rollback_operation(op_id)
@@ -1154,19 +1234,11 @@ class RollbackManager:
             path: The path of the file to back up.
             
         Returns:
-            The path of the backup file or None if backup failed.
+            The path of the backup snapshot or None if backup failed.
         """
         try:
-            # Ensure backup directory exists
-            BACKUP_DIR.mkdir(parents=True, exist_ok=True)
-            
-            # Create a unique backup filename
-            timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-            backup_name = f"{path.name}.{timestamp}.bak"
-            backup_path = BACKUP_DIR / backup_name
-            
-            # Copy the file to the backup location
-            shutil.copy2(path, backup_path)
+            # Store the file in the deduplicating backup store
+            backup_path = await asyncio.to_thread(get_backup_store().snapshot, path)
             logger.debug(f"Created backup of {path} at {backup_path}")
             
             return backup_path
@@ -1183,19 +1255,11 @@ class RollbackManager:
             path: The path of the directory to back up.
             
         Returns:
-            The path of the backup directory or None if backup failed.
+            The path of the backup snapshot or None if backup failed.
         """
         try:
-            # Ensure backup directory exists
-            BACKUP_DIR.mkdir(parents=True, exist_ok=True)
-            
-            # Create a unique backup directory name
-            timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-            backup_name = f"{path.name}.{timestamp}.bak"
-            backup_path = BACKUP_DIR / backup_name
-            
-            # Copy the directory to the backup location
-            shutil.copytree(path, backup_path)
+            # Snapshot the directory as a manifest of deduplicated file contents
+            backup_path = await asyncio.to_thread(get_backup_store().snapshot, path)
             logger.debug(f"Created backup of directory {path} at {backup_path}")
             
             return backup_path
@@ -0,0 +1,463 @@
+# angela/components/execution/sandbox_pool.py
+"""
+Warm interpreter pool for sandboxed code steps.
+
+Running a code step used to mean writing the code and its variables to a
+fresh temporary directory and starting a new interpreter, so a plan of many
+small transforms spent most of its time on interpreter startup. A
+SandboxPool keeps a few worker interpreters running instead:
+
+- requests (code plus variables) and replies travel as JSON lines over the
+  worker's stdin/stdout pipes; nothing is written to disk
+- each request runs in a fresh namespace (Python) or context (JavaScript)
+- Python workers run under rlimits (address space, CPU time, no core
+  dumps); JavaScript workers get a V8 heap limit
+- a request that exceeds its timeout kills its worker, and every worker is
+  recycled after ``max_uses`` requests, so state leaking between requests
+  (imported modules, patched globals) is bounded
+- a recycled worker is replaced in the background, so the next request
+  finds a warm interpreter
+"""
+import asyncio
+import json
+import sys
+from typing import Any, Dict, List, Optional, Set
+
+from angela.utils.logging import get_logger
+
+logger = get_logger(__name__)
+
+DEFAULT_WORKERS = 2
+DEFAULT_MAX_USES = 50
+DEFAULT_TIMEOUT = 30.0
+DEFAULT_MEMORY_LIMIT_MB = 512
+MAX_MESSAGE_BYTES = 16 * 1024 * 1024
+
+# Worker loop of a Python sandbox interpreter; run with "python -c".
+# The protocol pipes are moved off fds 0/1 so user code printing to the
+# real stdout cannot corrupt a reply.
+PYTHON_WORKER = r'''
+import io, json, os, sys, traceback, types
+
+def _set_limits(memory_mb, cpu_seconds):
+    try:
+        import resource
+    except ImportError:
+        return
+    limits = [("RLIMIT_CORE", 0)]
+    if memory_mb:
+        limits.append(("RLIMIT_AS", memory_mb * 1024 * 1024))
+    if cpu_seconds:
+        limits.append(("RLIMIT_CPU", cpu_seconds))
+    for name, value in limits:
+        if hasattr(resource, name):
+            try:
+                resource.setrlimit(getattr(resource, name), (value, value))
+            except (ValueError, OSError):
+                pass
+
+def _exportable(name, value):
+    return not (name.startswith("_") or isinstance(value, types.ModuleType) or callable(value))
+
+def _run(request):
+    namespace = {"__name__": "__sandbox__", "__builtins__": __builtins__}
+    namespace.update(request.get("variables") or {})
+    stdout, stderr = io.StringIO(), io.StringIO()
+    reply = {"success": False}
+    sys.stdout, sys.stderr = stdout, stderr
+    try:
+        exec(compile(request["code"], "<sandbox>", "exec"), namespace)
+        reply["success"] = True
+    except BaseException as e:
+        reply["error"] = str(e) or type(e).__name__
+        reply["traceback"] = traceback.format_exc()
+    finally:
+        sys.stdout, sys.stderr = sys.__stdout__, sys.__stderr__
+    reply["stdout"] = stdout.getvalue()
+    reply["stderr"] = stderr.getvalue()
+    reply["variables"] = {k: v for k, v in namespace.items() if _exportable(k, v)}
+    for name in ("result", "output"):
+        if name in namespace:
+            reply[name] = namespace[name]
+    return reply
+
+def _main():
+    settings = json.loads(sys.argv[1])
+    _set_limits(settings.get("memory_mb"), settings.get("cpu_seconds"))
+    channel_in = os.fdopen(os.dup(0), "rb")
+    channel_out = os.fdopen(os.dup(1), "wb")
+    devnull = os.open(os.devnull, os.O_RDWR)
+    os.dup2(devnull, 0)
+    os.dup2(devnull, 1)
+    for line in channel_in:
+        try:
+            reply = _run(json.loads(line))
+            data = json.dumps(reply, default=str)
+        except Exception as e:
+            data = json.dumps({"success": False, "error": "Invalid sandbox result: " + str(e)})
+        channel_out.write(data.encode("utf-8") + b"\n")
+        channel_out.flush()
+
+_main()
+'''
+
+# Worker loop of a JavaScript sandbox interpreter; run with "node -e".
+# Each request runs in a new context holding the Node globals; the reply is
+# sent once a returned promise has settled and the timers and I/O the code
+# started have finished.
+JAVASCRIPT_WORKER = r'''
+const path = require('path');
+const readline = require('readline');
+const vm = require('vm');
+
+// Node globals (process, Buffer, timers, URL, TextEncoder, ...) that a new
+// context lacks; code runs with them as it would in a script file
+const BUILTINS = new Set(Object.getOwnPropertyNames(vm.runInNewContext('globalThis')));
+const NODE_GLOBALS = Object.getOwnPropertyNames(globalThis).filter(
+    name => !BUILTINS.has(name) && name !== 'global' && name !== 'globalThis'
+);
+const HIDDEN = new Set([...NODE_GLOBALS, 'global', 'console', 'require', 'module', 'exports', '__filename', '__dirname']);
+
+// Replies are written with the real stdout; the code's own writes are captured
+const writeReply = process.stdout.write.bind(process.stdout);
+let current = null;
+
+process.stdout.write = (chunk, ...rest) => capture('stdout', chunk, rest);
+process.stderr.write = (chunk, ...rest) => capture('stderr', chunk, rest);
+process.on('uncaughtException', fail);
+process.on('unhandledRejection', fail);
+
+function capture(stream, chunk, rest) {
+    if (current) current[stream] += String(chunk);
+    const callback = rest.find(arg => typeof arg === 'function');
+    if (callback) process.nextTick(callback);
+    return true;
+}
+
+function fail(error) {
+    if (current && current.error === undefined) {
+        current.error = error && error.message !== undefined ? error.message : String(error);
+        current.stack = error && error.stack;
+    }
+}
+
+const format = (args) => args.map(arg =>
+    typeof arg === 'object' ? JSON.stringify(arg) : String(arg)
+).join(' ');
+
+function replacer() {
+    // Objects on the path to the current value; repeated (non-circular) references are fine
+    const ancestors = [];
+    return function (key, value) {
+        if (typeof value === 'function') return undefined;
+        if (typeof value !== 'object' || value === null) return value;
+        while (ancestors.length > 0 && ancestors[ancestors.length - 1] !== this) ancestors.pop();
+        if (ancestors.includes(value)) return '[Circular]';
+        ancestors.push(value);
+        return value;
+    };
+}
+
+function countResources() {
+    const counts = new Map();
+    for (const type of process.getActiveResourcesInfo()) counts.set(type, (counts.get(type) || 0) + 1);
+    return counts;
+}
+
+// Wait until the timers, I/O and other handles the code started have finished
+async function drain(baseline) {
+    for (;;) {
+        // Inside an immediate callback, only the code's own handles are left over
+        await new Promise(resolve => setImmediate(resolve));
+        const pending = [...countResources()].some(([type, count]) => count > (baseline.get(type) || 0));
+        if (!pending) return;
+        await new Promise(resolve => setTimeout(resolve, 5));
+    }
+}
+
+async function run(request) {
+    current = {stdout: '', stderr: '', error: undefined};
+    const filename = path.join(process.cwd(), 'sandbox.js');
+    const sandbox = {};
+    for (const name of NODE_GLOBALS) sandbox[name] = globalThis[name];
+    Object.assign(sandbox, request.variables || {});
+    sandbox.global = sandbox;
+    sandbox.require = require;
+    sandbox.module = {exports: {}};
+    sandbox.exports = sandbox.module.exports;
+    sandbox.__filename = filename;
+    sandbox.__dirname = path.dirname(filename);
+    sandbox.console = {
+        log: (...args) => capture('stdout', format(args) + '\n', []),
+        info: (...args) => capture('stdout', format(args) + '\n', []),
+        warn: (...args) => capture('stderr', format(args) + '\n', []),
+        error: (...args) => capture('stderr', format(args) + '\n', []),
+    };
+
+    const baseline = countResources();
+    try {
+        const value = vm.runInNewContext(request.code, sandbox, {filename, timeout: request.timeout_ms});
+        // The parent's timeout covers the asynchronous part as well
+        if (value && typeof value.then === 'function') await value;
+        await drain(baseline);
+    } catch (error) {
+        fail(error);
+    }
+
+    const reply = {success: current.error === undefined, stdout: current.stdout, stderr: current.stderr};
+    if (current.error !== undefined) {
+        reply.error = current.error;
+        reply.stack = current.stack;
+    }
+    current = null;
+    reply.variables = {};
+    for (const key of Object.keys(sandbox)) {
+        if (key.startsWith('_') || HIDDEN.has(key) || typeof sandbox[key] === 'function') continue;
+        reply.variables[key] = sandbox[key];
+    }
+    if ('result' in sandbox) reply.result = sandbox.result;
+    if ('output' in sandbox) reply.output = sandbox.output;
+    return reply;
+}
+
+let queue = Promise.resolve();
+readline.createInterface({input: process.stdin, terminal: false}).on('line', (line) => {
+    queue = queue.then(async () => {
+        let data;
+        try {
+            data = JSON.stringify(await run(JSON.parse(line)), replacer());
+        } catch (error) {
+            data = JSON.stringify({success: false, error: 'Invalid sandbox result: ' + error.message});
+        }
+        writeReply(data + '\n');
+    });
+});
+'''
+
+
+class SandboxError(Exception):
+    """A sandbox worker died or broke the protocol."""
+
+
+class SandboxWorker:
+    """One warm interpreter process."""
+
+    def __init__(self, argv: List[str]):
+        self.argv = argv
+        self.uses = 0
+        self.process: Optional[asyncio.subprocess.Process] = None
+
+    async def start(self) -> None:
+        self.process = await asyncio.create_subprocess_exec(
+            *self.argv,
+            stdin=asyncio.subprocess.PIPE,
+            stdout=asyncio.subprocess.PIPE,
+            stderr=asyncio.subprocess.DEVNULL,
+            limit=MAX_MESSAGE_BYTES
+        )
+
+    @property
+    def alive(self) -> bool:
+        return self.process is not None and self.process.returncode is None
+
+    async def call(self, request: Dict[str, Any]) -> Dict[str, Any]:
+        """Send a request and wait for its reply."""
+        self.uses += 1
+        try:
+            self.process.stdin.write(json.dumps(request, default=str).encode("utf-8") + b"\n")
+            await self.process.stdin.drain()
+            line = await self.process.stdout.readline()
+        except (ConnectionError, ValueError) as e:
+            raise SandboxError(f"Sandbox worker failed: {str(e)}")
+        if not line:
+            raise SandboxError("Sandbox worker exited unexpectedly")
+        return json.loads(line)
+
+    def kill(self) -> None:
+        if self.alive:
+            try:
+                self.process.kill()
+            except ProcessLookupError:
+                pass
+
+
+class SandboxPool:
+    """Pool of warm, resource-limited interpreters running code with variables."""
+
+    def __init__(
+        self,
+        language: str = "python",
+        workers: int = DEFAULT_WORKERS,
+        max_uses: int = DEFAULT_MAX_USES,
+        timeout: float = DEFAULT_TIMEOUT,
+        memory_limit_mb: int = DEFAULT_MEMORY_LIMIT_MB
+    ):
+        """
+        Initialize the pool. Workers are started on first use.
+
+        Args:
+            language: "python" or "javascript"
+            workers: Maximum number of worker interpreters
+            max_uses: Requests served by a worker before it is replaced
+            timeout: Default seconds a request may run
+            memory_limit_mb: Memory limit of a worker (0 for none)
+        """
+        if language not in ("python", "javascript"):
+            raise ValueError(f"Unsupported sandbox language: {language}")
+        self._logger = logger
+        self.language = language
+        self.workers = max(1, workers)
+        self.max_uses = max(1, max_uses)
+        self.timeout = timeout
+        self.memory_limit_mb = memory_limit_mb
+
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._slots: Optional[asyncio.Semaphore] = None
+        self._idle: List[SandboxWorker] = []
+        self._busy: Set[SandboxWorker] = set()
+        self._refills: Set[asyncio.Task] = set()
+
+    def _argv(self) -> List[str]:
+        if self.language == "python":
+            settings = {
+                "memory_mb": self.memory_limit_mb,
+                # Bounds the CPU time of a worker's whole life, as rlimits are cumulative
+                "cpu_seconds": int(self.timeout * self.max_uses) + 1
+            }
+            return [sys.executable, "-c", PYTHON_WORKER, json.dumps(settings)]
+        argv = ["node"]
+        if self.memory_limit_mb:
+            argv.append(f"--max-old-space-size={self.memory_limit_mb}")
+        return argv + ["-e", JAVASCRIPT_WORKER]
+
+    def _bind_loop(self) -> None:
+        # Worker pipes belong to the event loop that started them
+        loop = asyncio.get_running_loop()
+        if loop is self._loop:
+            return
+        self._discard_workers()
+        self._loop = loop
+        self._slots = asyncio.Semaphore(self.workers)
+
+    async def _spawn(self) -> SandboxWorker:
+        worker = SandboxWorker(self._argv())
+        await worker.start()
+        return worker
+
+    async def _acquire(self) -> SandboxWorker:
+        while self._idle:
+            worker = self._idle.pop()
+            if worker.alive:
+                self._busy.add(worker)
+                return worker
+        worker = await self._spawn()
+        self._busy.add(worker)
+        return worker
+
+    def _release(self, worker: SandboxWorker, reuse: bool) -> None:
+        self._busy.discard(worker)
+        if reuse and worker.alive and worker.uses < self.max_uses:
+            self._idle.append(worker)
+            return
+        worker.kill()
+        if len(self._idle) + len(self._busy) + len(self._refills) < self.workers:
+            task = asyncio.create_task(self._refill())
+            self._refills.add(task)
+            task.add_done_callback(self._refills.discard)
+
+    async def _refill(self) -> None:
+        try:
+            self._idle.append(await self._spawn())
+        except Exception as e:
+            self._logger.warning(f"Could not start {self.language} sandbox worker: {str(e)}")
+
+    async def warm(self, count: Optional[int] = None) -> None:
+        """
+        Start idle workers ahead of use.
+
+        Args:
+            count: Number of workers to have ready (all of them by default)
+        """
+        self._bind_loop()
+        missing = min(count or self.workers, self.workers) - len(self._idle) - len(self._busy)
+        if missing > 0:
+            self._idle.extend(await asyncio.gather(*(self._spawn() for _ in range(missing))))
+
+    async def run(
+        self,
+        code: str,
+        variables: Optional[Dict[str, Any]] = None,
+        timeout: Optional[float] = None
+    ) -> Dict[str, Any]:
+        """
+        Run code in a worker.
+
+        Args:
+            code: Source code to run
+            variables: JSON-serializable variables visible to the code
+            timeout: Seconds the code may run (the pool default if None)
+
+        Returns:
+            Dictionary with success, stdout, stderr, variables (the names the
+            code left behind), result/output if the code set them, and
+            error details on failure
+        """
+        self._bind_loop()
+        timeout = timeout or self.timeout
+        request = {"code": code, "variables": variables or {}, "timeout_ms": int(timeout * 1000)}
+
+        async with self._slots:
+            try:
+                worker = await self._acquire()
+            except OSError as e:
+                return {"success": False, "error": f"Could not start {self.language} sandbox: {str(e)}"}
+
+            reuse = False
+            try:
+                reply = await asyncio.wait_for(worker.call(request), timeout)
+                reuse = True
+                return reply
+            except asyncio.TimeoutError:
+                return {"success": False, "error": f"Code execution timed out after {timeout} seconds"}
+            except SandboxError as e:
+                return {"success": False, "error": str(e)}
+            finally:
+                self._release(worker, reuse)
+
+    def _discard_workers(self) -> None:
+        for worker in self._idle + list(self._busy):
+            worker.kill()
+        for task in self._refills:
+            task.cancel()
+        self._idle.clear()
+        self._busy.clear()
+        self._refills.clear()
+
+    async def close(self) -> None:
+        """Stop all workers."""
+        workers = self._idle + list(self._busy)
+        self._discard_workers()
+        for worker in workers:
+            if worker.process is not None:
+                await worker.process.wait()
+
+
+def create_sandbox_pool(language: str) -> SandboxPool:
+    """
+    Create a sandbox pool from the application configuration.
+
+    Args:
+        language: "python" or "javascript"
+
+    Returns:
+        A SandboxPool configured by the execution.sandbox_* settings
+    """
+    from angela.config import config_manager
+    config = config_manager.config.execution
+    return SandboxPool(
+        language,
+        workers=config.sandbox_workers,
+        max_uses=config.sandbox_max_uses,
+        timeout=config.sandbox_timeout,
+        memory_limit_mb=config.sandbox_memory_mb
+    )
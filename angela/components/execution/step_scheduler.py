@@ -0,0 +1,311 @@
+# angela/components/execution/step_scheduler.py
+"""
+Parallel execution of dependent plan steps.
+
+Plan executors used to rescan all pending steps for satisfied dependencies
+and then await the ready steps one after another, so independent steps never
+overlapped. StepScheduler runs a step graph as a DAG:
+
+- in-degree counters: finishing a step decrements its dependents, and a step
+  starts as soon as its last dependency has completed
+- at most ``max_parallel`` steps run at once (a semaphore)
+- steps naming the same resource (e.g. ``file:/abs/path``) never run at the
+  same time, so conflicting writes are serialized; locks are taken in sorted
+  order, so steps with several resources cannot deadlock
+- when a critical step fails, the running steps are cancelled and nothing
+  else is started
+- the run is timed per step, with the critical path: the chain of
+  dependent steps that determined the total run time
+
+Steps run only once activated: entry points are activated from the start,
+a completed step activates its dependents, and a step's outcome can
+activate further steps (the chosen branch of a decision). A decision lists
+its branches; a branch step runs only if the decision's outcome activates it,
+even when it depends on the decision. The branches not taken are skipped,
+and so is everything that depends only on skipped steps.
+"""
+import asyncio
+import time
+from collections import defaultdict
+from dataclasses import dataclass, field
+from typing import Any, Awaitable, Callable, Dict, Iterable, List, Optional, Sequence, Set, Tuple
+
+from angela.utils.logging import get_logger
+
+logger = get_logger(__name__)
+
+DEFAULT_MAX_PARALLEL = 4
+
+
+@dataclass
+class ScheduledStep:
+    """A node of the step graph."""
+    id: str
+    dependencies: Sequence[str] = ()
+    resources: Sequence[str] = ()  # Steps sharing a resource do not overlap
+    critical: bool = True          # A failure cancels the run
+    branches: Sequence[str] = ()   # A decision's branch steps; only those its outcome activates run
+
+
+@dataclass
+class StepOutcome:
+    """What the scheduler needs to know about a finished step."""
+    success: bool
+    activate: Sequence[str] = ()   # Further steps to run, e.g. a decision's branch
+
+
+@dataclass
+class StepTiming:
+    """When a step became ready, started and ended, in seconds from the start of the run."""
+    ready: float
+    start: float
+    end: Optional[float] = None
+
+    @property
+    def duration(self) -> float:
+        return (self.end if self.end is not None else self.start) - self.start
+
+    @property
+    def queued(self) -> float:
+        """Time spent waiting for a free slot or a resource."""
+        return self.start - self.ready
+
+
+@dataclass
+class ScheduleReport:
+    """Result of a scheduled run."""
+    completed: List[str] = field(default_factory=list)   # In completion order
+    failed: List[str] = field(default_factory=list)
+    cancelled: List[str] = field(default_factory=list)
+    skipped: List[str] = field(default_factory=list)     # On a decision branch not taken
+    not_run: List[str] = field(default_factory=list)     # Never activated, or blocked
+    failed_step: Optional[str] = None                    # The critical failure that stopped the run
+    timings: Dict[str, StepTiming] = field(default_factory=dict)
+    predecessors: Dict[str, List[str]] = field(default_factory=dict)
+    wall_time: float = 0.0
+
+    @property
+    def success(self) -> bool:
+        return self.failed_step is None
+
+    def critical_path(self) -> Tuple[List[str], float]:
+        """
+        Get the longest chain of dependent steps by run time.
+
+        Returns:
+            (step ids from first to last, total run time of the chain)
+        """
+        finished = {step_id: t for step_id, t in self.timings.items() if t.end is not None}
+        path_time: Dict[str, float] = {}
+        previous: Dict[str, Optional[str]] = {}
+        # A step starts after its predecessors end, so start order is topological
+        for step_id in sorted(finished, key=lambda s: finished[s].start):
+            best, best_time = None, 0.0
+            for pred in self.predecessors.get(step_id, ()):
+                if pred in path_time and path_time[pred] > best_time:
+                    best, best_time = pred, path_time[pred]
+            path_time[step_id] = best_time + finished[step_id].duration
+            previous[step_id] = best
+
+        if not path_time:
+            return [], 0.0
+        last = max(path_time, key=path_time.get)
+        path = []
+        step: Optional[str] = last
+        while step is not None:
+            path.append(step)
+            step = previous[step]
+        return path[::-1], path_time[last]
+
+    def timing_report(self) -> Dict[str, Any]:
+        """
+        Summarize the run times.
+
+        Returns:
+            Dictionary with wall time, summed step time, achieved
+            parallelism, the critical path and per-step timings
+        """
+        path, path_time = self.critical_path()
+        step_time = sum(t.duration for t in self.timings.values())
+        return {
+            "wall_time": round(self.wall_time, 4),
+            "step_time": round(step_time, 4),
+            "parallelism": round(step_time / self.wall_time, 2) if self.wall_time > 0 else 1.0,
+            "critical_path": path,
+            "critical_path_time": round(path_time, 4),
+            "steps": {
+                step_id: {
+                    "start": round(t.start, 4),
+                    "end": round(t.end, 4) if t.end is not None else None,
+                    "duration": round(t.duration, 4),
+                    "queued": round(t.queued, 4)
+                }
+                for step_id, t in self.timings.items()
+            }
+        }
+
+
+class StepScheduler:
+    """Runs a graph of steps in dependency order with bounded parallelism."""
+
+    def __init__(self, max_parallel: int = DEFAULT_MAX_PARALLEL):
+        """
+        Initialize the scheduler.
+
+        Args:
+            max_parallel: Maximum number of steps running at once
+        """
+        self._logger = logger
+        self.max_parallel = max(1, max_parallel)
+
+    async def run(
+        self,
+        steps: Dict[str, ScheduledStep],
+        run_step: Callable[[str], Awaitable[StepOutcome]],
+        entry_points: Iterable[str],
+        can_start: Optional[Callable[[str], bool]] = None
+    ) -> ScheduleReport:
+        """
+        Run the steps.
+
+        Args:
+            steps: The step graph by step id
+            run_step: Coroutine function running a step by id; an exception
+                counts as a failure
+            entry_points: Steps activated from the start
+            can_start: Extra readiness check, re-evaluated whenever a step finishes
+
+        Returns:
+            The run's ScheduleReport
+        """
+        report = ScheduleReport()
+        started_at = time.monotonic()
+        semaphore = asyncio.Semaphore(self.max_parallel)
+        locks: Dict[str, asyncio.Lock] = defaultdict(asyncio.Lock)
+
+        remaining: Dict[str, int] = {}
+        dependents: Dict[str, List[str]] = defaultdict(list)
+        for step_id, step in steps.items():
+            deps = list(dict.fromkeys(step.dependencies))
+            remaining[step_id] = len(deps)
+            report.predecessors[step_id] = deps
+            for dep in deps:
+                dependents[dep].append(step_id)
+            missing = [dep for dep in deps if dep not in steps]
+            if missing:
+                self._logger.warning(f"Step {step_id} depends on unknown steps {missing} and cannot run")
+
+        activated: Dict[str, None] = dict.fromkeys(s for s in entry_points if s in steps)
+        waiting: Dict[str, float] = {}      # Ready but held back by can_start, since when
+        started: Set[str] = set()
+        skipped: Set[str] = set()
+        running: Dict[asyncio.Task, str] = {}
+
+        def skip(step_id: str) -> None:
+            if step_id not in steps or step_id in started or step_id in skipped:
+                return
+            skipped.add(step_id)
+            report.skipped.append(step_id)
+            activated.pop(step_id, None)
+            waiting.pop(step_id, None)
+            # A skipped dependency counts as resolved, but does not activate
+            for dependent in dependents.get(step_id, ()):
+                remaining[dependent] -= 1
+                if remaining[dependent] == 0 and dependent not in activated:
+                    skip(dependent)
+
+        async def execute(step_id: str) -> StepOutcome:
+            step = steps[step_id]
+            acquired: List[asyncio.Lock] = []
+            try:
+                for resource in sorted(set(step.resources)):
+                    await locks[resource].acquire()
+                    acquired.append(locks[resource])
+                async with semaphore:
+                    report.timings[step_id].start = time.monotonic() - started_at
+                    try:
+                        return await run_step(step_id)
+                    finally:
+                        report.timings[step_id].end = time.monotonic() - started_at
+            finally:
+                for lock in reversed(acquired):
+                    lock.release()
+
+        def start_ready() -> None:
+            now = time.monotonic() - started_at
+            for step_id in list(activated):
+                if step_id in started or step_id in skipped or remaining[step_id] > 0:
+                    continue
+                ready_since = waiting.setdefault(step_id, now)
+                if can_start is not None and not can_start(step_id):
+                    continue
+                waiting.pop(step_id)
+                started.add(step_id)
+                report.timings[step_id] = StepTiming(ready=ready_since, start=ready_since)
+                running[asyncio.create_task(execute(step_id))] = step_id
+
+        start_ready()
+        while running:
+            done, _ = await asyncio.wait(running, return_when=asyncio.FIRST_COMPLETED)
+            for task in done:
+                step_id = running.pop(task)
+                try:
+                    outcome = task.result()
+                except Exception as e:
+                    self._logger.exception(f"Step {step_id} raised: {str(e)}")
+                    outcome = StepOutcome(success=False)
+
+                if outcome.success:
+                    report.completed.append(step_id)
+                    branches = list(dict.fromkeys(steps[step_id].branches))
+                    for dependent in dependents.get(step_id, ()):
+                        remaining[dependent] -= 1
+                        if dependent not in branches:
+                            activated[dependent] = None
+                    for next_step in outcome.activate:
+                        if next_step in steps and next_step not in skipped:
+                            activated[next_step] = None
+                            if step_id not in report.predecessors[next_step]:
+                                report.predecessors[next_step].append(step_id)
+                    for branch in branches:
+                        if branch not in outcome.activate:
+                            skip(branch)
+                    continue
+
+                report.failed.append(step_id)
+                if steps[step_id].critical and report.failed_step is None:
+                    report.failed_step = step_id
+
+            if report.failed_step is not None:
+                await self._cancel(running, report)
+                break
+            start_ready()
+
+        report.not_run = [step_id for step_id in steps if step_id not in started and step_id not in skipped]
+        report.wall_time = time.monotonic() - started_at
+        return report
+
+    async def _cancel(self, running: Dict[asyncio.Task, str], report: ScheduleReport) -> None:
+        """Cancel the running steps after a critical failure."""
+        for task in running:
+            task.cancel()
+        results = await asyncio.gather(*running, return_exceptions=True)
+        for (task, step_id), result in zip(list(running.items()), results):
+            if isinstance(result, asyncio.CancelledError):
+                report.cancelled.append(step_id)
+            elif isinstance(result, StepOutcome) and result.success:
+                report.completed.append(step_id)
+            else:
+                report.failed.append(step_id)
+        running.clear()
+
+
+def create_step_scheduler() -> StepScheduler:
+    """
+    Create a step scheduler from the application configuration.
+
+    Returns:
+        A StepScheduler running at most execution.max_parallel_steps steps at once
+    """
+    from angela.config import config_manager
+    return StepScheduler(max_parallel=config_manager.config.execution.max_parallel_steps)
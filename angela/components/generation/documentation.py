@@ -12,12 +12,14 @@ from typing import Dict, Any, List, Optional, Tuple, Union
 import json
 import re
 
-from angela.api.ai import get_gemini_client, get_gemini_request_class
+from angela.api.ai import get_gemini_client, get_gemini_request_class, get_llm_priority_enum, get_llm_priority_func
 from angela.utils.logging import get_logger
 from angela.api.context import get_context_manager, get_file_detector
 
 logger = get_logger(__name__)
 GeminiRequest = get_gemini_request_class()
+Priority = get_llm_priority_enum()
+llm_priority = get_llm_priority_func()
 
 class DocumentationGenerator:
     """
@@ -62,7 +64,7 @@ class DocumentationGenerator:
         )
         
         self._logger.debug("Sending README generation request to AI service")
-        response = await gemini_client.generate_text(api_request)
+        response = await get_gemini_client().generate_text(api_request)
         
         # Extract README content from the response
         readme_content = self._extract_markdown_content(response.text)
@@ -158,7 +160,7 @@ class DocumentationGenerator:
         )
         
         self._logger.debug("Sending user guide generation request to AI service")
-        response = await gemini_client.generate_text(api_request)
+        response = await get_gemini_client().generate_text(api_request)
         
         # Extract user guide content from the response
         guide_content = self._extract_markdown_content(response.text)
@@ -203,7 +205,7 @@ class DocumentationGenerator:
         )
         
         self._logger.debug("Sending contributing guide generation request to AI service")
-        response = await gemini_client.generate_text(api_request)
+        response = await get_gemini_client().generate_text(api_request)
         
         # Extract contributing guide content from the response
         guide_content = self._extract_markdown_content(response.text)
@@ -1477,7 +1479,8 @@ Package: `{package_name}`
         Returns:
             Dictionary mapping file names to documentation content
         """
-        dir_docs = {}
+        doc_names = []
+        tasks = []
         
         for file_info in files:
             file_path = file_info.get("path", "")
@@ -1488,14 +1491,17 @@ Package: `{package_name}`
             
             # Extract file name without extension
             file_name = os.path.basename(file_path)
-            doc_name = os.path.splitext(file_name)[0]
+            doc_names.append(os.path.splitext(file_name)[0] + ".md")
             
             # Generate markdown using AI
-            markdown = await self._generate_file_docs_with_ai(file_info)
-            
-            dir_docs[doc_name + ".md"] = markdown
+            tasks.append(self._generate_file_docs_with_ai(file_info))
         
-        return dir_docs
+        # Run the per-file requests concurrently at background priority; the
+        # request scheduler keeps them within the API quota
+        with llm_priority(Priority.BACKGROUND):
+            results = await asyncio.gather(*tasks)
+        
+        return dict(zip(doc_names, results))
     
     def _generate_generic_docs_index(self, directories: Dict[str, List[Dict[str, Any]]], project_name: str) -> str:
         """
@@ -1580,7 +1586,7 @@ DO NOT reproduce the entire file content - focus on documenting functionality an
         )
         
         self._logger.debug(f"Sending file documentation request to AI for {file_path}")
-        response = await gemini_client.generate_text(api_request)
+        response = await get_gemini_client().generate_text(api_request)
         
         # Extract documentation
         return response.text
@@ -16,13 +16,15 @@ import sys
 # Import models from the new models module instead of defining them here
 from angela.components.generation.models import CodeFile, CodeProject
 from angela.components.generation.validators import validate_code
-from angela.api.ai import get_gemini_client, get_gemini_request_class
+from angela.api.ai import get_gemini_client, get_gemini_request_class, get_llm_priority_enum, get_llm_priority_func
 from angela.api.context import get_context_manager, get_context_enhancer
 from angela.utils.logging import get_logger
 from angela.api.execution import get_filesystem_functions
 
 logger = get_logger(__name__)
 GeminiRequest = get_gemini_request_class()
+Priority = get_llm_priority_enum()
+llm_priority = get_llm_priority_func()
 
 
 class CodeGenerationEngine:
@@ -426,8 +428,10 @@ class CodeGenerationEngine:
                 )
                 tasks.append(task)
             
-            # Wait for all tasks in this batch to complete
-            results = await asyncio.gather(*tasks)
+            # Wait for all tasks in this batch to complete; the request scheduler
+            # bounds how many of them are in flight at once
+            with llm_priority(Priority.BACKGROUND):
+                results = await asyncio.gather(*tasks)
             
             # Update file contents
             for file, content in zip(batch, results):
@@ -1849,8 +1853,10 @@ If no specific framework is clearly indicated, return "None".
                 )
                 tasks.append(task)
             
-            # Wait for all tasks in this batch to complete
-            results = await asyncio.gather(*tasks)
+            # Wait for all tasks in this batch to complete; the request scheduler
+            # bounds how many of them are in flight at once
+            with llm_priority(Priority.BACKGROUND):
+                results = await asyncio.gather(*tasks)
             
             # Update file contents
             for file, content in zip(batch, results):
@@ -2250,22 +2256,12 @@ For services/utilities:
         """
         self._logger.info(f"Generating summaries for {len(project.files)} files")
         
-        summaries = {}
+        # Generate all summaries concurrently; the request scheduler keeps the
+        # number of in-flight calls within the API quota
+        with llm_priority(Priority.BACKGROUND):
+            results = await asyncio.gather(*(self._generate_file_summary(file) for file in project.files))
         
-        # Process files in batches to avoid overwhelming the API
-        batch_size = 10
-        for i in range(0, len(project.files), batch_size):
-            batch = project.files[i:i+batch_size]
-            
-            # Generate summaries concurrently
-            tasks = [self._generate_file_summary(file) for file in batch]
-            batch_summaries = await asyncio.gather(*tasks)
-            
-            # Add to results
-            for file, summary in zip(batch, batch_summaries):
-                summaries[file.path] = summary
-        
-        return summaries
+        return {file.path: summary for file, summary in zip(project.files, results)}
     
     async def _generate_file_summary(self, file: CodeFile) -> str:
         """
@@ -2299,7 +2295,7 @@ Keep your response to 1-2 sentences maximum.
             temperature=0.2
         )
         
-        response = await gemini_client.generate_text(api_request)
+        response = await get_gemini_client().generate_text(api_request)
         
         # Return cleaned summary
         return response.text.strip()
@@ -13,6 +13,7 @@ import json
 import shlex
 import asyncio
 import tempfile
+import shutil
 import subprocess
 from pathlib import Path
 from typing import Dict, Any, List, Tuple, Optional, Set, Union, Callable
@@ -21,7 +22,6 @@ import uuid
 import logging
 import aiohttp
 from enum import Enum
-import sys
 
 from pydantic import BaseModel, Field, ValidationError, validator
 
@@ -30,7 +30,10 @@ from angela.components.intent.models import ActionPlan, Intent, IntentType
 from angela.api.ai import get_gemini_client, get_gemini_request_class, get_parse_ai_response_func, get_build_prompt_func
 from angela.api.context import get_context_manager, get_file_resolver
 from angela.api.safety import get_validate_command_safety_func, get_command_risk_classifier
-from angela.api.execution import get_execution_engine, get_error_recovery_manager, get_rollback_manager
+from angela.api.execution import (
+    get_execution_engine, get_error_recovery_manager, get_rollback_manager,
+    get_step_scheduler, get_scheduled_step_classes, get_sandbox_pool
+)
 from angela.core.registry import registry
 from angela.utils.logging import get_logger
 
@@ -507,6 +510,7 @@ Ensure the plan handles potential errors and provides clear decision branches fo
         """
         # Get error recovery manager through API layer
         error_recovery_manager = self._get_error_recovery_manager()
+        ScheduledStep, StepOutcome = get_scheduled_step_classes()
     
         self._logger.info(f"Executing advanced plan: {plan.goal} (ID: {plan.id})")
         start_time = datetime.now()
@@ -531,216 +535,169 @@ Ensure the plan handles potential errors and provides clear decision branches fo
         
         # Initialize execution state
         results = {}
-        completed_steps = set()
-        pending_steps = {}
         execution_path = []
+        failure: Dict[str, Any] = {}
         
-        # Initialize with entry points
-        for entry_point in plan.entry_points:
-            if entry_point in plan.steps:
-                pending_steps[entry_point] = plan.steps[entry_point]
-        
-        # Execute steps until all are completed or no more can be executed
-        while pending_steps:
-            # Find steps that can be executed (all dependencies satisfied)
-            executable_steps = {}
-            for step_id, step in pending_steps.items():
-                if all(dep in completed_steps for dep in step.dependencies):
-                    executable_steps[step_id] = step
-            
-            # If no steps can be executed, we're stuck (circular dependencies or missing steps)
-            if not executable_steps:
-                self._logger.warning("No executable steps found, possible circular dependencies")
-                break
-            
-            # Execute all executable steps
-            newly_completed_steps = []
-            
-            for step_id, step in executable_steps.items():
-                self._logger.info(f"Executing step {step_id}: {step.type} - {step.description}")
+        async def run_step(step_id: str) -> StepOutcome:
+            step = plan.steps[step_id]
+            self._logger.info(f"Executing step {step_id}: {step.type} - {step.description}")
+            
+            # Each step gets its own view of the shared context, as steps run concurrently
+            step_context = context.model_copy(update={
+                "step_id": step_id,
+                "execution_path": execution_path.copy()
+            })
+            
+            # Execute the step with enhanced error handling
+            start_step_time = datetime.now()
+            try:
+                result = await self._execute_advanced_step(
+                    step=step,
+                    context=step_context
+                )
+            except Exception as e:
+                self._logger.exception(f"Error executing step {step_id}: {str(e)}")
+                self._execution_stats["errors"] += 1
+                result = {
+                    "step_id": step_id,
+                    "type": step.type,
+                    "description": step.description,
+                    "error": str(e),
+                    "success": False
+                }
+            
+            # Calculate execution time
+            execution_time = (datetime.now() - start_step_time).total_seconds()
+            
+            # Add execution time to result
+            if isinstance(result, dict) and "execution_time" not in result:
+                result["execution_time"] = execution_time
+            
+            # Store the result
+            results[step_id] = result
+            context.results[step_id] = result
+            
+            # Update execution path
+            execution_path.append(step_id)
+            
+            # Check for next steps based on step type
+            next_steps: List[str] = []
+            if step.type == PlanStepType.DECISION:
+                # Decision step might have conditional branches
+                condition_result = result.get("condition_result", False)
+                branch_key = "true_branch" if condition_result else "false_branch"
+                next_steps = getattr(step, branch_key, None) or []
                 
-                # Update execution context for this step
-                context.step_id = step_id
-                context.execution_path = execution_path.copy()
+                self._logger.debug(f"Decision step {step_id} evaluated to {condition_result}, following {branch_key}")
+            
+            elif step.type == PlanStepType.LOOP:
+                # Loop execution will use recursion
+                loop_result = result.get("loop_results", [])
+                self._logger.debug(f"Loop step {step_id} executed {len(loop_result)} iterations")
+            
+            # Update execution stats
+            self._execution_stats["executed_steps"] += 1
+            if step.type == PlanStepType.CODE:
+                self._execution_stats["code_executions"] += 1
+            elif step.type == PlanStepType.API:
+                self._execution_stats["api_calls"] += 1
+            elif step.type == PlanStepType.LOOP:
+                self._execution_stats["loops_executed"] += 1
+            
+            if result.get("success", False):
+                return StepOutcome(success=True, activate=next_steps)
+            
+            self._logger.warning(f"Step {step_id} failed with error: {result.get('error', 'Unknown error')}")
+            
+            # Attempt error recovery
+            if not dry_run and error_recovery_manager:
+                recovery_result = await self._attempt_recovery(step, result, step_context)
                 
-                # Execute the step with enhanced error handling
-                try:
-                    start_step_time = datetime.now()
-                    
-                    result = await self._execute_advanced_step(
-                        step=step,
-                        context=context
-                    )
-                    
-                    # Calculate execution time
-                    execution_time = (datetime.now() - start_step_time).total_seconds()
-                    
-                    # Add execution time to result
-                    if isinstance(result, dict) and "execution_time" not in result:
-                        result["execution_time"] = execution_time
-                    
-                    # Store the result
-                    results[step_id] = result
-                    context.results[step_id] = result
-                    
-                    # Update execution path
-                    execution_path.append(step_id)
-                    
-                    # Check for next steps based on step type
-                    if step.type == PlanStepType.DECISION:
-                        # Decision step might have conditional branches
-                        condition_result = result.get("condition_result", False)
-                        branch_key = "true_branch" if condition_result else "false_branch"
-                        next_steps = getattr(step, branch_key, [])
-                        
-                        self._logger.debug(f"Decision step {step_id} evaluated to {condition_result}, following {branch_key}")
-                        
-                        if next_steps:
-                            for next_step_id in next_steps:
-                                if next_step_id in plan.steps and next_step_id not in completed_steps:
-                                    pending_steps[next_step_id] = plan.steps[next_step_id]
-                    
-                    elif step.type == PlanStepType.LOOP:
-                        # Loop execution will use recursion
-                        loop_result = result.get("loop_results", [])
-                        self._logger.debug(f"Loop step {step_id} executed {len(loop_result)} iterations")
-                    
-                    # Mark step as completed
-                    completed_steps.add(step_id)
-                    newly_completed_steps.append(step_id)
-                    
-                    # Update execution stats
-                    self._execution_stats["executed_steps"] += 1
-                    if step.type == PlanStepType.CODE:
-                        self._execution_stats["code_executions"] += 1
-                    elif step.type == PlanStepType.API:
-                        self._execution_stats["api_calls"] += 1
-                    elif step.type == PlanStepType.LOOP:
-                        self._execution_stats["loops_executed"] += 1
-                    
-                    # Check if we need to stop due to an error
-                    if not result.get("success", False):
-                        self._logger.warning(f"Step {step_id} failed with error: {result.get('error', 'Unknown error')}")
-                        
-                        # Attempt error recovery
-                        if not dry_run and error_recovery_manager:
-                            recovery_result = await self._attempt_recovery(step, result, context)
-                            
-                            if recovery_result.get("recovery_success", False):
-                                self._logger.info(f"Recovery succeeded for step {step_id}")
-                                results[step_id] = recovery_result
-                                context.results[step_id] = recovery_result
-                                self._execution_stats["recoveries"] += 1
-                            else:
-                                self._logger.error(f"Recovery failed for step {step_id}")
-                                return {
-                                    "success": False,
-                                    "steps_completed": len(completed_steps),
-                                    "steps_total": len(plan.steps),
-                                    "failed_step": step_id,
-                                    "results": results,
-                                    "error": result.get("error", "Unknown error"),
-                                    "execution_path": execution_path,
-                                    "execution_time": (datetime.now() - start_time).total_seconds()
-                                }
-                        else:
-                            # No recovery attempted, return failure
-                            return {
-                                "success": False,
-                                "steps_completed": len(completed_steps),
-                                "steps_total": len(plan.steps),
-                                "failed_step": step_id,
-                                "results": results,
-                                "error": result.get("error", "Unknown error"),
-                                "execution_path": execution_path,
-                                "execution_time": (datetime.now() - start_time).total_seconds()
-                            }
-                            
-                except Exception as e:
-                    self._logger.exception(f"Error executing step {step_id}: {str(e)}")
-                    self._execution_stats["errors"] += 1
-                    
-                    # Record error result
-                    error_result = {
-                        "step_id": step_id,
-                        "type": step.type,
-                        "description": step.description,
-                        "error": str(e),
-                        "success": False,
-                        "execution_time": (datetime.now() - start_step_time).total_seconds()
-                    }
-                    
-                    results[step_id] = error_result
-                    context.results[step_id] = error_result
-                    
-                    # Attempt recovery
-                    if not dry_run and error_recovery_manager:
-                        recovery_result = await self._attempt_recovery(step, error_result, context)
-                        
-                        if recovery_result.get("recovery_success", False):
-                            self._logger.info(f"Recovery succeeded for step {step_id}")
-                            results[step_id] = recovery_result
-                            context.results[step_id] = recovery_result
-                            self._execution_stats["recoveries"] += 1
-                        else:
-                            self._logger.error(f"Recovery failed for step {step_id}")
-                            return {
-                                "success": False,
-                                "steps_completed": len(completed_steps),
-                                "steps_total": len(plan.steps),
-                                "failed_step": step_id,
-                                "results": results,
-                                "error": str(e),
-                                "execution_path": execution_path,
-                                "execution_time": (datetime.now() - start_time).total_seconds()
-                            }
-                    else:
-                        # No recovery attempted, return failure
-                        return {
-                            "success": False,
-                            "steps_completed": len(completed_steps),
-                            "steps_total": len(plan.steps),
-                            "failed_step": step_id,
-                            "results": results,
-                            "error": str(e),
-                            "execution_path": execution_path,
-                            "execution_time": (datetime.now() - start_time).total_seconds()
-                        }
-            
-            # Remove completed steps from pending steps
-            for step_id in newly_completed_steps:
-                if step_id in pending_steps:
-                    del pending_steps[step_id]
-            
-            # If we're using sequential execution (i.e., no newly completed steps during the last iteration)
-            # update pending_steps with steps that depend on the newly completed steps
-            if not newly_completed_steps:
-                # Find steps that depend on the newly completed steps
-                for step_id, step in plan.steps.items():
-                    if step_id not in completed_steps and not step_id in pending_steps:
-                        # Check if all dependencies are now satisfied
-                        if all(dep in completed_steps for dep in step.dependencies):
-                            pending_steps[step_id] = step
+                if recovery_result.get("recovery_success", False):
+                    self._logger.info(f"Recovery succeeded for step {step_id}")
+                    results[step_id] = recovery_result
+                    context.results[step_id] = recovery_result
+                    self._execution_stats["recoveries"] += 1
+                    return StepOutcome(success=True, activate=next_steps)
+                
+                self._logger.error(f"Recovery failed for step {step_id}")
+            
+            failure.setdefault("error", result.get("error", "Unknown error"))
+            return StepOutcome(success=False)
+        
+        # Run the steps as a DAG: independent steps overlap, steps on the same file do not.
+        # Only the branch a decision takes runs; the other one is skipped.
+        scheduled_steps = {
+            step_id: ScheduledStep(
+                id=step_id,
+                dependencies=step.dependencies,
+                resources=self._get_step_resources(step),
+                branches=(step.true_branch or []) + (step.false_branch or [])
+                if step.type == PlanStepType.DECISION else ()
+            )
+            for step_id, step in plan.steps.items()
+        }
+        report = await get_step_scheduler().run(scheduled_steps, run_step, plan.entry_points)
+        
+        if report.skipped:
+            self._logger.debug(f"Steps on decision branches not taken: {report.skipped}")
+        if report.not_run and report.failed_step is None:
+            self._logger.warning(f"Steps not executed (not reached or blocked by dependencies): {report.not_run}")
         
         # Calculate execution time
         execution_time = (datetime.now() - start_time).total_seconds()
         
+        if report.failed_step is not None:
+            return {
+                "success": False,
+                "steps_completed": len(report.completed),
+                "steps_total": len(plan.steps),
+                "failed_step": report.failed_step,
+                "cancelled_steps": report.cancelled,
+                "results": results,
+                "error": failure.get("error", "Unknown error"),
+                "execution_path": execution_path,
+                "execution_time": execution_time,
+                "timing": report.timing_report()
+            }
+        
         # Update execution stats
         self._execution_stats["executed_plans"] += 1
         
-        # Check if all steps were completed
-        all_completed = len(completed_steps) == len(plan.steps)
+        # Check if all steps were completed, apart from the branches not taken
+        all_completed = len(report.completed) + len(report.skipped) == len(plan.steps)
         
         return {
             "success": all_completed,
-            "steps_completed": len(completed_steps),
+            "steps_completed": len(report.completed),
+            "steps_skipped": report.skipped,
             "steps_total": len(plan.steps),
             "results": results,
             "execution_path": execution_path,
             "execution_time": execution_time,
+            "timing": report.timing_report(),
             "variables": {k: v.dict() for k, v in self._variables.items()}
         }
     
+    def _get_step_resources(self, step: AdvancedPlanStep) -> List[str]:
+        """
+        Get the resources a step needs exclusively while it runs.
+        
+        File steps hold the files they operate on. Other steps, such as
+        commands writing files, can declare resources as "resource:<name>" tags.
+        
+        Args:
+            step: The step
+            
+        Returns:
+            Resource names
+        """
+        resources = [tag[len("resource:"):] for tag in step.tags if tag.startswith("resource:")]
+        if step.type == PlanStepType.FILE:
+            for path in (step.file_path, getattr(step, "destination", None)):
+                if path:
+                    resources.append(f"file:{os.path.abspath(os.path.expanduser(path))}")
+        return resources
     
     async def _attempt_recovery(
         self, 
@@ -1302,7 +1259,7 @@ Ensure the plan handles potential errors and provides clear decision branches fo
         context: StepExecutionContext
     ) -> Dict[str, Any]:
         """
-        Execute Python code securely.
+        Execute Python code securely in a warm sandbox interpreter.
         
         Args:
             code: The Python code to execute
@@ -1311,157 +1268,15 @@ Ensure the plan handles potential errors and provides clear decision branches fo
         Returns:
             Dictionary with execution results
         """
-        # Create a unique identifier for this execution
-        execution_id = str(uuid.uuid4())
-        
-        # Create a temporary file to store the code
-        temp_dir = self._sandbox_dir / execution_id
-        temp_dir.mkdir(exist_ok=True)
-        
-        temp_file = temp_dir / "code.py"
-        
-        # Create a file to store the variables
-        variables_file = temp_dir / "variables.json"
-        
         try:
-            # Prepare context variables
-            context_vars = {}
-            for var_name, var in self._variables.items():
-                context_vars[var_name] = var.value
-            
-            # Write variables to file (serializing complex objects to JSON)
-            with open(variables_file, 'w') as f:
-                json.dump(context_vars, f, default=str)
-            
-            # Add wrapper code to load variables and capture output
-            wrapper_code = f'''
-# Generated wrapper for secure code execution
-import json
-import sys
-import io
-import traceback
-
-# Redirect stdout and stderr
-original_stdout = sys.stdout
-original_stderr = sys.stderr
-sys.stdout = io.StringIO()
-sys.stderr = io.StringIO()
-
-# Output dictionary for capturing results
-outputs = {{"success": False}}
-
-try:
-    # Load variables from file
-    with open("{variables_file}", "r") as var_file:
-        variables = json.load(var_file)
-    
-    # Make variables available in execution context
-    globals().update(variables)
-    
-    # Execute the user code
-    {code}
-    
-    # Capture stdout and stderr
-    outputs["stdout"] = sys.stdout.getvalue()
-    outputs["stderr"] = sys.stderr.getvalue()
-    outputs["success"] = True
-    
-    # If there's a 'result' or 'output' variable, capture it
-    if 'result' in locals():
-        outputs["result"] = result
-    if 'output' in locals():
-        outputs["output"] = output
-    
-    # Capture all locals that don't start with '_'
-    outputs["variables"] = {{
-        k: v for k, v in locals().items() 
-        if not k.startswith('_') and k not in ['variables', 'var_file']
-    }}
-    
-except Exception as e:
-    outputs["error"] = str(e)
-    outputs["traceback"] = traceback.format_exc()
-    outputs["success"] = False
-
-# Restore stdout and stderr
-sys.stdout = original_stdout
-sys.stderr = original_stderr
-
-# Write outputs to file
-with open("{temp_dir / 'output.json'}", "w") as output_file:
-    json.dump(outputs, output_file, default=str)
-'''
-            
-            # Write the wrapper code to the temporary file
-            with open(temp_file, 'w') as f:
-                f.write(wrapper_code)
-            
-            timeout = 30
-            
-            process = await asyncio.create_subprocess_exec(
-                sys.executable, str(temp_file),
-                stdout=asyncio.subprocess.PIPE,
-                stderr=asyncio.subprocess.PIPE
-            )
-            
-            try:
-                # Wait for process with timeout
-                stdout, stderr = await asyncio.wait_for(process.communicate(), timeout)
-                return_code = process.returncode
-                
-                # Read output file
-                output_file = temp_dir / 'output.json'
-                if output_file.exists():
-                    with open(output_file, 'r') as f:
-                        outputs = json.load(f)
-                else:
-                    outputs = {
-                        "success": False,
-                        "error": "Output file was not created"
-                    }
-                
-                # Create the result
-                result = {
-                    "success": outputs.get("success", False),
-                    "outputs": outputs.get("variables", {}),
-                    "stdout": outputs.get("stdout", ""),
-                    "stderr": outputs.get("stderr", "")
-                }
-                
-                if "error" in outputs:
-                    result["error"] = outputs["error"]
-                    result["traceback"] = outputs.get("traceback", "")
-                
-                if "result" in outputs:
-                    result["result"] = outputs["result"]
-                
-                if "output" in outputs:
-                    result["output"] = outputs["output"]
-                
-                return result
-                
-            except asyncio.TimeoutError:
-                # Kill the process if it times out
-                process.kill()
-                return {
-                    "success": False,
-                    "error": f"Code execution timed out after {timeout} seconds"
-                }
-                
+            outputs = await get_sandbox_pool("python").run(code, self._get_code_variables())
+            return self._code_result(outputs, "traceback")
         except Exception as e:
             self._logger.exception(f"Error in Python code execution: {str(e)}")
             return {
                 "success": False,
                 "error": str(e)
             }
-        finally:
-            # Clean up temporary files
-            try:
-                import shutil
-                shutil.rmtree(temp_dir)
-            except Exception as e:
-                self._logger.error(f"Error cleaning up temporary files: {str(e)}")
-                
                 
     async def _execute_javascript_code(
         self, 
@@ -1469,7 +1284,7 @@ with open("{temp_dir / 'output.json'}", "w") as output_file:
         context: StepExecutionContext
     ) -> Dict[str, Any]:
         """
-        Execute JavaScript code securely.
+        Execute JavaScript code securely in a warm sandbox interpreter.
         
         Args:
             code: The JavaScript code to execute
@@ -1478,222 +1293,55 @@ with open("{temp_dir / 'output.json'}", "w") as output_file:
         Returns:
             Dictionary with execution results
         """
-        # Create a unique identifier for this execution
-        execution_id = str(uuid.uuid4())
-        
-        # Create a temporary file to store the code
-        temp_dir = self._sandbox_dir / execution_id
-        temp_dir.mkdir(exist_ok=True)
-        
-        temp_file = temp_dir / "code.js"
-        
-        # Create a file to store the variables
-        variables_file = temp_dir / "variables.json"
+        if shutil.which("node") is None:
+            return {
+                "success": False,
+                "error": "Node.js is not available for JavaScript execution"
+            }
         
         try:
-            # Prepare context variables
-            context_vars = {}
-            for var_name, var in self._variables.items():
-                context_vars[var_name] = var.value
-            
-            # Write variables to file (serializing complex objects to JSON)
-            with open(variables_file, 'w') as f:
-                json.dump(context_vars, f, default=str)
-            
-            # Add wrapper code to load variables and capture output
-            wrapper_code = f'''
-// Generated wrapper for secure code execution
-const fs = require('fs');
-
-// Load variables from file
-const variables = JSON.parse(fs.readFileSync("{variables_file}", "utf8"));
-
-// Make variables available in execution context
-Object.assign(global, variables);
-
-// Output object for capturing results
-const outputs = {{
-    success: false,
-    stdout: "",
-    stderr: "",
-    variables: {{}}
-}};
-
-// Capture console.log output
-const originalLog = console.log;
-const originalError = console.error;
-const logs = [];
-const errors = [];
-
-console.log = (...args) => {{
-    const message = args.map(arg => 
-        typeof arg === 'object' ? JSON.stringify(arg) : String(arg)
-    ).join(' ');
-    logs.push(message);
-    outputs.stdout += message + "\\n";
-    originalLog.apply(console, args);
-}};
-
-console.error = (...args) => {{
-    const message = args.map(arg => 
-        typeof arg === 'object' ? JSON.stringify(arg) : String(arg)
-    ).join(' ');
-    errors.push(message);
-    outputs.stderr += message + "\\n";
-    originalError.apply(console, args);
-}};
-
-try {{
-    // Execute the user code
-    {code}
-    
-    outputs.success = true;
-    
-    // If there's a 'result' or 'output' variable, capture it
-    if (typeof result !== 'undefined') {{
-        outputs.result = result;
-    }}
-    if (typeof output !== 'undefined') {{
-        outputs.output = output;
-    }}
-    
-    // Capture all globals that don't start with '_'
-    for (const key in global) {{
-        if (!key.startsWith('_') && 
-            key !== 'variables' && 
-            key !== 'outputs' &&
-            key !== 'require' &&
-            key !== 'module' &&
-            key !== 'exports' &&
-            key !== 'Buffer' &&
-            key !== 'process' &&
-            typeof global[key] !== 'function') {{
-            outputs.variables[key] = global[key];
-        }}
-    }}
-    
-}} catch (error) {{
-    outputs.success = false;
-    outputs.error = error.message;
-    outputs.stack = error.stack;
-}}
-
-// Restore console functions
-console.log = originalLog;
-console.error = originalError;
-
-// Define a replacer function to handle circular references
-const seen = new WeakSet();
-function replacer(key, value) {{
-    if (typeof value === 'object' && value !== null) {{
-        if (seen.has(value)) {{
-            return '[Circular]';
-        }}
-        seen.add(value);
-        
-        // Filter out function properties
-        if (Object.prototype.toString.call(value) === '[object Object]') {{
-            return Object.fromEntries(
-                Object.entries(value).filter(([k, v]) => typeof v !== 'function')
-            );
-        }}
-    }}
-    return value;
-}}
-
-// Write outputs to file
-fs.writeFileSync("{temp_dir / 'output.json'}", JSON.stringify(outputs, replacer, 2));
-'''
-            
-            # Write the wrapper code to the temporary file
-            with open(temp_file, 'w') as f:
-                f.write(wrapper_code)
-            
-            # Check if Node.js is available
-            try:
-                # Try to run a simple Node.js command
-                process = await asyncio.create_subprocess_exec(
-                    "node", "--version",
-                    stdout=asyncio.subprocess.PIPE,
-                    stderr=asyncio.subprocess.PIPE
-                )
-                await process.communicate()
-                if process.returncode != 0:
-                    return {
-                        "success": False,
-                        "error": "Node.js is not available for JavaScript execution"
-                    }
-            except Exception:
-                return {
-                    "success": False,
-                    "error": "Node.js is not available for JavaScript execution"
-                }
-            
-            timeout = 30
-            
-            process = await asyncio.create_subprocess_exec(
-                "node", str(temp_file),
-                stdout=asyncio.subprocess.PIPE,
-                stderr=asyncio.subprocess.PIPE
-            )
-            
-            try:
-                # Wait for process with timeout
-                stdout, stderr = await asyncio.wait_for(process.communicate(), timeout)
-                return_code = process.returncode
-                
-                # Read output file
-                output_file = temp_dir / 'output.json'
-                if output_file.exists():
-                    with open(output_file, 'r') as f:
-                        outputs = json.load(f)
-                else:
-                    outputs = {
-                        "success": False,
-                        "error": "Output file was not created"
-                    }
-                
-                # Create the result
-                result = {
-                    "success": outputs.get("success", False),
-                    "outputs": outputs.get("variables", {}),
-                    "stdout": outputs.get("stdout", ""),
-                    "stderr": outputs.get("stderr", "")
-                }
-                
-                if "error" in outputs:
-                    result["error"] = outputs["error"]
-                    result["stack"] = outputs.get("stack", "")
-                
-                if "result" in outputs:
-                    result["result"] = outputs["result"]
-                
-                if "output" in outputs:
-                    result["output"] = outputs["output"]
-                
-                return result
-                
-            except asyncio.TimeoutError:
-                # Kill the process if it times out
-                process.kill()
-                return {
-                    "success": False,
-                    "error": f"Code execution timed out after {timeout} seconds"
-                }
-                
+            outputs = await get_sandbox_pool("javascript").run(code, self._get_code_variables())
+            return self._code_result(outputs, "stack")
         except Exception as e:
             self._logger.exception(f"Error in JavaScript code execution: {str(e)}")
             return {
                 "success": False,
                 "error": str(e)
             }
-        finally:
-            # Clean up temporary files
-            try:
-                import shutil
-                shutil.rmtree(temp_dir)
-            except Exception as e:
-                self._logger.error(f"Error cleaning up temporary files: {str(e)}")
+    
+    def _get_code_variables(self) -> Dict[str, Any]:
+        """Get the values of the plan variables for a code step."""
+        return {var_name: var.value for var_name, var in self._variables.items()}
+    
+    def _code_result(self, outputs: Dict[str, Any], trace_key: str) -> Dict[str, Any]:
+        """
+        Convert a sandbox reply to a code step result.
+        
+        Args:
+            outputs: The sandbox reply
+            trace_key: Key of the error trace in the reply ("traceback" or "stack")
+            
+        Returns:
+            Dictionary with execution results
+        """
+        result = {
+            "success": outputs.get("success", False),
+            "outputs": outputs.get("variables", {}),
+            "stdout": outputs.get("stdout", ""),
+            "stderr": outputs.get("stderr", "")
+        }
+        
+        if "error" in outputs:
+            result["error"] = outputs["error"]
+            result[trace_key] = outputs.get(trace_key, "")
+        
+        if "result" in outputs:
+            result["result"] = outputs["result"]
+        
+        if "output" in outputs:
+            result["output"] = outputs["output"]
+        
+        return result
     
     async def _execute_shell_code(
         self, 
@@ -1817,6 +1465,10 @@ fs.writeFileSync("{temp_dir / 'output.json'}", JSON.stringify(outputs, replacer,
                     "success": False,
                     "error": f"Shell script execution timed out after {timeout} seconds"
                 }
+            except asyncio.CancelledError:
+                # Cancelled with the rest of the plan: stop the script too
+                process.kill()
+                raise
                 
         except Exception as e:
             self._logger.exception(f"Error in shell code execution: {str(e)}")
@@ -1088,8 +1088,12 @@ Ensure each step has a unique ID and clear dependencies. Entry points are the st
             executed_steps: Set of executed step IDs
         """
         # For decision steps, add the appropriate branch
+        not_taken: Set[str] = set()
         if executed_step.type == PlanStepType.DECISION:
             condition_result = result.get("condition_result", False)
+            taken = (executed_step.true_branch if condition_result else executed_step.false_branch) or []
+            other = (executed_step.false_branch if condition_result else executed_step.true_branch) or []
+            not_taken = set(other) - set(taken)
             if condition_result and executed_step.true_branch:
                 # Add steps from true branch
                 for step_id in executed_step.true_branch:
@@ -1103,6 +1107,9 @@ Ensure each step has a unique ID and clear dependencies. Entry points are the st
         
         # For normal steps, add all steps that depend on this one
         for step_id, step in plan.steps.items():
+            if step_id in not_taken:
+                # Branch steps depend on their decision, but only the chosen branch runs
+                continue
             if executed_step.id in step.dependencies and step_id not in executed_steps:
                 # Check if all dependencies are satisfied
                 if all(dep in executed_steps for dep in step.dependencies):
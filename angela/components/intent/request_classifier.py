@@ -0,0 +1,290 @@
+# angela/components/intent/request_classifier.py
+"""
+Precompiled rule-based request classification.
+
+The orchestrator routes every request by matching it against groups of
+regular expressions in a fixed priority order. The patterns of each group
+are compiled once, at import time, into a single alternation, so a group
+costs one search instead of one per pattern. Each group also lists literal
+keywords, at least one of which occurs in any text the group can match;
+a group whose keywords are all absent from the request is skipped without
+running its regex. Keywords are checked against the casefolded request,
+which never hides a case-insensitive match.
+
+Classification results are the string values of the orchestrator's
+RequestType enum.
+"""
+import re
+from typing import List, NamedTuple, Pattern, Tuple
+
+from angela.utils.logging import get_logger
+
+logger = get_logger(__name__)
+
+
+class RuleGroup(NamedTuple):
+    """A set of patterns compiled into one case-insensitive alternation."""
+    name: str
+    keywords: Tuple[str, ...]  # At least one occurs in every match
+    regex: Pattern
+
+    def matches(self, request: str, folded: str) -> bool:
+        """Check whether any of the group's patterns matches the request."""
+        if not any(keyword in folded for keyword in self.keywords):
+            return False
+        return self.regex.search(request) is not None
+
+
+def _group(name: str, keywords: Tuple[str, ...], patterns: List[str]) -> RuleGroup:
+    """Compile a rule group."""
+    combined = "|".join(f"(?:{pattern})" for pattern in patterns)
+    return RuleGroup(name, keywords, re.compile(combined, re.IGNORECASE))
+
+
+WORKFLOW_DEFINITION = _group("workflow", ("workflow",), [
+    r'\b(?:define|create|make|add)\s+(?:a\s+)?(?:new\s+)?workflow\b',
+    r'\bworkflow\s+(?:called|named)\b',
+    r'\bsave\s+(?:this|these)\s+(?:as\s+(?:a\s+)?)?workflow\b',
+])
+
+WORKFLOW_EXECUTION = _group("run_workflow", ("workflow",), [
+    r'\brun\s+(?:the\s+)?workflow\b',
+    r'\bexecute\s+(?:the\s+)?workflow\b',
+    r'\bstart\s+(?:the\s+)?workflow\b',
+])
+
+FILE_MENTION = _group("file_mention", ("file", "code", "script", "document"), [
+    r'\b(?:file|code|script|document)\b',
+])
+
+FILE_CONTENT = _group("file_content", ("content", "code", "text", "file"), [
+    r'\b(?:analyze|understand|summarize|examine)\s+(?:the\s+)?(?:content|code|text)\b',
+    r'\b(?:modify|change|update|edit|refactor)\s+(?:the\s+)?(?:content|code|text|file)\b',
+    r'\bfind\s+(?:in|inside|within)\s+(?:the\s+)?file\b',
+])
+
+MULTI_STEP = _group("multi_step", (
+    "multiple steps", "sequence", "series", "several", "many", "and then",
+    "after that", "one by one", "step by step", "automatically",
+), [
+    r'\b(?:multiple steps|sequence|series|several|many)\b',
+    r'\band then\b',
+    r'\bafter that\b',
+    r'\bone by one\b',
+    r'\bstep by step\b',
+    r'\bautomatically\b',
+])
+
+DOCKER = _group("docker", ("docker", "container", "image"), [
+    r'\bdocker\b',
+    r'\bcontainer\b',
+    r'\bdockerfile\b',
+    r'\bdocker-compose\b',
+    r'\bdocker\s+compose\b',
+    r'\bimage\b.+\b(?:build|run|pull|push)\b',
+    r'\b(?:build|run|pull|push)\b.+\bimage\b',
+    r'\b(?:start|stop|restart|remove)\b.+\bcontainer\b',
+    r'\bcontainer\b.+\b(?:start|stop|restart|remove)\b',
+    r'\bgenerate\b.+\b(?:dockerfile|docker-compose)\b',
+    r'\bsetup\s+docker\b',
+    r'\bdocker\s+(?:ps|logs|images|rmi|exec)\b',
+])
+
+CODE_GENERATION = _group("code_generation", ("project", "app", "website", "build"), [
+    r'\bcreate\s+(?:a\s+)?(?:new\s+)?(?:project|app|website|application)\b',
+    r'\bgenerate\s+(?:a\s+)?(?:new\s+)?(?:project|app|website|application)\b',
+    r'\bmake\s+(?:a\s+)?(?:new\s+)?(?:project|app|website|application)\b',
+    r'\bbuild\s+(?:a\s+)?(?:whole|complete|full|entire)\b',
+])
+
+FEATURE_ADDITION = _group("feature_addition", ("feature", "extend"), [
+    r'\badd\s+(?:a\s+)?(?:new\s+)?feature\b',
+    r'\bimplement\s+(?:a\s+)?(?:new\s+)?feature\b',
+    r'\bcreate\s+(?:a\s+)?(?:new\s+)?feature\b',
+    r'\bextend\s+(?:the\s+)?(?:project|app|code|application)\b',
+])
+
+TOOLCHAIN = _group("toolchain_operation", ("setup", "configure", "generate", "dependencies", "initialize"), [
+    r'\bsetup\s+(?:ci|cd|ci/cd|cicd|continuous integration|deployment)\b',
+    r'\bconfigure\s+(?:ci|cd|ci/cd|cicd|continuous integration|deployment|git)\b',
+    r'\bgenerate\s+(?:ci|cd|jenkins|gitlab|github)\b',
+    r'\binstall\s+dependencies\b',
+    r'\binitialize\s+(?:git|repo|repository)\b',
+])
+
+CODE_REFINEMENT = _group("code_refinement", ("code",), [
+    r'\brefine\s+(?:the\s+)?code\b',
+    r'\bimprove\s+(?:the\s+)?code\b',
+    r'\boptimize\s+(?:the\s+)?code\b',
+    r'\brefactor\s+(?:the\s+)?code\b',
+    r'\bupdate\s+(?:the\s+)?code\b',
+    r'\benhance\s+(?:the\s+)?code\b',
+])
+
+CODE_ARCHITECTURE = _group("code_architecture", ("architecture", "structure"), [
+    r'\banalyze\s+(?:the\s+)?(?:architecture|structure)\b',
+    r'\bimprove\s+(?:the\s+)?(?:architecture|structure)\b',
+    r'\bredesign\s+(?:the\s+)?(?:architecture|structure)\b',
+    r'\bproject\s+structure\b',
+])
+
+CI_CD_PIPELINE = _group("ci_cd_pipeline", (
+    "set", "create", "ci/cd", "pipeline", "github", "gitlab", "jenkins", "travis", "circle", "automat",
+), [
+    r'\bset\s*up\s+(?:a\s+)?(?:ci|cd|ci/cd|cicd|continuous integration|deployment)(?:\s+pipeline)?\b',
+    r'\bcreate\s+(?:a\s+)?(?:ci|cd|ci/cd|cicd|continuous integration)(?:\s+pipeline)?\b',
+    r'\bci/cd\s+(?:pipeline|setup|configuration)\b',
+    r'\bpipeline\s+(?:setup|configuration|for)\b',
+    r'\bgithub\s+actions\b',
+    r'\bgitlab\s+ci\b',
+    r'\bjenkins(?:file)?\b',
+    r'\btravis\s+ci\b',
+    r'\bcircle\s+ci\b',
+    r'\b(?:automate|automation)\s+(?:build|test|deploy)\b',
+])
+
+COMPLEX_WORKFLOW = _group("complex_workflow", (
+    "complex", "complete", "automated", "end-to-end", "chain", "multi-step", "pipeline", "series",
+), [
+    r'\bcomplex\s+workflow\b',
+    r'\bcomplete\s+(?:ci/cd|cicd|pipeline)\b',
+    r'\bautomated\s+(?:build|test|deploy)\b',
+    r'\bend-to-end\s+workflow\b',
+    r'\bchain\s+of\s+commands\b',
+    r'\bmulti-step\s+operation\s+across\b',
+    r'\bpipeline\s+using\b',
+    r'\bseries\s+of\s+tools\b',
+])
+
+# Checked one by one: the first match whose captured tool is not one of
+# Angela's own commands wins
+UNIVERSAL_CLI_KEYWORDS = ("use", "command", "tool")
+UNIVERSAL_CLI_PATTERNS: Tuple[Pattern, ...] = tuple(re.compile(pattern, re.IGNORECASE) for pattern in (
+    r'\buse\s+(?:the\s+)?(.+?)\s+(?:cli|command|tool)\b',
+    r'\brun\s+(?:a\s+)?(.+?)\s+command\b',
+    r'\b(?:execute|with)\s+(?:the\s+)?(.+?)\s+tool\b',
+))
+UNIVERSAL_CLI_EXCLUDED_TOOLS = ("angela", "workflow")
+
+COMMON_TOOLS = ("git", "docker", "aws", "kubectl", "terraform", "npm", "pip", "yarn")
+TOOL_COMMAND_VERBS = ("use", "run", "with", "using", "execute")
+MULTI_TOOL_NAMES = ("git", "docker", "aws", "kubernetes", "npm", "pip")
+COMPLEX_INDICATORS = ("pipeline", "sequence", "then", "after", "followed")
+
+# Groups checked after the tool heuristics, in priority order
+ORDERED_GROUPS: Tuple[Tuple[RuleGroup, str], ...] = (
+    (CODE_GENERATION, "code_generation"),
+    (FEATURE_ADDITION, "feature_addition"),
+    (TOOLCHAIN, "toolchain_operation"),
+    (CODE_REFINEMENT, "code_refinement"),
+    (CODE_ARCHITECTURE, "code_architecture"),
+    (WORKFLOW_DEFINITION, "workflow"),
+    (WORKFLOW_EXECUTION, "run_workflow"),
+    (DOCKER, "toolchain_operation"),
+)
+
+# Quick intent categories: the first category with a keyword anywhere in the request wins
+QUICK_INTENT_KEYWORDS: Tuple[Tuple[str, Tuple[str, ...]], ...] = (
+    ("create", ("create", "generate", "make", "new file", "save as",
+                "write a new", "write new", "save it as", "output to")),
+    ("read", ("read", "open", "show", "display", "view", "cat",
+              "print", "output", "list", "contents of")),
+    ("modify", ("edit", "modify", "update", "change", "replace", "delete",
+                "remove", "rename", "move", "copy")),
+    ("analyze", ("analyze", "examine", "check", "inspect", "review",
+                 "summarize", "understand", "evaluate")),
+)
+
+
+class RequestClassifier:
+    """Classifies requests into orchestrator request types."""
+
+    def __init__(self):
+        """Initialize the classifier."""
+        self._logger = logger
+        self._quick_intents = tuple(
+            (intent, re.compile("|".join(re.escape(keyword) for keyword in keywords)))
+            for intent, keywords in QUICK_INTENT_KEYWORDS
+        )
+
+    def classify(self, request: str) -> str:
+        """
+        Determine the request type.
+
+        Args:
+            request: The user request
+
+        Returns:
+            The RequestType value of the request
+        """
+        folded = request.casefold()
+
+        # CI/CD patterns are the most specific
+        if CI_CD_PIPELINE.matches(request, folded):
+            return "ci_cd_pipeline"
+
+        if self._is_universal_cli(request, folded):
+            return "universal_cli"
+
+        if COMPLEX_WORKFLOW.matches(request, folded):
+            return "complex_workflow"
+
+        # Common CLI tools used directly or after a verb like "use" or "run"
+        lower = request.lower()
+        tool_words = lower.split()
+        for tool in COMMON_TOOLS:
+            if tool in tool_words:
+                for pos, word in enumerate(tool_words):
+                    if word == tool and pos > 0 and tool_words[pos - 1] in TOOL_COMMAND_VERBS:
+                        return "universal_cli"
+                if tool_words[0] == tool:
+                    return "universal_cli"
+
+        # Several tools combined with sequencing words
+        tool_mentions = sum(1 for tool in MULTI_TOOL_NAMES if tool in lower)
+        if tool_mentions >= 2 and any(indicator in lower for indicator in COMPLEX_INDICATORS):
+            return "complex_workflow"
+
+        for group, request_type in ORDERED_GROUPS:
+            if group.matches(request, folded):
+                return request_type
+
+        if FILE_MENTION.matches(request, folded) and FILE_CONTENT.matches(request, folded):
+            return "file_content"
+
+        # Complex requests or longer instructions often imply multi-step operations
+        if MULTI_STEP.matches(request, folded) or len(request.split()) > 15:
+            return "multi_step"
+
+        return "command"
+
+    def quick_intent(self, request: str) -> str:
+        """
+        Get the high-level intent used to decide whether file resolution is needed.
+
+        Args:
+            request: The user request
+
+        Returns:
+            "create", "read", "modify", "analyze" or "unknown"
+        """
+        request_lower = request.lower()
+        for intent, regex in self._quick_intents:
+            if regex.search(request_lower):
+                return intent
+        return "unknown"
+
+    @staticmethod
+    def _is_universal_cli(request: str, folded: str) -> bool:
+        """Check for an explicit request to use an external CLI tool."""
+        if not any(keyword in folded for keyword in UNIVERSAL_CLI_KEYWORDS):
+            return False
+        for pattern in UNIVERSAL_CLI_PATTERNS:
+            match = pattern.search(request)
+            if match and match.group(1).strip().lower() not in UNIVERSAL_CLI_EXCLUDED_TOOLS:
+                return True
+        return False
+
+
+# Global request classifier instance
+request_classifier = RequestClassifier()
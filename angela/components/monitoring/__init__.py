@@ -6,8 +6,25 @@ This package provides background monitoring capabilities that allow Angela
 to offer proactive suggestions and assistance based on system state.
 """
 
-from .background import background_monitor
-from .network_monitor import network_monitor
-from .proactive_assistant import proactive_assistant
+# Components are imported on first access so that the lightweight daemon
+# client can be imported by shell hooks without starting the monitors' stack.
+from typing import Any
 
-__all__ = ['background_monitor', 'network_monitor', 'proactive_assistant']
+_LAZY_EXPORTS = {
+    'background_monitor': 'angela.components.monitoring.background',
+    'network_monitor': 'angela.components.monitoring.network_monitor',
+    'proactive_assistant': 'angela.components.monitoring.proactive_assistant',
+    'angela_daemon': 'angela.components.monitoring.daemon',
+    'file_watcher': 'angela.components.monitoring.file_watcher',
+}
+
+__all__ = ['background_monitor', 'network_monitor', 'proactive_assistant', 'angela_daemon', 'file_watcher']
+
+
+def __getattr__(name: str) -> Any:
+    """Import exported components on first access."""
+    module_path = _LAZY_EXPORTS.get(name)
+    if module_path is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    import importlib
+    return getattr(importlib.import_module(module_path), name)
@@ -5,7 +5,6 @@ Background monitoring and proactive suggestions for Angela CLI.
 This module provides background monitoring of system state and user activities
 to offer proactive assistance and suggestions.
 """
-import os
 import sys
 import asyncio
 import time
@@ -36,6 +35,18 @@ class BackgroundMonitor:
     5. Common error patterns
     """
     
+    # File extensions checked when they change
+    SOURCE_EXTENSIONS = {
+        ".py", ".js", ".ts", ".java", ".c", ".cpp", ".h", ".hpp",
+        ".rs", ".go", ".rb", ".php", ".html", ".css", ".jsx", ".tsx"
+    }
+    
+    # Directories whose changes are never checked
+    IGNORED_DIRECTORIES = {
+        "__pycache__", "node_modules", ".git", "venv", "env",
+        "build", "dist", "target", ".idea", ".vscode"
+    }
+    
     def __init__(self):
         """Initialize the background monitor."""
         self._logger = logger
@@ -115,7 +126,7 @@ class BackgroundMonitor:
     
     async def _monitor_git_status(self) -> None:
         """Monitor Git status in the current project."""
-        from angela.api.context import get_context_manager
+        from angela.api.context import get_context_manager, get_git_state_provider
         from angela.api.shell import get_terminal_formatter
         
         self._logger.debug("Starting Git status monitoring")
@@ -130,24 +141,21 @@ class BackgroundMonitor:
                     continue
                 
                 project_root = Path(context["project_root"])
-                git_dir = project_root / ".git"
                 
-                if not git_dir.exists():
+                # Check Git status
+                git_state = await get_git_state_provider().get_state(project_root)
+                
+                if not git_state["is_git_repo"]:
                     # Not a Git repository, sleep and try again later
                     await asyncio.sleep(60)
                     continue
                 
-                # Check Git status
-                result = await self._run_command("git status -s", cwd=str(project_root))
-                
-                if result["success"] and result["stdout"].strip():
-                    # Check if this is different from the last status we saw
-                    status_text = result["stdout"].strip()
-                    
-                    # Count changes
-                    modified_count = status_text.count(" M ")
-                    untracked_count = status_text.count("?? ")
-                    deleted_count = status_text.count(" D ")
+                if git_state["has_changes"]:
+                    # Count changes in the working tree
+                    files = git_state["files"]
+                    modified_count = sum(1 for f in files if f.worktree == "M")
+                    untracked_count = len(git_state["untracked_files"])
+                    deleted_count = sum(1 for f in files if f.worktree == "D")
                     
                     # Analyze the status and suggest actions
                     if modified_count > 0 or untracked_count > 0 or deleted_count > 0:
@@ -192,64 +200,87 @@ class BackgroundMonitor:
                 await asyncio.sleep(60)  # Wait before retrying
     
     async def _monitor_file_changes(self) -> None:
-        """Monitor file changes for syntax errors and linting issues."""
+        """Check changed source files for syntax errors as the file watcher reports them."""
         from angela.api.context import get_context_manager
-        from angela.api.shell import get_terminal_formatter
+        from angela.api.monitoring import get_file_watcher
         
         self._logger.debug("Starting file changes monitoring")
         
-        # Track the last modified time of each file
-        last_modified_times = {}
+        watcher = get_file_watcher()
+        batches: asyncio.Queue = asyncio.Queue()
+        subscribers = [batches.put_nowait] + self._get_cache_subscribers()
+        for subscriber in subscribers:
+            watcher.subscribe(subscriber)
         
-        while self._monitoring_active:
-            try:
-                # Get current project context
-                context = get_context_manager().get_context_dict()
-                if not context.get("project_root"):
-                    # No project detected, sleep and try again later
-                    await asyncio.sleep(30)
-                    continue
-                
-                project_root = Path(context["project_root"])
-                
-                # Scan for files that have changed
-                changed_files = []
-                
-                for file_path in self._find_source_files(project_root):
+        watched_root = None
+        try:
+            while self._monitoring_active:
+                try:
+                    # Follow the current project
+                    project_root = get_context_manager().project_root
+                    if project_root != watched_root:
+                        if watched_root:
+                            await watcher.unwatch(watched_root)
+                        watched_root = project_root
+                        if project_root:
+                            await watcher.watch(project_root)
+                    
+                    if not watched_root:
+                        # No project detected, sleep and try again later
+                        await asyncio.sleep(30)
+                        continue
+                    
+                    # Block until the watcher delivers changes; wake up
+                    # occasionally to notice a project switch
                     try:
-                        mtime = file_path.stat().st_mtime
+                        batch = await asyncio.wait_for(batches.get(), timeout=30)
+                    except asyncio.TimeoutError:
+                        continue
+                    
+                    # Check changed files for issues
+                    for file_path in sorted(batch.created | batch.modified):
+                        if not self._is_source_file(file_path):
+                            continue
                         
-                        # Check if this file is newly modified
-                        if file_path in last_modified_times:
-                            if mtime > last_modified_times[file_path]:
-                                changed_files.append(file_path)
-                                last_modified_times[file_path] = mtime
-                        else:
-                            # New file we haven't seen before
-                            last_modified_times[file_path] = mtime
-                    except (FileNotFoundError, PermissionError):
-                        # File may have been deleted or is inaccessible
-                        if file_path in last_modified_times:
-                            del last_modified_times[file_path]
-                
-                # Check changed files for issues
-                for file_path in changed_files:
-                    # Get file info
-                    file_info = get_context_manager().get_file_info(file_path)
+                        # Get file info
+                        file_info = get_context_manager().get_file_info(file_path)
+                        
+                        # Check file based on language
+                        if file_info.get("language") == "Python":
+                            await self._check_python_file(file_path)
+                        elif file_info.get("language") == "JavaScript":
+                            await self._check_javascript_file(file_path)
+                        # Add more language checks as needed
                     
-                    # Check file based on language
-                    if file_info.get("language") == "Python":
-                        await self._check_python_file(file_path)
-                    elif file_info.get("language") == "JavaScript":
-                        await self._check_javascript_file(file_path)
-                    # Add more language checks as needed
-                
-                # Wait before checking again
-                await asyncio.sleep(10)
-                
+                except asyncio.CancelledError:
+                    raise
+                except Exception as e:
+                    self._logger.exception(f"Error in file changes monitoring: {str(e)}")
+                    await asyncio.sleep(30)  # Wait before retrying
+        finally:
+            for subscriber in subscribers:
+                watcher.unsubscribe(subscriber)
+            if watched_root:
+                await watcher.unwatch(watched_root)
+    
+    def _get_cache_subscribers(self) -> List[Callable]:
+        """
+        Get the cache invalidation callbacks fed by the file watcher.
+        
+        Returns:
+            List of callables taking a FileChangeBatch
+        """
+        from angela.api.context import (
+            get_project_index_manager, get_file_resolver, get_semantic_context_manager
+        )
+        
+        subscribers = []
+        for getter in (get_project_index_manager, get_file_resolver, get_semantic_context_manager):
+            try:
+                subscribers.append(getter().handle_file_changes)
             except Exception as e:
-                self._logger.exception(f"Error in file changes monitoring: {str(e)}")
-                await asyncio.sleep(30)  # Wait before retrying
+                self._logger.debug(f"Cache subscriber unavailable: {str(e)}")
+        return subscribers
     
     async def _monitor_system_resources(self) -> None:
         """Monitor system resources for potential issues."""
@@ -337,43 +368,19 @@ class BackgroundMonitor:
                 "success": False
             }
     
-    def _find_source_files(self, base_dir: Path) -> List[Path]:
+    def _is_source_file(self, file_path: Path) -> bool:
         """
-        Find source code files in a directory.
+        Check whether a changed file is a source file worth checking.
         
         Args:
-            base_dir: The base directory to search
+            file_path: The changed file
             
         Returns:
-            List of file paths
+            True if the file should be checked
         """
-        source_files = []
-        
-        # File extensions to look for
-        extensions = {
-            ".py", ".js", ".ts", ".java", ".c", ".cpp", ".h", ".hpp",
-            ".rs", ".go", ".rb", ".php", ".html", ".css", ".jsx", ".tsx"
-        }
-        
-        # Directories to ignore
-        ignore_dirs = {
-            "__pycache__", "node_modules", ".git", "venv", "env",
-            "build", "dist", "target", ".idea", ".vscode"
-        }
-        
-        try:
-            for root, dirs, files in os.walk(base_dir):
-                # Skip ignored directories
-                dirs[:] = [d for d in dirs if d not in ignore_dirs]
-                
-                for file in files:
-                    file_ext = os.path.splitext(file)[1]
-                    if file_ext in extensions:
-                        source_files.append(Path(os.path.join(root, file)))
-        except Exception as e:
-            self._logger.error(f"Error finding source files: {str(e)}")
-        
-        return source_files
+        if file_path.suffix not in self.SOURCE_EXTENSIONS:
+            return False
+        return not any(part in self.IGNORED_DIRECTORIES for part in file_path.parts)
     
     async def _check_python_file(self, file_path: Path) -> None:
         """
@@ -0,0 +1,353 @@
+# angela/components/monitoring/daemon.py
+"""
+Resident Angela daemon.
+
+The daemon initializes the application once and keeps the registry
+singletons (session memory, context, background monitor, proactive
+assistant) alive across shell commands. Shell hooks send notifications to it
+as datagrams on a Unix socket instead of starting a new interpreter for every
+command, and CLI processes can query its shared state over a small
+line-delimited JSON control socket. See ``daemon_client`` for the wire format.
+"""
+import asyncio
+import json
+import os
+import signal
+import socket
+import time
+from pathlib import Path
+from typing import Dict, Any, Optional, List
+
+from angela.constants import (
+    DAEMON_SOCKET_PATH,
+    DAEMON_CONTROL_SOCKET_PATH,
+    DAEMON_PID_FILE,
+    DAEMON_MAX_DATAGRAM,
+)
+from angela.components.monitoring.daemon_client import decode_notification
+from angela.utils.logging import get_logger
+
+logger = get_logger(__name__)
+
+
+class _NotificationProtocol(asyncio.DatagramProtocol):
+    """Datagram protocol that decodes notifications and queues them."""
+
+    def __init__(self, daemon: "AngelaDaemon"):
+        self._daemon = daemon
+
+    def datagram_received(self, data: bytes, addr: Any) -> None:
+        self._daemon._enqueue_notification(data)
+
+    def error_received(self, exc: Exception) -> None:
+        logger.debug(f"Daemon datagram socket error: {exc}")
+
+
+class AngelaDaemon:
+    """
+    Long-lived process that owns the Angela service singletons.
+
+    Notifications are decoded on receipt and handed to the notification
+    handler by a single worker task, so the socket is never blocked by slow
+    handlers and notifications from one shell are processed in order.
+    """
+
+    def __init__(
+        self,
+        socket_path: Optional[Path] = None,
+        control_path: Optional[Path] = None,
+        pid_file: Optional[Path] = None,
+        queue_size: int = 1024
+    ):
+        """
+        Initialize the daemon.
+
+        Args:
+            socket_path: Datagram socket for notifications
+            control_path: Stream socket for control requests
+            pid_file: File to record the daemon PID in
+            queue_size: Maximum number of notifications waiting to be handled
+        """
+        self._logger = logger
+        self.socket_path = Path(socket_path or DAEMON_SOCKET_PATH)
+        self.control_path = Path(control_path or DAEMON_CONTROL_SOCKET_PATH)
+        self.pid_file = Path(pid_file) if pid_file else DAEMON_PID_FILE
+        self._queue_size = queue_size
+
+        self._queue: Optional[asyncio.Queue] = None
+        self._shutdown_event: Optional[asyncio.Event] = None
+        self._transport: Optional[asyncio.DatagramTransport] = None
+        self._control_server: Optional[asyncio.AbstractServer] = None
+        self._worker_task: Optional[asyncio.Task] = None
+
+        self._started_at: Optional[float] = None
+        self._stats = {
+            "received": 0,
+            "handled": 0,
+            "dropped": 0,
+            "errors": 0,
+            "control_requests": 0,
+        }
+        self._handle_time_total = 0.0
+
+    @property
+    def is_running(self) -> bool:
+        """Whether the daemon is currently serving."""
+        return self._started_at is not None
+
+    def get_stats(self) -> Dict[str, Any]:
+        """
+        Get daemon statistics.
+
+        Returns:
+            Dictionary with counters, uptime and queue depth
+        """
+        handled = self._stats["handled"]
+        return {
+            **self._stats,
+            "pid": os.getpid(),
+            "uptime": time.monotonic() - self._started_at if self._started_at else 0.0,
+            "queue_depth": self._queue.qsize() if self._queue else 0,
+            "avg_handle_ms": (self._handle_time_total / handled * 1000) if handled else 0.0,
+        }
+
+    async def serve(self, initialize: bool = True, monitor: bool = False) -> None:
+        """
+        Run the daemon until shutdown is requested.
+
+        Args:
+            initialize: Whether to run ``init_application`` first
+            monitor: Whether to start the background monitor in this process
+        """
+        if initialize:
+            from angela import init_application
+            init_application()
+
+        loop = asyncio.get_running_loop()
+        self._queue = asyncio.Queue(maxsize=self._queue_size)
+        self._shutdown_event = asyncio.Event()
+
+        self._prepare_socket_path(self.socket_path)
+        self._prepare_socket_path(self.control_path)
+
+        sock = socket.socket(socket.AF_UNIX, socket.SOCK_DGRAM)
+        sock.setsockopt(socket.SOL_SOCKET, socket.SO_RCVBUF, DAEMON_MAX_DATAGRAM * 16)
+        sock.bind(str(self.socket_path))
+        os.chmod(self.socket_path, 0o600)
+        self._transport, _ = await loop.create_datagram_endpoint(
+            lambda: _NotificationProtocol(self), sock=sock
+        )
+
+        self._control_server = await asyncio.start_unix_server(
+            self._handle_control_client, path=str(self.control_path)
+        )
+        os.chmod(self.control_path, 0o600)
+
+        self._worker_task = asyncio.create_task(self._notification_worker())
+
+        for sig in (signal.SIGTERM, signal.SIGINT):
+            try:
+                loop.add_signal_handler(sig, self.request_shutdown)
+            except (NotImplementedError, RuntimeError):
+                pass
+
+        if monitor:
+            from angela.api.monitoring import get_background_monitor
+            get_background_monitor().start_monitoring()
+
+        self._write_pid_file()
+        self._started_at = time.monotonic()
+        self._logger.info(f"Angela daemon listening on {self.socket_path}")
+
+        try:
+            await self._shutdown_event.wait()
+        finally:
+            await self._cleanup()
+
+    def request_shutdown(self) -> None:
+        """Ask the daemon to stop after the current notification."""
+        if self._shutdown_event is not None:
+            self._shutdown_event.set()
+
+    def _enqueue_notification(self, data: bytes) -> None:
+        """
+        Queue a raw notification datagram for the worker.
+
+        Args:
+            data: The raw datagram
+        """
+        self._stats["received"] += 1
+        try:
+            self._queue.put_nowait(decode_notification(data))
+        except asyncio.QueueFull:
+            # Never block the shell: drop instead of applying backpressure
+            self._stats["dropped"] += 1
+
+    async def _notification_worker(self) -> None:
+        """Hand queued notifications to the notification handler in order."""
+        while True:
+            notification_type, args = await self._queue.get()
+            try:
+                await self._dispatch_notification(notification_type, args)
+            finally:
+                self._queue.task_done()
+
+    async def _dispatch_notification(self, notification_type: str, args: List[str]) -> None:
+        """
+        Handle one notification and record timing.
+
+        Args:
+            notification_type: Type of notification
+            args: Notification arguments
+        """
+        from angela.api.monitoring import get_notification_handler
+
+        if not notification_type:
+            return
+
+        start = time.perf_counter()
+        try:
+            await get_notification_handler().handle_notification(notification_type, *args)
+            self._stats["handled"] += 1
+        except Exception as e:
+            self._stats["errors"] += 1
+            self._logger.error(f"Error handling {notification_type} notification: {str(e)}")
+        finally:
+            self._handle_time_total += time.perf_counter() - start
+
+    async def _handle_control_client(self, reader: asyncio.StreamReader,
+                                     writer: asyncio.StreamWriter) -> None:
+        """
+        Serve line-delimited JSON control requests on one connection.
+
+        Args:
+            reader: Stream reader for the connection
+            writer: Stream writer for the connection
+        """
+        try:
+            while True:
+                line = await reader.readline()
+                if not line:
+                    break
+
+                self._stats["control_requests"] += 1
+                try:
+                    message = json.loads(line.decode("utf-8"))
+                    reply = await self._dispatch_control(message)
+                except Exception as e:
+                    reply = {"ok": False, "error": str(e)}
+
+                writer.write(json.dumps(reply, default=str).encode("utf-8") + b"\n")
+                await writer.drain()
+        except (ConnectionError, asyncio.IncompleteReadError, asyncio.CancelledError):
+            # Client went away, or the daemon is shutting down
+            pass
+        finally:
+            writer.close()
+
+    async def _dispatch_control(self, message: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Execute one control request.
+
+        Args:
+            message: The decoded request
+
+        Returns:
+            The reply to send back
+        """
+        op = message.get("op")
+
+        if op == "ping":
+            return {"ok": True, "pid": os.getpid()}
+
+        if op == "stats":
+            return {"ok": True, "stats": self.get_stats()}
+
+        if op == "session":
+            from angela.api.context import get_session_manager
+            return {"ok": True, "session": get_session_manager().get_context()}
+
+        if op == "session_update":
+            # A CLI process that continued the session hands it back
+            from angela.api.context import get_session_manager
+            get_session_manager().load_context(message.get("session") or {})
+            return {"ok": True}
+
+        if op == "notify":
+            # Synchronous delivery, for callers that need the effect applied
+            await self._dispatch_notification(
+                message.get("type", ""), [str(a) for a in message.get("args", [])]
+            )
+            return {"ok": True}
+
+        if op == "shutdown":
+            asyncio.get_running_loop().call_soon(self.request_shutdown)
+            return {"ok": True}
+
+        return {"ok": False, "error": f"Unknown operation: {op}"}
+
+    def _prepare_socket_path(self, path: Path) -> None:
+        """
+        Make sure a socket path can be bound, removing stale sockets.
+
+        Args:
+            path: The socket path
+
+        Raises:
+            RuntimeError: If another daemon is already listening on the path
+        """
+        path.parent.mkdir(parents=True, exist_ok=True)
+        if not path.exists():
+            return
+
+        if path == self.control_path:
+            probe = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+            try:
+                probe.settimeout(0.2)
+                probe.connect(str(path))
+                raise RuntimeError(f"Another Angela daemon is already listening on {path}")
+            except OSError:
+                pass
+            finally:
+                probe.close()
+
+        path.unlink()
+
+    def _write_pid_file(self) -> None:
+        """Record the daemon PID."""
+        try:
+            self.pid_file.parent.mkdir(parents=True, exist_ok=True)
+            self.pid_file.write_text(str(os.getpid()))
+        except OSError as e:
+            self._logger.warning(f"Could not write daemon PID file: {str(e)}")
+
+    async def _cleanup(self) -> None:
+        """Close sockets, stop the worker and remove runtime files."""
+        if self._worker_task:
+            self._worker_task.cancel()
+            try:
+                await self._worker_task
+            except asyncio.CancelledError:
+                pass
+
+        if self._transport:
+            self._transport.close()
+
+        if self._control_server:
+            self._control_server.close()
+            await self._control_server.wait_closed()
+
+        for path in (self.socket_path, self.control_path, self.pid_file):
+            try:
+                path.unlink()
+            except FileNotFoundError:
+                pass
+            except OSError as e:
+                self._logger.debug(f"Could not remove {path}: {str(e)}")
+
+        self._started_at = None
+        self._logger.info("Angela daemon stopped")
+
+
+# Global daemon instance
+angela_daemon = AngelaDaemon()
@@ -0,0 +1,193 @@
+# angela/components/monitoring/daemon_client.py
+"""
+Lightweight client for the resident Angela daemon.
+
+Shell hooks and CLI entry points use this module to hand work to a running
+daemon instead of initializing the full application in a fresh interpreter.
+It deliberately depends only on the standard library and ``angela.constants``
+so that importing it stays cheap.
+
+Wire formats:
+    * Notifications are single datagrams on ``DAEMON_SOCKET_PATH``. Fields are
+      NUL-terminated: ``type\\0arg1\\0arg2\\0...``. This is what
+      ``printf '%s\\0' post_exec "$cmd" 1 3`` produces, so shells can talk to
+      the daemon without Python at all.
+    * Control requests are newline-delimited JSON objects on the stream socket
+      ``DAEMON_CONTROL_SOCKET_PATH``; each request gets one JSON line back.
+"""
+import json
+import os
+import socket
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+from angela.constants import (
+    DAEMON_SOCKET_PATH,
+    DAEMON_CONTROL_SOCKET_PATH,
+    DAEMON_MAX_DATAGRAM,
+)
+
+# Keep well below DAEMON_MAX_DATAGRAM so that multi-field payloads still fit
+_MAX_FIELD_BYTES = 8 * 1024
+
+
+def encode_notification(notification_type: str, *args: Any) -> bytes:
+    """
+    Encode a notification as a NUL-terminated datagram payload.
+
+    Args:
+        notification_type: Type of notification (pre_exec, post_exec, dir_change)
+        args: Additional arguments for the notification
+
+    Returns:
+        The encoded payload
+    """
+    fields = [notification_type] + ["" if arg is None else str(arg) for arg in args]
+    payload = bytearray()
+    for field in fields:
+        data = field.replace("\0", "").encode("utf-8", errors="replace")
+        payload += data[:_MAX_FIELD_BYTES]
+        payload += b"\0"
+    return bytes(payload)
+
+
+def decode_notification(payload: bytes) -> Tuple[str, List[str]]:
+    """
+    Decode a datagram payload produced by :func:`encode_notification`.
+
+    A missing trailing NUL is tolerated so that hand-written senders
+    (``printf 'dir_change\\0/tmp'``) work as well.
+
+    Args:
+        payload: The raw datagram
+
+    Returns:
+        Tuple of (notification_type, args)
+    """
+    text = payload.decode("utf-8", errors="replace")
+    if text.endswith("\0"):
+        text = text[:-1]
+    fields = text.split("\0")
+    return fields[0].strip(), fields[1:]
+
+
+def send_notification(notification_type: str, *args: Any,
+                      socket_path: Optional[Path] = None) -> bool:
+    """
+    Send a notification to the daemon without waiting for it to be handled.
+
+    Args:
+        notification_type: Type of notification
+        args: Additional arguments for the notification
+        socket_path: Override for the daemon datagram socket
+
+    Returns:
+        True if the datagram was delivered to a listening daemon
+    """
+    path = str(socket_path or DAEMON_SOCKET_PATH)
+    if not os.path.exists(path):
+        return False
+
+    payload = encode_notification(notification_type, *args)
+    if len(payload) > DAEMON_MAX_DATAGRAM:
+        return False
+
+    sock = socket.socket(socket.AF_UNIX, socket.SOCK_DGRAM)
+    try:
+        sock.setblocking(False)
+        sock.sendto(payload, path)
+        return True
+    except OSError:
+        # No listener (stale socket), queue full or payload too large
+        return False
+    finally:
+        sock.close()
+
+
+def request_control(op: str, timeout: float = 1.0,
+                    socket_path: Optional[Path] = None, **params: Any) -> Optional[Dict[str, Any]]:
+    """
+    Send a control request to the daemon and wait for its reply.
+
+    Args:
+        op: The control operation (ping, session, session_update, stats, notify, shutdown)
+        timeout: Seconds to wait for connect and reply
+        socket_path: Override for the daemon control socket
+        params: Additional request fields
+
+    Returns:
+        The decoded reply, or None if no daemon answered
+    """
+    path = str(socket_path or DAEMON_CONTROL_SOCKET_PATH)
+    if not os.path.exists(path):
+        return None
+
+    message = dict(params)
+    message["op"] = op
+
+    sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    try:
+        sock.settimeout(timeout)
+        sock.connect(path)
+        sock.sendall(json.dumps(message).encode("utf-8") + b"\n")
+
+        buffer = bytearray()
+        while not buffer.endswith(b"\n"):
+            chunk = sock.recv(65536)
+            if not chunk:
+                break
+            buffer += chunk
+
+        if not buffer:
+            return None
+        return json.loads(buffer.decode("utf-8"))
+    except (OSError, ValueError):
+        return None
+    finally:
+        sock.close()
+
+
+def is_daemon_running(timeout: float = 0.2) -> bool:
+    """
+    Check whether a daemon is answering on the control socket.
+
+    Args:
+        timeout: Seconds to wait for the reply
+
+    Returns:
+        True if a daemon replied to a ping
+    """
+    reply = request_control("ping", timeout=timeout)
+    return bool(reply and reply.get("ok"))
+
+
+def fetch_session_context(timeout: float = 0.5) -> Optional[Dict[str, Any]]:
+    """
+    Fetch the daemon's session memory so a CLI process can continue it.
+
+    Args:
+        timeout: Seconds to wait for the reply
+
+    Returns:
+        The session context dictionary, or None if no daemon is running
+    """
+    reply = request_control("session", timeout=timeout)
+    if reply and reply.get("ok"):
+        return reply.get("session")
+    return None
+
+
+def push_session_context(session: Dict[str, Any], timeout: float = 0.5) -> bool:
+    """
+    Hand a session continued by a CLI process back to the daemon.
+
+    Args:
+        session: The session context dictionary, as returned by
+            ``fetch_session_context``
+        timeout: Seconds to wait for the reply
+
+    Returns:
+        True if the daemon stored the session
+    """
+    reply = request_control("session_update", timeout=timeout, session=session)
+    return bool(reply and reply.get("ok"))
@@ -0,0 +1,574 @@
+# angela/components/monitoring/file_watcher.py
+"""
+Event-driven file watching for project trees.
+
+On Linux the watcher uses inotify through ``ctypes`` (no extra service or
+dependency): one watch per directory, read from the event loop with
+``add_reader``, so an idle tree costs no CPU at all. Elsewhere, or when the
+inotify watch limit is exhausted, it falls back to a polling backend that
+compares directory snapshots.
+
+Raw events are coalesced per project root into :class:`FileChangeBatch`
+objects and pushed to every subscriber after a short quiet period.
+"""
+import asyncio
+import ctypes
+import ctypes.util
+import errno
+import inspect
+import os
+import struct
+import sys
+import time
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Dict, Any, Optional, List, Set, Callable, Tuple
+
+from angela.components.context.project_index import PRUNED_DIRECTORIES
+from angela.utils.logging import get_logger
+
+logger = get_logger(__name__)
+
+# Change kinds reported by backends
+CREATED = "created"
+MODIFIED = "modified"
+DELETED = "deleted"
+
+
+@dataclass
+class FileChangeBatch:
+    """Coalesced file changes below one project root."""
+    root: Path
+    created: Set[Path] = field(default_factory=set)
+    modified: Set[Path] = field(default_factory=set)
+    deleted: Set[Path] = field(default_factory=set)
+    overflow: bool = False  # Events were lost; subscribers should rescan
+
+    @property
+    def paths(self) -> Set[Path]:
+        """All paths touched by this batch."""
+        return self.created | self.modified | self.deleted
+
+    @property
+    def structure_changed(self) -> bool:
+        """Whether files were added or removed (or events were lost)."""
+        return bool(self.created or self.deleted or self.overflow)
+
+    def add(self, kind: str, path: Path) -> None:
+        """
+        Merge one change into the batch.
+
+        Args:
+            kind: CREATED, MODIFIED or DELETED
+            path: The changed path
+        """
+        if kind == CREATED:
+            if path in self.deleted:
+                # Deleted and re-created (e.g. atomic save): a modification
+                self.deleted.discard(path)
+                self.modified.add(path)
+            else:
+                self.created.add(path)
+        elif kind == MODIFIED:
+            if path not in self.created:
+                self.modified.add(path)
+        elif kind == DELETED:
+            self.modified.discard(path)
+            if path in self.created:
+                # Short-lived file: never existed as far as subscribers know
+                self.created.discard(path)
+            else:
+                self.deleted.add(path)
+
+    def __bool__(self) -> bool:
+        return bool(self.created or self.modified or self.deleted or self.overflow)
+
+
+# Emit callback: (kind, path) for changes, (None, None) for overflow
+EmitCallback = Callable[[Optional[str], Optional[Path]], None]
+
+
+class WatchLimitError(OSError):
+    """Raised when the kernel refuses more inotify watches."""
+
+
+class PollingBackend:
+    """Portable backend comparing directory snapshots at a fixed interval."""
+
+    name = "polling"
+
+    def __init__(self, root: Path, emit: EmitCallback, interval: float = 10.0):
+        """
+        Initialize the backend.
+
+        Args:
+            root: Directory tree to watch
+            emit: Callback receiving changes
+            interval: Seconds between scans
+        """
+        self.root = root
+        self._emit = emit
+        self.interval = interval
+        self._snapshot: Dict[str, Tuple[int, int]] = {}
+        self._task: Optional[asyncio.Task] = None
+
+    async def start(self) -> None:
+        """Take the initial snapshot and start polling."""
+        self._snapshot = await asyncio.to_thread(self._scan)
+        self._task = asyncio.create_task(self._poll())
+
+    async def stop(self) -> None:
+        """Stop polling."""
+        if self._task:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    async def _poll(self) -> None:
+        while True:
+            await asyncio.sleep(self.interval)
+            current = await asyncio.to_thread(self._scan)
+            previous = self._snapshot
+            self._snapshot = current
+
+            for path, stamp in current.items():
+                old = previous.get(path)
+                if old is None:
+                    self._emit(CREATED, Path(path))
+                elif old != stamp:
+                    self._emit(MODIFIED, Path(path))
+            for path in previous.keys() - current.keys():
+                self._emit(DELETED, Path(path))
+
+    def _scan(self) -> Dict[str, Tuple[int, int]]:
+        """Snapshot (mtime_ns, size) of every file below the root."""
+        snapshot = {}
+        stack = [str(self.root)]
+        while stack:
+            directory = stack.pop()
+            try:
+                with os.scandir(directory) as it:
+                    for entry in it:
+                        try:
+                            if entry.is_dir(follow_symlinks=False):
+                                if entry.name not in PRUNED_DIRECTORIES:
+                                    stack.append(entry.path)
+                            elif entry.is_file(follow_symlinks=False):
+                                st = entry.stat(follow_symlinks=False)
+                                snapshot[entry.path] = (st.st_mtime_ns, st.st_size)
+                        except OSError:
+                            continue
+            except OSError:
+                continue
+        return snapshot
+
+
+class InotifyBackend:
+    """Linux backend using inotify with one watch per directory."""
+
+    name = "inotify"
+
+    # inotify(7) constants
+    IN_MODIFY = 0x00000002
+    IN_CLOSE_WRITE = 0x00000008
+    IN_MOVED_FROM = 0x00000040
+    IN_MOVED_TO = 0x00000080
+    IN_CREATE = 0x00000100
+    IN_DELETE = 0x00000200
+    IN_DELETE_SELF = 0x00000400
+    IN_Q_OVERFLOW = 0x00004000
+    IN_IGNORED = 0x00008000
+    IN_ONLYDIR = 0x01000000
+    IN_EXCL_UNLINK = 0x04000000
+    IN_ISDIR = 0x40000000
+
+    WATCH_MASK = (IN_CLOSE_WRITE | IN_MOVED_FROM | IN_MOVED_TO | IN_CREATE |
+                  IN_DELETE | IN_DELETE_SELF | IN_ONLYDIR | IN_EXCL_UNLINK)
+
+    _EVENT_HEADER = struct.Struct("iIII")
+    _libc = None
+
+    def __init__(self, root: Path, emit: EmitCallback):
+        """
+        Initialize the backend.
+
+        Args:
+            root: Directory tree to watch
+            emit: Callback receiving changes
+        """
+        self.root = root
+        self._emit = emit
+        self._fd: Optional[int] = None
+        self._watches: Dict[int, str] = {}  # wd -> directory path
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._scans: Set[asyncio.Task] = set()
+
+    @classmethod
+    def is_available(cls) -> bool:
+        """Whether inotify can be used on this system."""
+        return cls._load_libc() is not None
+
+    @classmethod
+    def _load_libc(cls):
+        if cls._libc is None and sys.platform.startswith("linux"):
+            try:
+                libc = ctypes.CDLL(ctypes.util.find_library("c") or "libc.so.6", use_errno=True)
+                libc.inotify_init1.argtypes = [ctypes.c_int]
+                libc.inotify_add_watch.argtypes = [ctypes.c_int, ctypes.c_char_p, ctypes.c_uint32]
+                libc.inotify_rm_watch.argtypes = [ctypes.c_int, ctypes.c_int]
+                cls._libc = libc
+            except (OSError, AttributeError):
+                cls._libc = None
+        return cls._libc
+
+    @property
+    def watch_count(self) -> int:
+        """Number of active directory watches."""
+        return len(self._watches)
+
+    async def start(self) -> None:
+        """
+        Create the inotify instance and watch the whole tree.
+
+        Raises:
+            WatchLimitError: If the kernel watch limit was reached
+            OSError: If inotify could not be initialized
+        """
+        libc = self._load_libc()
+        if libc is None:
+            raise OSError(errno.ENOSYS, "inotify is not available")
+
+        fd = libc.inotify_init1(os.O_NONBLOCK | os.O_CLOEXEC)
+        if fd < 0:
+            err = ctypes.get_errno()
+            raise OSError(err, os.strerror(err))
+        self._fd = fd
+
+        try:
+            await asyncio.to_thread(self._add_tree, str(self.root))
+        except OSError:
+            self._close()
+            raise
+
+        self._loop = asyncio.get_running_loop()
+        self._loop.add_reader(fd, self._read_events)
+
+    async def stop(self) -> None:
+        """Remove all watches and close the inotify instance."""
+        if self._loop and self._fd is not None:
+            self._loop.remove_reader(self._fd)
+        for task in list(self._scans):
+            task.cancel()
+        self._close()
+
+    def _close(self) -> None:
+        if self._fd is not None:
+            os.close(self._fd)
+            self._fd = None
+        self._watches.clear()
+
+    def _add_watch(self, directory: str) -> None:
+        fd = self._fd
+        if fd is None:
+            return  # Stopped while a scan was running
+        wd = self._libc.inotify_add_watch(fd, os.fsencode(directory), self.WATCH_MASK)
+        if wd < 0:
+            err = ctypes.get_errno()
+            if err == errno.ENOSPC:
+                raise WatchLimitError(err, "inotify watch limit reached (fs.inotify.max_user_watches)")
+            if err in (errno.ENOENT, errno.ENOTDIR, errno.EACCES):
+                return
+            raise OSError(err, os.strerror(err))
+        self._watches[wd] = directory
+
+    def _add_tree(self, top: str, report_file: Optional[Callable[[Path], None]] = None) -> None:
+        """
+        Watch a directory and all of its subdirectories.
+
+        Runs in a worker thread.
+
+        Args:
+            top: Directory to add
+            report_file: Called for each existing file (for directories
+                that appeared after watching started)
+        """
+        stack = [top]
+        while stack and self._fd is not None:
+            directory = stack.pop()
+            self._add_watch(directory)
+            try:
+                with os.scandir(directory) as it:
+                    for entry in it:
+                        try:
+                            if entry.is_dir(follow_symlinks=False):
+                                if entry.name not in PRUNED_DIRECTORIES:
+                                    stack.append(entry.path)
+                            elif report_file and entry.is_file(follow_symlinks=False):
+                                report_file(Path(entry.path))
+                        except OSError:
+                            continue
+            except OSError:
+                continue
+
+    def _read_events(self) -> None:
+        """Drain and translate pending inotify events."""
+        while True:
+            try:
+                data = os.read(self._fd, 64 * 1024)
+            except BlockingIOError:
+                return
+            except OSError as e:
+                logger.debug(f"inotify read failed: {e}")
+                return
+            if not data:
+                return
+            self._parse_events(data)
+
+    def _parse_events(self, data: bytes) -> None:
+        header = self._EVENT_HEADER
+        offset = 0
+        while offset + header.size <= len(data):
+            wd, mask, _cookie, length = header.unpack_from(data, offset)
+            offset += header.size
+            name = data[offset:offset + length].rstrip(b"\0")
+            offset += length
+
+            if mask & self.IN_Q_OVERFLOW:
+                self._emit(None, None)
+                continue
+
+            directory = self._watches.get(wd)
+            if directory is None:
+                continue
+
+            if mask & self.IN_IGNORED:
+                self._watches.pop(wd, None)
+                continue
+            if mask & self.IN_DELETE_SELF:
+                continue
+
+            path = os.path.join(directory, os.fsdecode(name))
+            if mask & self.IN_ISDIR:
+                self._handle_directory_event(mask, path)
+            elif mask & (self.IN_CREATE | self.IN_MOVED_TO):
+                self._emit(CREATED, Path(path))
+            elif mask & (self.IN_DELETE | self.IN_MOVED_FROM):
+                self._emit(DELETED, Path(path))
+            elif mask & (self.IN_CLOSE_WRITE | self.IN_MODIFY):
+                self._emit(MODIFIED, Path(path))
+
+    def _handle_directory_event(self, mask: int, path: str) -> None:
+        if os.path.basename(path) in PRUNED_DIRECTORIES:
+            return
+        if mask & (self.IN_CREATE | self.IN_MOVED_TO):
+            # A moved-in tree can be large; scan it off the event loop like the initial one
+            task = self._loop.create_task(self._watch_new_tree(path))
+            self._scans.add(task)
+            task.add_done_callback(self._scans.discard)
+        elif mask & (self.IN_DELETE | self.IN_MOVED_FROM):
+            prefix = path + os.sep
+            for wd, directory in list(self._watches.items()):
+                if directory == path or directory.startswith(prefix):
+                    self._watches.pop(wd, None)
+                    self._libc.inotify_rm_watch(self._fd, wd)
+            self._emit(DELETED, Path(path))
+
+    async def _watch_new_tree(self, path: str) -> None:
+        loop = asyncio.get_running_loop()
+
+        def report_file(file_path: Path) -> None:
+            try:
+                loop.call_soon_threadsafe(self._emit, CREATED, file_path)
+            except RuntimeError:
+                pass  # Event loop already closed
+
+        try:
+            await asyncio.to_thread(self._add_tree, path, report_file)
+        except WatchLimitError:
+            logger.warning(f"inotify watch limit reached; {path} is not watched")
+            self._emit(None, None)
+        except OSError as e:
+            logger.debug(f"Could not watch {path}: {e}")
+
+
+class FileWatcher:
+    """
+    Watches project trees and pushes coalesced change batches to subscribers.
+
+    Subscribers are plain or async callables receiving a
+    :class:`FileChangeBatch`. Events are delivered once the tree has been
+    quiet for ``debounce`` seconds, or at the latest ``max_latency`` seconds
+    after the first pending event.
+    """
+
+    def __init__(self, debounce: float = 0.2, max_latency: float = 1.0,
+                 poll_interval: float = 10.0, backend: Optional[str] = None):
+        """
+        Initialize the watcher.
+
+        Args:
+            debounce: Quiet period before a batch is delivered
+            max_latency: Maximum delay between an event and its delivery
+            poll_interval: Scan interval of the polling fallback
+            backend: Force "inotify" or "polling" (defaults to ANGELA_WATCHER
+                or the best available backend)
+        """
+        self._logger = logger
+        self.debounce = debounce
+        self.max_latency = max_latency
+        self.poll_interval = poll_interval
+        self._preferred_backend = backend or os.environ.get("ANGELA_WATCHER")
+
+        self._subscribers: List[Callable[[FileChangeBatch], Any]] = []
+        self._backends: Dict[Path, Any] = {}
+        self._pending: Dict[Path, FileChangeBatch] = {}
+        self._pending_since: Dict[Path, float] = {}
+        self._flush_handles: Dict[Path, asyncio.TimerHandle] = {}
+        self._delivery_tasks: Set[asyncio.Task] = set()
+        self._stats = {"events": 0, "batches": 0, "overflows": 0, "subscriber_errors": 0}
+
+    def subscribe(self, callback: Callable[[FileChangeBatch], Any]) -> None:
+        """
+        Register a subscriber for change batches.
+
+        Args:
+            callback: Plain or async callable taking a FileChangeBatch
+        """
+        if callback not in self._subscribers:
+            self._subscribers.append(callback)
+
+    def unsubscribe(self, callback: Callable[[FileChangeBatch], Any]) -> None:
+        """
+        Remove a subscriber.
+
+        Args:
+            callback: A previously registered callback
+        """
+        if callback in self._subscribers:
+            self._subscribers.remove(callback)
+
+    def is_watching(self, root: Path) -> bool:
+        """Whether a root is currently watched."""
+        return Path(root).resolve() in self._backends
+
+    async def watch(self, root: Path) -> str:
+        """
+        Start watching a directory tree.
+
+        Args:
+            root: The root directory
+
+        Returns:
+            Name of the backend serving the root
+        """
+        root = Path(root).resolve()
+        if root in self._backends:
+            return self._backends[root].name
+
+        emit = lambda kind, path: self._on_event(root, kind, path)
+        backend = None
+
+        if self._preferred_backend != "polling" and InotifyBackend.is_available():
+            backend = InotifyBackend(root, emit)
+            try:
+                await backend.start()
+            except OSError as e:
+                self._logger.warning(f"Falling back to polling for {root}: {str(e)}")
+                backend = None
+
+        if backend is None:
+            backend = PollingBackend(root, emit, interval=self.poll_interval)
+            await backend.start()
+
+        self._backends[root] = backend
+        self._logger.debug(f"Watching {root} with {backend.name} backend")
+        return backend.name
+
+    async def unwatch(self, root: Path) -> None:
+        """
+        Stop watching a directory tree.
+
+        Args:
+            root: The root directory
+        """
+        root = Path(root).resolve()
+        backend = self._backends.pop(root, None)
+        if backend:
+            await backend.stop()
+        handle = self._flush_handles.pop(root, None)
+        if handle:
+            handle.cancel()
+        self._pending.pop(root, None)
+        self._pending_since.pop(root, None)
+
+    async def stop(self) -> None:
+        """Stop watching all roots and wait for in-flight deliveries."""
+        for root in list(self._backends):
+            await self.unwatch(root)
+        if self._delivery_tasks:
+            await asyncio.gather(*self._delivery_tasks, return_exceptions=True)
+
+    def get_stats(self) -> Dict[str, Any]:
+        """
+        Get watcher statistics.
+
+        Returns:
+            Dictionary with counters and watched roots
+        """
+        return {
+            **self._stats,
+            "roots": {str(root): backend.name for root, backend in self._backends.items()},
+            "watches": sum(getattr(b, "watch_count", 0) for b in self._backends.values()),
+        }
+
+    def _on_event(self, root: Path, kind: Optional[str], path: Optional[Path]) -> None:
+        """Record one backend event and schedule delivery."""
+        batch = self._pending.get(root)
+        if batch is None:
+            batch = self._pending[root] = FileChangeBatch(root)
+            self._pending_since[root] = time.monotonic()
+
+        self._stats["events"] += 1
+        if kind is None:
+            batch.overflow = True
+            self._stats["overflows"] += 1
+        else:
+            batch.add(kind, path)
+
+        loop = asyncio.get_running_loop()
+        handle = self._flush_handles.pop(root, None)
+        if handle:
+            handle.cancel()
+        elapsed = time.monotonic() - self._pending_since[root]
+        delay = max(0.0, min(self.debounce, self.max_latency - elapsed))
+        self._flush_handles[root] = loop.call_later(delay, self._flush, root)
+
+    def _flush(self, root: Path) -> None:
+        """Deliver the pending batch for a root."""
+        self._flush_handles.pop(root, None)
+        self._pending_since.pop(root, None)
+        batch = self._pending.pop(root, None)
+        if not batch:
+            return
+
+        self._stats["batches"] += 1
+        task = asyncio.create_task(self._deliver(batch))
+        self._delivery_tasks.add(task)
+        task.add_done_callback(self._delivery_tasks.discard)
+
+    async def _deliver(self, batch: FileChangeBatch) -> None:
+        for callback in list(self._subscribers):
+            try:
+                result = callback(batch)
+                if inspect.isawaitable(result):
+                    await result
+            except Exception as e:
+                self._stats["subscriber_errors"] += 1
+                self._logger.error(f"File change subscriber failed: {str(e)}")
+
+
+# Global file watcher instance
+file_watcher = FileWatcher()
@@ -0,0 +1,657 @@
+# angela/components/review/diff_engine.py
+"""
+Diff engine for Angela CLI.
+
+Computes differences between sequences of lines (text) or byte tokens
+(binary data) without difflib's quadratic matching:
+
+1. The common prefix and suffix are stripped.
+2. Lines are interned to integers, so every later comparison is an integer
+   comparison rather than a string comparison.
+3. Lines that occur exactly once on both sides are matched up by patience
+   diff (longest increasing subsequence) and split the input into small
+   independent regions.
+4. Regions without such anchors are diffed with Myers' O(ND) algorithm. If
+   the edit distance of a region exceeds a cost limit, the region is
+   reported as replaced instead of searched further.
+
+Results are difflib-style opcodes, from which unified diffs, HTML diffs
+and compact binary patches are built. A patch is a compressed list of
+copy and insert instructions that turns one byte string into another,
+with checksums of both so it cannot be applied to the wrong content.
+"""
+import html
+import re
+import struct
+import zlib
+from bisect import bisect_left
+from typing import Dict, Hashable, Iterator, List, Optional, Sequence, Tuple, Union
+
+from angela.utils.logging import get_logger
+
+logger = get_logger(__name__)
+
+# (tag, i1, i2, j1, j2), as returned by difflib.SequenceMatcher.get_opcodes
+Opcode = Tuple[str, int, int, int, int]
+
+# Maximum edit distance searched by Myers' algorithm within one region
+DEFAULT_MAX_COST = 1000
+
+# Patience recursion deeper than this switches to Myers
+MAX_PATIENCE_DEPTH = 64
+
+# Binary data is compared as tokens that end after a newline or NUL byte,
+# and are at most 64 bytes long
+_BINARY_TOKEN = re.compile(rb"[^\n\x00]{0,63}[\n\x00]|[^\n\x00]{1,64}")
+
+PATCH_MAGIC = b"ADP1"
+_OP_COPY = 1
+_OP_INSERT = 2
+_CHECKSUMS = struct.Struct("<II")
+
+NO_NEWLINE_MARKER = "\\ No newline at end of file\n"
+_HUNK_HEADER = re.compile(r"^@@ -(\d+)(?:,(\d+))? \+(\d+)(?:,(\d+))? @@")
+
+
+class PatchError(ValueError):
+    """A diff or patch does not apply to the given content."""
+
+
+def split_lines(data: Union[str, bytes]) -> list:
+    """
+    Split text or bytes into lines, keeping the newline of each line.
+
+    Unlike ``str.splitlines`` only ``\\n`` ends a line, so joining the
+    lines always gives back the input.
+    """
+    newline = b"\n" if isinstance(data, bytes) else "\n"
+    lines = data.split(newline)
+    result = [line + newline for line in lines[:-1]]
+    if lines[-1]:
+        result.append(lines[-1])
+    return result
+
+
+def is_binary(data: bytes, sample_size: int = 8192) -> bool:
+    """Check whether data looks binary (contains NUL bytes or is not UTF-8)."""
+    sample = data[:sample_size]
+    if b"\x00" in sample:
+        return True
+    try:
+        sample.decode("utf-8")
+    except UnicodeDecodeError as e:
+        # A multi-byte character cut off by the sample boundary is fine
+        return e.start < len(sample) - 3
+    return False
+
+
+def tokenize_bytes(data: bytes) -> List[bytes]:
+    """Split binary data into short, content-delimited tokens."""
+    return _BINARY_TOKEN.findall(data)
+
+
+# --- Matching ---
+
+def _intern(a: Sequence[Hashable], b: Sequence[Hashable]) -> Tuple[List[int], List[int]]:
+    """Replace items by integer IDs shared between both sequences."""
+    ids: Dict[Hashable, int] = {}
+    a_ids = [ids.setdefault(item, len(ids)) for item in a]
+    b_ids = [ids.setdefault(item, len(ids)) for item in b]
+    return a_ids, b_ids
+
+
+def _unique_anchors(a: List[int], alo: int, ahi: int, b: List[int], blo: int, bhi: int) -> List[Tuple[int, int]]:
+    """Longest increasing run of items that occur exactly once in both ranges."""
+    a_index: Dict[int, int] = {}
+    for i in range(alo, ahi):
+        a_index[a[i]] = -1 if a[i] in a_index else i
+    b_index: Dict[int, int] = {}
+    for j in range(blo, bhi):
+        item = b[j]
+        if item in a_index:
+            b_index[item] = -1 if item in b_index else j
+
+    pairs = [
+        (i, b_index[item]) for item, i in a_index.items()
+        if i >= 0 and b_index.get(item, -1) >= 0
+    ]
+    if not pairs:
+        return []
+
+    # Patience sorting: longest subsequence of pairs increasing in b
+    tails: List[int] = []
+    tail_pairs: List[int] = []
+    previous: List[int] = []
+    for n, (_, j) in enumerate(pairs):
+        pile = bisect_left(tails, j)
+        previous.append(tail_pairs[pile - 1] if pile else -1)
+        if pile == len(tails):
+            tails.append(j)
+            tail_pairs.append(n)
+        else:
+            tails[pile] = j
+            tail_pairs[pile] = n
+
+    anchors = []
+    n = tail_pairs[-1]
+    while n >= 0:
+        anchors.append(pairs[n])
+        n = previous[n]
+    anchors.reverse()
+    return anchors
+
+
+def _myers(
+    a: List[int], alo: int, ahi: int, b: List[int], blo: int, bhi: int, max_cost: int
+) -> List[Tuple[int, int, int]]:
+    """Matching blocks of a shortest edit script, or none if it costs more than max_cost."""
+    n = ahi - alo
+    m = bhi - blo
+    limit = min(n + m, max_cost)
+    offset = limit + 1
+    v = [0] * (2 * limit + 3)
+    trace: List[List[int]] = []
+
+    for d in range(limit + 1):
+        for k in range(-d, d + 1, 2):
+            if k == -d or (k != d and v[offset + k - 1] < v[offset + k + 1]):
+                x = v[offset + k + 1]
+            else:
+                x = v[offset + k - 1] + 1
+            y = x - k
+            while x < n and y < m and a[alo + x] == b[blo + y]:
+                x += 1
+                y += 1
+            v[offset + k] = x
+            if x >= n and y >= m:
+                trace.append(v[offset - d:offset + d + 1])
+                return _myers_backtrack(trace, n, m, alo, blo)
+        trace.append(v[offset - d:offset + d + 1])
+
+    return []
+
+
+def _myers_backtrack(trace: List[List[int]], x: int, y: int, alo: int, blo: int) -> List[Tuple[int, int, int]]:
+    blocks = []
+    for d in range(len(trace) - 1, 0, -1):
+        previous = trace[d - 1]
+        k = x - y
+        # previous[k'] is stored at index k' + (d - 1)
+        if k == -d or (k != d and previous[k - 1 + d - 1] < previous[k + 1 + d - 1]):
+            prev_k = k + 1
+            prev_x = previous[prev_k + d - 1]
+            start_x = prev_x
+        else:
+            prev_k = k - 1
+            prev_x = previous[prev_k + d - 1]
+            start_x = prev_x + 1
+        if x > start_x:
+            blocks.append((alo + start_x, blo + start_x - k, x - start_x))
+        x, y = prev_x, prev_x - prev_k
+    if x > 0:
+        blocks.append((alo, blo, x))
+    blocks.reverse()
+    return blocks
+
+
+def _match(
+    a: List[int], alo: int, ahi: int, b: List[int], blo: int, bhi: int,
+    blocks: List[Tuple[int, int, int]], max_cost: int, depth: int = 0
+) -> None:
+    """Append the matching blocks of a[alo:ahi] and b[blo:bhi] to blocks, in order."""
+    start_a, start_b = alo, blo
+    while alo < ahi and blo < bhi and a[alo] == b[blo]:
+        alo += 1
+        blo += 1
+    if alo > start_a:
+        blocks.append((start_a, start_b, alo - start_a))
+
+    suffix = 0
+    while alo < ahi - suffix and blo < bhi - suffix and a[ahi - 1 - suffix] == b[bhi - 1 - suffix]:
+        suffix += 1
+    ahi -= suffix
+    blo_end = bhi - suffix
+
+    if alo < ahi and blo < blo_end:
+        anchors = _unique_anchors(a, alo, ahi, b, blo, blo_end) if depth < MAX_PATIENCE_DEPTH else []
+        if anchors:
+            for i, j in anchors:
+                _match(a, alo, i, b, blo, j, blocks, max_cost, depth + 1)
+                blocks.append((i, j, 1))
+                alo, blo = i + 1, j + 1
+            _match(a, alo, ahi, b, blo, blo_end, blocks, max_cost, depth + 1)
+        else:
+            blocks.extend(_myers(a, alo, ahi, b, blo, blo_end, max_cost))
+
+    if suffix:
+        blocks.append((ahi, blo_end, suffix))
+
+
+def matching_blocks(
+    a: Sequence[Hashable], b: Sequence[Hashable], max_cost: int = DEFAULT_MAX_COST
+) -> List[Tuple[int, int, int]]:
+    """
+    Find the matching blocks between two sequences.
+
+    Args:
+        a: First sequence of hashable items
+        b: Second sequence of hashable items
+        max_cost: Edit distance limit for Myers' algorithm per region
+
+    Returns:
+        Non-overlapping (i, j, n) blocks with a[i:i+n] == b[j:j+n], in order
+    """
+    a_ids, b_ids = _intern(a, b)
+    raw: List[Tuple[int, int, int]] = []
+    _match(a_ids, 0, len(a_ids), b_ids, 0, len(b_ids), raw, max_cost)
+
+    blocks: List[Tuple[int, int, int]] = []
+    for i, j, n in raw:
+        if blocks and blocks[-1][0] + blocks[-1][2] == i and blocks[-1][1] + blocks[-1][2] == j:
+            blocks[-1] = (blocks[-1][0], blocks[-1][1], blocks[-1][2] + n)
+        elif n:
+            blocks.append((i, j, n))
+    return blocks
+
+
+def diff_opcodes(
+    a: Sequence[Hashable], b: Sequence[Hashable], max_cost: int = DEFAULT_MAX_COST
+) -> List[Opcode]:
+    """
+    Compute the opcodes turning ``a`` into ``b``.
+
+    Args:
+        a: First sequence of hashable items
+        b: Second sequence of hashable items
+        max_cost: Edit distance limit for Myers' algorithm per region
+
+    Returns:
+        difflib-style opcodes
+    """
+    opcodes: List[Opcode] = []
+    i = j = 0
+    for ai, bj, size in matching_blocks(a, b, max_cost) + [(len(a), len(b), 0)]:
+        if i < ai and j < bj:
+            opcodes.append(("replace", i, ai, j, bj))
+        elif i < ai:
+            opcodes.append(("delete", i, ai, j, bj))
+        elif j < bj:
+            opcodes.append(("insert", i, ai, j, bj))
+        i, j = ai + size, bj + size
+        if size:
+            opcodes.append(("equal", ai, i, bj, j))
+    return opcodes
+
+
+def group_opcodes(opcodes: List[Opcode], context: int = 3) -> Iterator[List[Opcode]]:
+    """
+    Group opcodes into hunks with up to ``context`` lines of context.
+
+    Same grouping as difflib.SequenceMatcher.get_grouped_opcodes.
+    """
+    codes = list(opcodes) or [("equal", 0, 1, 0, 1)]
+    if codes[0][0] == "equal":
+        tag, i1, i2, j1, j2 = codes[0]
+        codes[0] = tag, max(i1, i2 - context), i2, max(j1, j2 - context), j2
+    if codes[-1][0] == "equal":
+        tag, i1, i2, j1, j2 = codes[-1]
+        codes[-1] = tag, i1, min(i2, i1 + context), j1, min(j2, j1 + context)
+
+    gap = context + context
+    group: List[Opcode] = []
+    for tag, i1, i2, j1, j2 in codes:
+        if tag == "equal" and i2 - i1 > gap:
+            group.append((tag, i1, min(i2, i1 + context), j1, min(j2, j1 + context)))
+            yield group
+            group = []
+            i1, j1 = max(i1, i2 - context), max(j1, j2 - context)
+        group.append((tag, i1, i2, j1, j2))
+    if group and not (len(group) == 1 and group[0][0] == "equal"):
+        yield group
+
+
+# --- Text output ---
+
+def _format_range(start: int, stop: int) -> str:
+    """Unified diff line range, as in difflib."""
+    beginning = start + 1
+    length = stop - start
+    if length == 1:
+        return str(beginning)
+    if not length:
+        beginning -= 1
+    return f"{beginning},{length}"
+
+
+def unified_diff(
+    a_lines: List[str],
+    b_lines: List[str],
+    fromfile: str = "original",
+    tofile: str = "modified",
+    context: int = 3,
+    max_cost: int = DEFAULT_MAX_COST
+) -> str:
+    """
+    Generate a unified diff between two lists of lines.
+
+    Lines keep their newlines. A last line without one is followed by a
+    ``\\ No newline at end of file`` marker.
+
+    Args:
+        a_lines: Original lines
+        b_lines: Modified lines
+        fromfile: Name of the original in the header
+        tofile: Name of the modified version in the header
+        context: Number of context lines
+        max_cost: Edit distance limit for Myers' algorithm per region
+
+    Returns:
+        Unified diff text, empty if the inputs are equal
+    """
+    out: List[str] = []
+
+    def emit(prefix: str, line: str) -> None:
+        out.append(prefix + line)
+        if not line.endswith("\n"):
+            out.append("\n" + NO_NEWLINE_MARKER)
+
+    for group in group_opcodes(diff_opcodes(a_lines, b_lines, max_cost), context):
+        if not out:
+            out.append(f"--- {fromfile}\n")
+            out.append(f"+++ {tofile}\n")
+        first, last = group[0], group[-1]
+        out.append(f"@@ -{_format_range(first[1], last[2])} +{_format_range(first[3], last[4])} @@\n")
+        for tag, i1, i2, j1, j2 in group:
+            if tag == "equal":
+                for line in a_lines[i1:i2]:
+                    emit(" ", line)
+                continue
+            for line in a_lines[i1:i2]:
+                emit("-", line)
+            for line in b_lines[j1:j2]:
+                emit("+", line)
+    return "".join(out)
+
+
+def html_diff(
+    a_lines: List[str],
+    b_lines: List[str],
+    fromdesc: str = "Original",
+    todesc: str = "Modified",
+    context: int = 3,
+    max_cost: int = DEFAULT_MAX_COST
+) -> str:
+    """
+    Generate a side-by-side HTML page of the changed hunks.
+
+    Uses the table layout and CSS classes of difflib.HtmlDiff.
+
+    Args:
+        a_lines: Original lines
+        b_lines: Modified lines
+        fromdesc: Heading of the original column
+        todesc: Heading of the modified column
+        context: Number of context lines
+        max_cost: Edit distance limit for Myers' algorithm per region
+
+    Returns:
+        HTML document
+    """
+    classes = {"replace": "diff_chg", "delete": "diff_sub", "insert": "diff_add"}
+
+    def cell(number: Optional[int], line: Optional[str], css: str) -> str:
+        if line is None:
+            return '<td class="diff_next"></td><td nowrap="nowrap"></td>'
+        text = html.escape(line.rstrip("\r\n")).replace(" ", "&nbsp;")
+        if css:
+            text = f'<span class="{css}">{text}</span>'
+        return f'<td class="diff_header">{number}</td><td nowrap="nowrap">{text}</td>'
+
+    rows: List[str] = []
+    for group in group_opcodes(diff_opcodes(a_lines, b_lines, max_cost), context):
+        if rows:
+            rows.append('<tr><td class="diff_next" colspan="4">&#8942;</td></tr>')
+        for tag, i1, i2, j1, j2 in group:
+            css = classes.get(tag, "")
+            for k in range(max(i2 - i1, j2 - j1)):
+                i, j = i1 + k, j1 + k
+                left = cell(i + 1, a_lines[i], css) if i < i2 else cell(None, None, "")
+                right = cell(j + 1, b_lines[j], css) if j < j2 else cell(None, None, "")
+                rows.append(f"<tr>{left}{right}</tr>")
+    if not rows:
+        rows.append('<tr><td colspan="4">No Differences Found</td></tr>')
+
+    return (
+        "<!DOCTYPE html>\n<html>\n<head>\n<meta charset=\"utf-8\" />\n<title></title>\n"
+        "<style type=\"text/css\">\n"
+        "table.diff {font-family:Courier; border:medium;}\n"
+        ".diff_header {background-color:#e0e0e0}\n"
+        ".diff_next {background-color:#c0c0c0}\n"
+        ".diff_add {background-color:#aaffaa}\n"
+        ".diff_chg {background-color:#ffff77}\n"
+        ".diff_sub {background-color:#ffaaaa}\n"
+        "</style>\n</head>\n<body>\n"
+        "<table class=\"diff\" cellspacing=\"0\" cellpadding=\"0\" rules=\"groups\">\n"
+        f"<thead><tr><th class=\"diff_next\" colspan=\"2\">{html.escape(fromdesc)}</th>"
+        f"<th class=\"diff_next\" colspan=\"2\">{html.escape(todesc)}</th></tr></thead>\n"
+        "<tbody>\n" + "\n".join(rows) + "\n</tbody>\n</table>\n</body>\n</html>\n"
+    )
+
+
+# --- Applying unified diffs ---
+
+def _strip_eol(line: str) -> str:
+    return line.rstrip("\r\n")
+
+
+def _parse_hunks(diff: str) -> List[Tuple[int, List[Tuple[str, str]]]]:
+    """Parse the hunks of a unified diff into (old start, [(tag, line)])."""
+    hunks: List[Tuple[int, List[Tuple[str, str]]]] = []
+    body: Optional[List[Tuple[str, str]]] = None
+    for line in split_lines(diff):
+        match = _HUNK_HEADER.match(line)
+        if match:
+            old_start, old_count = int(match.group(1)), int(match.group(2) or 1)
+            body = []
+            hunks.append((old_start - 1 if old_count else old_start, body))
+        elif body is None:
+            continue  # File headers
+        elif line.startswith("\\"):
+            if body:
+                tag, text = body[-1]
+                body[-1] = (tag, text[:-1] if text.endswith("\n") else text)
+        elif line[:1] in (" ", "-", "+"):
+            body.append((line[0], line[1:]))
+        elif line in ("\n", "\r\n"):
+            # Context lines of empty lines that lost their leading space
+            body.append((" ", line))
+        else:
+            body = None
+    # A following file's "--- " and "+++ " headers read as hunk lines
+    for _, lines in hunks:
+        while len(lines) >= 2 and lines[-2][0] == "-" and lines[-2][1].startswith("-- ") \
+                and lines[-1][0] == "+" and lines[-1][1].startswith("++ "):
+            del lines[-2:]
+    return hunks
+
+
+def _find_block(source: List[str], block: List[str], hint: int, start: int) -> int:
+    """Position of block in source at or after start, nearest to hint, or -1."""
+    if not block:
+        return max(hint, start) if max(hint, start) <= len(source) else -1
+    wanted = [_strip_eol(line) for line in block]
+    size = len(wanted)
+
+    def matches(pos: int) -> bool:
+        return all(_strip_eol(source[pos + k]) == wanted[k] for k in range(size))
+
+    last = len(source) - size
+    for distance in range(max(last - start, hint - start) + 1):
+        for pos in (hint - distance, hint + distance) if distance else (hint,):
+            if start <= pos <= last and matches(pos):
+                return pos
+    return -1
+
+
+def apply_unified_diff(original: str, diff: str) -> str:
+    """
+    Apply a unified diff.
+
+    Each hunk is applied where its context and removed lines match,
+    starting at the position in its header and searching outwards from
+    there, so diffs with inaccurate line numbers still apply. Diffs without
+    hunk headers are applied from the start of the content.
+
+    Args:
+        original: Content the diff was made from
+        diff: Unified diff
+
+    Returns:
+        The patched content
+
+    Raises:
+        PatchError: If a hunk does not match the content
+    """
+    source = split_lines(original)
+    hunks = _parse_hunks(diff)
+    if not hunks and diff.strip():
+        # Headerless diff: a single hunk applied from the top
+        lines = [line for line in split_lines(diff) if not line.startswith(("---", "+++"))]
+        hunks = _parse_hunks("@@ -1 +1 @@\n" + "".join(lines))
+
+    result: List[str] = []
+    pos = 0
+    for hint, lines in hunks:
+        old_block = [text for tag, text in lines if tag != "+"]
+        found = _find_block(source, old_block, hint, pos)
+        if found < 0:
+            raise PatchError(f"Hunk at line {hint + 1} does not match the content")
+        result.extend(source[pos:found])
+        pos = found
+        for tag, text in lines:
+            if tag == " ":
+                result.append(source[pos])
+                pos += 1
+            elif tag == "-":
+                pos += 1
+            else:
+                result.append(text)
+    result.extend(source[pos:])
+    return "".join(result)
+
+
+# --- Binary patches ---
+
+def _write_varint(out: bytearray, value: int) -> None:
+    while value >= 0x80:
+        out.append((value & 0x7F) | 0x80)
+        value >>= 7
+    out.append(value)
+
+
+def _read_varint(data: bytes, pos: int) -> Tuple[int, int]:
+    value = 0
+    shift = 0
+    while True:
+        if pos >= len(data):
+            raise PatchError("Truncated patch")
+        byte = data[pos]
+        pos += 1
+        value |= (byte & 0x7F) << shift
+        if byte < 0x80:
+            return value, pos
+        shift += 7
+
+
+def make_patch(source: bytes, target: bytes, max_cost: int = DEFAULT_MAX_COST) -> bytes:
+    """
+    Build a compact patch that turns ``source`` into ``target``.
+
+    Text is compared line by line; binary data in short tokens.
+
+    Args:
+        source: Content the patch applies to
+        target: Content the patch produces
+        max_cost: Edit distance limit for Myers' algorithm per region
+
+    Returns:
+        The patch
+    """
+    if is_binary(source) or is_binary(target):
+        a, b = tokenize_bytes(source), tokenize_bytes(target)
+    else:
+        a, b = split_lines(source), split_lines(target)
+
+    # Byte offsets of the tokens
+    a_offsets = [0]
+    for token in a:
+        a_offsets.append(a_offsets[-1] + len(token))
+    b_offsets = [0]
+    for token in b:
+        b_offsets.append(b_offsets[-1] + len(token))
+
+    body = bytearray()
+    _write_varint(body, len(source))
+    _write_varint(body, len(target))
+    body += _CHECKSUMS.pack(zlib.crc32(source), zlib.crc32(target))
+    for tag, i1, i2, j1, j2 in diff_opcodes(a, b, max_cost):
+        if tag == "equal":
+            body.append(_OP_COPY)
+            _write_varint(body, a_offsets[i1])
+            _write_varint(body, a_offsets[i2] - a_offsets[i1])
+        elif tag in ("insert", "replace"):
+            body.append(_OP_INSERT)
+            _write_varint(body, b_offsets[j2] - b_offsets[j1])
+            body += target[b_offsets[j1]:b_offsets[j2]]
+    return PATCH_MAGIC + zlib.compress(bytes(body))
+
+
+def apply_patch(source: bytes, patch: bytes) -> bytes:
+    """
+    Apply a patch made by :func:`make_patch`.
+
+    Args:
+        source: Content the patch was made from
+        patch: The patch
+
+    Returns:
+        The patched content
+
+    Raises:
+        PatchError: If the patch is malformed or was made for other content
+    """
+    if not patch.startswith(PATCH_MAGIC):
+        raise PatchError("Not a patch")
+    try:
+        body = zlib.decompress(patch[len(PATCH_MAGIC):])
+    except zlib.error as e:
+        raise PatchError(f"Corrupt patch: {str(e)}")
+
+    source_size, pos = _read_varint(body, 0)
+    target_size, pos = _read_varint(body, pos)
+    if pos + _CHECKSUMS.size > len(body):
+        raise PatchError("Truncated patch")
+    source_crc, target_crc = _CHECKSUMS.unpack_from(body, pos)
+    pos += _CHECKSUMS.size
+    if len(source) != source_size or zlib.crc32(source) != source_crc:
+        raise PatchError("Patch does not apply to this content")
+
+    parts: List[bytes] = []
+    while pos < len(body):
+        op = body[pos]
+        pos += 1
+        if op == _OP_COPY:
+            offset, pos = _read_varint(body, pos)
+            length, pos = _read_varint(body, pos)
+            parts.append(source[offset:offset + length])
+        elif op == _OP_INSERT:
+            length, pos = _read_varint(body, pos)
+            parts.append(body[pos:pos + length])
+            pos += length
+        else:
+            raise PatchError(f"Unknown patch instruction {op}")
+
+    target = b"".join(parts)
+    if len(target) != target_size or zlib.crc32(target) != target_crc:
+        raise PatchError("Patch produced unexpected content")
+    return target
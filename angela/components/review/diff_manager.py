@@ -6,11 +6,14 @@ This module provides functionality for managing and presenting diffs
 between original and modified code.
 """
 import os
-import difflib
 from pathlib import Path
 from typing import Dict, Any, List, Optional, Tuple, Union
 
 from angela.utils.logging import get_logger
+from angela.components.review.diff_engine import (
+    PatchError, apply_patch, apply_unified_diff, html_diff, is_binary,
+    make_patch, split_lines, unified_diff
+)
 
 logger = get_logger(__name__)
 
@@ -42,20 +45,18 @@ class DiffManager:
         """
         self._logger.debug("Generating diff")
         
-        # Split content into lines
-        original_lines = original.splitlines(keepends=True)
-        modified_lines = modified.splitlines(keepends=True)
+        # Identical content needs no line matching
+        if original == modified:
+            return ''
         
         # Generate unified diff
-        diff = difflib.unified_diff(
-            original_lines, 
-            modified_lines,
+        return unified_diff(
+            split_lines(original),
+            split_lines(modified),
             fromfile='original',
             tofile='modified',
-            n=context_lines
+            context=context_lines
         )
-        
-        return ''.join(diff)
     
     def generate_html_diff(
         self, 
@@ -76,21 +77,14 @@ class DiffManager:
         """
         self._logger.debug("Generating HTML diff")
         
-        # Split content into lines
-        original_lines = original.splitlines()
-        modified_lines = modified.splitlines()
-        
         # Generate HTML diff
-        diff = difflib.HtmlDiff().make_file(
-            original_lines, 
-            modified_lines,
+        return html_diff(
+            split_lines(original),
+            split_lines(modified),
             fromdesc='Original',
             todesc='Modified',
-            context=True,
-            numlines=context_lines
+            context=context_lines
         )
-        
-        return diff
     
     def generate_file_diff(
         self, 
@@ -113,18 +107,13 @@ class DiffManager:
         
         # Read file contents
         try:
-            with open(original_file, 'r', encoding='utf-8', errors='replace') as f:
-                original_content = f.read()
+            with open(original_file, 'rb') as f:
+                original_data = f.read()
             
-            with open(modified_file, 'r', encoding='utf-8', errors='replace') as f:
-                modified_content = f.read()
+            with open(modified_file, 'rb') as f:
+                modified_data = f.read()
             
-            # Generate diff
-            return self.generate_diff(
-                original_content, 
-                modified_content,
-                context_lines
-            )
+            return self._diff_contents(original_data, modified_data, context_lines)
         except Exception as e:
             self._logger.error(f"Error generating file diff: {str(e)}")
             return f"Error generating diff: {str(e)}"
@@ -185,9 +174,10 @@ class DiffManager:
             modified_file = modified_dir / rel_path
             
             try:
-                diff = self.generate_file_diff(
-                    original_file, 
-                    modified_file,
+                # Identical files are skipped before any line matching
+                diff = self._diff_contents(
+                    original_file.read_bytes(),
+                    modified_file.read_bytes(),
                     context_lines
                 )
                 
@@ -202,12 +192,8 @@ class DiffManager:
             original_file = original_dir / rel_path
             
             try:
-                with open(original_file, 'r', encoding='utf-8', errors='replace') as f:
-                    content = f.read()
-                
                 # Generate diff showing deletion
-                diff = self.generate_diff(content, '')
-                diffs[rel_path] = diff
+                diffs[rel_path] = self._diff_contents(original_file.read_bytes(), b'', context_lines)
             except Exception as e:
                 self._logger.error(f"Error generating diff for {rel_path}: {str(e)}")
         
@@ -216,12 +202,8 @@ class DiffManager:
             modified_file = modified_dir / rel_path
             
             try:
-                with open(modified_file, 'r', encoding='utf-8', errors='replace') as f:
-                    content = f.read()
-                
                 # Generate diff showing addition
-                diff = self.generate_diff('', content)
-                diffs[rel_path] = diff
+                diffs[rel_path] = self._diff_contents(b'', modified_file.read_bytes(), context_lines)
             except Exception as e:
                 self._logger.error(f"Error generating diff for {rel_path}: {str(e)}")
         
@@ -245,55 +227,72 @@ class DiffManager:
         self._logger.debug("Applying diff")
         
         try:
-            # Parse the diff
-            lines = diff.splitlines()
-            
-            # Skip header lines (starting with ---, +++, @@)
-            i = 0
-            while i < len(lines) and (lines[i].startswith('---') or lines[i].startswith('+++') or lines[i].startswith('@@')):
-                i += 1
-            
-            # Apply changes
-            result = []
-            original_lines = original.splitlines()
-            
-            line_num = 0
-            while line_num < len(original_lines):
-                if i < len(lines):
-                    if lines[i].startswith('-'):
-                        # Line removed, skip in original
-                        if not original_lines[line_num] == lines[i][1:]:
-                            # Mismatch, can't apply diff
-                            return original, False
-                        
-                        line_num += 1
-                        i += 1
-                    elif lines[i].startswith('+'):
-                        # Line added
-                        result.append(lines[i][1:])
-                        i += 1
-                    elif lines[i].startswith(' '):
-                        # Context line
-                        if not original_lines[line_num] == lines[i][1:]:
-                            # Mismatch, can't apply diff
-                            return original, False
-                        
-                        result.append(original_lines[line_num])
-                        line_num += 1
-                        i += 1
-                    else:
-                        # Unknown line in diff
-                        return original, False
-                else:
-                    # No more diff lines, copy remaining original lines
-                    result.extend(original_lines[line_num:])
-                    break
-            
-            # Return the modified content
-            return '\n'.join(result), True
+            return apply_unified_diff(original, diff), True
+        except PatchError as e:
+            self._logger.debug(f"Diff does not apply: {str(e)}")
+            return original, False
         except Exception as e:
             self._logger.error(f"Error applying diff: {str(e)}")
             return original, False
+    
+    def generate_patch(
+        self,
+        original: Union[str, bytes],
+        modified: Union[str, bytes]
+    ) -> bytes:
+        """
+        Generate a compact binary patch from original to modified content.
+        
+        Args:
+            original: Original content
+            modified: Modified content
+            
+        Returns:
+            Patch bytes for apply_patch
+        """
+        return make_patch(self._to_bytes(original), self._to_bytes(modified))
+    
+    def apply_patch(
+        self,
+        original: Union[str, bytes],
+        patch: bytes
+    ) -> Tuple[Union[str, bytes], bool]:
+        """
+        Apply a patch made by generate_patch.
+        
+        Args:
+            original: Content the patch was made from
+            patch: Patch bytes
+            
+        Returns:
+            Tuple of (modified_content, success); content is returned as the type it was given
+        """
+        try:
+            result = apply_patch(self._to_bytes(original), patch)
+        except PatchError as e:
+            self._logger.error(f"Error applying patch: {str(e)}")
+            return original, False
+        if isinstance(original, str):
+            return result.decode('utf-8', errors='surrogateescape'), True
+        return result, True
+    
+    def _diff_contents(self, original: bytes, modified: bytes, context_lines: int) -> str:
+        """Diff raw file contents, summarizing binary files instead of diffing them as text."""
+        if original == modified:
+            return ''
+        if is_binary(original) or is_binary(modified):
+            return "Binary files original and modified differ\n"
+        return self.generate_diff(
+            original.decode('utf-8', errors='replace'),
+            modified.decode('utf-8', errors='replace'),
+            context_lines
+        )
+    
+    @staticmethod
+    def _to_bytes(content: Union[str, bytes]) -> bytes:
+        if isinstance(content, str):
+            return content.encode('utf-8', errors='surrogateescape')
+        return content
 
 # Global diff manager instance
 diff_manager = DiffManager()
@@ -8,7 +8,7 @@ on generated code and refining code based on feedback.
 import os
 import re
 from pathlib import Path
-from typing import Dict, Any, List, Optional, Tuple, Union
+from typing import Dict, Any, List, Optional, Tuple, Union, Callable
 import json
 
 from angela.api.ai import get_gemini_client, get_gemini_request_class
@@ -34,7 +34,8 @@ class FeedbackManager:
         feedback: str,
         original_code: str,
         file_path: Optional[str] = None,
-        context: Optional[Dict[str, Any]] = None
+        context: Optional[Dict[str, Any]] = None,
+        on_chunk: Optional[Callable[[str], None]] = None
     ) -> Dict[str, Any]:
         """
         Process feedback on code and generate improved version.
@@ -44,6 +45,7 @@ class FeedbackManager:
             original_code: Original code to improve
             file_path: Optional path to the file
             context: Optional additional context
+            on_chunk: Optional callback receiving the response as it is generated
             
         Returns:
             Dictionary with the improved code and other information
@@ -72,7 +74,7 @@ class FeedbackManager:
             temperature=0.2
         )
         
-        response = await gemini_client.generate_text(api_request)
+        response = await gemini_client.generate_text(api_request, on_chunk=on_chunk)
         
         # Extract improved code and explanation
         improved_code, explanation = self._extract_improved_code(response.text, original_code)
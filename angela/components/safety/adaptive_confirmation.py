@@ -212,7 +212,7 @@ async def offer_command_learning(command: str) -> None:
         return # <<< IF IT'S ALREADY TRUSTED, IT EXITS HERE
 
     # 2. Check if this command should be offered for learning
-    pattern = history_manager._patterns.get(base_command) # This accesses a "private" attribute of HistoryManager
+    pattern = history_manager.get_pattern(base_command)
 
     
     # Only offer for commands used a few times but not yet trusted
@@ -9,7 +9,8 @@ from common packages and specialized tools.
 """
 import re
 import shlex
-from typing import List, Dict, Tuple, Set, Optional
+import functools
+from typing import List, Dict, Tuple, Set, Optional, Pattern
 
 from angela.constants import RISK_LEVELS
 from angela.utils.logging import get_logger
@@ -487,31 +488,232 @@ OVERRIDE_PATTERNS = {
 
 
 
+# Number of classified command strings remembered
+CLASSIFY_CACHE_SIZE = 4096
+
+_LEADING_WORD = re.compile(r"[A-Za-z]+")
+
+
+def _split_alternatives(pattern: str) -> List[str]:
+    """Split a regex at its top-level ``|``, outside groups and character classes."""
+    parts, depth, start, i, in_class = [], 0, 0, 0, False
+    while i < len(pattern):
+        char = pattern[i]
+        if char == "\\":
+            i += 2
+            continue
+        if in_class:
+            in_class = char != "]"
+        elif char == "[":
+            in_class = True
+        elif char == "(":
+            depth += 1
+        elif char == ")":
+            depth -= 1
+        elif char == "|" and depth == 0:
+            parts.append(pattern[start:i])
+            start = i + 1
+        i += 1
+    parts.append(pattern[start:])
+    return parts
+
+
+def _closing_paren(pattern: str, open_index: int) -> int:
+    """Index of the parenthesis closing the group opened at ``open_index``."""
+    depth, i, in_class = 0, open_index, False
+    while i < len(pattern):
+        char = pattern[i]
+        if char == "\\":
+            i += 2
+            continue
+        if in_class:
+            in_class = char != "]"
+        elif char == "[":
+            in_class = True
+        elif char == "(":
+            depth += 1
+        elif char == ")":
+            depth -= 1
+            if depth == 0:
+                return i
+        i += 1
+    return -1
+
+
+def _leading_word(pattern: str) -> Optional[str]:
+    """The letters every match of a regex starts with, if it starts with literal letters."""
+    match = _LEADING_WORD.match(pattern)
+    if not match:
+        return None
+    word = match.group()
+    # A quantifier after the run makes its last letter optional
+    if pattern[len(word):len(word) + 1] in ("?", "*", "{"):
+        word = word[:-1]
+    return word or None
+
+
+def command_words(pattern: str) -> Optional[Tuple[str, ...]]:
+    """
+    Get the words a command must start with to match an anchored pattern.
+
+    For ``^(apt-get|yum)\\s+install`` these are ("apt", "yum"): the leading
+    letters of each alternative. Every command the pattern matches starts
+    with one of them.
+
+    Args:
+        pattern: A risk or override pattern
+
+    Returns:
+        The words, or None if the pattern is not anchored to the start of
+        the command or does not start with literal letters
+    """
+    if not pattern.startswith("^") or len(_split_alternatives(pattern)) > 1:
+        return None
+    body = pattern[1:]
+    if not body.startswith("("):
+        word = _leading_word(body)
+        return (word,) if word else None
+
+    end = _closing_paren(body, 0)
+    if body.startswith("(?") or end < 0 or body[end + 1:end + 2] in ("?", "*", "{"):
+        return None
+    words = tuple(_leading_word(alternative) for alternative in _split_alternatives(body[1:end]))
+    return words if all(words) else None
+
+
+class CompiledRiskRules:
+    """
+    The override and risk patterns compiled for dispatch on the command's first word.
+
+    Every pattern gets a rank: override patterns first, then risk patterns
+    from the highest level down, each in table order. The verdict for a
+    command is that of its lowest-ranked matching pattern.
+
+    Anchored patterns are filed under the words a matching command must
+    start with. For a command, the patterns filed under any prefix of its
+    leading letters are combined, in rank order, into one regex matched at
+    the start of the command; regex alternation then yields the first
+    matching pattern. The few patterns that can match anywhere are searched
+    one by one, after a combined search tells whether any of them matches.
+    """
+
+    def __init__(self, override_patterns: Dict[str, List], risk_patterns: Dict[int, List[Tuple[str, str]]]):
+        """
+        Compile the rules.
+
+        Args:
+            override_patterns: Level name -> patterns, or (pattern, reason) tuples
+            risk_patterns: Risk level -> (pattern, reason) tuples
+        """
+        rules = []
+        for level_name, patterns_list in override_patterns.items():
+            for pattern_item in patterns_list:
+                pattern_str = pattern_item[0] if isinstance(pattern_item, tuple) else pattern_item
+                reason = pattern_item[1] if isinstance(pattern_item, tuple) and len(pattern_item) > 1 else f"Matched override pattern for {level_name} risk"
+                rules.append((pattern_str, RISK_LEVELS[level_name], reason))
+        for level, patterns_list in sorted(risk_patterns.items(), key=lambda x: x[0], reverse=True):
+            for pattern_str, reason_str in patterns_list:
+                rules.append((pattern_str, level, reason_str))
+
+        self.patterns: List[str] = [pattern for pattern, _, _ in rules]
+        self.verdicts: List[Tuple[int, str]] = [(level, reason) for _, level, reason in rules]
+
+        # word -> ranks of the anchored patterns filed under it
+        self.dispatch: Dict[str, List[int]] = {}
+        # Patterns that can match anywhere, checked for every command
+        self.unanchored: List[Tuple[int, Pattern]] = []
+        for rank, pattern in enumerate(self.patterns):
+            words = command_words(pattern)
+            if words is None:
+                self.unanchored.append((rank, re.compile(pattern)))
+            else:
+                for word in set(words):
+                    self.dispatch.setdefault(word, []).append(rank)
+
+        self.unanchored_any = re.compile("|".join(f"(?:{regex.pattern})" for _, regex in self.unanchored))
+        self._max_word = max((len(word) for word in self.dispatch), default=0)
+        self._combined_cache: Dict[Tuple[str, ...], Pattern] = {}
+
+    def _combined(self, words: Tuple[str, ...]) -> Pattern:
+        """The anchored patterns filed under some words, as one regex in rank order."""
+        regex = self._combined_cache.get(words)
+        if regex is None:
+            ranks = sorted({rank for word in words for rank in self.dispatch[word]})
+            regex = re.compile("|".join(f"(?P<r{rank}>{self.patterns[rank]})" for rank in ranks))
+            self._combined_cache[words] = regex
+        return regex
+
+    def match(self, command: str) -> Optional[int]:
+        """
+        Get the rank of the first pattern matching a stripped command.
+
+        Args:
+            command: The command, without surrounding whitespace
+
+        Returns:
+            The rank, or None if no pattern matches
+        """
+        best = len(self.patterns)
+
+        leading = _LEADING_WORD.match(command)
+        if leading:
+            letters = leading.group()
+            words = tuple(
+                letters[:n] for n in range(1, min(len(letters), self._max_word) + 1)
+                if letters[:n] in self.dispatch
+            )
+            if words:
+                match = self._combined(words).match(command)
+                if match:
+                    best = int(match.lastgroup[1:])
+
+        if self.unanchored_any.search(command):
+            for rank, regex in self.unanchored:
+                if rank >= best:
+                    break
+                if regex.search(command):
+                    best = rank
+                    break
+
+        return best if best < len(self.patterns) else None
+
+
 class CommandRiskClassifier:
+    def __init__(self):
+        self._rules: Optional[CompiledRiskRules] = None
+        self._classify_cached = functools.lru_cache(maxsize=CLASSIFY_CACHE_SIZE)(self._classify)
+
+    @property
+    def rules(self) -> CompiledRiskRules:
+        """The compiled patterns, compiled on first use."""
+        if self._rules is None:
+            self._rules = CompiledRiskRules(OVERRIDE_PATTERNS, RISK_PATTERNS)
+        return self._rules
+
     def classify(self, command: str) -> Tuple[int, str]:
         """
         Classify the risk level of a shell command.
+
+        Override patterns are checked first, then risk patterns from the
+        highest level to the lowest; the first match decides. Results are
+        remembered per command string.
+
+        Args:
+            command: The shell command
+
+        Returns:
+            A tuple of (risk_level, reason)
         """
-        if not command.strip():
+        return self._classify_cached(command)
+
+    def _classify(self, command: str) -> Tuple[int, str]:
+        stripped = command.strip()
+        if not stripped:
             return RISK_LEVELS["SAFE"], "Empty command"
 
-        # Check OVERRIDE_PATTERNS first
-        for level_name, patterns_list in OVERRIDE_PATTERNS.items():
-            for pattern_item in patterns_list:
-                # Assuming pattern_item can be a string or a tuple (pattern, reason)
-                pattern_str = pattern_item[0] if isinstance(pattern_item, tuple) else pattern_item
-                
-                if re.search(pattern_str, command.strip()):
-                    level = RISK_LEVELS[level_name]
-                    # Provide a default reason if pattern_item was just a string
-                    reason = pattern_item[1] if isinstance(pattern_item, tuple) and len(pattern_item) > 1 else f"Matched override pattern for {level_name} risk"
-                    return level, reason
-
-        # Then check RISK_PATTERNS, from highest risk to lowest
-        for level, patterns_list in sorted(RISK_PATTERNS.items(), key=lambda x: x[0], reverse=True):
-            for pattern_str, reason_str in patterns_list: # RISK_PATTERNS items are (pattern, reason) tuples
-                if re.search(pattern_str, command.strip()):
-                    return level, reason_str
+        rank = self.rules.match(stripped)
+        if rank is not None:
+            return self.rules.verdicts[rank]
 
         return RISK_LEVELS["MEDIUM"], "Unrecognized command type"
 
@@ -6,6 +6,29 @@ ANGELA_LAST_COMMAND=""
 ANGELA_LAST_COMMAND_RESULT=$?
 ANGELA_LAST_PWD="$PWD"
 ANGELA_COMMAND_START_TIME=0
+ANGELA_SOCKET="${ANGELA_SOCKET:-$HOME/.config/angela/angela.sock}"
+
+# Minimal datagram sender used when socat is not installed (no site imports)
+_ANGELA_SEND_PY='import socket,sys
+s=socket.socket(socket.AF_UNIX,socket.SOCK_DGRAM)
+s.sendto(b"".join(a.encode("utf-8","surrogateescape")+b"\0" for a in sys.argv[2:]),sys.argv[1])'
+
+# Send a notification to the resident Angela daemon as one NUL-separated
+# datagram. Falls back to a one-shot Angela process if no daemon is listening.
+_angela_notify() {
+    if [[ -S "$ANGELA_SOCKET" ]]; then
+        if command -v socat >/dev/null 2>&1; then
+            printf '%s\0' "$@" | socat -u - "UNIX-SENDTO:$ANGELA_SOCKET" 2>/dev/null && return
+        fi
+        python3 -S -c "$_ANGELA_SEND_PY" "$ANGELA_SOCKET" "$@" 2>/dev/null && return
+    fi
+    python -m angela --notify "$@" &>/dev/null
+}
+
+# Start the daemon once per login if it is not already running
+if [[ "${ANGELA_DAEMON_AUTOSTART:-1}" = "1" && ! -S "$ANGELA_SOCKET" ]]; then
+    (python -m angela daemon start &>/dev/null &)
+fi
 
 # Pre-command execution hook
 angela_pre_exec() {
@@ -16,7 +39,7 @@ angela_pre_exec() {
     # Send notification to Angela's monitoring system
     if [[ ! "$ANGELA_LAST_COMMAND" =~ ^angela ]]; then
         # Only track non-angela commands to avoid recursion
-        (angela --notify pre_exec "$ANGELA_LAST_COMMAND" &>/dev/null &)
+        (_angela_notify pre_exec "$ANGELA_LAST_COMMAND" &>/dev/null &)
     fi
 }
 
@@ -30,13 +53,13 @@ angela_post_exec() {
     if [[ "$PWD" != "$ANGELA_LAST_PWD" ]]; then
         # Directory changed, update context
         ANGELA_LAST_PWD="$PWD"
-        (angela --notify dir_change "$PWD" &>/dev/null &)
+        (_angela_notify dir_change "$PWD" &>/dev/null &)
     fi
     
     # Send post-execution notification for non-angela commands
     if [[ ! "$ANGELA_LAST_COMMAND" =~ ^angela ]]; then
         # Pass execution result to Angela
-        (angela --notify post_exec "$ANGELA_LAST_COMMAND" $exit_code $duration &>/dev/null &)
+        (_angela_notify post_exec "$ANGELA_LAST_COMMAND" $exit_code $duration &>/dev/null &)
         
         # Check if we should offer assistance based on exit code and command pattern
         if [[ $exit_code -ne 0 ]]; then
@@ -88,7 +111,13 @@ angela() {
     # Handle notify subcommand (used by hooks)
     if [ "$1" = "--notify" ]; then
         # This is a notification from the hooks, handle silently
-        python -m angela --notify "${@:2}" &>/dev/null &
+        (_angela_notify "${@:2}" &>/dev/null &)
+        return
+    fi
+
+    # Handle completions (used by the completion function)
+    if [ "$1" = "--completions" ]; then
+        python -m angela --completions "${@:2}"
         return
     fi
 
@@ -1,21 +1,17 @@
 # angela/shell/completion.py
 """
 AI-powered contextual auto-completion for Angela CLI.
+
+The module is imported by the ``--completions`` fast path on every shell
+completion, so it only imports the standard library at load time. Logging,
+context and AI services are imported on first use, and static completions
+are available without an event loop via ``get_static_completions``.
 """
-import asyncio
 from typing import List, Dict, Any, Optional, Set
 import os
 from pathlib import Path
 import re
 
-from angela.utils.logging import get_logger
-from angela.api.context import get_context_manager
-from angela.api.context import get_file_activity_tracker
-from angela.api.context import get_session_manager
-from angela.api.context import get_history_manager
-from angela.api.ai import get_gemini_client, get_gemini_request_class
-
-logger = get_logger(__name__)
 
 class CompletionHandler:
     """
@@ -27,8 +23,6 @@ class CompletionHandler:
     
     def __init__(self):
         """Initialize the completion handler."""
-        self._logger = logger
-        
         # Cache common completions to avoid repeated calculation
         self._completion_cache = {}
         self._cache_ttl = 300  # Cache lifetime in seconds
@@ -54,6 +48,32 @@ class CompletionHandler:
             "docs": [".md", ".txt", ".pdf", ".docx"],
         }
     
+    @property
+    def _logger(self):
+        """Module logger, imported on first use to keep the completion fast path light."""
+        from angela.utils.logging import get_logger
+        return get_logger(__name__)
+    
+    def get_static_completions(self, args: List[str]) -> Optional[List[str]]:
+        """
+        Get completions that need neither an event loop nor any service.
+        
+        Args:
+            args: The current command line arguments
+            
+        Returns:
+            List of completions, or None if the command line needs
+            ``get_completions``
+        """
+        if not args:
+            # No args yet, return top-level commands
+            return self._get_top_level_completions()
+        
+        if args[0] in self._static_completions and len(args) == 1:
+            return self._static_completions[args[0]]
+        
+        return None
+    
     async def get_completions(self, args: List[str]) -> List[str]:
         """
         Get completions for the current command line.
@@ -64,19 +84,16 @@ class CompletionHandler:
         Returns:
             List of completions
         """
-        self._logger.debug(f"Generating completions for args: {args}")
+        # Check static completions first
+        static = self.get_static_completions(args)
+        if static is not None:
+            return static
         
-        if not args:
-            # No args yet, return top-level commands
-            return self._get_top_level_completions()
+        self._logger.debug(f"Generating completions for args: {args}")
         
         # Handle subcommand completions
         main_command = args[0]
         
-        # Check static completions first
-        if main_command in self._static_completions and len(args) == 1:
-            return self._static_completions[main_command]
-        
         # Handle specific completion contexts
         if main_command == "files":
             return await self._get_files_completions(args[1:] if len(args) > 1 else [])
@@ -5,15 +5,16 @@ This module provides responsive terminal output formatting with
 symmetric layouts, proper content sizing, and a consistent color scheme.
 """
 import asyncio
+import importlib
 import sys
 import time
 import random
-from typing import Optional, List, Dict, Any, Callable, Awaitable, Tuple, Set
+from typing import Optional, List, Dict, Any, Callable, Awaitable, Tuple, Set, AsyncIterable
 from enum import Enum
 from pathlib import Path
 import textwrap
 
-from rich.console import Console, Group
+from rich.console import Console, Group, RenderableType
 from rich.panel import Panel
 from rich.syntax import Syntax
 from rich.progress import Progress, SpinnerColumn, TextColumn, BarColumn, TimeElapsedColumn
@@ -105,6 +106,86 @@ class OutputType(Enum):
     ERROR = "error"
     PROGRESS = "progress"
 
+class StreamingPanel:
+    """
+    Live panel that shows model output while it is being generated.
+    
+    Chunks are appended from the caller; the Live display repaints on its
+    own refresh thread, so appending is cheap and never blocks on the
+    terminal. Only the tail of long output is shown while streaming.
+    """
+    
+    def __init__(
+        self,
+        console: Console,
+        title: str,
+        render: Optional[Callable[[str], RenderableType]] = None,
+        transient: bool = False
+    ):
+        """
+        Initialize the panel.
+        
+        Args:
+            console: Console to render on
+            title: Panel title
+            render: Builds the panel body from the text received so far
+            transient: Remove the panel once streaming ends
+        """
+        self._console = console
+        self._title = title
+        self._render = render
+        self._parts: List[str] = []
+        self._live = Live(
+            get_renderable=self._renderable,
+            console=console,
+            refresh_per_second=15,
+            transient=transient
+        )
+    
+    @property
+    def text(self) -> str:
+        """All text received so far."""
+        return "".join(self._parts)
+    
+    def append(self, chunk: str) -> None:
+        """Add a chunk of output."""
+        self._parts.append(chunk)
+    
+    def start(self) -> None:
+        """Start the live display."""
+        self._live.start()
+    
+    def __enter__(self) -> "StreamingPanel":
+        self.start()
+        return self
+    
+    def __exit__(self, *exc_info) -> None:
+        self.stop()
+    
+    def stop(self) -> None:
+        """Stop the live display, rendering the final state."""
+        self._live.refresh()
+        self._live.stop()
+    
+    def _renderable(self) -> RenderableType:
+        text = self.text
+        if self._render:
+            body = self._render(text)
+        else:
+            max_lines = max(5, self._console.size.height - 8)
+            lines = text.splitlines()
+            if len(lines) > max_lines:
+                text = "\n".join(["…"] + lines[-max_lines:])
+            body = Text(text, style=COLOR_PALETTE["text"])
+        return Panel(
+            body,
+            title=f"[bold {COLOR_PALETTE['text']}]{self._title}[/bold {COLOR_PALETTE['text']}]",
+            border_style=COLOR_PALETTE["border"],
+            box=DEFAULT_BOX,
+            padding=(1, 2)
+        )
+
+
 class TerminalFormatter:
     """
     Rich terminal formatter with responsive layout and consistent styling.
@@ -797,8 +878,6 @@ class TerminalFormatter:
         
         if should_recommend:
             # Provide a recommendation instead of execution for interactive commands
-            from rich.panel import Panel
-            
             # Create a recommendation message
             recommendation = f"""
     [bold cyan]Interactive Command Detected:[/bold cyan]
@@ -922,42 +1001,15 @@ class TerminalFormatter:
                 stderr=asyncio.subprocess.PIPE
             )
             
-            # Collect output
-            stdout_chunks = []
-            stderr_chunks = []
-            
-            # Set up tasks to read output
-            async def read_stream(stream, is_stdout: bool):
-                while True:
-                    line = await stream.readline()
-                    if not line:
-                        break
-                        
-                    try:
-                        line_str = line.decode('utf-8', errors='replace')
-                        
-                        # Store the output
-                        if is_stdout:
-                            stdout_chunks.append(line_str)
-                        else:
-                            stderr_chunks.append(line_str)
-                            
-                    except Exception as e:
-                        self._logger.error(f"Error processing output: {str(e)}")
-            
-            # Create tasks for stdout and stderr
-            stdout_task = asyncio.create_task(read_stream(process.stdout, True))
-            stderr_task = asyncio.create_task(read_stream(process.stderr, False))
+            # Collect output, retaining a bounded amount of it
+            from angela.components.execution.output_stream import create_output_stream
+            output = create_output_stream(process)
             
             # Display the live progress with stunning visuals
             try:
                 with Live(get_layout(), refresh_per_second=20, console=self._console) as live:
-                    # Wait for the command to complete while updating the display
-                    return_code = await process.wait()
-                    
-                    # Wait for the streams to complete
-                    await stdout_task
-                    await stderr_task
+                    # Wait for the command and its output to complete while updating the display
+                    return_code = await output.wait()
                     
                     execution_time = time.time() - start_time
                     
@@ -989,7 +1041,7 @@ class TerminalFormatter:
                 if process.returncode is None: # Check if process might still be running
                     try:
                         # Wait for process with a timeout to avoid hanging indefinitely
-                        await asyncio.wait_for(process.wait(), timeout=5.0) 
+                        await asyncio.wait_for(output.wait(), timeout=5.0)
                         return_code = process.returncode if process.returncode is not None else -1
                     except asyncio.TimeoutError:
                         self._logger.error("Timeout waiting for process to complete after error.")
@@ -1010,29 +1062,21 @@ class TerminalFormatter:
                 else: # Fallback if process object is in an unexpected state
                     return_code = -1
     
-                # Wait for the streams to complete, even in error cases
-                # Use try-except for each to ensure one doesn't prevent the other
+                # Stop reading the streams, even in error cases
                 try:
-                    await asyncio.wait_for(stdout_task, timeout=2.0)
+                    await asyncio.wait_for(output.aclose(), timeout=2.0)
                 except asyncio.TimeoutError:
-                    self._logger.error("Timeout waiting for stdout_task to complete after error.")
+                    self._logger.error("Timeout waiting for output streams to close after error.")
                 except Exception as stream_e:
-                    self._logger.error(f"Error waiting for stdout_task: {stream_e}")
-                
-                try:
-                    await asyncio.wait_for(stderr_task, timeout=2.0)
-                except asyncio.TimeoutError:
-                    self._logger.error("Timeout waiting for stderr_task to complete after error.")
-                except Exception as stream_e:
-                    self._logger.error(f"Error waiting for stderr_task: {stream_e}")
+                    self._logger.error(f"Error closing output streams: {stream_e}")
                 
                 # Recalculate execution_time up to the point of error handling completion
                 execution_time = time.time() - start_time
             
             # Return the results
             return (
-                "".join(stdout_chunks),
-                "".join(stderr_chunks),
+                output.stdout.text(),
+                output.stderr.text(),
                 return_code if isinstance(return_code, int) else -1, # Ensure return_code is an int
                 execution_time
             )
@@ -1143,6 +1187,70 @@ class TerminalFormatter:
             except Exception as e:
                 self._logger.error(f"Error cleaning up console state: {str(e)}")
 
+    def streaming_panel(
+        self,
+        title: str,
+        render: Optional[Callable[[str], RenderableType]] = None,
+        transient: bool = False
+    ) -> StreamingPanel:
+        """
+        Create a live panel for model output that arrives incrementally.
+        
+        Use it as a context manager and pass its ``append`` method as the
+        ``on_chunk`` callback of ``GeminiClient.generate_text``.
+        
+        Args:
+            title: Panel title
+            render: Builds the panel body from the text received so far
+            transient: Remove the panel once streaming ends
+            
+        Returns:
+            A StreamingPanel
+        """
+        self._ensure_no_active_live()
+        return StreamingPanel(self._console, title, render=render, transient=transient)
+    
+    async def display_streaming_response(
+        self,
+        chunks: AsyncIterable[str],
+        title: str,
+        render: Optional[Callable[[str], RenderableType]] = None,
+        transient: bool = False,
+        on_first_chunk: Optional[Callable[[], Awaitable[None]]] = None
+    ) -> str:
+        """
+        Render a streamed model response as it arrives.
+        
+        The panel only appears once the first chunk is received, so a loading
+        display can stay up until then; ``on_first_chunk`` is awaited right
+        before the panel starts so the caller can stop it.
+        
+        Args:
+            chunks: The response text as it arrives
+            title: Panel title
+            render: Builds the panel body from the text received so far
+            transient: Remove the panel once streaming ends
+            on_first_chunk: Awaited when the first chunk arrives
+            
+        Returns:
+            The complete response text
+        """
+        panel: Optional[StreamingPanel] = None
+        parts: List[str] = []
+        try:
+            async for chunk in chunks:
+                if panel is None:
+                    if on_first_chunk:
+                        await on_first_chunk()
+                    panel = self.streaming_panel(title, render=render, transient=transient)
+                    panel.start()
+                parts.append(chunk)
+                panel.append(chunk)
+        finally:
+            if panel is not None:
+                panel.stop()
+        return "".join(parts)
+    
     async def display_result_summary(self, result: Dict[str, Any]) -> None:
         """
         Display a summary of a command execution result without duplicating explanations.
@@ -1380,3 +1488,13 @@ class TerminalFormatter:
 
 # Global formatter instance
 terminal_formatter = TerminalFormatter()
+
+
+# Advanced formatter will modify terminal_formatter after import. It is
+# imported here rather than from the package __init__ so that the extension is
+# applied however the formatter module is first reached.
+try:
+    importlib.import_module("angela.components.shell.advanced_formatter")
+except Exception as e:
+    logger.warning(f"Failed to import advanced_formatter: {str(e)}")
+    # Continue without the advanced formatter - the basic formatter will still work
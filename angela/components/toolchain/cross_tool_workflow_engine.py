@@ -5,12 +5,9 @@ Cross-Tool Workflow Engine for Angela CLI.
 This module provides specialized workflow orchestration capabilities for
 executing complex, multi-tool workflows across different CLI tools and services.
 """
-import asyncio
 import re
-import os
 import json
 import shlex
-import tempfile
 from datetime import datetime
 from typing import Dict, Any, List, Optional, Set, Union, Tuple
 from pathlib import Path
@@ -26,7 +23,10 @@ from angela.api.context import get_context_manager
 from angela.core.registry import registry
 from angela.api.ai import get_gemini_client, GeminiRequest
 from angela.api.shell import get_terminal_formatter
-from angela.api.execution import get_execution_engine, get_execution_hooks
+from angela.api.execution import (
+    get_execution_engine, get_execution_hooks, get_step_scheduler, get_scheduled_step_classes,
+    get_sandbox_pool
+)
 
 logger = get_logger(__name__)
 
@@ -213,6 +213,7 @@ class CrossToolWorkflowEngine:
             Dictionary with execution results
         """
         self._logger.info(f"Executing cross-tool workflow: {workflow.name}")
+        ScheduledStep, StepOutcome = get_scheduled_step_classes()
         
         # Initialize execution state
         execution_state = {
@@ -235,64 +236,65 @@ class CrossToolWorkflowEngine:
         
         try:
             # Determine initial steps to execute (entry points)
-            steps_to_execute = self._get_initial_steps(workflow)
+            entry_points = self._get_initial_steps(workflow)
             
             # Track all steps
             all_steps = set(workflow.steps.keys())
             
-            # Execute steps until no more steps can be executed
-            while steps_to_execute:
-                # Get next batch of steps to execute (based on dependencies)
-                executable_steps = self._get_executable_steps(workflow, steps_to_execute, execution_state)
+            async def run_step(step_id: str) -> StepOutcome:
+                step = workflow.steps[step_id]
                 
-                if not executable_steps:
-                    # Check if we're stuck
-                    remaining_steps = all_steps - execution_state["completed_steps"] - execution_state["failed_steps"]
-                    if remaining_steps:
-                        self._logger.warning(f"Workflow execution is stuck. Remaining steps: {remaining_steps}")
-                        execution_state["status"] = "stuck"
-                    else:
-                        self._logger.info("All workflow steps completed")
-                        execution_state["status"] = "completed"
-                    break
-                
-                # Execute steps
-                for step_id in executable_steps:
-                    step = workflow.steps[step_id]
-                    
-                    # Execute the step
-                    self._logger.info(f"Executing step {step_id}: {step.name}")
-                    result = await self._execute_step(step, workflow, execution_state)
-                    
-                    # Store the result
-                    execution_state["results"][step_id] = result
-                    
-                    # Update step status
-                    if result.get("success", False):
-                        execution_state["completed_steps"].add(step_id)
-                        
-                        # Apply data flow from this step
-                        await self._apply_data_flow(step_id, workflow, execution_state)
-                    else:
-                        execution_state["failed_steps"].add(step_id)
-                        
-                        # Check if this failure should stop the workflow
-                        if not step.continue_on_failure:
-                            self._logger.warning(f"Step {step_id} failed and is critical - stopping workflow")
-                            execution_state["status"] = "failed"
-                            break
+                # Execute the step
+                self._logger.info(f"Executing step {step_id}: {step.name}")
+                result = await self._execute_step(step, workflow, execution_state)
                 
-                # If status is failed, stop execution
-                if execution_state["status"] == "failed":
-                    break
+                # Store the result
+                execution_state["results"][step_id] = result
                 
-                # Update steps to execute - remove completed and failed steps
-                steps_to_execute -= execution_state["completed_steps"]
-                steps_to_execute -= execution_state["failed_steps"]
+                # Update step status
+                if result.get("success", False):
+                    execution_state["completed_steps"].add(step_id)
+                    
+                    # Apply data flow from this step
+                    await self._apply_data_flow(step_id, workflow, execution_state)
+                    return StepOutcome(success=True)
                 
-                # Add new executable steps based on dependencies
-                new_steps = self._get_next_steps(workflow, execution_state)
-                steps_to_execute.update(new_steps)
+                execution_state["failed_steps"].add(step_id)
+                if not step.continue_on_failure:
+                    self._logger.warning(f"Step {step_id} failed and is critical - stopping workflow")
+                return StepOutcome(success=False)
+            
+            def has_required_variables(step_id: str) -> bool:
+                required = workflow.steps[step_id].required_variables or []
+                return all(var_name in execution_state["variables"] for var_name in required)
+            
+            # Run the steps as a DAG. Every step runs once its dependencies are
+            # met, entry points first; steps of the same tool do not overlap.
+            scheduled_steps = {
+                step_id: ScheduledStep(
+                    id=step_id,
+                    dependencies=workflow.dependencies.get(step_id, []),
+                    resources=[f"tool:{step.tool}"],
+                    critical=not step.continue_on_failure
+                )
+                for step_id, step in workflow.steps.items()
+            }
+            activation_order = [s for s in entry_points if s in workflow.steps]
+            activation_order += [s for s in workflow.steps if s not in entry_points]
+            report = await get_step_scheduler().run(
+                scheduled_steps, run_step, activation_order, can_start=has_required_variables
+            )
+            execution_state["timing"] = report.timing_report()
+            
+            if report.failed_step is not None:
+                execution_state["status"] = "failed"
+                execution_state["cancelled_steps"] = report.cancelled
+            elif report.not_run:
+                self._logger.warning(f"Workflow execution is stuck. Remaining steps: {set(report.not_run)}")
+                execution_state["status"] = "stuck"
+            else:
+                self._logger.info("All workflow steps completed")
+                execution_state["status"] = "completed"
             
             # Calculate success based on status and critical steps
             critical_steps = [step_id for step_id, step in workflow.steps.items() 
@@ -338,7 +340,8 @@ class CrossToolWorkflowEngine:
                 "started_at": execution_state["started_at"],
                 "ended_at": execution_state["ended_at"],
                 "variables": execution_state["variables"],
-                "results": execution_state["results"]
+                "results": execution_state["results"],
+                "timing": execution_state["timing"]
             }
             
         except Exception as e:
@@ -382,99 +385,6 @@ class CrossToolWorkflowEngine:
         else:
             return set()
     
-    def _get_executable_steps(
-        self,
-        workflow: CrossToolWorkflow,
-        steps_to_execute: Set[str],
-        execution_state: Dict[str, Any]
-    ) -> Set[str]:
-        """
-        Get steps that can be executed based on dependencies.
-        
-        Args:
-            workflow: The workflow
-            steps_to_execute: Steps being considered for execution
-            execution_state: Current execution state
-            
-        Returns:
-            Set of executable step IDs
-        """
-        executable_steps = set()
-        
-        for step_id in steps_to_execute:
-            # Check if already completed or failed
-            if (step_id in execution_state["completed_steps"] or 
-                step_id in execution_state["failed_steps"]):
-                continue
-            
-            # Check if step exists
-            if step_id not in workflow.steps:
-                continue
-            
-            # Check dependencies - step is executable if all dependencies are completed
-            dependencies_satisfied = True
-            
-            # Get dependencies for this step
-            for dep_step_id in workflow.dependencies.get(step_id, []):
-                if dep_step_id not in execution_state["completed_steps"]:
-                    dependencies_satisfied = False
-                    break
-            
-            # Check required variables
-            step = workflow.steps[step_id]
-            for var_name in step.required_variables or []:
-                if var_name not in execution_state["variables"]:
-                    dependencies_satisfied = False
-                    break
-            
-            if dependencies_satisfied:
-                executable_steps.add(step_id)
-        
-        return executable_steps
-    
-    def _get_next_steps(
-        self,
-        workflow: CrossToolWorkflow,
-        execution_state: Dict[str, Any]
-    ) -> Set[str]:
-        """
-        Get next steps to execute based on dependencies.
-        
-        Args:
-            workflow: The workflow
-            execution_state: Current execution state
-            
-        Returns:
-            Set of step IDs to execute next
-        """
-        next_steps = set()
-        
-        # For each step, check if its dependencies are satisfied
-        for step_id in workflow.steps:
-            # Skip completed or failed steps
-            if (step_id in execution_state["completed_steps"] or 
-                step_id in execution_state["failed_steps"]):
-                continue
-            
-            # Check dependencies
-            dependencies_satisfied = True
-            for dep_step_id in workflow.dependencies.get(step_id, []):
-                if dep_step_id not in execution_state["completed_steps"]:
-                    dependencies_satisfied = False
-                    break
-            
-            # Check required variables
-            step = workflow.steps[step_id]
-            for var_name in step.required_variables or []:
-                if var_name not in execution_state["variables"]:
-                    dependencies_satisfied = False
-                    break
-            
-            if dependencies_satisfied:
-                next_steps.add(step_id)
-        
-        return next_steps
-    
     async def _execute_step(
         self,
         step: CrossToolStep,
@@ -590,18 +500,7 @@ class CrossToolWorkflowEngine:
         Returns:
             Transformed output
         """
-        # Create a sandbox for code execution
-        sandbox = {
-            "stdout": stdout,
-            "stderr": stderr,
-            "return_code": return_code,
-            "result": None,
-            "import_modules": ["json", "re"],
-            "json": json,
-            "re": re
-        }
-        
-        # Prefix with safety wrapper
+        # Wrap the user code in a function returning "result"
         safe_code = f"""
 # Transformation code
 import json
@@ -619,41 +518,21 @@ def transform_output(stdout, stderr, return_code):
 result = transform_output(stdout, stderr, return_code)
 """
         
-        # Execute in a temporary file
-        with tempfile.NamedTemporaryFile(mode="w+", suffix=".py") as temp_file:
-            temp_file.write(safe_code)
-            temp_file.flush()
-            
-            # Run the transformation using subprocess
-            try:
-                import sys
-                process = await asyncio.create_subprocess_exec(
-                    sys.executable, temp_file.name,
-                    stdout=asyncio.subprocess.PIPE,
-                    stderr=asyncio.subprocess.PIPE,
-                    env={"PYTHONPATH": os.pathsep.join(sys.path)}
-                )
-                
-                proc_stdout, proc_stderr = await process.communicate()
-                
-                if process.returncode != 0:
-                    self._logger.error(f"Error transforming output: {proc_stderr.decode()}")
-                    return None
-                
-                # The result should be the last line of stdout
-                result_line = proc_stdout.decode().strip().split("\n")[-1]
-                
-                try:
-                    # Try to parse as JSON
-                    transformed = json.loads(result_line)
-                    return transformed
-                except json.JSONDecodeError:
-                    # Return as string
-                    return result_line
-                    
-            except Exception as e:
-                self._logger.error(f"Error executing transformation code: {str(e)}")
-                return None
+        # Run in a warm sandbox interpreter
+        try:
+            reply = await get_sandbox_pool("python").run(
+                safe_code,
+                {"stdout": stdout, "stderr": stderr, "return_code": return_code}
+            )
+        except Exception as e:
+            self._logger.error(f"Error executing transformation code: {str(e)}")
+            return None
+        
+        if not reply.get("success"):
+            self._logger.error(f"Error transforming output: {reply.get('error')}")
+            return None
+        
+        return reply.get("result")
     
     def _extract_variables_from_output(
         self,
@@ -778,16 +657,7 @@ result = transform_output(stdout, stderr, return_code)
         Returns:
             Transformed value
         """
-        # Create a sandbox for code execution
-        sandbox = {
-            "value": value,
-            "result": None,
-            "import_modules": ["json", "re"],
-            "json": json,
-            "re": re
-        }
-        
-        # Prefix with safety wrapper
+        # Wrap the user code in a function returning "result"
         safe_code = f"""
 # Transformation code
 import json
@@ -805,46 +675,18 @@ def transform_value(value):
 result = transform_value(value)
 """
         
-        # Execute in a temporary file
-        with tempfile.NamedTemporaryFile(mode="w+", suffix=".py") as temp_file:
-            temp_file.write(safe_code)
-            temp_file.flush()
-            
-            # Run the transformation using subprocess
-            try:
-                import sys
-                
-                # Create a JSON serializable representation of the value
-                value_json = json.dumps(value)
-                
-                process = await asyncio.create_subprocess_exec(
-                    sys.executable, temp_file.name,
-                    stdin=asyncio.subprocess.PIPE,
-                    stdout=asyncio.subprocess.PIPE,
-                    stderr=asyncio.subprocess.PIPE,
-                    env={"PYTHONPATH": os.pathsep.join(sys.path)}
-                )
-                
-                proc_stdout, proc_stderr = await process.communicate(value_json.encode())
-                
-                if process.returncode != 0:
-                    self._logger.error(f"Error transforming value: {proc_stderr.decode()}")
-                    return None
-                
-                # The result should be the last line of stdout
-                result_line = proc_stdout.decode().strip().split("\n")[-1]
-                
-                try:
-                    # Try to parse as JSON
-                    transformed = json.loads(result_line)
-                    return transformed
-                except json.JSONDecodeError:
-                    # Return as string
-                    return result_line
-                    
-            except Exception as e:
-                self._logger.error(f"Error executing transformation code: {str(e)}")
-                return None
+        # Run in a warm sandbox interpreter
+        try:
+            reply = await get_sandbox_pool("python").run(safe_code, {"value": value})
+        except Exception as e:
+            self._logger.error(f"Error executing transformation code: {str(e)}")
+            return None
+        
+        if not reply.get("success"):
+            self._logger.error(f"Error transforming value: {reply.get('error')}")
+            return None
+        
+        return reply.get("result")
     
     def _substitute_variables(self, text: str, variables: Dict[str, Any]) -> str:
         """
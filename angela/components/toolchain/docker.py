@@ -2197,9 +2197,13 @@ class DockerIntegration:
             "*.yml", "*.yaml", "*.json", "*.env", "*.toml", "*.ini", "Dockerfile"
         ]
         
+        from angela.api.context import get_project_index_async
+        index = await get_project_index_async(project_dir)
+        
         for pattern in file_patterns:
-            for file_path in project_dir.glob(f"**/{pattern}"):
-                if file_path.is_file() and file_path.stat().st_size < 1000000:  # Skip large files
+            for file_path in index.glob(f"**/{pattern}"):
+                entry = index.get(file_path)
+                if entry and entry.size < 1000000:  # Skip large files
                     try:
                         with open(file_path, 'r', encoding='utf-8', errors='ignore') as f:
                             content = f.read()
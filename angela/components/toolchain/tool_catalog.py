@@ -0,0 +1,366 @@
+# angela/components/toolchain/tool_catalog.py
+"""
+Catalog of CLI tools: where they are installed and how their commands work.
+
+UniversalCLITranslator used to run ``tool --version`` (and then
+``tool --help``) to find out whether a tool exists, and a help command for
+every new (tool, command) pair, keeping parsed definitions only in memory.
+The catalog replaces these probes:
+
+- availability is a PATH lookup, memoized until the mtime of a PATH
+  directory changes (installing or removing a binary touches its directory)
+- help texts and parsed command definitions are stored in a SQLite database
+  under ``CONFIG_DIR/cache``, keyed by the binary's path and mtime, so
+  upgrading a tool invalidates its entries
+- request analyses are stored too, evicting the least recently used
+- prewarm() resolves commonly used tools and fetches their top-level help
+  texts in the background, a few at a time
+
+Once a tool's definitions are cached, translating a request for it spawns
+no processes.
+"""
+import asyncio
+import json
+import os
+import shlex
+import shutil
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Any, Dict, Iterable, Optional, Set, Tuple, Union
+
+from angela.constants import TOOL_CATALOG_FILE
+from angela.utils.logging import get_logger
+
+logger = get_logger(__name__)
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS commands (
+    binary TEXT NOT NULL,
+    command TEXT NOT NULL,
+    mtime_ns INTEGER NOT NULL,
+    help_text TEXT,
+    definition TEXT,
+    PRIMARY KEY (binary, command)
+);
+CREATE TABLE IF NOT EXISTS analyses (
+    request TEXT PRIMARY KEY,
+    payload TEXT NOT NULL,
+    last_used REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS analyses_by_use ON analyses (last_used);
+"""
+
+DEFAULT_PREWARM_TOOLS = ("git", "docker", "kubectl", "aws", "npm")
+HELP_TIMEOUT = 10.0
+MAX_CONCURRENT_PROBES = 4
+MAX_ANALYSES = 1000
+
+
+class ToolCatalog:
+    """Installed CLI tools with their cached help texts and command definitions."""
+
+    def __init__(self, db_path: Optional[Union[str, Path]] = None, persistent: bool = True,
+                 max_analyses: int = MAX_ANALYSES):
+        """
+        Initialize the catalog. The database is opened on first use.
+
+        Args:
+            db_path: Path to the SQLite database
+            persistent: Whether entries outlive the process; if False they are
+                kept in an in-memory database
+            max_analyses: Maximum number of stored request analyses
+        """
+        self._logger = logger
+        self.db_path = str(db_path or TOOL_CATALOG_FILE) if persistent else ":memory:"
+        self.max_analyses = max_analyses
+        self._conn: Optional[sqlite3.Connection] = None
+        self._lock = threading.RLock()
+
+        self._path_key: Optional[Tuple[Tuple[str, Optional[int]], ...]] = None
+        self._which: Dict[str, Optional[str]] = {}
+        self._executables: Optional[Set[str]] = None
+        self._probes: Dict[Tuple[str, str], asyncio.Task] = {}
+
+    def _connect(self) -> sqlite3.Connection:
+        if self._conn is None:
+            if self.db_path != ":memory:":
+                Path(self.db_path).parent.mkdir(parents=True, exist_ok=True)
+            conn = sqlite3.connect(self.db_path, check_same_thread=False, isolation_level=None, timeout=5)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.executescript(SCHEMA)
+            self._conn = conn
+        return self._conn
+
+    def _check_path(self) -> None:
+        """Forget PATH lookups once PATH or the content of one of its directories changes."""
+        key = []
+        for path_dir in os.environ.get("PATH", "").split(os.pathsep):
+            try:
+                key.append((path_dir, os.stat(path_dir).st_mtime_ns))
+            except OSError:
+                key.append((path_dir, None))
+        key = tuple(key)
+        if key != self._path_key:
+            self._path_key = key
+            self._which.clear()
+            self._executables = None
+
+    def resolve(self, tool: str) -> Optional[str]:
+        """
+        Find a tool's executable.
+
+        Args:
+            tool: The tool name (or a path to it)
+
+        Returns:
+            Path of the executable, or None if the tool is not installed
+        """
+        self._check_path()
+        if tool not in self._which:
+            self._which[tool] = shutil.which(tool)
+        return self._which[tool]
+
+    def executables(self) -> Set[str]:
+        """
+        Get the names of all executables on PATH.
+
+        Returns:
+            Set of executable names
+        """
+        self._check_path()
+        if self._executables is None:
+            names = set()
+            for path_dir, mtime in self._path_key:
+                if mtime is None:
+                    continue
+                try:
+                    with os.scandir(path_dir) as entries:
+                        for entry in entries:
+                            try:
+                                if entry.is_file() and os.access(entry.path, os.X_OK):
+                                    names.add(entry.name)
+                            except OSError:
+                                continue
+                except OSError:
+                    continue
+            self._executables = names
+        return self._executables
+
+    def _binary(self, tool: str) -> Optional[Tuple[str, int]]:
+        binary = self.resolve(tool)
+        if binary is None:
+            return None
+        try:
+            return binary, os.stat(binary).st_mtime_ns
+        except OSError:
+            return None
+
+    def _get_row(self, tool: str, command: str) -> Optional[Tuple[str, int, Optional[str], Optional[str]]]:
+        """Get (binary, mtime_ns, help_text, definition) of a command if current."""
+        binary = self._binary(tool)
+        if binary is None:
+            return None
+        try:
+            with self._lock:
+                row = self._connect().execute(
+                    "SELECT mtime_ns, help_text, definition FROM commands WHERE binary = ? AND command = ?",
+                    (binary[0], command)
+                ).fetchone()
+        except sqlite3.Error as e:
+            self._logger.debug(f"Tool catalog lookup failed for {tool} {command}: {str(e)}")
+            return None
+        if row is None or row[0] != binary[1]:
+            return binary[0], binary[1], None, None
+        return binary[0], binary[1], row[1], row[2]
+
+    def _store(self, tool: str, command: str, **fields: Optional[str]) -> None:
+        row = self._get_row(tool, command)
+        if row is None:
+            return
+        binary, mtime_ns, help_text, definition = row
+        help_text = fields.get("help_text", help_text)
+        definition = fields.get("definition", definition)
+        try:
+            with self._lock:
+                self._connect().execute(
+                    "INSERT OR REPLACE INTO commands VALUES (?, ?, ?, ?, ?)",
+                    (binary, command, mtime_ns, help_text, definition)
+                )
+        except sqlite3.Error as e:
+            self._logger.debug(f"Could not store {tool} {command} in the tool catalog: {str(e)}")
+
+    def get_definition(self, tool: str, command: Optional[str] = None) -> Optional[Dict[str, Any]]:
+        """
+        Get the stored definition of a command.
+
+        Args:
+            tool: The tool name
+            command: The subcommand ("" or None for the tool itself)
+
+        Returns:
+            The definition as stored by put_definition, or None if there is
+            none for the installed binary
+        """
+        row = self._get_row(tool, command or "")
+        if row is None or row[3] is None:
+            return None
+        try:
+            return json.loads(row[3])
+        except ValueError:
+            return None
+
+    def put_definition(self, tool: str, command: Optional[str], definition: Dict[str, Any]) -> None:
+        """
+        Store the definition of a command for the installed binary.
+
+        Args:
+            tool: The tool name
+            command: The subcommand ("" or None for the tool itself)
+            definition: JSON-serializable definition
+        """
+        self._store(tool, command or "", definition=json.dumps(definition, separators=(",", ":")))
+
+    async def get_help_text(self, tool: str, command: Optional[str] = None) -> Optional[str]:
+        """
+        Get the help text of a command, running ``tool [command] --help`` only
+        if it is not stored for the installed binary.
+
+        Args:
+            tool: The tool name
+            command: The subcommand ("" or None for the tool itself)
+
+        Returns:
+            The help text, or None if the tool is not installed or printed none
+        """
+        command = command or ""
+        row = self._get_row(tool, command)
+        if row is None:
+            return None
+        if row[2] is not None:
+            return row[2]
+
+        # Share a probe already running for the same command
+        key = (row[0], command)
+        probe = self._probes.get(key)
+        if probe is None or probe.get_loop() is not asyncio.get_running_loop():
+            probe = asyncio.create_task(self._run_help(row[0], command))
+            self._probes[key] = probe
+            probe.add_done_callback(lambda _: self._probes.pop(key, None))
+        help_text = await asyncio.shield(probe)
+        if help_text:
+            self._store(tool, command, help_text=help_text)
+        return help_text
+
+    async def _run_help(self, binary: str, command: str) -> Optional[str]:
+        args = [binary, *shlex.split(command), "--help"]
+        self._logger.debug(f"Running help command: {' '.join(args)}")
+        try:
+            process = await asyncio.create_subprocess_exec(
+                *args,
+                stdin=asyncio.subprocess.DEVNULL,
+                stdout=asyncio.subprocess.PIPE,
+                stderr=asyncio.subprocess.PIPE
+            )
+            try:
+                stdout, stderr = await asyncio.wait_for(process.communicate(), HELP_TIMEOUT)
+            except asyncio.TimeoutError:
+                process.kill()
+                await process.wait()
+                self._logger.warning(f"Help command timed out: {' '.join(args)}")
+                return None
+        except Exception as e:
+            self._logger.error(f"Error running help command '{' '.join(args)}': {str(e)}")
+            return None
+
+        # Some tools print help to stderr
+        help_text = stdout.decode('utf-8', errors='replace')
+        if not help_text and stderr:
+            help_text = stderr.decode('utf-8', errors='replace')
+        return help_text or None
+
+    async def prewarm(self, tools: Iterable[str] = DEFAULT_PREWARM_TOOLS) -> None:
+        """
+        Fetch the top-level help texts of installed tools missing from the catalog.
+
+        Args:
+            tools: The tool names
+        """
+        slots = asyncio.Semaphore(MAX_CONCURRENT_PROBES)
+
+        async def warm(tool: str) -> None:
+            async with slots:
+                await self.get_help_text(tool)
+
+        await asyncio.gather(*(warm(tool) for tool in tools if self.resolve(tool)), return_exceptions=True)
+
+    def get_analysis(self, request: str) -> Optional[Dict[str, Any]]:
+        """
+        Get the stored analysis of a request.
+
+        Args:
+            request: The normalized request text
+
+        Returns:
+            The analysis, or None if there is none
+        """
+        try:
+            with self._lock:
+                conn = self._connect()
+                row = conn.execute("SELECT payload FROM analyses WHERE request = ?", (request,)).fetchone()
+                if row is None:
+                    return None
+                conn.execute("UPDATE analyses SET last_used = ? WHERE request = ?", (time.time(), request))
+            return json.loads(row[0])
+        except (sqlite3.Error, ValueError) as e:
+            self._logger.debug(f"Tool catalog analysis lookup failed: {str(e)}")
+            return None
+
+    def put_analysis(self, request: str, analysis: Dict[str, Any]) -> None:
+        """
+        Store the analysis of a request.
+
+        Args:
+            request: The normalized request text
+            analysis: JSON-serializable analysis
+        """
+        try:
+            payload = json.dumps(analysis, separators=(",", ":"))
+            with self._lock:
+                conn = self._connect()
+                conn.execute("INSERT OR REPLACE INTO analyses VALUES (?, ?, ?)", (request, payload, time.time()))
+                excess = conn.execute("SELECT COUNT(*) FROM analyses").fetchone()[0] - self.max_analyses
+                if excess > 0:
+                    conn.execute(
+                        "DELETE FROM analyses WHERE request IN "
+                        "(SELECT request FROM analyses ORDER BY last_used LIMIT ?)", (excess,)
+                    )
+        except (sqlite3.Error, TypeError, ValueError) as e:
+            self._logger.debug(f"Could not store analysis in the tool catalog: {str(e)}")
+
+    def clear(self) -> None:
+        """Remove all entries."""
+        with self._lock:
+            conn = self._connect()
+            conn.execute("DELETE FROM commands")
+            conn.execute("DELETE FROM analyses")
+
+    def close(self) -> None:
+        """Close the database connection."""
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
+
+
+def create_tool_catalog() -> ToolCatalog:
+    """
+    Create the tool catalog from the application configuration.
+
+    Returns:
+        A ToolCatalog, kept on disk unless cache.tools_enabled is off
+    """
+    from angela.config import config_manager
+    return ToolCatalog(persistent=config_manager.config.cache.tools_enabled)
@@ -9,9 +9,6 @@ and applying knowledge about CLI conventions.
 """
 import asyncio
 import re
-import shlex
-import subprocess
-import os
 from typing import Dict, Any, List, Optional, Tuple, Set, Union
 from pathlib import Path
 
@@ -23,6 +20,7 @@ from angela.api.context import get_context_manager
 from angela.utils.logging import get_logger
 from angela.api.safety import get_command_validator
 from angela.core.registry import registry
+from angela.components.toolchain.tool_catalog import DEFAULT_PREWARM_TOOLS, ToolCatalog, create_tool_catalog
 
 logger = get_logger(__name__)
 
@@ -68,10 +66,31 @@ class UniversalCLITranslator:
     def __init__(self):
         """Initialize the translator."""
         self._logger = logger
-        self._command_cache: Dict[str, CommandDefinition] = {}
-        self._analysis_cache: Dict[str, Dict[str, Any]] = {}
+        self._catalog = None  # Tool catalog, created on first use
+        self._prewarm_task: Optional[asyncio.Task] = None
         self._recently_used_tools: List[str] = []
     
+    def _get_catalog(self) -> ToolCatalog:
+        """Get the tool catalog, creating it on first use."""
+        if self._catalog is None:
+            try:
+                self._catalog = create_tool_catalog()
+            except Exception as e:
+                self._logger.warning(f"Tool catalog unavailable, keeping entries in memory: {str(e)}")
+                self._catalog = ToolCatalog(persistent=False)
+        return self._catalog
+    
+    def _start_prewarm(self) -> None:
+        """Fetch the help texts of commonly used tools in the background, once."""
+        if self._prewarm_task is not None:
+            return
+        try:
+            from angela.config import config_manager
+            tools = config_manager.config.cache.tools_prewarm
+        except Exception:
+            tools = DEFAULT_PREWARM_TOOLS
+        self._prewarm_task = asyncio.create_task(self._get_catalog().prewarm(tools))
+    
     async def translate_request(
         self, 
         request: str, 
@@ -88,6 +107,7 @@ class UniversalCLITranslator:
             Dictionary with the translation result
         """
         self._logger.info(f"Translating request: {request}")
+        self._start_prewarm()
         
         # Analyze the request to determine the likely tool and command
         analysis = await self._analyze_request(request, context)
@@ -189,9 +209,10 @@ class UniversalCLITranslator:
         """
         # Check if we've already analyzed this request
         cache_key = request.strip().lower()
-        if cache_key in self._analysis_cache:
+        cached = self._get_catalog().get_analysis(cache_key)
+        if cached is not None:
             self._logger.debug(f"Using cached analysis for request: {request}")
-            return self._analysis_cache[cache_key]
+            return cached
         
         # Prepare the context information for the prompt
         recently_used = ", ".join(self._recently_used_tools) if self._recently_used_tools else "None"
@@ -243,7 +264,7 @@ Only include the most likely tool. If you're unsure, make your best guess.
             analysis = json.loads(json_str)
             
             # Cache the result
-            self._analysis_cache[cache_key] = analysis
+            self._get_catalog().put_analysis(cache_key, analysis)
             
             self._logger.debug(f"Analysis found tool: {analysis.get('tool')}, command: {analysis.get('command')}")
             
@@ -268,22 +289,21 @@ Only include the most likely tool. If you're unsure, make your best guess.
         Returns:
             CommandDefinition object or None if not found
         """
-        # Check if we already have this command cached
-        cache_key = f"{tool}:{command}" if command else tool
-        if cache_key in self._command_cache:
-            self._logger.debug(f"Using cached command definition for {cache_key}")
-            return self._command_cache[cache_key]
+        catalog = self._get_catalog()
+        
+        # Check if we already have this command cached for the installed binary
+        cached = catalog.get_definition(tool, command)
+        if cached is not None:
+            self._logger.debug(f"Using cached command definition for {tool} {command or ''}")
+            return CommandDefinition(**cached)
         
         # Check if the tool is available
         if not await self._is_tool_available(tool):
             self._logger.warning(f"Tool {tool} not available in the system")
             return None
         
-        # Generate the help command based on the tool and command
-        help_cmd = await self._generate_help_command(tool, command)
-        
-        # Run the help command to get documentation
-        help_text = await self._get_help_text(help_cmd)
+        # Get the documentation, running the help command unless it is cached
+        help_text = await catalog.get_help_text(tool, command)
         if not help_text:
             self._logger.warning(f"Could not get help text for {tool} {command}")
             return None
@@ -293,8 +313,8 @@ Only include the most likely tool. If you're unsure, make your best guess.
         
         if command_def:
             # Cache the result
-            self._command_cache[cache_key] = command_def
-            self._logger.debug(f"Cached command definition for {cache_key}")
+            catalog.put_definition(tool, command, command_def.model_dump())
+            self._logger.debug(f"Cached command definition for {tool} {command or ''}")
         
         return command_def
     
@@ -308,98 +328,9 @@ Only include the most likely tool. If you're unsure, make your best guess.
         Returns:
             True if the tool is available, False otherwise
         """
-        try:
-            self._logger.debug(f"Checking if tool is available: {tool}")
-            
-            # Try to run the command with --version or --help
-            process = await asyncio.create_subprocess_exec(
-                tool, "--version",
-                stdout=asyncio.subprocess.PIPE,
-                stderr=asyncio.subprocess.PIPE
-            )
-            await process.communicate()
-            
-            if process.returncode == 0:
-                self._logger.debug(f"Tool {tool} is available (--version check)")
-                return True
-            
-            # Try with --help if --version failed
-            process = await asyncio.create_subprocess_exec(
-                tool, "--help",
-                stdout=asyncio.subprocess.PIPE,
-                stderr=asyncio.subprocess.PIPE
-            )
-            await process.communicate()
-            
-            availability = process.returncode == 0
-            self._logger.debug(f"Tool {tool} {'is' if availability else 'is not'} available (--help check)")
-            return availability
-            
-        except Exception as e:
-            self._logger.error(f"Error checking tool availability for {tool}: {str(e)}")
-            return False
-    
-    async def _generate_help_command(
-        self, 
-        tool: str, 
-        command: Optional[str] = None
-    ) -> str:
-        """
-        Generate a help command for a CLI tool.
-        
-        Args:
-            tool: The CLI tool name
-            command: Optional specific command
-            
-        Returns:
-            Help command string
-        """
-        if command:
-            # Try with both --help and help syntax
-            return f"{tool} {command} --help"
-        else:
-            return f"{tool} --help"
-    
-    async def _get_help_text(self, help_cmd: str) -> Optional[str]:
-        """
-        Get help text by running a help command.
-        
-        Args:
-            help_cmd: The help command to run
-            
-        Returns:
-            Help text string or None if failed
-        """
-        try:
-            self._logger.debug(f"Running help command: {help_cmd}")
-            
-            # Split the command into args
-            args = shlex.split(help_cmd)
-            
-            # Run the command
-            process = await asyncio.create_subprocess_exec(
-                *args,
-                stdout=asyncio.subprocess.PIPE,
-                stderr=asyncio.subprocess.PIPE
-            )
-            
-            stdout, stderr = await process.communicate()
-            
-            # Combine stdout and stderr as some tools print help to stderr
-            help_text = stdout.decode('utf-8', errors='replace')
-            if not help_text and stderr:
-                help_text = stderr.decode('utf-8', errors='replace')
-            
-            if help_text:
-                self._logger.debug(f"Got help text of length {len(help_text)}")
-            else:
-                self._logger.warning(f"No help text received for command: {help_cmd}")
-            
-            return help_text if help_text else None
-            
-        except Exception as e:
-            self._logger.error(f"Error running help command '{help_cmd}': {str(e)}")
-            return None
+        available = self._get_catalog().resolve(tool) is not None
+        self._logger.debug(f"Tool {tool} {'is' if available else 'is not'} available")
+        return available
     
     async def _parse_help_text(
         self, 
@@ -653,19 +584,9 @@ Be precise and accurate. Include necessary quotes for paths or arguments that ne
         Returns:
             List of tool suggestions
         """
-        # Check common locations for executables
-        path_dirs = os.environ.get("PATH", "").split(os.pathsep)
-        
-        tools = set()
-        for path_dir in path_dirs:
-            if not os.path.exists(path_dir):
-                continue
-                
-            for entry in os.listdir(path_dir):
-                entry_path = os.path.join(path_dir, entry)
-                if os.path.isfile(entry_path) and os.access(entry_path, os.X_OK):
-                    if not partial_tool or entry.startswith(partial_tool):
-                        tools.add(entry)
+        # Executables on PATH
+        tools = {tool for tool in self._get_catalog().executables()
+                 if not partial_tool or tool.startswith(partial_tool)}
         
         # Prioritize recently used tools
         result = []
@@ -5,7 +5,7 @@ Uses TOML format for configuration files.
 """
 import os
 from pathlib import Path
-from typing import Dict, Any, Optional
+from typing import Dict, Any, List, Optional
 import sys
 from angela.utils.logging import get_logger
 
@@ -55,10 +55,59 @@ class UserConfig(BaseModel):
     confirm_all_actions: bool = Field(False, description="Whether to confirm all actions regardless of risk level")
 
 
+class CacheConfig(BaseModel):
+    """Cache configuration settings."""
+    responses_enabled: bool = Field(False, description="Cache AI responses on disk and reuse them for identical requests")
+    response_ttl: int = Field(7 * 24 * 3600, description="Seconds a cached AI response stays valid")
+    response_max_entries: int = Field(2000, description="Maximum number of cached AI responses")
+    response_max_bytes: int = Field(64 * 1024 * 1024, description="Maximum total size of cached AI responses in bytes")
+    semantic_enabled: bool = Field(True, description="Keep semantic code analysis results on disk across runs")
+    semantic_max_bytes: int = Field(128 * 1024 * 1024, description="Maximum total size of cached semantic analyses in bytes")
+    tools_enabled: bool = Field(True, description="Keep CLI tool help texts, parsed command definitions and request analyses on disk across runs")
+    tools_prewarm: List[str] = Field(default_factory=lambda: ["git", "docker", "kubectl", "aws", "npm"], description="Tools whose help texts are fetched in the background when the CLI translator is first used")
+
+
+class LLMConfig(BaseModel):
+    """LLM backend and request scheduling settings."""
+    max_concurrency: int = Field(8, description="Maximum number of simultaneous AI API calls")
+    requests_per_minute: int = Field(60, description="AI API request quota per minute (0 for no limit)")
+    tokens_per_minute: int = Field(1_000_000, description="AI API input token quota per minute (0 for no limit)")
+    max_retries: int = Field(5, description="Times a rate limited AI API call is retried")
+    backend: str = Field("gemini", description="Model backend: gemini, replay or synthetic")
+    replay_path: str = Field("", description="Fixture file (JSONL) for the replay backend")
+    replay_record: bool = Field(False, description="Record replay misses from the Gemini API")
+    synthetic_latency: float = Field(0.5, description="Seconds to first token for the synthetic backend")
+    synthetic_tokens_per_second: float = Field(200.0, description="Output rate of the synthetic backend")
+
+
+class BackupConfig(BaseModel):
+    """Rollback backup store settings."""
+    retention_days: float = Field(30, description="Days a backup snapshot is kept (0 to keep them until max_snapshots)")
+    max_snapshots: int = Field(1000, description="Maximum number of backup snapshots kept (0 for no limit)")
+    gc_every: int = Field(50, description="Collect expired backups after this many new snapshots (0 to disable)")
+
+
+class ExecutionConfig(BaseModel):
+    """Command execution settings."""
+    max_retained_bytes: int = Field(1024 * 1024, description="Bytes of a command's stdout and of its stderr kept in memory; the middle of longer output is dropped")
+    spill_output: bool = Field(False, description="Write the complete output of commands exceeding max_retained_bytes to temporary files")
+    spill_dir: str = Field("", description="Directory of spilled output files (the system temporary directory if empty)")
+    spill_retention_days: float = Field(7, description="Days spilled output files are kept (0 to keep them)")
+    max_parallel_steps: int = Field(4, description="Maximum number of independent plan steps run at the same time")
+    sandbox_workers: int = Field(2, description="Warm interpreters kept per language for sandboxed code steps")
+    sandbox_max_uses: int = Field(50, description="Code runs served by a sandbox interpreter before it is replaced")
+    sandbox_timeout: float = Field(30.0, description="Seconds a sandboxed code run may take")
+    sandbox_memory_mb: int = Field(512, description="Memory limit of a sandbox interpreter in MiB (0 for none)")
+
+
 class AppConfig(BaseModel):
     """Application configuration settings."""
     api: ApiConfig = Field(default_factory=ApiConfig, description="API configuration")
     user: UserConfig = Field(default_factory=UserConfig, description="User configuration")
+    cache: CacheConfig = Field(default_factory=CacheConfig, description="Cache configuration")
+    llm: LLMConfig = Field(default_factory=LLMConfig, description="LLM request scheduling configuration")
+    backup: BackupConfig = Field(default_factory=BackupConfig, description="Rollback backup configuration")
+    execution: ExecutionConfig = Field(default_factory=ExecutionConfig, description="Command execution configuration")
     debug: bool = Field(False, description="Enable debug mode")
 
 
@@ -126,6 +175,18 @@ class ConfigManager:
                  # Pydantic will handle Path conversion from string during validation
                  self._config.user = UserConfig(**config_data["user"])
         
+            if "cache" in config_data and isinstance(config_data["cache"], dict):
+                self._config.cache = CacheConfig(**config_data["cache"])
+        
+            if "llm" in config_data and isinstance(config_data["llm"], dict):
+                self._config.llm = LLMConfig(**config_data["llm"])
+        
+            if "backup" in config_data and isinstance(config_data["backup"], dict):
+                self._config.backup = BackupConfig(**config_data["backup"])
+        
+            if "execution" in config_data and isinstance(config_data["execution"], dict):
+                self._config.execution = ExecutionConfig(**config_data["execution"])
+        
             if "debug" in config_data:
                 # Explicitly check type for robustness
                 if isinstance(config_data["debug"], bool):
@@ -16,12 +16,22 @@ CONFIG_DIR = Path(os.path.expanduser("~/.config/angela"))
 CONFIG_FILE = CONFIG_DIR / "config.toml"
 LOG_DIR = CONFIG_DIR / "logs"
 HISTORY_FILE = CONFIG_DIR / "history.json"
+CACHE_DIR = CONFIG_DIR / "cache"
+RESPONSE_CACHE_DIR = CACHE_DIR / "responses"
+ANALYSIS_CACHE_FILE = CACHE_DIR / "semantic_analysis.db"
+TOOL_CATALOG_FILE = CACHE_DIR / "tool_catalog.db"
 
 # Shell integration
 SHELL_INVOKE_COMMAND = "angela"
 BASH_INTEGRATION_PATH = BASE_DIR / "shell" / "angela.bash"
 ZSH_INTEGRATION_PATH = BASE_DIR / "shell" / "angela.zsh"
 
+# Resident daemon (shell hook notifications and shared session state)
+DAEMON_SOCKET_PATH = Path(os.environ.get("ANGELA_SOCKET", str(CONFIG_DIR / "angela.sock")))
+DAEMON_CONTROL_SOCKET_PATH = DAEMON_SOCKET_PATH.with_name(DAEMON_SOCKET_PATH.name + ".ctl")
+DAEMON_PID_FILE = CONFIG_DIR / "angela-daemon.pid"
+DAEMON_MAX_DATAGRAM = 64 * 1024  # Largest notification payload we send in one datagram
+
 # Project markers for detection
 PROJECT_MARKERS = [
     ".git",               # Git repository
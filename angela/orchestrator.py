@@ -8,7 +8,7 @@ user requests to executing commands with safety checks.
 import asyncio
 import re
 import shlex
-from typing import Dict, Any, Optional, List, Tuple, Union
+from typing import Dict, Any, Optional, List, Set, Tuple, Union, Callable, Awaitable
 from pathlib import Path
 from enum import Enum
 import time
@@ -19,12 +19,15 @@ from rich.panel import Panel
 
 # Use API imports to avoid circular dependencies
 from angela.api.ai import get_gemini_client, get_gemini_request_class, get_parse_ai_response_func
+from angela.api.ai import get_streaming_response_parser_class, get_llm_priority_enum, get_llm_priority_func
 from angela.api.ai import get_build_prompt_func, get_error_analyzer, get_content_analyzer, get_intent_analyzer
 from angela.api.ai import get_confidence_scorer, get_command_suggestion_class
 from angela.api.context import get_context_manager, get_session_manager, get_history_manager, get_file_resolver
 from angela.api.context import get_file_activity_tracker, get_activity_type, get_context_enhancer
+from angela.api.context import get_context_pipeline, get_stage_timings_class
 from angela.api.execution import get_execution_engine, get_adaptive_engine, get_rollback_manager, get_execution_hooks
 from angela.api.intent import get_task_planner, get_plan_model_classes, get_enhanced_task_planner
+from angela.api.intent import get_request_classifier
 from angela.api.workflows import get_workflow_manager
 from angela.api.shell import get_terminal_formatter, get_output_type_enum
 from angela.api.shell import display_advanced_plan, display_execution_results
@@ -44,6 +47,10 @@ adaptive_engine = get_adaptive_engine()
 # Import other required components
 GeminiRequest = get_gemini_request_class()
 parse_ai_response = get_parse_ai_response_func()
+StreamingResponseParser = get_streaming_response_parser_class()
+Priority = get_llm_priority_enum()
+llm_priority = get_llm_priority_func()
+request_classifier = get_request_classifier()
 build_prompt = get_build_prompt_func()
 context_manager = get_context_manager()
 session_manager = get_session_manager()
@@ -64,6 +71,8 @@ background_monitor = get_background_monitor()
 network_monitor = get_network_monitor()
 content_analyzer = get_content_analyzer()
 context_enhancer = get_context_enhancer()
+context_pipeline = get_context_pipeline()
+StageTimings = get_stage_timings_class()
 gemini_client = get_gemini_client()
 enhanced_task_planner = get_enhanced_task_planner()
 CommandSuggestion = get_command_suggestion_class()
@@ -111,6 +120,22 @@ class RequestType(Enum):
     COMPLEX_WORKFLOW = "complex_workflow"  # Complex workflow involving multiple tools
     CI_CD_PIPELINE = "ci_cd_pipeline"  # CI/CD pipeline setup and execution
     PROACTIVE_SUGGESTION = "proactive_suggestion"    
+
+
+# Lazy context pipeline stages each request type's handler reads, on top of
+# the eager base and session stages. Types not listed get every stage.
+REQUEST_CONTEXT_STAGES: Dict[RequestType, Tuple[str, ...]] = {
+    RequestType.COMMAND: ("project", "recent_files"),
+    RequestType.CLARIFICATION: (),
+    RequestType.UNKNOWN: (),
+    RequestType.PROACTIVE_SUGGESTION: (),
+    RequestType.WORKFLOW_DEFINITION: ("project",),
+    RequestType.WORKFLOW_EXECUTION: ("project",),
+    RequestType.UNIVERSAL_CLI: ("project", "recent_files"),
+    RequestType.CI_CD_PIPELINE: ("project",),
+    RequestType.TOOLCHAIN_OPERATION: ("project",),
+}
+
         
 class Orchestrator:
     """Main orchestration service for Angela CLI."""
@@ -145,53 +170,14 @@ class Orchestrator:
         
         # Initialize dependencies we'll need (getting from registry avoids circular imports)
         error_recovery_manager = self._get_error_recovery_manager()
-            
-        # Refresh context to ensure we have the latest information
-        context_manager.refresh_context()
-        context = context_manager.get_context_dict()
         
-        # Add session context for continuity across requests
-        session_context = session_manager.get_context()
-        context["session"] = session_context
+        timings = StageTimings()
+        evaluated_stages: Set[str] = set()
         
-        # Enhance context with project information, dependencies, and recent activity
-        try:
-            # Get context enhancer from registry
-            from angela.core.registry import registry
-            context_enhancer = registry.get("context_enhancer")
-            
-            if context_enhancer:
-                # If available in registry, use it
-                context = await context_enhancer.enrich_context(context)
-            else:
-                # If not in registry, try direct import as fallback
-                self._logger.warning("context_enhancer not found in registry, attempting direct import")
-                try:
-                    # Use API layer to access context_enhancer
-                    from angela.api.context import get_context_enhancer
-                    context_enhancer = get_context_enhancer()
-                    if context_enhancer:
-                        # Register for future use
-                        registry.register("context_enhancer", context_enhancer)
-                        context = await context_enhancer.enrich_context(context)
-                    else:
-                        self._logger.warning("context_enhancer is None after direct import, attempting to create instance")
-                        try:
-                            # Import via API layer
-                            from angela.api.context import get_context_enhancer_class
-                            temp_enhancer = get_context_enhancer_class()()
-                            registry.register("context_enhancer", temp_enhancer)
-                            context = await temp_enhancer.enrich_context(context)
-                            self._logger.info("Successfully created and used temporary context_enhancer")
-                        except Exception as create_error:
-                            self._logger.error(f"Failed to create context_enhancer instance: {create_error}")
-                            self._logger.warning("Continuing with basic context")
-                except ImportError as e:
-                    self._logger.error(f"Failed to import context_enhancer directly: {e}")
-                    self._logger.warning("Continuing with basic context")
-        except Exception as e:
-            self._logger.error(f"Error during context enhancement: {str(e)}")
-            self._logger.warning("Continuing with unenriched context")
+        # Build the base context (cwd, project, session). Enrichment stages are
+        # deferred until the request type tells us which of them are needed,
+        # and every stage is only recomputed when its inputs changed.
+        context = await context_pipeline.build(evaluated_stages, timings)
         
         self._logger.info(f"Processing request: {request}")
         self._logger.debug(f"Context contains {len(context)} keys")
@@ -201,8 +187,9 @@ class Orchestrator:
         
         # Only extract file references for certain intents
         if request_intent in ["read", "modify", "analyze", "unknown"]:
-            # Extract and resolve file references
-            file_references = await file_resolver.extract_references(request, context)
+            with timings.stage("resolve_files"):
+                # Extract and resolve file references
+                file_references = await file_resolver.extract_references(request, context)
             if file_references:
                 # Add resolved file references to context
                 context["resolved_files"] = [
@@ -215,65 +202,26 @@ class Orchestrator:
         
         try:
             # Analyze the request to determine its type
-            request_type = await self._determine_request_type(request, context)
+            with timings.stage("classify"):
+                request_type = await self._determine_request_type(request, context)
             self._logger.info(f"Determined request type: {request_type.value}")
             
-   
-            # Process the request based on its type
-            if request_type == RequestType.COMMAND:
-                # Handle single command request
-                return await self._process_command_request(request, context, execute, dry_run)
-                
-            elif request_type == RequestType.MULTI_STEP:
-                # Handle multi-step operation
-                return await self._process_multi_step_request(request, context, execute, dry_run)
-                
-            elif request_type == RequestType.FILE_CONTENT:
-                # Handle file content analysis/manipulation
-                return await self._process_file_content_request(request, context, execute, dry_run)
-                
-            elif request_type == RequestType.WORKFLOW_DEFINITION:
-                # Handle workflow definition
-                return await self._process_workflow_definition(request, context)
-                
-            elif request_type == RequestType.WORKFLOW_EXECUTION:
-                # Handle workflow execution
-                return await self._process_workflow_execution(request, context, execute, dry_run)
-                
-            elif request_type == RequestType.CLARIFICATION:
-                # Handle request for clarification
-                return await self._process_clarification_request(request, context)
-                
-            elif request_type == RequestType.CODE_GENERATION:
-                return await self._process_code_generation_request(request, context, execute, dry_run)
-                
-            elif request_type == RequestType.FEATURE_ADDITION:
-                return await self._process_feature_addition_request(request, context, execute, dry_run)
-                
-            elif request_type == RequestType.TOOLCHAIN_OPERATION:
-                return await self._process_toolchain_operation(request, context, execute, dry_run)
-                
-            elif request_type == RequestType.CODE_REFINEMENT:
-                return await self._process_code_refinement_request(request, context, execute, dry_run)
-                
-            elif request_type == RequestType.CODE_ARCHITECTURE:
-                return await self._process_code_architecture_request(request, context, execute, dry_run)
-                
-            elif request_type == RequestType.UNIVERSAL_CLI:
-                return await self._process_universal_cli_request(request, context, execute, dry_run)
-                
-            elif request_type == RequestType.COMPLEX_WORKFLOW:
-                return await self._process_complex_workflow_request(request, context, execute, dry_run)
-                
-            elif request_type == RequestType.CI_CD_PIPELINE:
-                return await self._process_ci_cd_pipeline_request(request, context, execute, dry_run)
-                
-            elif request_type == RequestType.PROACTIVE_SUGGESTION:
-                return await self._process_proactive_suggestion(request, context)
-                
-            else:
-                # Handle unknown request type
-                return await self._process_unknown_request(request, context)
+            # Evaluate only the context stages this request type reads
+            await context_pipeline.complete(
+                context,
+                REQUEST_CONTEXT_STAGES.get(request_type),
+                evaluated_stages,
+                timings
+            )
+            
+            # A user is waiting on this request, so its LLM calls go ahead of
+            # queued background work (bulk generation marks itself background)
+            with timings.stage(f"handle.{request_type.value}"), llm_priority(Priority.INTERACTIVE):
+                result = await self._dispatch_request(request_type, request, context, execute, dry_run)
+            
+            if isinstance(result, dict):
+                result["timings"] = timings.as_dict()
+            return result
             
         except Exception as e:
             self._logger.exception(f"Error processing request: {str(e)}")
@@ -283,11 +231,90 @@ class Orchestrator:
                 "response": f"An error occurred while processing your request: {str(e)}",
                 "error": str(e),
                 "context": context,
+                "timings": timings.as_dict(),
                 "success": False
             }
+        finally:
+            self._logger.debug(f"Request timings: {timings.summary()}")
+    
+    async def _dispatch_request(
+        self,
+        request_type: RequestType,
+        request: str,
+        context: Dict[str, Any],
+        execute: bool,
+        dry_run: bool
+    ) -> Dict[str, Any]:
+        """
+        Route a classified request to its handler.
+        
+        Args:
+            request_type: The determined request type
+            request: The user request
+            context: Context information
+            execute: Whether to execute commands
+            dry_run: Whether to simulate execution without making changes
             
+        Returns:
+            Dictionary with processing results
+        """
+        # Process the request based on its type
+        if request_type == RequestType.COMMAND:
+            # Handle single command request
+            return await self._process_command_request(request, context, execute, dry_run)
+            
+        elif request_type == RequestType.MULTI_STEP:
+            # Handle multi-step operation
+            return await self._process_multi_step_request(request, context, execute, dry_run)
+            
+        elif request_type == RequestType.FILE_CONTENT:
+            # Handle file content analysis/manipulation
+            return await self._process_file_content_request(request, context, execute, dry_run)
+            
+        elif request_type == RequestType.WORKFLOW_DEFINITION:
+            # Handle workflow definition
+            return await self._process_workflow_definition(request, context)
+            
+        elif request_type == RequestType.WORKFLOW_EXECUTION:
+            # Handle workflow execution
+            return await self._process_workflow_execution(request, context, execute, dry_run)
+            
+        elif request_type == RequestType.CLARIFICATION:
+            # Handle request for clarification
+            return await self._process_clarification_request(request, context)
+            
+        elif request_type == RequestType.CODE_GENERATION:
+            return await self._process_code_generation_request(request, context, execute, dry_run)
+            
+        elif request_type == RequestType.FEATURE_ADDITION:
+            return await self._process_feature_addition_request(request, context, execute, dry_run)
+            
+        elif request_type == RequestType.TOOLCHAIN_OPERATION:
+            return await self._process_toolchain_operation(request, context, execute, dry_run)
+            
+        elif request_type == RequestType.CODE_REFINEMENT:
+            return await self._process_code_refinement_request(request, context, execute, dry_run)
+            
+        elif request_type == RequestType.CODE_ARCHITECTURE:
+            return await self._process_code_architecture_request(request, context, execute, dry_run)
+            
+        elif request_type == RequestType.UNIVERSAL_CLI:
+            return await self._process_universal_cli_request(request, context, execute, dry_run)
+            
+        elif request_type == RequestType.COMPLEX_WORKFLOW:
+            return await self._process_complex_workflow_request(request, context, execute, dry_run)
+            
+        elif request_type == RequestType.CI_CD_PIPELINE:
+            return await self._process_ci_cd_pipeline_request(request, context, execute, dry_run)
+            
+        elif request_type == RequestType.PROACTIVE_SUGGESTION:
+            return await self._process_proactive_suggestion(request, context)
+            
+        else:
+            # Handle unknown request type
+            return await self._process_unknown_request(request, context)
+
 
-    
     async def _determine_request_type(
             self, 
             request: str, 
@@ -303,256 +330,8 @@ class Orchestrator:
             Returns:
                 RequestType enum value
             """
-            # Check for keywords and patterns indicating different request types
-            
-            # Workflow definition patterns
-            workflow_def_patterns = [
-                r'\b(?:define|create|make|add)\s+(?:a\s+)?(?:new\s+)?workflow\b',
-                r'\bworkflow\s+(?:called|named)\b',
-                r'\bsave\s+(?:this|these)\s+(?:as\s+(?:a\s+)?)?workflow\b',
-            ]
-            
-            # Workflow execution patterns
-            workflow_exec_patterns = [
-                r'\brun\s+(?:the\s+)?workflow\b',
-                r'\bexecute\s+(?:the\s+)?workflow\b',
-                r'\bstart\s+(?:the\s+)?workflow\b',
-            ]
-            
-            # File content patterns
-            file_content_patterns = [
-                r'\b(?:analyze|understand|summarize|examine)\s+(?:the\s+)?(?:content|code|text)\b',
-                r'\b(?:modify|change|update|edit|refactor)\s+(?:the\s+)?(?:content|code|text|file)\b',
-                r'\bfind\s+(?:in|inside|within)\s+(?:the\s+)?file\b',
-            ]
-            
-            # Multi-step operation patterns
-            multi_step_patterns = [
-                r'\b(?:multiple steps|sequence|series|several|many)\b',
-                r'\band then\b',
-                r'\bafter that\b',
-                r'\bone by one\b',
-                r'\bstep by step\b',
-                r'\bautomatically\b',
-            ]
-     
-            # Docker operation patterns
-            docker_patterns = [
-                r'\bdocker\b',
-                r'\bcontainer\b',
-                r'\bdockerfile\b',
-                r'\bdocker-compose\b',
-                r'\bdocker\s+compose\b',
-                r'\bimage\b.+\b(?:build|run|pull|push)\b',
-                r'\b(?:build|run|pull|push)\b.+\bimage\b',
-                r'\b(?:start|stop|restart|remove)\b.+\bcontainer\b',
-                r'\bcontainer\b.+\b(?:start|stop|restart|remove)\b',
-                r'\bgenerate\b.+\b(?:dockerfile|docker-compose)\b',
-                r'\bsetup\s+docker\b',
-                r'\bdocker\s+(?:ps|logs|images|rmi|exec)\b',
-            ]
-    
-            code_generation_patterns = [
-                r'\bcreate\s+(?:a\s+)?(?:new\s+)?(?:project|app|website|application)\b',
-                r'\bgenerate\s+(?:a\s+)?(?:new\s+)?(?:project|app|website|application)\b',
-                r'\bmake\s+(?:a\s+)?(?:new\s+)?(?:project|app|website|application)\b',
-                r'\bbuild\s+(?:a\s+)?(?:whole|complete|full|entire)\b',
-            ]
-            
-            # Feature addition patterns
-            feature_addition_patterns = [
-                r'\badd\s+(?:a\s+)?(?:new\s+)?feature\b',
-                r'\bimplement\s+(?:a\s+)?(?:new\s+)?feature\b',
-                r'\bcreate\s+(?:a\s+)?(?:new\s+)?feature\b',
-                r'\bextend\s+(?:the\s+)?(?:project|app|code|application)\b',
-            ]
-            
-            # Toolchain operation patterns
-            toolchain_patterns = [
-                r'\bsetup\s+(?:ci|cd|ci/cd|cicd|continuous integration|deployment)\b',
-                r'\bconfigure\s+(?:ci|cd|ci/cd|cicd|continuous integration|deployment|git)\b',
-                r'\bgenerate\s+(?:ci|cd|jenkins|gitlab|github)\b',
-                r'\binstall\s+dependencies\b',
-                r'\binitialize\s+(?:git|repo|repository)\b',
-            ]
-            
-            # Code refinement patterns
-            refinement_patterns = [
-                r'\brefine\s+(?:the\s+)?code\b',
-                r'\bimprove\s+(?:the\s+)?code\b',
-                r'\boptimize\s+(?:the\s+)?code\b',
-                r'\brefactor\s+(?:the\s+)?code\b',
-                r'\bupdate\s+(?:the\s+)?code\b',
-                r'\benhance\s+(?:the\s+)?code\b',
-            ]
-            
-            # Architecture patterns
-            architecture_patterns = [
-                r'\banalyze\s+(?:the\s+)?(?:architecture|structure)\b',
-                r'\bimprove\s+(?:the\s+)?(?:architecture|structure)\b',
-                r'\bredesign\s+(?:the\s+)?(?:architecture|structure)\b',
-                r'\bproject\s+structure\b',
-            ]
-    
-            # CI/CD patterns
-            ci_cd_patterns = [
-                r'\bset\s*up\s+(?:a\s+)?(?:ci|cd|ci/cd|cicd|continuous integration|deployment)(?:\s+pipeline)?\b',
-                r'\bcreate\s+(?:a\s+)?(?:ci|cd|ci/cd|cicd|continuous integration)(?:\s+pipeline)?\b',
-                r'\bci/cd\s+(?:pipeline|setup|configuration)\b',
-                r'\bpipeline\s+(?:setup|configuration|for)\b',
-                r'\bgithub\s+actions\b',
-                r'\bgitlab\s+ci\b',
-                r'\bjenkins(?:file)?\b',
-                r'\btravis\s+ci\b',
-                r'\bcircle\s+ci\b',
-                r'\b(?:automate|automation)\s+(?:build|test|deploy)\b',
-            ]
-            
-            # First check for CI/CD patterns since they're more specific
-            for pattern in ci_cd_patterns:
-                if re.search(pattern, request, re.IGNORECASE):
-                    return RequestType.CI_CD_PIPELINE
-            
-            # Then check for Universal CLI patterns
-            universal_cli_patterns = [
-                r'\buse\s+(?:the\s+)?(.+?)\s+(?:cli|command|tool)\b',
-                r'\brun\s+(?:a\s+)?(.+?)\s+command\b',
-                r'\b(?:execute|with)\s+(?:the\s+)?(.+?)\s+tool\b',
-            ]
-            
-            for pattern in universal_cli_patterns:
-                match = re.search(pattern, request, re.IGNORECASE)
-                if match:
-                    tool = match.group(1).strip().lower()
-                    if tool not in ["angela", "workflow"]:  # Exclude Angela's own commands
-                        return RequestType.UNIVERSAL_CLI
-            
-            # Check for complex workflow patterns
-            complex_workflow_patterns = [
-                r'\bcomplex\s+workflow\b',
-                r'\bcomplete\s+(?:ci/cd|cicd|pipeline)\b',
-                r'\bautomated\s+(?:build|test|deploy)\b',
-                r'\bend-to-end\s+workflow\b',
-                r'\bchain\s+of\s+commands\b',
-                r'\bmulti-step\s+operation\s+across\b',
-                r'\bpipeline\s+using\b',
-                r'\bseries\s+of\s+tools\b',
-            ]
-            
-            for pattern in complex_workflow_patterns:
-                if re.search(pattern, request, re.IGNORECASE):
-                    return RequestType.COMPLEX_WORKFLOW
-            
-            # Check for common CLI tools explicitly mentioned
-            common_tools = ["git", "docker", "aws", "kubectl", "terraform", "npm", "pip", "yarn"]
-            tool_words = request.lower().split()
-            for tool in common_tools:
-                if tool in tool_words:
-                    # Make sure it's a standalone word, not part of another word
-                    # Check the positions where the tool appears
-                    positions = [i for i, word in enumerate(tool_words) if word == tool]
-                    for pos in positions:
-                        # Check if it's a command (usually preceded by use, run, with, etc.)
-                        if pos > 0 and tool_words[pos-1] in ["use", "run", "with", "using", "execute"]:
-                            return RequestType.UNIVERSAL_CLI
-                    
-                    # If tool is the first word in the request, it's likely a direct usage
-                    if tool_words[0] == tool:
-                        return RequestType.UNIVERSAL_CLI
-            
-            # Also check for complexity indicators combined with multiple tool mentions
-            tool_mentions = sum(1 for tool in ["git", "docker", "aws", "kubernetes", "npm", "pip"] 
-                               if tool in request.lower())
-            has_complex_indicators = any(indicator in request.lower() for indicator in 
-                                       ["pipeline", "sequence", "then", "after", "followed"])
-        
-            if tool_mentions >= 2 and has_complex_indicators:
-                return RequestType.COMPLEX_WORKFLOW
-    
-            # Check for code generation first (highest priority)
-            for pattern in code_generation_patterns:
-                if re.search(pattern, request, re.IGNORECASE):
-                    return RequestType.CODE_GENERATION
-            
-            # Check for feature addition
-            for pattern in feature_addition_patterns:
-                if re.search(pattern, request, re.IGNORECASE):
-                    return RequestType.FEATURE_ADDITION
-            
-            # Check for toolchain operations
-            for pattern in toolchain_patterns:
-                if re.search(pattern, request, re.IGNORECASE):
-                    return RequestType.TOOLCHAIN_OPERATION
-            
-            # Check for code refinement
-            for pattern in refinement_patterns:
-                if re.search(pattern, request, re.IGNORECASE):
-                    return RequestType.CODE_REFINEMENT
-            
-            # Check for architecture analysis
-            for pattern in architecture_patterns:
-                if re.search(pattern, request, re.IGNORECASE):
-                    return RequestType.CODE_ARCHITECTURE
-     
-            # Check for workflow definition
-            for pattern in workflow_def_patterns:
-                if re.search(pattern, request, re.IGNORECASE):
-                    return RequestType.WORKFLOW_DEFINITION
-            
-            # Check for workflow execution
-            for pattern in workflow_exec_patterns:
-                if re.search(pattern, request, re.IGNORECASE):
-                    return RequestType.WORKFLOW_EXECUTION
-    
-            # Check for Docker operations first
-            for pattern in docker_patterns:
-                if re.search(pattern, request, re.IGNORECASE):
-                    return RequestType.TOOLCHAIN_OPERATION
-    
-            # Check for code generation (high priority)
-            for pattern in code_generation_patterns:
-                if re.search(pattern, request, re.IGNORECASE):
-                    return RequestType.CODE_GENERATION
-            
-            # Check for feature addition
-            for pattern in feature_addition_patterns:
-                if re.search(pattern, request, re.IGNORECASE):
-                    return RequestType.FEATURE_ADDITION
-            
-            # Check for toolchain operations
-            for pattern in toolchain_patterns:
-                if re.search(pattern, request, re.IGNORECASE):
-                    return RequestType.TOOLCHAIN_OPERATION
-            
-            # Check for code refinement
-            for pattern in refinement_patterns:
-                if re.search(pattern, request, re.IGNORECASE):
-                    return RequestType.CODE_REFINEMENT
-            
-            # Check for architecture analysis
-            for pattern in architecture_patterns:
-                if re.search(pattern, request, re.IGNORECASE):
-                    return RequestType.CODE_ARCHITECTURE
-    
-            for pattern in complex_workflow_patterns:
-                if re.search(pattern, request, re.IGNORECASE):
-                    return RequestType.COMPLEX_WORKFLOW
-                    
-            # Check for file content analysis/manipulation
-            file_mentions = re.search(r'\b(?:file|code|script|document)\b', request, re.IGNORECASE)
-            if file_mentions:
-                for pattern in file_content_patterns:
-                    if re.search(pattern, request, re.IGNORECASE):
-                        return RequestType.FILE_CONTENT
-            
-            # Check for multi-step operation
-            complexity_indicators = sum(bool(re.search(pattern, request, re.IGNORECASE)) for pattern in multi_step_patterns)
-            if complexity_indicators >= 1 or len(request.split()) > 15:
-                # Complex requests or longer instructions often imply multi-step operations
-                return RequestType.MULTI_STEP
-            
-            # Default to single command
-            return RequestType.COMMAND
+            # Rules are precompiled and checked in priority order by the classifier
+            return RequestType(request_classifier.classify(request))
 
 
     def _analyze_quick_intent(self, request: str) -> str:
@@ -565,46 +344,7 @@ class Orchestrator:
         Returns:
             String indicating the high-level intent: "create", "read", "modify", "analyze", "unknown"
         """
-        request_lower = request.lower()
-        
-        # Check for file creation keywords
-        creation_keywords = [
-            "create", "generate", "make", "new file", "save as", 
-            "write a new", "write new", "save it as", "output to"
-        ]
-        for keyword in creation_keywords:
-            if keyword in request_lower:
-                return "create"
-        
-        # Check for file reading keywords
-        read_keywords = [
-            "read", "open", "show", "display", "view", "cat", 
-            "print", "output", "list", "contents of"
-        ]
-        for keyword in read_keywords:
-            if keyword in request_lower:
-                return "read"
-        
-        # Check for file modification keywords
-        modify_keywords = [
-            "edit", "modify", "update", "change", "replace", "delete",
-            "remove", "rename", "move", "copy"
-        ]
-        for keyword in modify_keywords:
-            if keyword in request_lower:
-                return "modify"
-        
-        # Check for analysis keywords
-        analyze_keywords = [
-            "analyze", "examine", "check", "inspect", "review",
-            "summarize", "understand", "evaluate"
-        ]
-        for keyword in analyze_keywords:
-            if keyword in request_lower:
-                return "analyze"
-        
-        # Default case
-        return "unknown"
+        return request_classifier.quick_intent(request)
 
     async def _process_code_generation_request(
         self, 
@@ -1778,6 +1518,14 @@ class Orchestrator:
             terminal_formatter.display_loading_timer("Angela’s decrypting the payload....")
         )
         
+        async def stop_loading() -> None:
+            # The suggestion panel replaces the timer once output starts arriving
+            loading_task.cancel()
+            try:
+                await loading_task
+            except asyncio.CancelledError:
+                pass
+        
         try:
             # Analyze intent with enhanced NLU
             intent_result = intent_analyzer.analyze_intent(request)
@@ -1785,12 +1533,13 @@ class Orchestrator:
             # Check if we've seen a similar request before
             similar_command = history_manager.search_similar_command(request)
             
-            # Get command suggestion from AI
+            # Get command suggestion from AI, showing it while it streams in
             suggestion = await self._get_ai_suggestion(
                 request, 
                 context, 
                 similar_command, 
-                intent_result
+                intent_result,
+                on_first_output=stop_loading
             )
             
             # Score confidence in the suggestion
@@ -3190,7 +2939,8 @@ Keep your response concise and focused.
         request: str, 
         context: Dict[str, Any],
         similar_command: Optional[str] = None,
-        intent_result: Optional[Any] = None
+        intent_result: Optional[Any] = None,
+        on_first_output: Optional[Callable[[], Awaitable[None]]] = None
     ) -> CommandSuggestion:
         """
         Get a command suggestion from the AI service.
@@ -3200,6 +2950,8 @@ Keep your response concise and focused.
             context: Context information about the current environment
             similar_command: Optional similar command from history
             intent_result: Optional intent analysis result
+            on_first_output: If given, the response is streamed to the terminal;
+                awaited right before the first output is shown
             
         Returns:
             A CommandSuggestion object with the suggested command
@@ -3214,10 +2966,13 @@ Keep your response concise and focused.
         # Call the Gemini API
         self._logger.info("Sending request to Gemini API")
         try:
-            api_response = await gemini_client.generate_text(api_request)
-            
-            # Parse the response
-            suggestion = parse_ai_response(api_response.text)
+            if on_first_output:
+                suggestion = await self._stream_ai_suggestion(api_request, on_first_output)
+            else:
+                api_response = await gemini_client.generate_text(api_request)
+                
+                # Parse the response
+                suggestion = parse_ai_response(api_response.text)
             
             self._logger.info(f"Received suggestion: {suggestion.command}")
             return suggestion
@@ -3230,6 +2985,50 @@ Keep your response concise and focused.
                 explanation="This is a fallback command due to an error in the AI service."
             )
     
+    async def _stream_ai_suggestion(
+        self,
+        api_request: Any,
+        on_first_output: Callable[[], Awaitable[None]]
+    ) -> CommandSuggestion:
+        """
+        Stream a command suggestion, showing the command and explanation as they arrive.
+        
+        Args:
+            api_request: The Gemini request
+            on_first_output: Awaited right before the first output is shown
+            
+        Returns:
+            The parsed CommandSuggestion
+        """
+        from rich.text import Text
+        from angela.api.shell import get_terminal_formatter
+        
+        parser = StreamingResponseParser()
+        
+        def render(_text: str) -> Text:
+            command = parser.partial_value("command")
+            explanation = parser.partial_value("explanation")
+            body = Text()
+            if command is not None:
+                body.append(command, style="bold cyan")
+            if explanation:
+                body.append("\n\n" + explanation)
+            return body if body else Text("…")
+        
+        async def chunks():
+            async for chunk in gemini_client.generate_text_stream(api_request):
+                parser.feed(chunk)
+                yield chunk
+        
+        await get_terminal_formatter().display_streaming_response(
+            chunks(),
+            title="Suggestion",
+            render=render,
+            transient=True,
+            on_first_chunk=on_first_output
+        )
+        return parser.finish()
+    
     async def _extract_file_path(
         self, 
         request: str, 
@@ -0,0 +1,226 @@
+# angela/startup.py
+"""
+Import-light startup for the ``angela`` entry point.
+
+Every service that used to be constructed eagerly by ``init_application`` is
+registered here as a lazy ``registry.register_factory`` entry instead, so it is
+only imported the first time something asks the registry for it. Each
+top-level subcommand has a startup profile naming the side effects it really
+needs (starting the proactive assistant, background project inference, ...).
+
+The hidden shell-integration commands (``--notify``, ``--completions``) and
+``--version`` are served by :func:`run_fast_path` before Typer, Rich or any
+component is imported at all.
+"""
+import importlib
+import sys
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+# Registry name -> (module, attribute, call). The attribute is the component's
+# module-level instance; when ``call`` is true it is a builder to call instead.
+# The targets must not resolve themselves through the registry under the same
+# name, or the factory would recurse.
+SERVICE_FACTORIES: Dict[str, Tuple[str, str, bool]] = {
+    "app": ("angela.api.cli", "get_app", True),
+    "execution_engine": ("angela.components.execution.engine", "execution_engine", False),
+    "adaptive_engine": ("angela.components.execution.adaptive_engine", "adaptive_engine", False),
+    "orchestrator": ("angela.orchestrator", "orchestrator", False),
+    "universal_cli_translator": ("angela.components.toolchain.universal_cli", "universal_cli_translator", False),
+    "enhanced_universal_cli": ("angela.components.toolchain.enhanced_universal_cli", "enhanced_universal_cli", False),
+    "cross_tool_workflow_engine": ("angela.components.toolchain.cross_tool_workflow_engine", "cross_tool_workflow_engine", False),
+    "ci_cd_integration": ("angela.components.toolchain.ci_cd", "ci_cd_integration", False),
+    "proactive_assistant": ("angela.components.monitoring.proactive_assistant", "proactive_assistant", False),
+    "check_command_safety": ("angela.components.safety", "check_command_safety", False),
+    "validate_command_safety": ("angela.components.safety", "validate_command_safety", False),
+    "check_operation_safety": ("angela.components.safety", "check_operation_safety", False),
+}
+
+# Startup side effects, in the order they run
+STEP_CONTEXT = "context"
+STEP_PROACTIVE = "proactive"
+STEP_PROJECT_INFERENCE = "project_inference"
+
+FULL_PROFILE: Tuple[str, ...] = (STEP_CONTEXT, STEP_PROACTIVE, STEP_PROJECT_INFERENCE)
+
+# Top-level command -> startup steps. Commands not listed get FULL_PROFILE.
+STARTUP_PROFILES: Dict[Optional[str], Tuple[str, ...]] = {
+    None: FULL_PROFILE,
+    "request": FULL_PROFILE,
+    "shell": FULL_PROFILE,
+    "generate": (STEP_CONTEXT, STEP_PROJECT_INFERENCE),
+    "files": (STEP_CONTEXT,),
+    "workflows": (STEP_CONTEXT,),
+    "docker": (STEP_CONTEXT,),
+    "rollback": (),
+    "init": (),
+    "status": (),
+    "daemon": (),
+    "--notify": (),
+    "--completions": (),
+    "--version": (),
+    "-v": (),
+    "--help": (),
+    "-h": (),
+}
+
+# Global options of the main Typer callback that may precede the command
+_GLOBAL_FLAGS = {"--debug", "-d", "--monitor", "-m"}
+
+# Commands served without building the Typer application
+FAST_PATH_COMMANDS = ("--version", "-v", "--notify", "--completions")
+
+
+def _import_factory(module_path: str, attr: str, call: bool) -> Callable[[], Any]:
+    """
+    Build a registry factory that imports its target on first use.
+
+    Args:
+        module_path: Module containing the service or its getter
+        attr: Attribute name within the module
+        call: Whether the attribute must be called to obtain the service
+
+    Returns:
+        A zero-argument factory
+    """
+    def factory() -> Any:
+        target = getattr(importlib.import_module(module_path), attr)
+        return target() if call else target
+    return factory
+
+
+def register_service_factories() -> None:
+    """Register lazy factories for all core services."""
+    from angela.core.registry import registry
+    for name, (module_path, attr, call) in SERVICE_FACTORIES.items():
+        registry.register_factory(name, _import_factory(module_path, attr, call))
+
+
+def get_invoked_command(argv: List[str]) -> Optional[str]:
+    """
+    Find the top-level subcommand in the command-line arguments.
+
+    Args:
+        argv: Arguments after the program name
+
+    Returns:
+        The subcommand name, or None if there is none
+    """
+    for arg in argv:
+        if arg in _GLOBAL_FLAGS:
+            continue
+        return arg
+    return None
+
+
+def get_startup_profile(command: Optional[str]) -> Tuple[str, ...]:
+    """
+    Get the startup steps required by a subcommand.
+
+    Args:
+        command: The top-level subcommand
+
+    Returns:
+        Tuple of startup step names
+    """
+    return STARTUP_PROFILES.get(command, FULL_PROFILE)
+
+
+def run_startup_steps(steps: Tuple[str, ...]) -> None:
+    """
+    Run the given startup side effects.
+
+    Args:
+        steps: Startup step names from a profile
+    """
+    from angela.core.registry import registry
+    from angela.utils.logging import get_logger
+    logger = get_logger(__name__)
+
+    if STEP_CONTEXT in steps:
+        from angela.api.context import get_context_manager, get_semantic_context_manager
+        get_context_manager()
+        get_semantic_context_manager()
+
+    if STEP_PROACTIVE in steps:
+        try:
+            registry.get("proactive_assistant").start()
+        except Exception as e:
+            logger.error(f"Failed to start proactive assistant: {str(e)}")
+
+    if STEP_PROJECT_INFERENCE in steps:
+        from angela.api.context import initialize_project_inference
+        initialize_project_inference()
+
+
+def run_fast_path(argv: List[str]) -> Optional[int]:
+    """
+    Serve shell-integration commands without loading the CLI application.
+
+    Args:
+        argv: Arguments after the program name
+
+    Returns:
+        Exit code if the command was fully handled, otherwise None
+    """
+    if not argv or argv[0] not in FAST_PATH_COMMANDS:
+        return None
+
+    command, args = argv[0], argv[1:]
+
+    if command in ("--version", "-v"):
+        from angela import __version__
+        print(f"Angela CLI version: {__version__}")
+        return 0
+
+    if command == "--notify":
+        if not args:
+            return 0
+
+        # Hand the notification to the resident daemon if one is listening
+        from angela.components.monitoring.daemon_client import send_notification
+        if send_notification(args[0], *args[1:]):
+            return 0
+
+        # Otherwise handle it in this process, never disrupting the shell
+        import asyncio
+        from angela.api.monitoring import get_notification_handler
+        try:
+            asyncio.run(get_notification_handler().handle_notification(args[0], *args[1:]))
+        except Exception:
+            pass
+        return 0
+
+    if command == "--completions":
+        from angela.components.shell.completion import completion_handler
+        # Static completions are served without starting an event loop
+        completions = completion_handler.get_static_completions(args)
+        if completions is None:
+            import asyncio
+            try:
+                completions = asyncio.run(completion_handler.get_completions(args))
+            except Exception:
+                completions = []
+        print(" ".join(completions))
+        return 0
+
+    return None
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    """
+    Entry point for the ``angela`` command.
+
+    Args:
+        argv: Arguments after the program name (defaults to ``sys.argv[1:]``)
+    """
+    argv = sys.argv[1:] if argv is None else argv
+
+    exit_code = run_fast_path(argv)
+    if exit_code is not None:
+        sys.exit(exit_code)
+
+    from angela import init_application
+    init_application(get_invoked_command(argv))
+
+    from angela.components.cli import app
+    app(args=argv)
@@ -0,0 +1,188 @@
+#!/usr/bin/env python3
+"""
+Request-path benchmark for the orchestrator, without the live Gemini API.
+
+Drives Orchestrator.process_request with a representative request for each
+RequestType against an offline LLM backend and reports p50/p95 latency,
+peak traced allocations and LLM calls per request. Requests run with
+execute=False and dry_run=True inside a scratch directory; interactive
+confirmations are declined.
+
+Backends:
+  synthetic  canned responses after --latency seconds (default)
+  replay     responses recorded in the JSONL file given by --fixtures
+
+Usage:
+    python scripts/benchmark_requests.py [--backend synthetic|replay] [--fixtures FILE]
+                                         [--runs N] [--type TYPE ...] [--json]
+"""
+import argparse
+import asyncio
+import contextlib
+import io
+import json
+import math
+import os
+import statistics
+import sys
+import tempfile
+import time
+import tracemalloc
+from pathlib import Path
+from typing import Any, Dict, List
+from unittest import mock
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(REPO_ROOT))
+
+# Request type value -> request expected to be classified as that type
+SAMPLE_REQUESTS: Dict[str, str] = {
+    "command": "list all python files larger than 1MB",
+    "multi_step": "create a backup folder and then copy all log files into it",
+    "file_content": "summarize the content of the file README.md",
+    "workflow": "define a new workflow called deploy",
+    "run_workflow": "run the workflow deploy",
+    "code_generation": "create a new project for a todo list app",
+    "feature_addition": "add a new feature for user login",
+    "toolchain_operation": "install dependencies",
+    "code_refinement": "refine the code in main.py",
+    "code_architecture": "analyze the architecture",
+    "universal_cli": "use the aws cli to list buckets",
+    "complex_workflow": "complex workflow to build and deploy",
+    "ci_cd_pipeline": "set up ci pipeline with github actions",
+}
+
+
+def _percentile(samples: List[float], pct: float) -> float:
+    """Nearest-rank percentile."""
+    ordered = sorted(samples)
+    index = max(0, math.ceil(pct / 100 * len(ordered)) - 1)
+    return ordered[index]
+
+
+def _configure_client(options: argparse.Namespace) -> Any:
+    """Point the shared Gemini client at the offline backend."""
+    from angela.api.ai import get_gemini_client
+    from angela.components.ai.backends import ReplayBackend, SyntheticBackend
+    from angela.components.ai.scheduler import RequestScheduler
+
+    if options.backend == "replay":
+        if not options.fixtures:
+            raise SystemExit("--fixtures is required for the replay backend")
+        backend = ReplayBackend(Path(options.fixtures))
+    else:
+        backend = SyntheticBackend(latency=options.latency, tokens_per_second=options.tokens_per_second)
+
+    client = get_gemini_client()
+    client.backend = backend
+    # Measure the request path itself: no response reuse, no quota throttling
+    if not options.with_cache:
+        client.response_cache = None
+    client.scheduler = RequestScheduler(requests_per_minute=0, tokens_per_minute=0)
+    return backend
+
+
+def _backend_calls(backend: Any) -> int:
+    """Number of prompts the backend has answered so far."""
+    if hasattr(backend, "calls"):
+        return backend.calls
+    return backend.hits + backend.misses
+
+
+async def _run_request(orchestrator: Any, request: str) -> Dict[str, Any]:
+    """Run one request with terminal output suppressed and confirmations declined."""
+    with contextlib.redirect_stdout(io.StringIO()), mock.patch("builtins.input", return_value="n"):
+        return await orchestrator.process_request(request, execute=False, dry_run=True)
+
+
+async def _benchmark(options: argparse.Namespace) -> Dict[str, Dict[str, Any]]:
+    backend = _configure_client(options)
+
+    from angela.orchestrator import orchestrator
+
+    results: Dict[str, Dict[str, Any]] = {}
+    for type_name in options.types:
+        request = SAMPLE_REQUESTS[type_name]
+        context = {"cwd": os.getcwd()}
+        classified = (await orchestrator._determine_request_type(request, context)).value
+
+        latencies: List[float] = []
+        errors = 0
+        calls_before = _backend_calls(backend)
+        for run in range(options.warmup + options.runs):
+            start = time.perf_counter()
+            try:
+                result = await _run_request(orchestrator, request)
+                failed = isinstance(result, dict) and bool(result.get("error"))
+            except Exception:
+                failed = True
+            elapsed = (time.perf_counter() - start) * 1000
+            if run >= options.warmup:
+                latencies.append(elapsed)
+                errors += int(failed)
+        calls = _backend_calls(backend) - calls_before
+
+        # Allocations are measured in a separate traced run, so tracing
+        # overhead does not distort the latency figures
+        tracemalloc.start()
+        try:
+            tracemalloc.reset_peak()
+            baseline = tracemalloc.get_traced_memory()[0]
+            try:
+                await _run_request(orchestrator, request)
+            except Exception:
+                pass
+            current, peak = tracemalloc.get_traced_memory()
+        finally:
+            tracemalloc.stop()
+
+        results[type_name] = {
+            "classified_as": classified,
+            "p50_ms": round(statistics.median(latencies), 1),
+            "p95_ms": round(_percentile(latencies, 95), 1),
+            "peak_alloc_kib": round((peak - baseline) / 1024, 1),
+            "retained_kib": round((current - baseline) / 1024, 1),
+            "llm_calls_per_request": round(calls / (options.warmup + options.runs), 2),
+            "errors": errors,
+        }
+    return results
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--backend", choices=["synthetic", "replay"], default="synthetic")
+    parser.add_argument("--fixtures", help="Recorded responses (JSONL) for the replay backend")
+    parser.add_argument("--latency", type=float, default=0.2, help="Synthetic time to first token (s)")
+    parser.add_argument("--tokens-per-second", type=float, default=0.0, help="Synthetic output rate (0 = instant)")
+    parser.add_argument("--runs", type=int, default=10, help="Measured runs per request type")
+    parser.add_argument("--warmup", type=int, default=1, help="Unmeasured runs per request type")
+    parser.add_argument("--type", dest="types", action="append", choices=sorted(SAMPLE_REQUESTS),
+                        help="Request type to benchmark (repeatable; default all)")
+    parser.add_argument("--with-cache", action="store_true", help="Keep the response cache enabled")
+    parser.add_argument("--json", action="store_true", help="Emit results as JSON")
+    options = parser.parse_args()
+    options.types = options.types or list(SAMPLE_REQUESTS)
+
+    cwd = os.getcwd()
+    with tempfile.TemporaryDirectory() as tmpdir:
+        os.chdir(tmpdir)
+        Path("README.md").write_text("# Benchmark project\n")
+        Path("main.py").write_text("def main():\n    print('hello')\n")
+        try:
+            results = asyncio.run(_benchmark(options))
+        finally:
+            os.chdir(cwd)
+
+    if options.json:
+        print(json.dumps(results, indent=2))
+    else:
+        print(f"{'request type':<22} {'p50':>9} {'p95':>9} {'peak alloc':>12} {'llm calls':>10} {'errors':>7}")
+        for type_name, r in results.items():
+            mismatch = "" if r["classified_as"] == type_name else f"  (classified as {r['classified_as']})"
+            print(f"{type_name:<22} {r['p50_ms']:>7.1f}ms {r['p95_ms']:>7.1f}ms "
+                  f"{r['peak_alloc_kib']:>9.1f}KiB {r['llm_calls_per_request']:>10} {r['errors']:>7}{mismatch}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,175 @@
+#!/usr/bin/env python3
+"""
+Benchmark for command risk classification.
+
+Times the compiled, first-word dispatched CommandRiskClassifier against the
+previous sequential implementation (one ``re.search`` per pattern string,
+reproduced below as the reference) and checks that both return the same
+risk level and reason for every command. Exits non-zero on a mismatch.
+
+The corpus is generated: commands are built from the words that occur in
+the risk patterns themselves, mixed with flags, paths, redirections, pipes
+and command chaining, so that most patterns are both hit and narrowly
+missed. A file with one command per line can be given instead.
+
+Usage:
+    python scripts/benchmark_risk_classifier.py [--corpus FILE] [--count N] [--seed N] [--json]
+"""
+import argparse
+import json
+import random
+import re
+import sys
+import time
+from pathlib import Path
+from typing import Callable, List, Tuple
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(REPO_ROOT))
+
+EXTRA_COMMANDS = [
+    "python3", "python2", "mkfs.ext4", "ldapsearch", "apt-get", "grub-install", "ssh-keygen",
+    "firewall-cmd", "sha256sum", "bzip2", "sqlite3", "pwdx", "sudo", "for", "./run.sh", "make",
+    "npm", "cargo", "kubectl", "terraform", "unknowncmd", "LS", "rmx", "ipx", "gitk",
+]
+
+EXTRA_ARGUMENTS = [
+    "-r", "-rf", "-R", "-f", "--force", "--recursive", "-l", "-la", "-lah", "-h", "-a", "-v",
+    "--version", "-c", "3", "-n", "10", "-e", "-g", "--global", "-L", "-T", "--output", "out.bin",
+    "/", "/etc", "/etc/hosts", "/usr/bin", "/var/log", "/home", "/dev/sda", "if=/dev/zero",
+    "of=/dev/sda", "of=big.img", "bs=1M", "file.txt", "src/", "notes.md", "script.sh", "x.py",
+    "localhost", "example.com", "root", "eth0", "down", "up", "install", "remove", "status",
+    "push", "origin", "main", "--dport", "22", "\"DROP", "\"DELETE FROM", "wttr.in", "777", "*.log",
+]
+
+JOINERS = [" | ", " && ", "; ", " > ", " >> ", " >/etc/", " | sudo ", " | bash", ";rm -rf "]
+
+
+def legacy_classify(command: str) -> Tuple[int, str]:
+    """Sequential classification as done before the classifier was compiled."""
+    from angela.components.safety.classifier import OVERRIDE_PATTERNS, RISK_PATTERNS
+    from angela.constants import RISK_LEVELS
+
+    if not command.strip():
+        return RISK_LEVELS["SAFE"], "Empty command"
+
+    # Check OVERRIDE_PATTERNS first
+    for level_name, patterns_list in OVERRIDE_PATTERNS.items():
+        for pattern_item in patterns_list:
+            pattern_str = pattern_item[0] if isinstance(pattern_item, tuple) else pattern_item
+
+            if re.search(pattern_str, command.strip()):
+                level = RISK_LEVELS[level_name]
+                reason = pattern_item[1] if isinstance(pattern_item, tuple) and len(pattern_item) > 1 else f"Matched override pattern for {level_name} risk"
+                return level, reason
+
+    # Then check RISK_PATTERNS, from highest risk to lowest
+    for level, patterns_list in sorted(RISK_PATTERNS.items(), key=lambda x: x[0], reverse=True):
+        for pattern_str, reason_str in patterns_list:
+            if re.search(pattern_str, command.strip()):
+                return level, reason_str
+
+    return RISK_LEVELS["MEDIUM"], "Unrecognized command type"
+
+
+def generate_corpus(count: int, seed: int) -> List[str]:
+    """Random commands built from the vocabulary of the risk patterns."""
+    from angela.components.safety.classifier import OVERRIDE_PATTERNS, RISK_PATTERNS, command_words
+
+    patterns = [p if isinstance(p, str) else p[0] for group in OVERRIDE_PATTERNS.values() for p in group]
+    patterns += [pattern for group in RISK_PATTERNS.values() for pattern, _ in group]
+
+    commands, words = set(EXTRA_COMMANDS), set(EXTRA_ARGUMENTS)
+    for pattern in patterns:
+        commands.update(command_words(pattern) or ())
+        # Literal runs of the pattern, skipping escapes like \s and \b
+        words.update(re.findall(r"(?<!\\)[A-Za-z][\w.=/-]*", pattern))
+    commands, words = sorted(commands), sorted(words)
+
+    rng = random.Random(seed)
+    corpus = []
+    for _ in range(count):
+        parts = [rng.choice(commands)]
+        parts += [rng.choice(words) for _ in range(rng.randint(0, 5))]
+        command = " ".join(parts)
+        if rng.random() < 0.25:
+            command += rng.choice(JOINERS) + " ".join(
+                [rng.choice(commands)] + [rng.choice(words) for _ in range(rng.randint(0, 3))]
+            )
+        if rng.random() < 0.05:
+            command = "  " + command + " "
+        corpus.append(command)
+    return corpus
+
+
+def _time_per_command(classify: Callable[[str], Tuple[int, str]], corpus: List[str]) -> float:
+    """Best-of-3 mean time per classification, in microseconds."""
+    best = float("inf")
+    for _ in range(3):
+        start = time.perf_counter()
+        for command in corpus:
+            classify(command)
+        best = min(best, time.perf_counter() - start)
+    return best / len(corpus) * 1e6
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--corpus", type=Path, help="One command per line instead of a generated corpus")
+    parser.add_argument("--count", type=int, default=50000, help="Number of generated commands")
+    parser.add_argument("--seed", type=int, default=0, help="Seed of the generated corpus")
+    parser.add_argument("--json", action="store_true", help="Emit results as JSON")
+    options = parser.parse_args()
+
+    from angela.components.safety.classifier import CommandRiskClassifier
+
+    if options.corpus:
+        corpus = [line.rstrip("\n") for line in options.corpus.read_text().splitlines() if line.strip()]
+    else:
+        corpus = generate_corpus(options.count, options.seed)
+
+    classifier = CommandRiskClassifier()
+    mismatches = [
+        (command, legacy, compiled)
+        for command, legacy, compiled in ((c, legacy_classify(c), classifier.classify(c)) for c in corpus)
+        if legacy != compiled
+    ]
+
+    # The old code compiled patterns through re's cache; clear it so the
+    # legacy timing includes the cache lookups it did on every command
+    re.purge()
+    legacy_us = _time_per_command(legacy_classify, corpus)
+    # _classify bypasses the per-command memo
+    compiled_us = _time_per_command(classifier._classify, corpus)
+    memoized_us = _time_per_command(classifier.classify, corpus[:1000])
+
+    results = {
+        "commands": len(corpus),
+        "distinct_verdicts": len({classifier.classify(c) for c in corpus}),
+        "legacy_us_per_command": round(legacy_us, 2),
+        "compiled_us_per_command": round(compiled_us, 2),
+        "memoized_us_per_command": round(memoized_us, 3),
+        "speedup": round(legacy_us / compiled_us, 1) if compiled_us else None,
+        "mismatches": [
+            {"command": command, "legacy": list(legacy), "compiled": list(compiled)}
+            for command, legacy, compiled in mismatches
+        ],
+    }
+
+    if options.json:
+        print(json.dumps(results, indent=2))
+    else:
+        print(f"{results['commands']} commands, {results['distinct_verdicts']} distinct verdicts")
+        print(f"legacy    {legacy_us:8.2f} us/command")
+        print(f"compiled  {compiled_us:8.2f} us/command  ({results['speedup']}x)")
+        print(f"memoized  {memoized_us:8.3f} us/command")
+        for mismatch in results["mismatches"][:20]:
+            print(f"MISMATCH {mismatch['command']!r}: {mismatch['legacy']} != {mismatch['compiled']}")
+        if len(mismatches) > 20:
+            print(f"... {len(mismatches) - 20} more mismatches")
+
+    return 1 if mismatches else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
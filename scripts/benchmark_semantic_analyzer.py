@@ -0,0 +1,232 @@
+#!/usr/bin/env python3
+"""
+Benchmark for Python entity extraction in SemanticAnalyzer.
+
+Times the single-pass PythonEntityExtractor against the previous
+implementation (an ``ast.walk`` over the module with a second walk per
+function to find its class, reproduced below as the reference) on large
+real Python files, and checks that both find the same top-level functions,
+classes, methods, imports, calls and complexities. Exits non-zero on a
+mismatch.
+
+Files default to the largest modules of this repository and of the
+standard library.
+
+Usage:
+    python scripts/benchmark_semantic_analyzer.py [FILE ...] [--count N] [--repeat N] [--json]
+"""
+import argparse
+import ast
+import json
+import sys
+import sysconfig
+import time
+from collections import Counter
+from pathlib import Path
+from typing import Callable, Dict, List, Optional
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(REPO_ROOT))
+
+
+def legacy_extract(tree: ast.Module, module) -> None:
+    """Entity extraction as done before the single-pass extractor."""
+    from angela.components.ai.semantic_analyzer import Class, Function, Import, Variable, _type_annotation
+
+    filename = module.filename
+    module.docstring = ast.get_docstring(tree)
+
+    for node in ast.walk(tree):
+        if isinstance(node, ast.Import):
+            for name in node.names:
+                import_name = name.asname or name.name
+                module.imports[import_name] = Import(import_name, node.lineno, node.lineno, filename,
+                                                     import_path=name.name, is_from=False, alias=name.asname)
+                module.dependencies.append(name.name)
+
+        elif isinstance(node, ast.ImportFrom):
+            module_name = node.module or ""
+            for name in node.names:
+                import_name = name.asname or name.name
+                full_path = f"{module_name}.{name.name}" if module_name else name.name
+                module.imports[import_name] = Import(import_name, node.lineno, node.lineno, filename,
+                                                     import_path=full_path, is_from=True, alias=name.asname)
+                module.dependencies.append(full_path)
+
+        elif isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef)):
+            # Check if we're inside a class
+            parent_class = None
+            for ancestor in ast.walk(tree):
+                if isinstance(ancestor, ast.ClassDef):
+                    if any(node is child for child in ancestor.body):
+                        parent_class = ancestor.name
+                        break
+
+            params = [arg.arg for arg in node.args.args]
+            decorators = []
+            for decorator in node.decorator_list:
+                if isinstance(decorator, ast.Name):
+                    decorators.append(decorator.id)
+                elif isinstance(decorator, ast.Attribute):
+                    decorators.append(f"{decorator.value.id}.{decorator.attr}")
+                elif isinstance(decorator, ast.Call):
+                    if isinstance(decorator.func, ast.Name):
+                        decorators.append(decorator.func.id)
+                    elif isinstance(decorator.func, ast.Attribute):
+                        decorators.append(f"{decorator.func.value.id}.{decorator.func.attr}")
+
+            function = Function(node.name, node.lineno, node.end_lineno, filename, params=params,
+                                docstring=ast.get_docstring(node), is_method=parent_class is not None,
+                                decorators=decorators,
+                                return_type=_type_annotation(node.returns) if node.returns else None,
+                                class_name=parent_class)
+
+            for child in ast.walk(node):
+                if isinstance(child, ast.Call):
+                    if isinstance(child.func, ast.Name):
+                        function.called_functions.append(child.func.id)
+                    elif isinstance(child.func, ast.Attribute):
+                        if isinstance(child.func.value, ast.Name):
+                            function.called_functions.append(f"{child.func.value.id}.{child.func.attr}")
+
+            complexity = 1
+            for child in ast.walk(node):
+                if isinstance(child, (ast.If, ast.While, ast.For, ast.IfExp)):
+                    complexity += 1
+                elif isinstance(child, ast.BoolOp):
+                    complexity += len(child.values) - 1
+                elif isinstance(child, ast.Try):
+                    complexity += len(child.handlers)
+            function.complexity = complexity
+
+            if parent_class and parent_class in module.classes:
+                module.classes[parent_class].methods[node.name] = function
+            else:
+                module.functions[node.name] = function
+
+        elif isinstance(node, ast.ClassDef):
+            base_classes = []
+            for base in node.bases:
+                if isinstance(base, ast.Name):
+                    base_classes.append(base.id)
+                elif isinstance(base, ast.Attribute):
+                    base_classes.append(f"{base.value.id}.{base.attr}")
+            decorators = [d.id for d in node.decorator_list if isinstance(d, ast.Name)]
+            module.classes[node.name] = Class(node.name, node.lineno, node.end_lineno, filename,
+                                              docstring=ast.get_docstring(node), base_classes=base_classes,
+                                              decorators=decorators)
+
+        elif isinstance(node, ast.Assign) and all(isinstance(target, ast.Name) for target in node.targets):
+            for target in node.targets:
+                if not target.id.startswith('_'):
+                    module.variables[target.id] = Variable(target.id, node.lineno, node.lineno, filename,
+                                                           is_constant=target.id.isupper())
+
+
+def new_extract(tree: ast.Module, module) -> None:
+    from angela.components.ai.semantic_analyzer import PythonEntityExtractor
+    PythonEntityExtractor(module).visit(tree)
+
+
+def _signature(module, tree: ast.Module) -> Dict[str, object]:
+    """Entities both implementations must agree on."""
+    top_level = {node.name for node in tree.body if isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef))}
+    top_classes = {node.name for node in tree.body if isinstance(node, ast.ClassDef)}
+
+    def describe(function):
+        return (function.line_start, function.complexity, sorted(Counter(function.called_functions).items()))
+
+    return {
+        "imports": sorted((name, imp.import_path) for name, imp in module.imports.items()),
+        "functions": {name: describe(f) for name, f in module.functions.items() if name in top_level},
+        "methods": {
+            f"{cls_name}.{name}": describe(method)
+            for cls_name, cls in module.classes.items() if cls_name in top_classes
+            for name, method in cls.methods.items()
+        },
+        "classes": sorted(top_classes & set(module.classes)),
+    }
+
+
+def _time_extraction(extract: Callable, tree: ast.Module, filename: str, repeat: int) -> float:
+    """Best-of-3 mean time per extraction, in milliseconds."""
+    from angela.components.ai.semantic_analyzer import Module
+
+    best = float("inf")
+    for _ in range(3):
+        start = time.perf_counter()
+        for _ in range(repeat):
+            extract(tree, Module(filename))
+        best = min(best, time.perf_counter() - start)
+    return best / repeat * 1000
+
+
+def _default_files(count: int) -> List[Path]:
+    """The largest Python files of this repository and the standard library."""
+    candidates = list((REPO_ROOT / "angela").rglob("*.py"))
+    candidates += list(Path(sysconfig.get_paths()["stdlib"]).glob("*.py"))
+    candidates.sort(key=lambda path: path.stat().st_size, reverse=True)
+    return candidates[:count]
+
+
+def _run_file(path: Path, repeat: int) -> Optional[Dict[str, object]]:
+    from angela.components.ai.semantic_analyzer import Module
+
+    source = path.read_text(encoding="utf-8", errors="replace")
+    try:
+        tree = ast.parse(source, filename=str(path))
+    except SyntaxError:
+        return None
+
+    legacy_module, new_module = Module(str(path)), Module(str(path))
+    try:
+        legacy_extract(tree, legacy_module)
+    except AttributeError:
+        # The old decorator and base class handling failed on nested attributes
+        legacy_module = None
+    new_extract(tree, new_module)
+
+    new_ms = _time_extraction(new_extract, tree, str(path), repeat)
+    result = {
+        "file": str(path),
+        "lines": len(source.splitlines()),
+        "new_ms": round(new_ms, 2),
+        "legacy_ms": None,
+        "speedup": None,
+        "mismatch": False,
+        "legacy_failed": legacy_module is None,
+    }
+    if legacy_module is not None:
+        legacy_ms = _time_extraction(legacy_extract, tree, str(path), repeat)
+        result["legacy_ms"] = round(legacy_ms, 2)
+        result["speedup"] = round(legacy_ms / new_ms, 1) if new_ms else None
+        result["mismatch"] = _signature(legacy_module, tree) != _signature(new_module, tree)
+    return result
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("files", nargs="*", type=Path, help="Python files to analyze")
+    parser.add_argument("--count", type=int, default=8, help="Number of default files")
+    parser.add_argument("--repeat", type=int, default=3, help="Extractions per measurement")
+    parser.add_argument("--json", action="store_true", help="Emit results as JSON")
+    options = parser.parse_args()
+
+    files = options.files or _default_files(options.count)
+    results = [r for r in (_run_file(path, options.repeat) for path in files) if r]
+
+    if options.json:
+        print(json.dumps(results, indent=2))
+    else:
+        print(f"{'lines':>7} {'legacy ms':>10} {'new ms':>8} {'speedup':>8}  file")
+        for r in results:
+            legacy = "failed" if r["legacy_failed"] else f"{r['legacy_ms']:.2f}"
+            speedup = f"{r['speedup']}x" if r["speedup"] else "-"
+            flag = "  MISMATCH" if r["mismatch"] else ""
+            print(f"{r['lines']:>7} {legacy:>10} {r['new_ms']:>8.2f} {speedup:>8}  {r['file']}{flag}")
+
+    return 1 if any(r["mismatch"] for r in results) else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,125 @@
+#!/usr/bin/env python3
+"""
+Startup benchmark for the angela entry point.
+
+Runs each benchmarked subcommand in a fresh interpreter under
+``python -X importtime`` and reports the time spent importing angela (its own
+modules and everything they import, but not interpreter startup such as
+``site`` and ``.pth`` processing) and the wall time to the first line of
+output, each compared against a per-subcommand budget.
+Exits non-zero if any budget is exceeded so it can gate CI.
+
+Usage:
+    python scripts/benchmark_startup.py [--runs N] [--json]
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from typing import Dict, List, Tuple
+
+# Subcommand label -> (arguments, import-time budget in ms, first-output budget in ms)
+BUDGETS: Dict[str, Tuple[List[str], float, float]] = {
+    "--version": (["--version"], 60.0, 150.0),
+    "--completions": (["--completions", "files"], 120.0, 150.0),
+    "--notify (daemon)": (["--notify", "pre_exec", "ls"], 60.0, 150.0),
+}
+
+
+def _parse_import_time(stderr: str) -> float:
+    """
+    Sum the cumulative time (microseconds) of the outermost angela imports, in ms.
+
+    ``-X importtime`` prints an import after the imports nested in it, indented
+    two spaces per level. Reading the lines backwards, each outermost angela
+    module comes before everything it imported, which its cumulative time
+    already covers.
+    """
+    total_us = 0
+    angela_depth = None
+    for line in reversed(stderr.splitlines()):
+        if not line.startswith("import time:"):
+            continue
+        fields = line[len("import time:"):].split("|")
+        if len(fields) != 3:
+            continue
+        name = fields[2].rstrip()
+        stripped = name.lstrip()
+        depth = len(name) - len(stripped)
+        if angela_depth is not None and depth > angela_depth:
+            continue
+        angela_depth = None
+        if stripped == "angela" or stripped.startswith("angela."):
+            try:
+                total_us += int(fields[1])
+            except ValueError:
+                continue
+            angela_depth = depth
+    return total_us / 1000.0
+
+
+def _run_once(args: List[str], env: Dict[str, str]) -> Tuple[float, float]:
+    """Run one cold start and return (import ms, wall ms to first output)."""
+    start = time.perf_counter()
+    process = subprocess.Popen(
+        [sys.executable, "-X", "importtime", "-m", "angela", *args],
+        stdout=subprocess.PIPE,
+        stderr=subprocess.PIPE,
+        env=env,
+    )
+    process.stdout.readline()
+    first_output = (time.perf_counter() - start) * 1000
+    _, stderr = process.communicate()
+    return _parse_import_time(stderr.decode("utf-8", errors="replace")), first_output
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--runs", type=int, default=5, help="Cold starts per subcommand")
+    parser.add_argument("--json", action="store_true", help="Emit results as JSON")
+    options = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmpdir:
+        env = dict(os.environ)
+        # A socket that exists but has no reader: measures the daemon fast
+        # path without depending on a running daemon.
+        env["ANGELA_SOCKET"] = os.path.join(tmpdir, "bench.sock")
+        import socket
+        sink = socket.socket(socket.AF_UNIX, socket.SOCK_DGRAM)
+        sink.bind(env["ANGELA_SOCKET"])
+
+        results = {}
+        failed = False
+        for label, (args, import_budget, output_budget) in BUDGETS.items():
+            samples = [_run_once(args, env) for _ in range(options.runs)]
+            import_ms = statistics.median(s[0] for s in samples)
+            wall_ms = statistics.median(s[1] for s in samples)
+            over = import_ms > import_budget or wall_ms > output_budget
+            failed = failed or over
+            results[label] = {
+                "import_ms": round(import_ms, 1),
+                "import_budget_ms": import_budget,
+                "first_output_ms": round(wall_ms, 1),
+                "first_output_budget_ms": output_budget,
+                "ok": not over,
+            }
+        sink.close()
+
+    if options.json:
+        print(json.dumps(results, indent=2))
+    else:
+        print(f"{'subcommand':<20} {'imports':>10} {'budget':>8} {'first out':>10} {'budget':>8}")
+        for label, r in results.items():
+            status = "ok" if r["ok"] else "OVER"
+            print(f"{label:<20} {r['import_ms']:>8.1f}ms {r['import_budget_ms']:>6.0f}ms "
+                  f"{r['first_output_ms']:>8.1f}ms {r['first_output_budget_ms']:>6.0f}ms  {status}")
+
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
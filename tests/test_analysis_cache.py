@@ -0,0 +1,101 @@
+"""
+Tests for the persistent semantic analysis cache.
+"""
+import ast
+import os
+
+import pytest
+
+from angela.components.ai.analysis_cache import AnalysisCache
+from angela.components.ai.semantic_analyzer import Module, PythonEntityExtractor
+
+
+@pytest.fixture
+def cache(tmp_path):
+    cache = AnalysisCache(tmp_path / "analysis.db", max_bytes=1024 * 1024)
+    yield cache
+    cache.close()
+
+
+def _touch(path, delta):
+    st = os.stat(path)
+    os.utime(path, ns=(st.st_atime_ns, st.st_mtime_ns + delta))
+
+
+def test_hit_miss_and_revalidation(tmp_path, cache):
+    """Test validity by stat, content hash and analyzer version."""
+    source = tmp_path / "mod.py"
+    source.write_text("x = 1\n")
+    cache.put(source, "1", {"answer": 42})
+
+    assert cache.get(source, "1") == {"answer": 42}
+    assert cache.get(source, "2") is None
+
+    # Same content under a new mtime is still a hit
+    _touch(source, 10_000_000_000)
+    assert cache.get(source, "1") == {"answer": 42}
+
+    source.write_text("x = 2\n")
+    assert cache.get(source, "1") is None
+    assert cache.get(tmp_path / "missing.py", "1") is None
+    assert cache.stats()["hits"] == 2
+
+
+def test_put_skips_files_changed_during_analysis(tmp_path, cache):
+    """Test that a stale analysis is not stored."""
+    source = tmp_path / "mod.py"
+    source.write_text("x = 1\n")
+    started = os.stat(source).st_mtime_ns
+    _touch(source, 10_000_000_000)
+    cache.put(source, "1", {"answer": 42}, analyzed_mtime_ns=started)
+    assert cache.get(source, "1") is None
+
+
+def test_lru_eviction(tmp_path):
+    """Test that the least recently used entries are evicted first."""
+    cache = AnalysisCache(tmp_path / "analysis.db", max_bytes=2500)
+    payload = {"data": os.urandom(600).hex()}
+    files = []
+    for n in range(4):
+        path = tmp_path / f"f{n}.py"
+        path.write_text(str(n))
+        files.append(path)
+        cache.put(path, "1", payload)
+        if n == 1:
+            cache.get(files[0], "1")
+
+    assert cache.get(files[0], "1") is not None
+    assert cache.get(files[1], "1") is None
+    assert cache.get(files[3], "1") is not None
+    assert cache.stats()["bytes"] <= 2500
+
+    # A second process sees the same entries
+    other = AnalysisCache(tmp_path / "analysis.db", max_bytes=2500)
+    assert other.get(files[3], "1") == payload
+
+
+def test_module_round_trip(tmp_path):
+    """Test that a module survives serialization."""
+    module = Module(str(tmp_path / "mod.py"))
+    PythonEntityExtractor(module).visit(ast.parse(
+        "import os\n"
+        "LIMIT = 3\n"
+        "class A(Base):\n"
+        "    size: int = 1\n"
+        "    class Inner:\n"
+        "        pass\n"
+        "    def run(self):\n"
+        "        return os.getcwd()\n"
+        "def main():\n"
+        "    A().run()\n"
+    ))
+    module.classes["A"].references.append(("other.py", 3))
+
+    restored = Module.from_dict(module.to_dict())
+    assert restored.to_dict() == Module.from_dict(restored.to_dict()).to_dict()
+    assert restored.classes["A"].methods["run"].called_functions == ["os.getcwd"]
+    assert restored.classes["A"].attributes["size"].var_type == "int"
+    assert restored.classes["A"].nested_classes["Inner"] is restored.classes["Inner"]
+    assert restored.classes["A"].references == [("other.py", 3)]
+    assert restored.imports["os"].import_path == "os"
+    assert restored.variables["LIMIT"].is_constant
@@ -0,0 +1,194 @@
+"""
+Tests for the deduplicating backup store.
+"""
+import os
+import random
+
+import pytest
+
+from angela.components.execution.backup_store import BackupStore, BackupStoreError, find_chunk_boundary
+
+
+@pytest.fixture
+def store(tmp_path):
+    return BackupStore(tmp_path / "store", min_chunk_size=1024, max_chunk_size=8192, boundary_mask=0x1F, gc_every=0)
+
+
+def _text(lines, seed=0):
+    rng = random.Random(seed)
+    return "".join(f"line {i} {rng.random()}\n" for i in range(lines)).encode()
+
+
+def test_chunk_boundaries_are_content_defined():
+    """Test that an insertion only changes the chunks around it."""
+    data = _text(5000)
+
+    def chunks(blob):
+        out = []
+        while blob:
+            cut = find_chunk_boundary(blob, 1024, 8192, 0x1F)
+            out.append(blob[:cut])
+            blob = blob[cut:]
+        return out
+
+    original = chunks(data)
+    middle = len(data) // 2
+    edited = chunks(data[:middle] + b"inserted line\n" + data[middle:])
+    assert b"".join(edited) == data[:middle] + b"inserted line\n" + data[middle:]
+    assert all(1024 <= len(chunk) <= 8192 for chunk in original[:-1])
+    assert len(set(original) - set(edited)) <= 2
+    # Data without newlines is cut at the maximum size
+    assert find_chunk_boundary(b"x" * 10000, 1024, 8192, 0x1F) == 8192
+
+
+def test_file_snapshot_roundtrip(store, tmp_path):
+    """Test backing up and restoring a file with its mode and mtime."""
+    path = tmp_path / "data.txt"
+    path.write_bytes(_text(2000))
+    os.chmod(path, 0o640)
+    os.utime(path, (1_600_000_000, 1_600_000_000))
+    original = path.read_bytes()
+
+    manifest = store.snapshot(path)
+    assert store.is_manifest(manifest)
+    path.write_text("changed")
+
+    store.restore(manifest)
+    assert path.read_bytes() == original
+    assert (os.stat(path).st_mode & 0o777) == 0o640
+    assert os.stat(path).st_mtime == 1_600_000_000
+
+
+def test_repeated_snapshots_store_only_changed_chunks(store, tmp_path):
+    """Test that editing a large file costs only the changed chunks."""
+    path = tmp_path / "big.txt"
+    data = _text(20000)
+    path.write_bytes(data)
+    store.snapshot(path)
+    objects_before = store.stats()["objects"]
+
+    middle = len(data) // 2
+    path.write_bytes(data[:middle] + b"edited\n" + data[middle:])
+    second = store.snapshot(path)
+    assert store.stats()["objects"] - objects_before <= 2
+
+    store.snapshot(path)
+    assert store.stats()["objects"] - objects_before <= 2
+    store.restore(second, tmp_path / "restored.txt")
+    assert (tmp_path / "restored.txt").read_bytes() == path.read_bytes()
+
+
+def test_directory_snapshot_roundtrip(store, tmp_path):
+    """Test restoring a directory tree from its manifest."""
+    root = tmp_path / "project"
+    (root / "src" / "pkg").mkdir(parents=True)
+    (root / "src" / "pkg" / "mod.py").write_text("print('hi')\n")
+    (root / "README.md").write_text("# Project\n")
+    (root / "empty").mkdir()
+    os.symlink("README.md", root / "link")
+
+    manifest = store.snapshot(root, detach=True)
+    (root / "README.md").write_text("changed")
+    (root / "extra.txt").write_text("new")
+
+    store.restore(manifest)
+    assert (root / "src" / "pkg" / "mod.py").read_text() == "print('hi')\n"
+    assert (root / "README.md").read_text() == "# Project\n"
+    assert (root / "empty").is_dir()
+    assert os.readlink(root / "link") == "README.md"
+    assert not (root / "extra.txt").exists()
+
+
+def test_linked_large_file(tmp_path):
+    """Test that large files being deleted are hardlinked rather than copied."""
+    store = BackupStore(tmp_path / "store", link_threshold=1024, gc_every=0)
+    path = tmp_path / "large.bin"
+    path.write_bytes(os.urandom(4096))
+    original = path.read_bytes()
+
+    manifest = store.snapshot(path, detach=True)
+    entry = store.load_manifest(manifest)["entries"][0]
+    assert "object" in entry
+    path.unlink()
+
+    store.restore(manifest)
+    assert path.read_bytes() == original
+    # The restored file is a copy, so editing it cannot change the backup
+    path.write_bytes(b"edited")
+    store.restore(manifest, tmp_path / "again.bin")
+    assert (tmp_path / "again.bin").read_bytes() == original
+
+
+def test_detached_object_survives_failed_delete(tmp_path):
+    """Test that a hardlinked object is unshared when its file was not deleted."""
+    store = BackupStore(tmp_path / "store", link_threshold=1024, gc_every=0)
+    path = tmp_path / "large.bin"
+    original = os.urandom(4096)
+    path.write_bytes(original)
+
+    manifest = store.snapshot(path, detach=True)
+    # The deletion failed: the file is still there when the snapshot is finished
+    store.finish_detach(manifest)
+    digest = store.load_manifest(manifest)["entries"][0]["object"]
+    assert os.stat(store._object_path(digest, linked=True)).st_nlink == 1
+
+    with open(path, "r+b") as f:
+        f.write(b"edited in place")
+    store.restore(manifest, tmp_path / "restored.bin")
+    assert (tmp_path / "restored.bin").read_bytes() == original
+
+    # A file with other links is not hardlinked, since deleting it frees nothing
+    other = tmp_path / "shared.bin"
+    other.write_bytes(os.urandom(4096))
+    os.link(other, tmp_path / "shared-link.bin")
+    manifest = store.snapshot(other, detach=True)
+    assert os.stat(other).st_nlink == 2
+
+
+def test_gc_removes_unreferenced_objects(store, tmp_path, monkeypatch):
+    """Test retention and collection of objects no snapshot references."""
+    monkeypatch.setattr("angela.components.execution.backup_store.GC_GRACE_SECONDS", 0)
+    store.max_snapshots = 1
+    path = tmp_path / "file.txt"
+    path.write_bytes(_text(500, seed=1))
+    first = store.snapshot(path)
+    path.write_bytes(_text(500, seed=2))
+    second = store.snapshot(path)
+
+    result = store.gc()
+    assert result["manifests_removed"] == 1
+    assert result["objects_removed"] > 0
+    assert not first.exists()
+    store.restore(second, tmp_path / "restored.txt")
+    assert (tmp_path / "restored.txt").read_bytes() == path.read_bytes()
+
+    # Kept manifests survive the retention policy
+    third = store.snapshot(path)
+    assert store.gc(keep=[second])["manifests_removed"] == 0
+    assert second.exists() and third.exists()
+
+    with pytest.raises(BackupStoreError):
+        store.restore(first)
+
+
+def test_gc_keeps_snapshots_named_by_keep_sources(store, tmp_path):
+    """Test that snapshots still referenced elsewhere survive the retention policy."""
+    store.max_snapshots = 1
+    path = tmp_path / "file.txt"
+    snapshots = []
+    for seed in range(3):
+        path.write_bytes(_text(200, seed=seed))
+        snapshots.append(store.snapshot(path))
+
+    store.add_keep_source(lambda: [snapshots[0]])
+    assert store.gc()["manifests_removed"] == 1
+    assert snapshots[0].exists() and not snapshots[1].exists() and snapshots[2].exists()
+
+    # A source that fails keeps every snapshot
+    def failing():
+        raise OSError("history unavailable")
+
+    store.add_keep_source(failing)
+    path.write_bytes(_text(200, seed=3))
+    store.snapshot(path)
+    assert store.gc()["manifests_removed"] == 0
@@ -0,0 +1,98 @@
+"""
+Tests for the incremental context pipeline.
+"""
+import os
+
+import pytest
+
+from angela.components.context.pipeline import ContextPipeline, StageTimings
+
+
+@pytest.fixture
+def pipeline():
+    """Pipeline with the default stages replaced by counting test stages."""
+    pipeline = ContextPipeline()
+    pipeline._stages.clear()
+    pipeline._cache.clear()
+
+    state = {"version": 1, "calls": {}}
+
+    def counted(name, produce):
+        async def compute(context):
+            state["calls"][name] = state["calls"].get(name, 0) + 1
+            return produce(context)
+        return compute
+
+    pipeline.register_key("version", lambda context: state["version"])
+    pipeline.register_stage("base", counted("base", lambda c: {"cwd": os.getcwd()}), keys=("version",))
+    pipeline.register_stage("volatile", counted("volatile", lambda c: {"tick": True}))
+    pipeline.register_stage("derived", counted("derived", lambda c: {"derived": c["cwd"]}),
+                            keys=("version",), requires=("base",), lazy=True)
+    pipeline.state = state
+    return pipeline
+
+
+@pytest.mark.asyncio
+async def test_lazy_stages_not_built_eagerly(pipeline):
+    """Test that lazy stages are only evaluated when requested."""
+    evaluated = set()
+    context = await pipeline.build(evaluated)
+
+    assert "derived" not in context
+    assert evaluated == {"base", "volatile"}
+
+    await pipeline.complete(context, ["derived"], evaluated)
+    assert context["derived"] == os.getcwd()
+
+    # Already evaluated stages are not run again for the same context
+    await pipeline.complete(context, ["derived"], evaluated)
+    assert pipeline.state["calls"] == {"base": 1, "volatile": 1, "derived": 1}
+
+
+@pytest.mark.asyncio
+async def test_stages_recomputed_only_when_keys_change(pipeline):
+    """Test that cached stage output is reused until an invalidation key changes."""
+    for _ in range(3):
+        context = await pipeline.build()
+        await pipeline.complete(context, ["derived"])
+
+    calls = pipeline.state["calls"]
+    assert calls["base"] == 1
+    assert calls["derived"] == 1
+    # Stages without invalidation keys run on every request
+    assert calls["volatile"] == 3
+
+    pipeline.state["version"] = 2
+    await pipeline.build()
+    assert calls["base"] == 2
+
+    pipeline.invalidate("base")
+    await pipeline.build()
+    assert calls["base"] == 3
+
+
+@pytest.mark.asyncio
+async def test_stage_timings(pipeline):
+    """Test that stage durations and cache hits are recorded."""
+    await pipeline.build()
+
+    timings = StageTimings()
+    context = await pipeline.build(timings=timings)
+    with timings.stage("handle"):
+        await pipeline.complete(context, ["derived"], timings=timings)
+
+    stages = {stage["name"]: stage for stage in timings.as_dict()["stages"]}
+    assert stages["context.base"]["cached"] is True
+    assert stages["context.volatile"]["cached"] is False
+    assert stages["context.derived"]["cached"] is False
+    assert "handle" in stages
+    assert "context.base" in timings.summary()
+
+
+def test_unknown_invalidation_key(pipeline):
+    """Test that stages cannot depend on unregistered keys."""
+    async def compute(context):
+        return {}
+
+    with pytest.raises(ValueError):
+        pipeline.register_stage("bad", compute, keys=("no_such_key",))
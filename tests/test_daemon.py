@@ -0,0 +1,111 @@
+"""
+Tests for the resident daemon and its client.
+"""
+import asyncio
+import tempfile
+from pathlib import Path
+from unittest.mock import patch, AsyncMock, MagicMock
+
+import pytest
+
+from angela.components.monitoring import daemon_client
+from angela.components.monitoring.daemon import AngelaDaemon
+
+
+@pytest.fixture
+def socket_dir():
+    """Short temporary directory for Unix socket paths."""
+    with tempfile.TemporaryDirectory(dir="/tmp") as tmpdir:
+        yield Path(tmpdir)
+
+
+def test_notification_round_trip():
+    """Test encoding and decoding of notification datagrams."""
+    payload = daemon_client.encode_notification("post_exec", "git push", 1, 3)
+    assert payload == b"post_exec\0git push\x001\x003\0"
+
+    notification_type, args = daemon_client.decode_notification(payload)
+    assert notification_type == "post_exec"
+    assert args == ["git push", "1", "3"]
+
+    # Hand-written senders may omit the trailing NUL
+    assert daemon_client.decode_notification(b"dir_change\0/tmp") == ("dir_change", ["/tmp"])
+
+
+def test_send_without_daemon(socket_dir):
+    """Test that sending fails cleanly when no daemon is listening."""
+    assert daemon_client.send_notification("pre_exec", "ls", socket_path=socket_dir / "none.sock") is False
+    assert daemon_client.request_control("ping", socket_path=socket_dir / "none.ctl") is None
+
+
+@pytest.mark.asyncio
+async def test_daemon_dispatches_notifications(socket_dir):
+    """Test that datagrams reach the notification handler in order."""
+    daemon = AngelaDaemon(
+        socket_path=socket_dir / "a.sock",
+        control_path=socket_dir / "a.ctl",
+        pid_file=socket_dir / "a.pid",
+    )
+
+    handler = MagicMock()
+    handler.handle_notification = AsyncMock()
+
+    with patch("angela.api.monitoring.get_notification_handler", return_value=handler):
+        server = asyncio.create_task(daemon.serve(initialize=False))
+        for _ in range(50):
+            if daemon.is_running:
+                break
+            await asyncio.sleep(0.01)
+
+        assert daemon_client.send_notification("pre_exec", "make", socket_path=daemon.socket_path)
+        assert daemon_client.send_notification("post_exec", "make", 2, 5, socket_path=daemon.socket_path)
+
+        for _ in range(50):
+            if daemon.get_stats()["handled"] == 2:
+                break
+            await asyncio.sleep(0.01)
+
+        reply = await asyncio.to_thread(
+            daemon_client.request_control, "stats", 1.0, daemon.control_path
+        )
+        assert reply["ok"] is True
+        assert reply["stats"]["received"] == 2
+
+        daemon.request_shutdown()
+        await server
+
+    handler.handle_notification.assert_any_await("pre_exec", "make")
+    handler.handle_notification.assert_awaited_with("post_exec", "make", "2", "5")
+    assert not daemon.socket_path.exists()
+    assert not daemon.pid_file.exists()
+
+
+@pytest.mark.asyncio
+async def test_session_round_trip(socket_dir):
+    """Test that a session continued by a CLI process is handed back to the daemon."""
+    daemon = AngelaDaemon(
+        socket_path=socket_dir / "s.sock",
+        control_path=socket_dir / "s.ctl",
+        pid_file=socket_dir / "s.pid",
+    )
+    session_manager = MagicMock()
+    session_manager.get_context.return_value = {"recent_commands": ["ls"]}
+
+    with patch("angela.api.context.get_session_manager", return_value=session_manager), \
+            patch.object(daemon_client, "DAEMON_CONTROL_SOCKET_PATH", daemon.control_path):
+        server = asyncio.create_task(daemon.serve(initialize=False))
+        for _ in range(50):
+            if daemon.is_running:
+                break
+            await asyncio.sleep(0.01)
+
+        session = await asyncio.to_thread(daemon_client.fetch_session_context)
+        assert session == {"recent_commands": ["ls"]}
+
+        session["recent_commands"].append("git status")
+        assert await asyncio.to_thread(daemon_client.push_session_context, session)
+
+        daemon.request_shutdown()
+        await server
+
+    session_manager.load_context.assert_called_once_with({"recent_commands": ["ls", "git status"]})
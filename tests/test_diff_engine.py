@@ -0,0 +1,161 @@
+"""
+Tests for the diff engine.
+"""
+import difflib
+import os
+import random
+import time
+
+import pytest
+
+from angela.components.review.diff_engine import (
+    PatchError, apply_patch, apply_unified_diff, diff_opcodes, make_patch, split_lines, unified_diff
+)
+
+
+def _mutate(lines, rng, edits):
+    lines = list(lines)
+    for _ in range(edits):
+        op = rng.choice(["insert", "delete", "replace"])
+        pos = rng.randrange(len(lines) + 1)
+        if op == "insert" or not lines or pos == len(lines):
+            lines.insert(pos, f"new {rng.random()}\n")
+        elif op == "delete":
+            del lines[pos]
+        else:
+            lines[pos] = f"changed {rng.random()}\n"
+    return lines
+
+
+def _apply_opcodes(a, b, opcodes):
+    out = []
+    for tag, i1, i2, j1, j2 in opcodes:
+        out.extend(a[i1:i2] if tag == "equal" else b[j1:j2])
+    return out
+
+
+@pytest.mark.parametrize("seed", range(20))
+def test_opcodes_rebuild_target(seed):
+    """Test that opcodes cover both sequences and equal runs really match."""
+    rng = random.Random(seed)
+    a = [f"{rng.choice('abcde')}\n" for _ in range(rng.randrange(0, 80))]
+    b = _mutate(a, rng, rng.randrange(0, 15))
+    opcodes = diff_opcodes(a, b)
+    assert _apply_opcodes(a, b, opcodes) == b
+    for tag, i1, i2, j1, j2 in opcodes:
+        if tag == "equal":
+            assert a[i1:i2] == b[j1:j2]
+    # Never more changed lines than difflib reports
+    changed = sum(i2 - i1 + j2 - j1 for tag, i1, i2, j1, j2 in opcodes if tag != "equal")
+    reference = difflib.SequenceMatcher(None, a, b, autojunk=False).get_opcodes()
+    assert changed <= sum(i2 - i1 + j2 - j1 for tag, i1, i2, j1, j2 in reference if tag != "equal")
+
+
+def test_cost_limit_falls_back_to_replace():
+    """Test that a region too expensive to search is reported as replaced."""
+    a = [f"{i % 7}\n" for i in range(200)]
+    b = [f"{i % 5}\n" for i in range(200)]
+    opcodes = diff_opcodes(a, b, max_cost=10)
+    assert _apply_opcodes(a, b, opcodes) == b
+
+
+@pytest.mark.parametrize("seed", range(10))
+def test_unified_diff_roundtrip(seed):
+    """Test that generated unified diffs apply back to the modified content."""
+    rng = random.Random(seed)
+    original = "".join(f"line {i}\n" for i in range(200))
+    if seed % 2:
+        original = original.rstrip("\n")
+    modified = "".join(_mutate(split_lines(original), rng, 8))
+    diff = unified_diff(split_lines(original), split_lines(modified))
+    assert apply_unified_diff(original, diff) == modified
+
+
+def test_unified_diff_format_matches_difflib():
+    """Test the header and hunk format for a simple change."""
+    a = ["one\n", "two\n", "three\n"]
+    b = ["one\n", "2\n", "three\n"]
+    expected = "".join(difflib.unified_diff(a, b, fromfile="original", tofile="modified"))
+    assert unified_diff(a, b) == expected
+    assert unified_diff(a, a) == ""
+
+
+def test_apply_diff_with_shifted_line_numbers():
+    """Test that hunks are found when their header line numbers are off."""
+    original = "".join(f"line {i}\n" for i in range(50))
+    diff = "--- a\n+++ b\n@@ -10,3 +10,3 @@\n line 30\n-line 31\n+LINE 31\n line 32\n"
+    assert apply_unified_diff(original, diff) == original.replace("line 31\n", "LINE 31\n")
+    with pytest.raises(PatchError):
+        apply_unified_diff(original, "@@ -1,1 +1,1 @@\n-missing\n+x\n")
+
+
+def test_binary_patch_roundtrip():
+    """Test compact patches for text and binary content."""
+    rng = random.Random(1)
+    text = "".join(f"row {i}\n" for i in range(5000)).encode()
+    edited = text.replace(b"row 2500\n", b"row 2500 edited\n")
+    patch = make_patch(edited, text)
+    assert apply_patch(edited, patch) == text
+    assert len(patch) < 200
+
+    blob = bytes(rng.randrange(256) for _ in range(50000))
+    changed = blob[:20000] + b"\x00inserted\x00" + blob[20000:]
+    patch = make_patch(blob, changed)
+    assert apply_patch(blob, patch) == changed
+    assert len(patch) < len(changed) // 4
+
+    with pytest.raises(PatchError):
+        apply_patch(changed, patch)
+
+
+def test_large_input_is_fast():
+    """Test that a lockfile-sized diff with scattered edits stays fast."""
+    rng = random.Random(2)
+    a = [f"package-{i} == {rng.random()}\n" for i in range(50000)]
+    b = _mutate(a, rng, 50)
+    start = time.perf_counter()
+    diff = unified_diff(a, b)
+    elapsed = time.perf_counter() - start
+    assert apply_unified_diff("".join(a), diff) == "".join(b)
+    assert elapsed < 2.0
+
+
+@pytest.mark.asyncio
+async def test_content_rollback_uses_patch(tmp_path):
+    """Test that content changes are undone from a stored patch."""
+    from angela.components.execution.rollback import RollbackManager
+
+    manager = RollbackManager(tmp_path / "history.log", tmp_path / "transactions" / "journal.log")
+    path = tmp_path / "module.py"
+    original = "".join(f"def f{i}():\n    return {i}\n" for i in range(500))
+    modified = original.replace("return 250", "return -250")
+    path.write_text(modified)
+
+    operation_id = await manager.record_content_manipulation(path, original, modified)
+    record = manager._get_operation(operation_id)
+    assert "patch" in record.undo_info and "diff" not in record.undo_info
+
+    assert await manager.rollback_operation(operation_id)
+    assert path.read_text() == original
+
+
+@pytest.mark.asyncio
+async def test_content_rollback_uses_snapshot_for_rewrites(tmp_path, monkeypatch):
+    """Test that wholesale rewrites are undone from a backup snapshot."""
+    from angela.components.execution.backup_store import BackupStore
+    from angela.components.execution.rollback import RollbackManager
+
+    store = BackupStore(tmp_path / "store", gc_every=0)
+    monkeypatch.setattr("angela.components.execution.rollback.get_backup_store", lambda: store)
+    manager = RollbackManager(tmp_path / "history.log", tmp_path / "transactions" / "journal.log")
+    path = tmp_path / "notes.txt"
+    original = os.urandom(10000).hex()
+    modified = os.urandom(10000).hex()
+    path.write_text(modified)
+
+    operation_id = await manager.record_content_manipulation(path, original, modified)
+    record = manager._get_operation(operation_id)
+    assert store.is_manifest(record.undo_info["snapshot"])
+
+    assert await manager.rollback_operation(operation_id)
+    assert path.read_text() == original
@@ -0,0 +1,110 @@
+"""
+Tests for the event-driven file watcher.
+"""
+import asyncio
+from pathlib import Path
+
+import pytest
+
+from angela.components.monitoring.file_watcher import (
+    FileWatcher, FileChangeBatch, InotifyBackend, CREATED, MODIFIED, DELETED
+)
+
+
+async def _next_batch(queue: asyncio.Queue, timeout: float = 5.0) -> FileChangeBatch:
+    return await asyncio.wait_for(queue.get(), timeout=timeout)
+
+
+def test_batch_coalescing(tmp_path):
+    """Test that raw events are merged into a minimal batch."""
+    batch = FileChangeBatch(tmp_path)
+    a, b, c = tmp_path / "a.py", tmp_path / "b.py", tmp_path / "c.py"
+
+    batch.add(CREATED, a)
+    batch.add(MODIFIED, a)
+    batch.add(MODIFIED, b)
+    batch.add(DELETED, b)
+    batch.add(CREATED, c)
+    batch.add(DELETED, c)
+
+    assert batch.created == {a}
+    assert batch.modified == set()
+    assert batch.deleted == {b}
+
+    # Atomic save: delete followed by re-create is a modification
+    save = FileChangeBatch(tmp_path)
+    save.add(DELETED, a)
+    save.add(CREATED, a)
+    assert save.modified == {a} and not save.structure_changed
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("backend", ["inotify", "polling"])
+async def test_watcher_delivers_batches(tmp_path, backend):
+    """Test that changes below a watched root reach subscribers."""
+    if backend == "inotify" and not InotifyBackend.is_available():
+        pytest.skip("inotify is not available")
+
+    (tmp_path / "src").mkdir()
+    existing = tmp_path / "src" / "main.py"
+    existing.write_text("x = 1\n")
+
+    watcher = FileWatcher(debounce=0.05, max_latency=0.2, poll_interval=0.1, backend=backend)
+    batches: asyncio.Queue = asyncio.Queue()
+    watcher.subscribe(batches.put_nowait)
+
+    assert await watcher.watch(tmp_path) == backend
+    try:
+        await asyncio.sleep(0.05)
+        existing.write_text("x = 2\n")
+        (tmp_path / "src" / "new.py").write_text("")
+
+        received = FileChangeBatch(tmp_path.resolve())
+        while not ({Path(existing).resolve()} <= received.modified and received.created):
+            batch = await _next_batch(batches)
+            received.created |= batch.created
+            received.modified |= batch.modified
+
+        assert (tmp_path / "src" / "new.py").resolve() in received.created
+
+        # Files in new directories are reported too
+        (tmp_path / "pkg").mkdir()
+        (tmp_path / "pkg" / "mod.py").write_text("")
+        created = set()
+        while (tmp_path / "pkg" / "mod.py").resolve() not in created:
+            created |= (await _next_batch(batches)).created
+
+        # ...including trees moved in whole, which are scanned off the event loop
+        outside = tmp_path.parent / (tmp_path.name + "-outside")
+        (outside / "lib" / "sub").mkdir(parents=True)
+        (outside / "lib" / "sub" / "util.py").write_text("")
+        outside.joinpath("lib").rename(tmp_path / "lib")
+        moved = (tmp_path / "lib" / "sub" / "util.py").resolve()
+        while moved not in created:
+            created |= (await _next_batch(batches)).created
+    finally:
+        await watcher.stop()
+
+    assert not watcher.is_watching(tmp_path)
+
+
+@pytest.mark.asyncio
+async def test_subscriber_errors_are_isolated(tmp_path):
+    """Test that a failing subscriber does not prevent delivery to others."""
+    watcher = FileWatcher(debounce=0.01, max_latency=0.05, backend="polling", poll_interval=60)
+    batches: asyncio.Queue = asyncio.Queue()
+
+    def broken(batch):
+        raise RuntimeError("boom")
+
+    async def good(batch):
+        await batches.put(batch)
+
+    watcher.subscribe(broken)
+    watcher.subscribe(good)
+
+    watcher._on_event(tmp_path, MODIFIED, tmp_path / "a.py")
+    batch = await _next_batch(batches)
+
+    assert batch.modified == {tmp_path / "a.py"}
+    assert watcher.get_stats()["subscriber_errors"] == 1
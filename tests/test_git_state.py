@@ -0,0 +1,117 @@
+"""
+Tests for the batched, cached Git state provider.
+"""
+import os
+import subprocess
+
+import pytest
+
+from angela.components.context import git_state
+from angela.components.context.git_state import GitStateProvider, parse_status_v2, read_head
+
+GIT_ENV = dict(
+    os.environ,
+    GIT_AUTHOR_NAME="Test", GIT_AUTHOR_EMAIL="test@example.com",
+    GIT_COMMITTER_NAME="Test", GIT_COMMITTER_EMAIL="test@example.com",
+)
+
+
+def _git(repo, *args):
+    return subprocess.run(["git", *args], cwd=repo, env=GIT_ENV, check=True,
+                          capture_output=True, text=True).stdout
+
+
+@pytest.fixture
+def repo(tmp_path):
+    _git(tmp_path, "init", "-q", "-b", "main")
+    _git(tmp_path, "config", "user.name", "Test")
+    (tmp_path / "a.txt").write_text("a\n")
+    (tmp_path / "b.txt").write_text("b\n")
+    _git(tmp_path, "add", ".")
+    _git(tmp_path, "commit", "-q", "-m", "first")
+    return tmp_path
+
+
+def test_parse_status_v2():
+    output = "\0".join([
+        "# branch.oid 1234", "# branch.head main", "# branch.upstream origin/main", "# branch.ab +2 -1",
+        "1 .M N... 100644 100644 100644 aaa bbb src/my file.py",
+        "2 R. N... 100644 100644 100644 aaa aaa R100 new.py", "old.py",
+        "u UU N... 100644 100644 100644 100644 aaa bbb ccc both.py",
+        "? notes.txt", "",
+    ])
+    status = parse_status_v2(output)
+    assert (status["branch"], status["upstream"], status["ahead"], status["behind"]) == ("main", "origin/main", 2, 1)
+    assert [tuple(f) for f in status["files"]] == [
+        ("src/my file.py", ".", "M", None),
+        ("new.py", "R", ".", "old.py"),
+        ("both.py", "U", "U", None),
+        ("notes.txt", "?", "?", None),
+    ]
+
+
+@pytest.mark.asyncio
+async def test_state_of_repository(repo):
+    (repo / "a.txt").write_text("changed\n")
+    _git(repo, "stash", "-q")
+    (repo / "a.txt").write_text("changed again\n")
+    _git(repo, "mv", "b.txt", "c.txt")
+    (repo / "new.txt").write_text("new\n")
+
+    state = await GitStateProvider().get_state(repo)
+    assert state["is_git_repo"] and state["current_branch"] == "main"
+    assert state["head"] == _git(repo, "rev-parse", "HEAD").strip()
+    assert state["untracked_files"] == ["new.txt"]
+    assert state["modified_files"] == ["a.txt"]
+    assert state["staged_files"] == ["c.txt"]
+    assert state["stashes"] == [{"id": "0", "description": "WIP on main: " + _git(repo, "log", "-1", "--format=%h %s").strip()}]
+    assert state["remote_state"] == {"tracking": False, "upstream": None, "ahead": 0, "behind": 0}
+    assert [c["message"] for c in state["recent_commits"]] == ["first"]
+
+    assert (await GitStateProvider().get_state(repo.parent))["is_git_repo"] is False
+
+
+@pytest.mark.asyncio
+async def test_state_is_cached_until_index_changes(repo, monkeypatch):
+    provider = GitStateProvider(max_age=60)
+    first = await provider.get_state(repo)
+
+    calls = []
+    real_run_git = git_state.run_git
+
+    async def counting_run_git(root, *args, **kwargs):
+        calls.append(args[0])
+        return await real_run_git(root, *args, **kwargs)
+
+    monkeypatch.setattr(git_state, "run_git", counting_run_git)
+    assert await provider.get_state(repo) == first
+    assert calls == []
+
+    (repo / "d.txt").write_text("d\n")
+    _git(repo, "add", "d.txt")
+    os.utime(repo / ".git" / "index", ns=(0, os.stat(repo / ".git" / "index").st_mtime_ns + 10**9))
+    state = await provider.get_state(repo)
+    assert "status" in calls
+    assert state["staged_files"] == ["d.txt"]
+
+
+def test_read_head_from_packed_refs_and_detached(repo):
+    head = _git(repo, "rev-parse", "HEAD").strip()
+    _git(repo, "pack-refs", "--all")
+    assert not (repo / ".git" / "refs" / "heads" / "main").exists()
+    assert read_head(repo / ".git") == ("main", head)
+
+    _git(repo, "checkout", "-q", "--detach")
+    assert read_head(repo / ".git") == (None, head)
+
+
+@pytest.mark.asyncio
+async def test_details(repo):
+    _git(repo, "remote", "add", "origin", "https://example.com/repo.git")
+    _git(repo, "config", "pull.rebase", "true")
+    details = await GitStateProvider().get_details(repo)
+    assert details["remotes"] == {"origin": {"fetch": "https://example.com/repo.git",
+                                             "push": "https://example.com/repo.git"}}
+    assert details["branches"][0]["name"] == "main" and details["branches"][0]["is_current"]
+    assert details["config"] == {"user.name": "Test", "pull_strategy": "rebase"}
+    assert "first" in details["log_graph"]
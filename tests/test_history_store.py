@@ -0,0 +1,137 @@
+"""
+Tests for the SQLite command history store.
+"""
+import json
+import time
+
+import pytest
+
+from angela.components.context.history import HistoryManager
+from angela.components.context.history_store import HistoryStore, extract_base_command, tokenize_request
+
+
+@pytest.fixture
+def store(tmp_path):
+    store = HistoryStore(tmp_path / "history.db")
+    yield store
+    store.close()
+
+
+def _record(command, request="", success=True, error=None, n=0):
+    return {
+        "command": command,
+        "natural_request": request,
+        "success": success,
+        "timestamp": f"2026-01-01T00:00:{n % 60:02d}",
+        "output": None,
+        "error": error,
+        "risk_level": 0
+    }
+
+
+def test_base_command_and_tokens():
+    """Test the helpers shared with the history manager."""
+    assert extract_base_command("git commit -m 'x'") == "git commit"
+    assert extract_base_command("git --version") == "git"
+    assert extract_base_command("ls -la") == "ls"
+    assert extract_base_command("   ") == ""
+    assert tokenize_request("List the files, list them!") == ["files", "list", "the", "them"]
+
+
+def test_find_similar_returns_most_recent_match(store):
+    """Test similarity lookup against past requests."""
+    store.add_records([
+        _record("ls -la", "list all files here"),
+        _record("df -h", "show disk usage"),
+        _record("ls -lah", "list all the files here"),
+    ])
+    assert store.find_similar("list all files here") == "ls -lah"
+    assert store.find_similar("show the disk usage") == "df -h"
+    assert store.find_similar("compile the project") is None
+    assert store.find_similar("") is None
+
+
+def test_find_similar_matches_linear_scan(store):
+    """Test that the prefix-filtered lookup agrees with a full scan."""
+    words = ["list", "files", "show", "disk", "usage", "git", "status", "find", "large", "logs"]
+    records = []
+    for n in range(300):
+        request = " ".join(words[(n * k) % len(words)] for k in (1, 3, 7) if (n >> k) % 2 or k == 1)
+        records.append(_record(f"cmd{n}", request, n=n))
+    store.add_records(records)
+
+    def scan(request):
+        tokens = set(tokenize_request(request))
+        for record in reversed(records):
+            other = set(tokenize_request(record["natural_request"]))
+            if tokens and other and len(tokens & other) / len(tokens | other) > 0.6:
+                return record["command"]
+        return None
+
+    for query in ["list files", "show disk usage", "git status logs", "find large logs files", "usage"]:
+        assert store.find_similar(query) == scan(query)
+
+
+def test_aggregates_follow_trimming(store):
+    """Test that trimming removes old records from every aggregate."""
+    store.add_records([_record("git status", "status"), _record("ls -l", "list files"),
+                       _record("git status", "status")])
+    assert store.following_commands() == {"git status": ["ls"], "ls": ["git status"]}
+    assert store.common_flags("ls") == ["-l"]
+
+    store.add_records([_record("pwd", "where am i"), _record("pwd", "where am i")], max_items=2)
+    assert len(store) == 2
+    assert [r["command"] for r in store.recent(10)] == ["pwd", "pwd"]
+    assert store.following_commands() == {"pwd": ["pwd"]}
+    assert store.common_flags("ls") == []
+    assert store.find_similar("list files") is None
+    # Patterns outlive the records they were learned from
+    assert store.get_pattern("git status")["count"] == 2
+
+
+def test_error_fixes(store):
+    """Test pairing failed commands with the next successful one."""
+    store.add_records([
+        _record("npm start", success=False, error="Cannot find module x"),
+        _record("npm test", success=False, error="other"),
+        _record("npm install", success=True),
+        _record("make", success=False, error="Cannot find module y"),
+        *[_record("false", success=False) for _ in range(4)],
+        _record("true", success=True),
+    ])
+    assert store.find_error_fixes("Cannot find module") == [("npm start", "npm install")]
+
+
+def test_history_manager_migrates_json(tmp_path):
+    """Test moving the JSON history and patterns into the database."""
+    (tmp_path / "command_history.json").write_text(json.dumps([
+        _record("ls -la", "list all files"), _record("git push", "push my changes", success=False)
+    ]))
+    (tmp_path / "command_patterns.json").write_text(json.dumps({
+        "ls": {"base_command": "ls", "count": 7, "success_rate": 1.0, "last_used": "2026-01-01T00:00:00"}
+    }))
+
+    manager = HistoryManager(tmp_path / "command_history.db")
+    assert [r.command for r in manager.get_recent_commands()] == ["ls -la", "git push"]
+    assert manager.get_command_frequency("ls /tmp") == 7
+    assert manager.search_similar_command("list all the files") == "ls -la"
+    assert not (tmp_path / "command_history.json").exists()
+    assert (tmp_path / "command_patterns.json.migrated").exists()
+
+    manager.add_command("ls -l", "list files", success=False)
+    assert manager.get_command_frequency("ls") == 8
+    assert manager.get_command_success_rate("ls") == pytest.approx(7 / 8)
+
+
+def test_search_scales(store):
+    """Test that similarity lookup stays fast on a large history."""
+    vocabulary = [f"word{i}" for i in range(2000)]
+    store.add_records(
+        _record(f"cmd{n}", " ".join(vocabulary[(n * p) % len(vocabulary)] for p in (1, 7, 13, 31)), n=n)
+        for n in range(100_000)
+    )
+    store.find_similar("word1 word7 word13 word31")
+    start = time.perf_counter()
+    for n in range(100):
+        store.find_similar(f"word{n} word{n * 7} word{n * 13} unrelated")
+    assert (time.perf_counter() - start) / 100 < 0.01
@@ -0,0 +1,84 @@
+"""
+Tests for the offline LLM backends.
+"""
+import asyncio
+import json
+
+import pytest
+
+from angela.components.ai.backends import ReplayBackend, ReplayMissError, SyntheticBackend
+from angela.components.ai.client import GeminiClient, GeminiRequest
+from angela.components.ai.scheduler import RequestScheduler
+
+
+@pytest.fixture
+def fixtures(tmp_path):
+    path = tmp_path / "fixtures.jsonl"
+    path.write_text(json.dumps({"prompt": "list files in /tmp at 12:00", "response": "ls /tmp"}) + "\n")
+    return path
+
+
+def _client(backend):
+    client = GeminiClient(backend=backend)
+    client.response_cache = None
+    client.scheduler = RequestScheduler(requests_per_minute=0, tokens_per_minute=0)
+    return client
+
+
+def test_replay_matching(fixtures):
+    """Test exact and normalized prompt matching."""
+    backend = ReplayBackend(fixtures)
+    assert backend.generate_content("list files in /tmp at 12:00").text == "ls /tmp"
+    # Differences in whitespace and numbers still match the recording
+    assert backend.generate_content("list files  in /tmp at 13:45").text == "ls /tmp"
+    with pytest.raises(ReplayMissError):
+        backend.generate_content("something else")
+    assert (backend.hits, backend.misses) == (2, 1)
+
+
+def test_replay_records_misses(tmp_path):
+    """Test that misses are recorded from the source backend and persisted."""
+    path = tmp_path / "recorded.jsonl"
+    source = SyntheticBackend(latency=0, tokens_per_second=0, responder=lambda prompt: prompt.upper())
+    backend = ReplayBackend(path, record_from=source)
+
+    assert backend.generate_content("hello").text == "HELLO"
+    assert ReplayBackend(path).generate_content("hello").text == "HELLO"
+    assert source.calls == 1
+
+
+def test_synthetic_stream_chunks():
+    """Test that the synthetic backend streams the whole response."""
+    backend = SyntheticBackend(latency=0, tokens_per_second=0, responder=lambda prompt: "x" * 40, chunk_size=16)
+    chunks = list(backend.generate_content("prompt", stream=True))
+    assert [len(chunk.text) for chunk in chunks] == [16, 16, 8]
+
+
+@pytest.mark.asyncio
+async def test_client_runs_offline(fixtures):
+    """Test the full client path, including streaming, without the Gemini API."""
+    client = _client(ReplayBackend(fixtures))
+    response = await client.generate_text(GeminiRequest(prompt="list files in /tmp at 12:00"))
+    assert response.text == "ls /tmp"
+
+    client = _client(SyntheticBackend(latency=0, tokens_per_second=0))
+    chunks = [chunk async for chunk in client.generate_text_stream(GeminiRequest(prompt="anything"))]
+    assert json.loads("".join(chunks))["command"]
+    assert client.scheduler.stats()["completed"] == 1
+
+
+@pytest.mark.asyncio
+async def test_client_does_not_retry_replay_misses(fixtures, monkeypatch):
+    """Test that a replay miss fails at once instead of being retried."""
+    async def no_sleep(delay):
+        raise AssertionError(f"unexpected retry after {delay}s")
+
+    backend = ReplayBackend(fixtures)
+    client = _client(backend)
+    monkeypatch.setattr(asyncio, "sleep", no_sleep)
+    with pytest.raises(ReplayMissError):
+        await client.generate_text(GeminiRequest(prompt="delete everything"))
+    assert backend.misses == 1
+
+    with pytest.raises(ReplayMissError):
+        [chunk async for chunk in client.generate_text_stream(GeminiRequest(prompt="delete everything"))]
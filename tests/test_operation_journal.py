@@ -0,0 +1,203 @@
+"""
+Tests for the rollback history journals.
+"""
+import json
+
+import pytest
+
+from angela.components.execution.journal import INDEX_ENTRY, OperationLog, TransactionJournal
+
+
+def _op(n):
+    return {"operation_type": "command", "params": {"command": f"echo {n}"}}
+
+
+def test_append_and_read(tmp_path):
+    """Test appending operations and reading them back by ID."""
+    log = OperationLog(tmp_path / "ops.log")
+    assert [log.append(_op(n)) for n in range(5)] == [0, 1, 2, 3, 4]
+    assert len(log) == 5
+    assert log.get(3) == _op(3)
+    assert log.get(5) is None
+    assert log.read_range(3, 10) == [_op(3), _op(4)]
+    log.close()
+
+    reopened = OperationLog(tmp_path / "ops.log")
+    assert len(reopened) == 5
+    assert reopened.get(0) == _op(0)
+    reopened.close()
+
+
+def test_truncate(tmp_path):
+    """Test dropping operations after a rollback."""
+    log = OperationLog(tmp_path / "ops.log")
+    for n in range(5):
+        log.append(_op(n))
+    log.get(4)
+    log.truncate(2)
+    assert len(log) == 2
+    assert log.append(_op(9)) == 2
+    assert log.get(2) == _op(9)
+    log.close()
+
+    reopened = OperationLog(tmp_path / "ops.log")
+    assert reopened.read_range(0, 10) == [_op(0), _op(1), _op(9)]
+    reopened.close()
+
+
+def test_recovers_torn_tail(tmp_path):
+    """Test that an interrupted write is discarded on open."""
+    log = OperationLog(tmp_path / "ops.log")
+    for n in range(3):
+        log.append(_op(n))
+    log.close()
+    with open(tmp_path / "ops.log", "ab") as f:
+        f.write(b'{"id":3,"op":{"operation_ty')
+
+    reopened = OperationLog(tmp_path / "ops.log")
+    assert len(reopened) == 3
+    assert reopened.append(_op(3)) == 3
+    assert reopened.get(3) == _op(3)
+    reopened.close()
+
+
+@pytest.mark.parametrize("damage", ["missing", "short", "stale"])
+def test_rebuilds_index(tmp_path, damage):
+    """Test that the index is reconciled with the log."""
+    log = OperationLog(tmp_path / "ops.log")
+    for n in range(4):
+        log.append(_op(n))
+    log.close()
+    index_path = tmp_path / "ops.idx"
+    if damage == "missing":
+        index_path.unlink()
+    elif damage == "short":
+        # Crash after the log line was written but before its index entry
+        index_path.write_bytes(index_path.read_bytes()[:-INDEX_ENTRY.size - 3])
+    else:
+        # Crash between truncating the log and truncating the index
+        with open(tmp_path / "ops.log", "r+b") as f:
+            f.truncate(len(b"".join(f.readlines()[:2])))
+
+    reopened = OperationLog(tmp_path / "ops.log")
+    expected = 2 if damage == "stale" else 4
+    assert len(reopened) == expected
+    assert reopened.get(expected - 1) == _op(expected - 1)
+    assert index_path.stat().st_size == expected * INDEX_ENTRY.size
+    reopened.close()
+
+
+def test_shared_log(tmp_path):
+    """Test two handles (as in two processes) appending to the same log."""
+    a = OperationLog(tmp_path / "ops.log")
+    b = OperationLog(tmp_path / "ops.log")
+    assert a.append(_op("a0")) == 0
+    assert b.append(_op("b1")) == 1
+    assert a.append(_op("a2")) == 2
+    assert a.get(1) == _op("b1")
+    assert len(b) == 3 and b.get(2) == _op("a2")
+
+    b.truncate(1)
+    assert len(a) == 1
+    assert a.append(_op("a1")) == 1
+    assert b.read_range(0, 10) == [_op("a0"), _op("a1")]
+    a.close()
+    b.close()
+
+    reopened = OperationLog(tmp_path / "ops.log")
+    assert reopened.read_range(0, 10) == [_op("a0"), _op("a1")]
+    assert (tmp_path / "ops.idx").stat().st_size == 2 * INDEX_ENTRY.size
+    reopened.close()
+
+
+def test_shared_transaction_journal(tmp_path):
+    """Test that transactions recorded through another handle survive compaction."""
+    path = tmp_path / "txn.log"
+    a = TransactionJournal(path, compact_threshold=3)
+    b = TransactionJournal(path)
+    state = {"description": "", "timestamp": "2024-01-01T00:00:00", "status": "started"}
+    a.record({**state, "transaction_id": "A"})
+    b.record({**state, "transaction_id": "B1"})
+    for n in range(3):
+        a.record_operation("A", n)
+    b.record({**state, "transaction_id": "B2"})
+    b.record_operation("B1", 3)
+    assert sorted(a.transactions) == ["A", "B1", "B2"]
+    assert a.transactions["B1"]["operation_ids"] == [3]
+    a.close()
+    b.close()
+
+    reopened = TransactionJournal(path)
+    assert sorted(reopened.transactions) == ["A", "B1", "B2"]
+    assert reopened.transactions["A"]["operation_ids"] == [0, 1, 2]
+    reopened.close()
+
+
+def test_transaction_journal_prunes_finished(tmp_path):
+    """Test that compaction keeps only the most recent finished transactions."""
+    path = tmp_path / "txn.log"
+    journal = TransactionJournal(path, compact_threshold=1000, max_finished=2)
+    for n in range(4):
+        state = {"transaction_id": f"t{n}", "description": "", "timestamp": f"2024-01-0{n + 1}T00:00:00"}
+        journal.record({**state, "status": "started"})
+        if n != 1:
+            journal.record({**state, "status": "completed"})
+    journal.compact()
+    assert sorted(journal.transactions) == ["t1", "t2", "t3"]
+    journal.close()
+    assert sorted(TransactionJournal(path).transactions) == ["t1", "t2", "t3"]
+
+
+def test_transaction_journal_replay_and_compaction(tmp_path):
+    """Test replaying transaction state and compacting superseded entries."""
+    path = tmp_path / "txn.log"
+    journal = TransactionJournal(path, compact_threshold=10)
+    journal.record({"transaction_id": "t1", "description": "first", "status": "started", "operation_ids": []})
+    journal.record_operation("t1", 0)
+    journal.record_operation("t1", 1)
+    journal.record({"transaction_id": "t1", "description": "first", "status": "completed", "operation_ids": []})
+    journal.close()
+
+    replayed = TransactionJournal(path, compact_threshold=10)
+    assert replayed.transactions["t1"]["status"] == "completed"
+    assert replayed.transactions["t1"]["operation_ids"] == [0, 1]
+
+    for n in range(2, 12):
+        replayed.record_operation("t1", n)
+    # Compacted into a checkpoint once 10 entries were superseded, then appended to
+    lines = path.read_text().splitlines()
+    assert len(lines) == 4
+    assert json.loads(lines[0])["txn"]["operation_ids"] == list(range(9))
+    replayed.close()
+
+    assert TransactionJournal(path).transactions["t1"]["operation_ids"] == list(range(12))
+
+
+@pytest.mark.asyncio
+async def test_rollback_manager_uses_journal(tmp_path):
+    """Test recording operations and migrating the legacy JSON history."""
+    from angela.components.execution.rollback import RollbackManager
+
+    legacy = [
+        {"operation_type": "command", "params": {"command": "touch a"}, "timestamp": "2024-01-01T00:00:00",
+         "backup_path": None, "transaction_id": None, "step_id": None, "undo_info": {}},
+    ]
+    (tmp_path / "operation_history.json").write_text(json.dumps(legacy))
+    (tmp_path / "transactions").mkdir()
+
+    manager = RollbackManager(tmp_path / "operation_history.log", tmp_path / "transactions" / "journal.log")
+    transaction_id = await manager.start_transaction("test")
+    operation_id = await manager.record_operation(
+        "command", {"command": "mkdir b"}, transaction_id=transaction_id
+    )
+    await manager.end_transaction(transaction_id)
+    assert operation_id == 1
+    assert not (tmp_path / "operation_history.json").exists()
+
+    recent = await manager.get_recent_operations(limit=5)
+    assert [op["id"] for op in recent] == [1, 0]
+    assert recent[0]["transaction"]["status"] == "completed"
+
+    reopened = RollbackManager(tmp_path / "operation_history.log", tmp_path / "transactions" / "journal.log")
+    assert reopened._transactions[transaction_id].operation_ids == [1]
+    assert len(await reopened.get_recent_operations(limit=5)) == 2
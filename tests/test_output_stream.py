@@ -0,0 +1,106 @@
+"""
+Tests for streaming command output with bounded retention.
+"""
+import asyncio
+import os
+import sys
+import time
+
+import pytest
+
+from angela.components.execution.output_stream import CommandOutputStream, OutputBuffer, remove_expired_spills
+
+WRITER = "import sys\nfor i in range({lines}):\n    sys.stdout.write('line %07d\\n' % i)\nsys.stderr.write('done')"
+
+
+async def _start(lines, **kwargs):
+    process = await asyncio.create_subprocess_exec(
+        sys.executable, "-c", WRITER.format(lines=lines),
+        stdout=asyncio.subprocess.PIPE, stderr=asyncio.subprocess.PIPE
+    )
+    return CommandOutputStream(process, **kwargs)
+
+
+def test_buffer_keeps_head_and_tail():
+    buffer = OutputBuffer(max_bytes=40)
+    for i in range(100):
+        buffer.write(b"%03d\n" % i)
+    assert buffer.total_bytes == 400
+    assert buffer.dropped_bytes == 360
+    value = buffer.getvalue()
+    assert value.startswith(b"000\n001\n")
+    assert value.endswith(b"097\n098\n099\n")
+    assert b"[... 360 bytes omitted ...]" in value
+
+    small = OutputBuffer(max_bytes=40)
+    small.write(b"short")
+    assert small.text() == "short" and not small.truncated
+
+
+def test_buffer_spills_complete_stream(tmp_path):
+    buffer = OutputBuffer(max_bytes=16, spill=True, spill_dir=str(tmp_path), name="stdout")
+    data = b"".join(b"%04d," % i for i in range(1000))
+    for i in range(0, len(data), 7):
+        buffer.write(data[i:i + 7])
+    buffer.close()
+    assert buffer.spill_path and os.path.dirname(buffer.spill_path) == str(tmp_path)
+    assert open(buffer.spill_path, "rb").read() == data
+    assert buffer.spill_path in buffer.text()
+    assert len(buffer.getvalue()) < 200
+
+
+def test_expired_spill_files_are_removed(tmp_path):
+    buffers = [OutputBuffer(max_bytes=4, spill=True, spill_dir=str(tmp_path), name=name)
+               for name in ("stdout", "stderr", "stdout")]
+    for buffer in buffers:
+        buffer.write(b"more than four bytes")
+        buffer.close()
+    unrelated = tmp_path / "angela-notes.log"
+    unrelated.write_text("")
+    old = time.time() - 3 * 86400
+    for path in (buffers[0].spill_path, buffers[1].spill_path, unrelated):
+        os.utime(path, (old, old))
+
+    assert remove_expired_spills(str(tmp_path), retention_days=2) == 2
+    assert sorted(os.listdir(tmp_path)) == sorted(["angela-notes.log", os.path.basename(buffers[2].spill_path)])
+
+
+@pytest.mark.asyncio
+async def test_stream_yields_all_output_and_retains_bounded():
+    stream = await _start(20000, max_retained_bytes=4096)
+    streamed = {"stdout": 0, "stderr": 0}
+    text = []
+    async for chunk in stream:
+        streamed[chunk.stream] += len(chunk.data)
+        if chunk.stream == "stdout":
+            text.append(chunk.text)
+    assert await stream.wait() == 0
+
+    assert streamed == {"stdout": 20000 * 13, "stderr": 4}
+    assert "".join(text).splitlines()[-1] == "line 0019999"
+    assert stream.stdout.total_bytes == 20000 * 13
+    assert len(stream.stdout.getvalue()) < 4096 + 100
+    assert stream.stdout.text().endswith("line 0019999\n")
+    assert stream.stderr.text() == "done"
+
+
+@pytest.mark.asyncio
+async def test_slow_consumer_holds_command_back():
+    stream = await _start(200000, queue_chunks=2, read_size=1024)
+    first = await stream.__anext__()
+    await asyncio.sleep(0.5)
+    # The pipes stop being read while the queue is full, so the writer blocks
+    assert stream._queue.qsize() <= 2
+    assert stream.process.returncode is None
+    assert first.stream == "stdout"
+
+    assert await stream.wait() == 0
+    assert stream.stdout.total_bytes == 200000 * 13
+
+
+@pytest.mark.asyncio
+async def test_finished_stream():
+    stream = CommandOutputStream.finished("[DRY RUN] Would execute: ls", "", 0)
+    assert [chunk.text async for chunk in stream] == ["[DRY RUN] Would execute: ls"]
+    assert await stream.wait() == 0
+    assert stream.stdout.text() == "[DRY RUN] Would execute: ls"
@@ -0,0 +1,261 @@
+"""
+Tests for the persistent project file index.
+"""
+import asyncio
+import gc
+import os
+import threading
+import time
+import weakref
+
+import pytest
+
+from angela.components.context.project_index import ProjectIndex, ProjectIndexManager
+
+
+@pytest.fixture
+def project(tmp_path):
+    """Small project tree with source, test, vendored and build files."""
+    root = tmp_path / "project"
+    (root / "pkg").mkdir(parents=True)
+    (root / "tests" / "unit").mkdir(parents=True)
+    (root / "node_modules" / "lib").mkdir(parents=True)
+    (root / "build").mkdir()
+    (root / ".github").mkdir()
+
+    (root / "setup.py").write_text("")
+    (root / "pkg" / "__init__.py").write_text("")
+    (root / "pkg" / "main.py").write_text("print('hi')")
+    (root / "tests" / "unit" / "test_main.py").write_text("")
+    (root / "node_modules" / "lib" / "index.js").write_text("")
+    (root / "build" / "main.py").write_text("")
+    (root / ".github" / "ci.yml").write_text("")
+    (root / "notes.log").write_text("")
+    (root / ".gitignore").write_text("*.log\n")
+    return root
+
+
+@pytest.fixture
+def storage(tmp_path):
+    return tmp_path / "index"
+
+
+def _rel(index, paths):
+    return sorted(p.relative_to(index.root).as_posix() for p in paths)
+
+
+def test_initial_scan(project, storage):
+    """Test that a full scan indexes files and applies ignore rules."""
+    index = ProjectIndex(project, storage_dir=storage)
+    assert index.refresh() is True
+
+    # Pruned directories are never indexed
+    assert index.get("node_modules/lib/index.js") is None
+
+    # Build output, hidden directories and .gitignore matches are marked ignored
+    assert index.get("build/main.py").ignored
+    assert index.get(".github/ci.yml").ignored
+    assert index.get("notes.log").ignored
+    assert not index.get("pkg/main.py").ignored
+
+    assert _rel(index, index.glob("**/*.py")) == [
+        "pkg/__init__.py", "pkg/main.py", "setup.py", "tests/unit/test_main.py"
+    ]
+    assert _rel(index, index.glob("*.py")) == ["setup.py"]
+    assert _rel(index, index.glob("**/tests/**/*.py")) == ["tests/unit/test_main.py"]
+    assert _rel(index, index.find_by_name("main.py", include_ignored=True)) == ["build/main.py", "pkg/main.py"]
+    assert index.count_by_extension() == {".py": 4}
+
+
+def test_incremental_refresh(project, storage):
+    """Test that only changed directories are rescanned."""
+    index = ProjectIndex(project, storage_dir=storage)
+    index.refresh()
+    generation = index.generation
+
+    assert index.refresh() is False
+    assert index.generation == generation
+
+    (project / "pkg" / "util.py").write_text("")
+    (project / "tests" / "unit" / "test_main.py").unlink()
+    assert index.refresh() is True
+    assert index.generation > generation
+    assert index.get("pkg/util.py") is not None
+    assert index.get("tests/unit/test_main.py") is None
+
+    # Removing a whole subtree drops all of its entries
+    (project / "pkg" / "util.py").unlink()
+    (project / "pkg" / "main.py").unlink()
+    (project / "pkg" / "__init__.py").unlink()
+    (project / "pkg").rmdir()
+    index.refresh()
+    assert not list(index.iter_files(under="pkg"))
+
+
+def test_in_place_modification(project, storage):
+    """Test that file content changes are picked up by stat_files or update_paths."""
+    index = ProjectIndex(project, storage_dir=storage)
+    index.refresh()
+
+    target = project / "pkg" / "main.py"
+    target.write_text("print('a much longer body')")
+    os.utime(target, (time.time() + 10, time.time() + 10))
+
+    assert index.update_paths([target]) is True
+    assert index.get(target).size == target.stat().st_size
+
+    target.write_text("x")
+    assert index.refresh(stat_files=True) is True
+    assert index.get(target).size == 1
+
+
+def test_persistence(project, storage):
+    """Test that a new index instance starts from the saved snapshot."""
+    first = ProjectIndex(project, storage_dir=storage)
+    first.refresh()
+    assert first.storage_path.exists()
+
+    second = ProjectIndex(project, storage_dir=storage)
+    assert second.load() is True
+    assert second.file_count == first.file_count
+    # Nothing changed on disk, so the loaded snapshot is already current
+    assert second.refresh() is False
+
+
+def test_gitignore_change_rebuilds(project, storage):
+    """Test that editing .gitignore re-evaluates ignore status."""
+    index = ProjectIndex(project, storage_dir=storage)
+    index.refresh()
+    assert index.get("notes.log").ignored
+
+    (project / ".gitignore").write_text("pkg/\n")
+    os.utime(project / ".gitignore", (time.time() + 10, time.time() + 10))
+    index.refresh()
+    assert not index.get("notes.log").ignored
+    assert index.get("pkg/main.py").ignored
+
+
+def test_ignore_status_change_rescans_subtree(project, storage):
+    """Test that a directory becoming ignored re-evaluates everything below it."""
+    (project / "tests" / "unit" / "deep").mkdir()
+    (project / "tests" / "unit" / "deep" / "test_deep.py").write_text("")
+    index = ProjectIndex(project, storage_dir=storage)
+    index.refresh()
+    assert not index.get("tests/unit/deep/test_deep.py").ignored
+
+    index._gitignore_patterns = ["tests/"]
+    os.utime(project / "tests", (time.time() + 10, time.time() + 10))
+    index.refresh()
+    assert index.get("tests/unit/test_main.py").ignored
+    assert index.get("tests/unit/deep/test_deep.py").ignored
+
+
+def test_snapshot_written_only_when_changed(project, storage):
+    """Test that refreshes rewrite the snapshot only when the index changed."""
+    index = ProjectIndex(project, storage_dir=storage)
+    index.refresh()
+    assert not index.dirty
+    written = index.storage_path.stat().st_mtime_ns
+
+    index.last_refresh = 0.0
+    assert index.refresh() is False
+    assert index.storage_path.stat().st_mtime_ns == written
+
+    # Changes within the save interval are deferred, then flushed by save()
+    (project / "pkg" / "extra.py").write_text("")
+    assert index.refresh() is True
+    assert index.dirty and index.storage_path.stat().st_mtime_ns == written
+    index.save()
+    assert not index.dirty
+    reloaded = ProjectIndex(project, storage_dir=storage)
+    assert reloaded.load() and reloaded.get("pkg/extra.py")
+
+
+def test_manager_shares_indexes(project, storage):
+    """Test that the manager returns one index per root and throttles refreshes."""
+    manager = ProjectIndexManager(refresh_interval=60, storage_dir=storage)
+    index = manager.get_index(project)
+    assert manager.get_index(str(project)) is index
+
+    (project / "new.py").write_text("")
+    assert manager.get_index(project).get("new.py") is None
+
+    manager.notify_changes([project / "new.py"])
+    assert index.get("new.py") is not None
+
+    (project / "other.py").write_text("")
+    manager.invalidate(project)
+    assert manager.get_index(project).get("other.py") is not None
+
+
+def test_exit_hook_does_not_keep_indexes_alive(project, storage):
+    """Test that discarded indexes are collected instead of being held for the exit save."""
+    index = ProjectIndex(project, storage_dir=storage)
+    ref = weakref.ref(index)
+    del index
+    gc.collect()
+    assert ref() is None
+
+
+def test_async_access_refreshes_off_the_event_loop(project, storage, monkeypatch):
+    """Test that async callers get the shared index, refreshed on a worker thread."""
+    manager = ProjectIndexManager(refresh_interval=60, storage_dir=storage)
+    refresh_threads = []
+    original = ProjectIndex.refresh
+
+    def refresh(self, *args, **kwargs):
+        refresh_threads.append(threading.current_thread())
+        return original(self, *args, **kwargs)
+
+    async def access():
+        first = await manager.get_index_async(project)
+        second = await manager.get_index_async(project)
+        return first, second
+
+    monkeypatch.setattr(ProjectIndex, "refresh", refresh)
+    first, second = asyncio.run(access())
+    assert first is second is manager.get_index(project)
+    assert first.get("pkg/main.py") is not None
+    assert len(refresh_threads) == 1 and refresh_threads[0] is not threading.main_thread()
+
+
+def test_search_paths(project, storage):
+    """Test fuzzy path search and its incremental updates."""
+    index = ProjectIndex(project, storage_dir=storage)
+    index.refresh()
+
+    assert index.search_paths("main.py")[0].path == "pkg/main.py"
+    assert index.search_paths("tst_main")[0].path == "tests/unit/test_main.py"
+    assert "build/main.py" not in [c.path for c in index.search_paths("main.py")]
+    assert "build/main.py" in [c.path for c in index.search_paths("main.py", include_ignored=True)]
+    assert [c.path for c in index.search_paths("unit/", directories=True)][:1] == ["tests/unit"]
+    in_pkg = [c.path for c in index.search_paths("main.py", under="pkg")]
+    assert in_pkg[0] == "pkg/main.py" and all(p.startswith("pkg/") for p in in_pkg)
+
+    # Directory parts of the reference favour paths under similar directories
+    (project / "tests" / "unit" / "main.py").write_text("")
+    index.refresh()
+    assert index.search_paths("tests/main.py")[0].path == "tests/unit/main.py"
+
+    (project / "pkg" / "main.py").unlink()
+    index.refresh()
+    assert [c.path for c in index.search_paths("main.py")][:2] == ["tests/unit/main.py", "tests/unit/test_main.py"]
+
+
+def test_glob_uses_name_trigrams(project, storage):
+    """Test that narrowed globs match the same files as a full scan."""
+    index = ProjectIndex(project, storage_dir=storage)
+    index.refresh()
+    for pattern in ["**/*main*", "**/main.py", "pkg/*.py", "**/test_*.py", "*.py", "**/*ai?.py", "**/[ms]*.py"]:
+        assert index._paths().glob_candidates(pattern) is not None or "?" in pattern
+        expected = sorted(p.relative_to(project).as_posix() for p in project.glob(pattern)
+                          if p.is_file() and "node_modules" not in p.parts and "build" not in p.parts
+                          and not p.name.endswith(".log"))
+        assert _rel(index, index.glob(pattern)) == expected
+
+    # Directories match too when asked for, as with Path.glob
+    for pattern in ["**/unit", "**/*", "tests/*", "**/pk?"]:
+        expected = sorted(p.relative_to(project).as_posix() for p in project.glob(pattern)
+                          if not {"node_modules", "build", ".github"} & set(p.parts)
+                          and not p.name.endswith(".log"))
+        assert _rel(index, index.glob(pattern, directories=True)) == expected
@@ -0,0 +1,50 @@
+"""
+Tests for the precompiled request classifier.
+"""
+import pytest
+
+from angela.components.intent.request_classifier import request_classifier
+
+
+@pytest.mark.parametrize("request_text, expected", [
+    ("set up ci pipeline with github actions", "ci_cd_pipeline"),
+    ("use the aws cli to list buckets", "universal_cli"),
+    ("use the angela command", "command"),
+    ("complex workflow to build and deploy", "complex_workflow"),
+    ("git status", "universal_cli"),
+    ("push with git then deploy with docker", "universal_cli"),
+    ("install packages via npm and build the docker image after", "complex_workflow"),
+    ("create a new project for a todo list app", "code_generation"),
+    ("add a new feature for user login", "feature_addition"),
+    ("install dependencies", "toolchain_operation"),
+    ("refine the code in main.py", "code_refinement"),
+    ("analyze the architecture", "code_architecture"),
+    ("define a new workflow called deploy", "workflow"),
+    ("run the workflow deploy", "run_workflow"),
+    ("stop the container named web", "toolchain_operation"),
+    ("summarize the content of the file README.md", "file_content"),
+    ("summarize the content of README.md", "command"),
+    ("create a backup folder and then copy the logs", "multi_step"),
+    ("list all python files larger than 1MB", "command"),
+])
+def test_classify(request_text, expected):
+    """Test that rule priority matches the orchestrator's routing order."""
+    assert request_classifier.classify(request_text) == expected
+
+
+def test_case_insensitive():
+    """Test that keyword prefiltering does not change case-insensitive matching."""
+    assert request_classifier.classify("SET UP a CI pipeline") == "ci_cd_pipeline"
+    assert request_classifier.classify("Refactor The Code") == "code_refinement"
+
+
+@pytest.mark.parametrize("request_text, expected", [
+    ("make a new file called notes.txt", "create"),
+    ("show me the contents of log.txt", "read"),
+    ("rename foo to bar", "modify"),
+    ("inspect the logs", "analyze"),
+    ("hello", "unknown"),
+])
+def test_quick_intent(request_text, expected):
+    """Test the quick intent categories and their priority."""
+    assert request_classifier.quick_intent(request_text) == expected
@@ -0,0 +1,125 @@
+"""
+Tests for the LLM request scheduler.
+"""
+import asyncio
+
+import pytest
+
+from angela.components.ai.scheduler import (
+    Priority, RequestScheduler, TokenBucket, is_rate_limit_error, llm_priority
+)
+
+
+class ResourceExhausted(Exception):
+    """Stand-in for the API client's 429 error."""
+
+
+def test_token_bucket_delay():
+    """Test that an empty bucket reports the refill time."""
+    bucket = TokenBucket(per_minute=60)
+    assert bucket.delay(60) == 0
+    bucket.consume(60)
+    assert bucket.delay(1) == pytest.approx(1.0, abs=0.05)
+    # Oversized requests wait for a full bucket instead of forever
+    assert bucket.delay(1000) <= 60.0
+    assert TokenBucket(per_minute=0).delay(10 ** 9) == 0
+
+
+def test_rate_limit_detection():
+    """Test recognising quota errors."""
+    assert is_rate_limit_error(ResourceExhausted("quota"))
+    assert is_rate_limit_error(RuntimeError("429 Too Many Requests"))
+    assert not is_rate_limit_error(ValueError("Prompt blocked"))
+
+
+@pytest.mark.asyncio
+async def test_concurrency_is_bounded():
+    """Test that no more than max_concurrency calls run at once."""
+    scheduler = RequestScheduler(max_concurrency=3, requests_per_minute=0, tokens_per_minute=0)
+    running = 0
+    peak = 0
+
+    async def call():
+        nonlocal running, peak
+        running += 1
+        peak = max(peak, running)
+        await asyncio.sleep(0.01)
+        running -= 1
+        return True
+
+    results = await asyncio.gather(*(scheduler.run(call) for _ in range(12)))
+    assert all(results)
+    assert peak == 3
+    stats = scheduler.stats()
+    assert stats["completed"] == 12
+    assert stats["max_queue_depth"] >= 9
+    assert stats["queue_depth"] == 0
+
+
+@pytest.mark.asyncio
+async def test_interactive_dispatched_before_background():
+    """Test that a later interactive call overtakes queued background calls."""
+    scheduler = RequestScheduler(max_concurrency=1, requests_per_minute=0, tokens_per_minute=0)
+    order = []
+    gate = asyncio.Event()
+
+    async def call(name):
+        order.append(name)
+        if name == "first":
+            await gate.wait()
+
+    first = asyncio.create_task(scheduler.run(lambda: call("first")))
+    await asyncio.sleep(0)
+    with llm_priority(Priority.BACKGROUND):
+        background = [asyncio.create_task(scheduler.run(lambda i=i: call(f"bg{i}"))) for i in range(3)]
+    await asyncio.sleep(0)
+    interactive = asyncio.create_task(scheduler.run(lambda: call("interactive"), priority=Priority.INTERACTIVE))
+    await asyncio.sleep(0)
+
+    assert scheduler.stats()["queue_depth_by_priority"]["background"] == 3
+    gate.set()
+    await asyncio.gather(first, interactive, *background)
+    assert order == ["first", "interactive", "bg0", "bg1", "bg2"]
+
+
+@pytest.mark.asyncio
+async def test_rate_limit_backoff_and_retry():
+    """Test that 429s shrink concurrency, back off and are retried."""
+    scheduler = RequestScheduler(
+        max_concurrency=4, requests_per_minute=0, tokens_per_minute=0, base_backoff=0.01, max_backoff=0.05
+    )
+    attempts = 0
+
+    async def call():
+        nonlocal attempts
+        attempts += 1
+        if attempts <= 2:
+            raise ResourceExhausted("429 quota exceeded")
+        return "ok"
+
+    assert await scheduler.run(call) == "ok"
+    stats = scheduler.stats()
+    assert stats["rate_limited"] == 2
+    assert stats["retries"] == 2
+    # Halved twice, then one slot back for the successful attempt
+    assert stats["concurrency_limit"] == 2
+
+    # Further successful calls grow the limit back to the maximum
+    for _ in range(10):
+        await scheduler.run(lambda: asyncio.sleep(0))
+    assert scheduler.stats()["concurrency_limit"] == 4
+
+
+@pytest.mark.asyncio
+async def test_gives_up_after_max_retries():
+    """Test that persistent rate limiting is eventually reported."""
+    scheduler = RequestScheduler(
+        requests_per_minute=0, tokens_per_minute=0, max_retries=1, base_backoff=0.01, max_backoff=0.01
+    )
+
+    async def call():
+        raise ResourceExhausted("429")
+
+    with pytest.raises(ResourceExhausted):
+        await scheduler.run(call)
+    assert scheduler.stats()["rate_limited"] == 2
@@ -0,0 +1,133 @@
+"""
+Tests for the content-addressed AI response cache.
+"""
+import asyncio
+import os
+import time
+
+import pytest
+
+from angela.components.ai.response_cache import ResponseCache
+
+
+@pytest.fixture
+def cache(tmp_path):
+    return ResponseCache(storage_dir=tmp_path / "responses", ttl=60, max_entries=10)
+
+
+def _key(prompt="prompt", temperature=0.0, max_tokens=100, safety="permissive"):
+    return ResponseCache.make_key("model", prompt, temperature, max_tokens, safety)
+
+
+def test_key_covers_request_parameters():
+    """Test that every parameter that changes the output changes the key."""
+    base = _key()
+    assert _key() == base
+    assert _key(prompt="other") != base
+    assert _key(temperature=0.4) != base
+    assert _key(max_tokens=200) != base
+    assert _key(safety="api_default") != base
+    assert ResponseCache.make_key("other-model", "prompt", 0.0, 100, "permissive") != base
+
+
+def test_hits_misses_and_persistence(cache, tmp_path):
+    """Test counters and that entries are shared through the disk store."""
+    key = _key()
+    assert cache.get(key) is None
+    cache.put(key, {"text": "hello"})
+    assert cache.get(key) == {"text": "hello"}
+    assert cache.stats()["hits"] == 1
+    assert cache.stats()["misses"] == 1
+
+    # A second instance (another process) reads the same store
+    other = ResponseCache(storage_dir=tmp_path / "responses", ttl=60)
+    assert other.get(key) == {"text": "hello"}
+    assert other.stats()["disk_hits"] == 1
+
+
+def test_ttl_expiry(cache, tmp_path):
+    """Test that expired entries are treated as misses and removed."""
+    key = _key()
+    cache.put(key, {"text": "old"})
+
+    other = ResponseCache(storage_dir=tmp_path / "responses", ttl=0)
+    time.sleep(0.01)
+    assert other.get(key) is None
+    assert not cache._path(key).exists()
+
+
+def test_size_eviction(cache):
+    """Test that pruning keeps the newest entries within max_entries."""
+    keys = [_key(prompt=str(i)) for i in range(15)]
+    now = time.time()
+    for i, key in enumerate(keys):
+        cache.put(key, {"text": str(i)})
+        os.utime(cache._path(key), (now - 30 + i, now - 30 + i))
+
+    cache.prune()
+    remaining = [key for key in keys if cache._path(key).exists()]
+    assert remaining == keys[-10:]
+    assert cache.stats()["evictions"] >= 5
+
+
+def test_eviction_is_least_recently_used(cache, tmp_path):
+    """Test that a hit keeps an old entry from being evicted before newer unused ones."""
+    writer = ResponseCache(storage_dir=tmp_path / "responses", ttl=60, max_entries=100)
+    keys = [_key(prompt=str(i)) for i in range(15)]
+    now = time.time()
+    for i, key in enumerate(keys):
+        writer.put(key, {"text": str(i)})
+        os.utime(writer._path(key), (now - 30 + i, now - 30 + i))
+
+    assert cache.get(keys[0]) == {"text": "0"}
+    # Memory hits count as uses too
+    assert cache.get(keys[0]) == {"text": "0"}
+    cache.prune()
+    remaining = [key for key in keys if cache._path(key).exists()]
+    assert remaining == [keys[0]] + keys[-9:]
+
+
+@pytest.mark.asyncio
+async def test_inflight_deduplication(cache):
+    """Test that concurrent identical requests generate the response once."""
+    key = _key()
+    calls = []
+
+    async def generate():
+        async with cache.inflight(key):
+            cached = cache.get(key, record_stats=False)
+            if cached is not None:
+                return cached
+            calls.append(1)
+            await asyncio.sleep(0.01)
+            payload = {"text": "generated"}
+            cache.put(key, payload)
+            return payload
+
+    results = await asyncio.gather(*(generate() for _ in range(5)))
+    assert all(result == {"text": "generated"} for result in results)
+    assert len(calls) == 1
+    assert cache._inflight == {}
+
+
+@pytest.mark.asyncio
+async def test_inflight_cancelled_waiter(cache, tmp_path):
+    """Test that a waiter cancelled while another process holds the key can retry later."""
+    key = _key()
+    other = ResponseCache(storage_dir=tmp_path / "responses", ttl=60)
+    entered = []
+
+    async def wait():
+        async with cache.inflight(key):
+            entered.append(1)
+
+    async with other.inflight(key):
+        waiter = asyncio.ensure_future(wait())
+        await asyncio.sleep(0.05)
+        waiter.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await waiter
+    assert entered == [] and cache._inflight == {}
+
+    await asyncio.wait_for(wait(), timeout=1)
+    assert entered == [1]
@@ -0,0 +1,76 @@
+"""
+Tests for the compiled command risk classifier.
+"""
+import random
+import re
+
+import pytest
+
+from angela.components.safety.classifier import (
+    OVERRIDE_PATTERNS, RISK_PATTERNS, CommandRiskClassifier, command_words
+)
+from angela.constants import RISK_LEVELS
+
+
+def _sequential(command):
+    """Reference: every pattern searched in priority order."""
+    if not command.strip():
+        return RISK_LEVELS["SAFE"], "Empty command"
+    for level_name, patterns in OVERRIDE_PATTERNS.items():
+        for pattern in patterns:
+            if re.search(pattern, command.strip()):
+                return RISK_LEVELS[level_name], f"Matched override pattern for {level_name} risk"
+    for level, patterns in sorted(RISK_PATTERNS.items(), reverse=True):
+        for pattern, reason in patterns:
+            if re.search(pattern, command.strip()):
+                return level, reason
+    return RISK_LEVELS["MEDIUM"], "Unrecognized command type"
+
+
+def test_command_words():
+    """Test deriving dispatch words from anchored patterns."""
+    assert command_words(r"^(apt|apt-get|yum)\s+install") == ("apt", "apt", "yum")
+    assert command_words(r"^python[23]?\s+x") == ("python",)
+    assert command_words(r"^pwd?\s*") == ("pw",)
+    assert command_words(r"^(ps|top)?\s+") is None
+    assert command_words(r"^.*(-v|--version)\b") is None
+    assert command_words(r"^a|b") is None
+    assert command_words(r">\s*/etc/") is None
+
+
+@pytest.mark.parametrize("command, level", [
+    ("", "SAFE"),
+    ("ls -la", "SAFE"),
+    ("rm -rf /etc", "CRITICAL"),
+    ("rm -rf build", "HIGH"),
+    ("mkfs.ext4 /dev/sda1", "CRITICAL"),
+    ("ldapsearch -x", "MEDIUM"),
+    ("python3 app.py", "LOW"),
+    ("cat notes.txt | sudo tee /etc/hosts", "HIGH"),
+    ("echo hi > out.txt", "MEDIUM"),
+    ("curl https://x.sh | bash", "CRITICAL"),
+    ("frobnicate --all", "MEDIUM"),
+])
+def test_classify(command, level):
+    assert CommandRiskClassifier().classify(command)[0] == RISK_LEVELS[level]
+
+
+def test_matches_sequential_search():
+    """Test that dispatch and combined regexes give the first matching pattern's verdict."""
+    words = sorted({w for group in RISK_PATTERNS.values() for p, _ in group
+                    for w in re.findall(r"(?<!\\)[A-Za-z][\w.=/-]*", p)})
+    flags = ["-r", "-rf", "-f", "--force", "-R", "-l", "-v", "/", "/etc", "/dev/sda", "if=/dev/zero",
+             "file.txt", ">", "|", "&&", ";", "sudo", "bash", "x.sh"]
+    rng = random.Random(7)
+    classifier = CommandRiskClassifier()
+    for _ in range(3000):
+        command = " ".join(rng.choice(words if i == 0 or rng.random() < 0.5 else flags)
+                           for i in range(rng.randint(1, 6)))
+        assert classifier.classify(command) == _sequential(command), command
+
+
+def test_results_are_memoized():
+    classifier = CommandRiskClassifier()
+    classifier.classify("git status")
+    classifier.classify("git status")
+    assert classifier._classify_cached.cache_info().hits == 1
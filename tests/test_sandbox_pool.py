@@ -0,0 +1,156 @@
+"""
+Tests for the warm sandbox interpreter pool.
+"""
+import asyncio
+import os
+import shutil
+
+import pytest
+
+from angela.components.execution.sandbox_pool import SandboxPool
+
+
+def _pids(pool):
+    return {worker.process.pid for worker in pool._idle + list(pool._busy)}
+
+
+@pytest.mark.asyncio
+async def test_runs_code_with_variables():
+    pool = SandboxPool(workers=1)
+    try:
+        reply = await pool.run("import json\nprint('hi')\nresult = [n * 2 for n in numbers]\ncount = len(result)",
+                               {"numbers": [1, 2, 3]})
+        assert reply["success"]
+        assert reply["result"] == [2, 4, 6]
+        assert reply["stdout"] == "hi\n"
+        assert reply["variables"] == {"numbers": [1, 2, 3], "result": [2, 4, 6], "count": 3}
+
+        # Each run gets a fresh namespace
+        reply = await pool.run("result = 'count' in globals()")
+        assert reply["result"] is False
+    finally:
+        await pool.close()
+
+
+@pytest.mark.asyncio
+async def test_workers_are_reused_and_recycled():
+    pool = SandboxPool(workers=1, max_uses=3)
+    try:
+        await pool.warm()
+        first = _pids(pool)
+        for _ in range(3):
+            assert (await pool.run("result = 1"))["success"]
+        # The third run retired the worker; a replacement starts in the background
+        await asyncio.gather(*pool._refills)
+        assert _pids(pool) and _pids(pool) != first
+
+        second = _pids(pool)
+        await pool.run("result = 1")
+        assert _pids(pool) == second
+    finally:
+        await pool.close()
+
+
+@pytest.mark.asyncio
+async def test_errors_and_timeouts():
+    pool = SandboxPool(workers=1, timeout=0.5)
+    try:
+        reply = await pool.run("x = 1\nraise ValueError('bad input')")
+        assert not reply["success"]
+        assert reply["error"] == "bad input"
+        assert "ValueError" in reply["traceback"]
+
+        # Output written to the real stdout cannot corrupt the protocol
+        assert (await pool.run("import os\nos.write(1, b'noise\\n')\nresult = 2"))["result"] == 2
+        assert (await pool.run("raise SystemExit(3)"))["success"] is False
+
+        pid = _pids(pool)
+        reply = await pool.run("while True:\n    pass")
+        assert reply == {"success": False, "error": "Code execution timed out after 0.5 seconds"}
+        assert (await pool.run("result = 'alive'"))["result"] == "alive"
+        assert _pids(pool) != pid
+    finally:
+        await pool.close()
+
+
+@pytest.mark.asyncio
+async def test_memory_limit():
+    pool = SandboxPool(workers=1, memory_limit_mb=256)
+    try:
+        reply = await pool.run("data = bytearray(1024 * 1024 * 1024)")
+        assert not reply["success"] and "MemoryError" in reply["traceback"]
+        assert (await pool.run("result = 1"))["success"]
+    finally:
+        await pool.close()
+
+
+@pytest.mark.asyncio
+async def test_concurrent_runs_are_bounded():
+    pool = SandboxPool(workers=2)
+    try:
+        replies = await asyncio.gather(*(pool.run("import time\ntime.sleep(0.05)\nresult = n", {"n": n})
+                                         for n in range(6)))
+        assert [reply["result"] for reply in replies] == list(range(6))
+        assert len(_pids(pool)) == 2
+    finally:
+        await pool.close()
+
+
+@pytest.mark.asyncio
+@pytest.mark.skipif(shutil.which("node") is None, reason="Node.js is not installed")
+async def test_javascript():
+    pool = SandboxPool("javascript", workers=1)
+    try:
+        reply = await pool.run("console.log('hi', {a: 1});\nvar result = items.map(i => i + 1);", {"items": [1, 2]})
+        assert reply["success"]
+        assert reply["result"] == [2, 3]
+        assert reply["stdout"] == 'hi {"a":1}\n'
+
+        reply = await pool.run("throw new Error('bad input')")
+        assert not reply["success"] and reply["error"] == "bad input"
+    finally:
+        await pool.close()
+
+
+@pytest.mark.asyncio
+@pytest.mark.skipif(shutil.which("node") is None, reason="Node.js is not installed")
+async def test_javascript_node_globals_and_async_work(tmp_path):
+    (tmp_path / "data.txt").write_text("from disk")
+    pool = SandboxPool("javascript", workers=1, timeout=2)
+    try:
+        reply = await pool.run(
+            "var home = process.env.HOME;\n"
+            "var encoded = Buffer.from('hi').toString('base64');\n"
+            "var host = new URL('https://example.com/a').host;\n"
+            "var size = new TextEncoder().encode('abc').length;",
+        )
+        assert reply["success"], reply
+        assert reply["variables"] == {"home": os.environ["HOME"], "encoded": "aGk=",
+                                      "host": "example.com", "size": 3}
+
+        # Callbacks and promises started by the code finish before the reply
+        reply = await pool.run(
+            "setTimeout(() => { result = 'later'; console.log('timer'); }, 50);\n"
+            "require('fs').promises.readFile(path, 'utf8').then(console.log);",
+            {"path": str(tmp_path / "data.txt")}
+        )
+        assert reply["success"], reply
+        assert reply["result"] == "later"
+        assert sorted(reply["stdout"].splitlines()) == ["from disk", "timer"]
+
+        # A returned promise is awaited; its rejection fails the step
+        reply = await pool.run("(async () => { throw new Error('async failure'); })()")
+        assert not reply["success"] and reply["error"] == "async failure"
+        reply = await pool.run("setTimeout(() => { throw new Error('in callback'); }, 10);")
+        assert not reply["success"] and reply["error"] == "in callback"
+
+        # Writes to the real stdout are captured rather than corrupting the protocol
+        reply = await pool.run("process.stdout.write('raw\\n'); var result = 1;")
+        assert reply["stdout"] == "raw\n" and reply["result"] == 1
+
+        # The timeout covers the asynchronous part
+        reply = await pool.run("setInterval(() => {}, 100);")
+        assert reply == {"success": False, "error": "Code execution timed out after 2 seconds"}
+        assert (await pool.run("var result = 'alive';"))["result"] == "alive"
+    finally:
+        await pool.close()
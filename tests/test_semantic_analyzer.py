@@ -0,0 +1,122 @@
+"""
+Tests for Python entity extraction in the semantic analyzer.
+"""
+import ast
+import asyncio
+import textwrap
+
+from angela.api import context as api_context
+from angela.components.ai.semantic_analyzer import Module, PythonEntityExtractor, SemanticAnalyzer
+from angela.components.context.project_index import ProjectIndex
+
+SOURCE = textwrap.dedent('''
+    """Module docstring."""
+    import os
+    from typing import List as L
+
+    LIMIT: int = 10
+    name = "x"
+    _private = 1
+
+    @app.routes.get("/")
+    def handler(request):
+        local = 1
+        if request and local:
+            return os.path.join("a", "b")
+        def inner():
+            for _ in range(3):
+                print("hi")
+        return inner
+
+    class Base(models.db.Model):
+        kind = "base"
+        size: int = 3
+
+        def run(self, x):
+            try:
+                self.step(x)
+            except ValueError:
+                pass
+            except KeyError:
+                pass
+
+        class Meta:
+            def describe(self):
+                return str(self)
+''')
+
+
+def _extract():
+    module = Module("example.py")
+    PythonEntityExtractor(module).visit(ast.parse(SOURCE))
+    return module
+
+
+def test_module_level_entities():
+    """Test imports, variables and docstring."""
+    module = _extract()
+    assert module.docstring == "Module docstring."
+    assert {name: imp.import_path for name, imp in module.imports.items()} == {"os": "os", "L": "typing.List"}
+    assert module.dependencies == ["os", "typing.List"]
+    # Locals and class attributes are not module variables
+    assert set(module.variables) == {"LIMIT", "name"}
+    assert module.variables["LIMIT"].var_type == "int" and module.variables["LIMIT"].is_constant
+
+
+def test_functions_calls_and_complexity():
+    """Test that nested calls and branches count for every enclosing function."""
+    module = _extract()
+    handler = module.functions["handler"]
+    assert handler.decorators == ["app.routes.get"]
+    assert handler.params == ["request"]
+    # if + "and" + for, plus calls of the nested function
+    assert handler.complexity == 4
+    assert sorted(handler.called_functions) == ["print", "range"]
+    inner = module.functions["inner"]
+    assert not inner.is_method and inner.complexity == 2
+
+
+def test_classes_and_methods():
+    """Test methods, attributes and nested classes."""
+    module = _extract()
+    base = module.classes["Base"]
+    assert base.base_classes == ["models.db.Model"]
+    assert set(base.attributes) == {"kind", "size"}
+    assert base.attributes["size"].var_type == "int"
+    assert base.methods["run"].class_name == "Base"
+    assert base.methods["run"].complexity == 3
+    assert base.methods["run"].called_functions == ["self.step"]
+    assert "run" not in module.functions
+
+    meta = module.classes["Meta"]
+    assert base.nested_classes["Meta"] is meta
+    assert meta.methods["describe"].is_method
+
+
+def test_project_analysis_in_workers(tmp_path, monkeypatch):
+    """Test that parsing in worker processes matches parsing in this process."""
+    project = tmp_path / "project"
+    (project / "pkg").mkdir(parents=True)
+    for n in range(20):
+        (project / "pkg" / f"mod{n}.py").write_text(SOURCE + f"\ndef extra{n}():\n    return {n}\n")
+    (project / "app.js").write_text("import x from 'y';\nfunction run(a) { return a; }\n")
+    index = ProjectIndex(project, storage_dir=tmp_path / "index")
+    index.refresh()
+    monkeypatch.setattr(api_context, "get_project_index", lambda root, refresh=True: index)
+
+    def analyze(**kwargs):
+        analyzer = SemanticAnalyzer()
+        analyzer._analysis_cache_created = True  # no persistent cache
+        return asyncio.run(analyzer.analyze_project_files(project, **kwargs))
+
+    progress = []
+    parallel = analyze(max_workers=2, progress_callback=lambda done, total: progress.append((done, total)))
+    serial = analyze(max_workers=1)
+    assert len(parallel) == 21
+    assert progress[-1] == (21, 21)
+    assert {path: m.to_dict() for path, m in parallel.items()} == {path: m.to_dict() for path, m in serial.items()}
+    assert "extra7" in parallel[str(project / "pkg" / "mod7.py")].functions
+
+    one_file = (project / "pkg" / "mod0.py").stat().st_size
+    assert len(analyze(size_budget=one_file)) == 1
+    assert analyze(time_budget=0) == {}
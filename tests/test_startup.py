@@ -0,0 +1,75 @@
+"""
+Tests for the import-light startup path.
+"""
+import json
+import subprocess
+import sys
+
+import pytest
+
+from angela.startup import (
+    get_invoked_command, get_startup_profile, FULL_PROFILE, SERVICE_FACTORIES
+)
+
+# Modules that must not be imported by the shell-integration fast paths
+HEAVY_MODULES = [
+    "typer",
+    "rich.console",
+    "google.generativeai",
+    "angela.orchestrator",
+    "angela.components.shell.formatter",
+    "angela.utils.logging",
+    "asyncio",
+]
+
+
+def _modules_after(snippet: str):
+    """Run a snippet in a fresh interpreter and return the loaded modules."""
+    code = f"{snippet}\nimport sys, json\nprint(json.dumps(sorted(sys.modules)))"
+    result = subprocess.run(
+        [sys.executable, "-c", code], capture_output=True, text=True, timeout=60
+    )
+    assert result.returncode == 0, result.stderr
+    return set(json.loads(result.stdout.strip().splitlines()[-1]))
+
+
+def test_get_invoked_command():
+    """Test subcommand detection with and without global flags."""
+    assert get_invoked_command([]) is None
+    assert get_invoked_command(["request", "list files"]) == "request"
+    assert get_invoked_command(["--debug", "files", "ls"]) == "files"
+    assert get_invoked_command(["--completions", "files"]) == "--completions"
+
+
+def test_startup_profiles():
+    """Test that lightweight commands skip eager startup work."""
+    assert get_startup_profile("--notify") == ()
+    assert get_startup_profile("status") == ()
+    assert get_startup_profile("request") == FULL_PROFILE
+    # Unknown commands keep the full initialization
+    assert get_startup_profile("something-new") == FULL_PROFILE
+
+
+@pytest.mark.parametrize("argv", [["--version"], ["--completions", "files"], ["--completions"]])
+def test_fast_paths_stay_import_light(argv):
+    """Test that fast paths never load the CLI or AI stack."""
+    modules = _modules_after(
+        "import contextlib, io\n"
+        "from angela.startup import run_fast_path\n"
+        "with contextlib.redirect_stdout(io.StringIO()):\n"
+        f"    assert run_fast_path({argv!r}) == 0\n"
+    )
+    loaded = [name for name in HEAVY_MODULES if name in modules]
+    assert loaded == []
+
+
+def test_init_application_registers_lazily():
+    """Test that init_application does not construct services up front."""
+    modules = _modules_after(
+        "from angela import init_application\n"
+        "init_application('status')\n"
+        "from angela.core.registry import registry\n"
+        f"assert set({sorted(SERVICE_FACTORIES)!r}) <= set(registry._factories)\n"
+    )
+    assert "angela.orchestrator" not in modules
+    assert "angela.components.toolchain.ci_cd" not in modules
@@ -0,0 +1,187 @@
+"""
+Tests for the DAG step scheduler.
+"""
+import asyncio
+
+import pytest
+
+from angela.components.execution.step_scheduler import ScheduledStep, StepOutcome, StepScheduler
+
+
+def _graph(**dependencies):
+    return {step_id: ScheduledStep(step_id, deps) for step_id, deps in dependencies.items()}
+
+
+class Recorder:
+    """Runs steps by sleeping, recording concurrency."""
+
+    def __init__(self, durations=None, fail=(), activate=None):
+        self.durations = durations or {}
+        self.fail = set(fail)
+        self.activate = activate or {}
+        self.order = []
+        self.running = 0
+        self.max_running = 0
+
+    async def __call__(self, step_id):
+        self.order.append(step_id)
+        self.running += 1
+        self.max_running = max(self.max_running, self.running)
+        try:
+            await asyncio.sleep(self.durations.get(step_id, 0.05))
+        finally:
+            self.running -= 1
+        if step_id in self.fail:
+            raise RuntimeError(f"{step_id} failed")
+        return StepOutcome(success=True, activate=self.activate.get(step_id, ()))
+
+
+@pytest.mark.asyncio
+async def test_independent_steps_overlap():
+    steps = _graph(a=[], b=["a"], c=["a"], d=["a"], e=["b", "c", "d"])
+    recorder = Recorder()
+    report = await StepScheduler(max_parallel=8).run(steps, recorder, ["a"])
+
+    assert report.success and report.not_run == []
+    assert report.completed[0] == "a" and report.completed[-1] == "e"
+    assert recorder.max_running == 3
+    # Three levels of 50ms each, not five steps in sequence
+    assert report.wall_time < 0.2
+
+
+@pytest.mark.asyncio
+async def test_parallelism_is_bounded():
+    steps = _graph(**{f"s{i}": [] for i in range(6)})
+    recorder = Recorder()
+    report = await StepScheduler(max_parallel=2).run(steps, recorder, list(steps))
+    assert len(report.completed) == 6
+    assert recorder.max_running == 2
+
+
+@pytest.mark.asyncio
+async def test_shared_resources_are_serialized():
+    steps = {
+        "w1": ScheduledStep("w1", resources=["file:/tmp/out.txt"]),
+        "w2": ScheduledStep("w2", resources=["file:/tmp/out.txt", "db"]),
+        "w3": ScheduledStep("w3", resources=["db"]),
+        "other": ScheduledStep("other"),
+    }
+    holders = {}
+    overlaps = []
+
+    async def run_step(step_id):
+        for resource in steps[step_id].resources:
+            if holders.get(resource):
+                overlaps.append((holders[resource], step_id))
+            holders[resource] = step_id
+        await asyncio.sleep(0.02)
+        for resource in steps[step_id].resources:
+            holders[resource] = None
+        return StepOutcome(success=True)
+
+    report = await StepScheduler(max_parallel=4).run(steps, run_step, list(steps))
+    assert sorted(report.completed) == ["other", "w1", "w2", "w3"]
+    assert overlaps == []
+
+
+@pytest.mark.asyncio
+async def test_failure_cancels_running_steps():
+    steps = _graph(fast=[], slow=[], after=["fast"])
+    recorder = Recorder(durations={"fast": 0.01, "slow": 1.0}, fail={"fast"})
+    report = await StepScheduler().run(steps, recorder, ["fast", "slow"])
+
+    assert not report.success
+    assert report.failed_step == "fast"
+    assert report.cancelled == ["slow"]
+    assert report.not_run == ["after"]
+    assert report.wall_time < 0.5
+
+
+@pytest.mark.asyncio
+async def test_non_critical_failure_blocks_only_dependents():
+    steps = {"a": ScheduledStep("a", critical=False), "b": ScheduledStep("b", ["a"]), "c": ScheduledStep("c")}
+    report = await StepScheduler().run(steps, Recorder(fail={"a"}), ["a", "c"])
+    assert report.success
+    assert (report.failed, report.completed, report.not_run) == (["a"], ["c"], ["b"])
+
+
+@pytest.mark.asyncio
+async def test_activation_and_readiness():
+    # Only entry points, dependents of completed steps and activated branches run
+    steps = _graph(decide=[], yes=[], no=[], orphan=[], missing_dep=["nowhere"])
+    recorder = Recorder(activate={"decide": ["yes"]})
+    report = await StepScheduler().run(steps, recorder, ["decide", "missing_dep"])
+    assert report.completed == ["decide", "yes"]
+    assert sorted(report.not_run) == ["missing_dep", "no", "orphan"]
+    assert report.predecessors["yes"] == ["decide"]
+
+    variables = set()
+
+    async def run_step(step_id):
+        variables.add(step_id)
+        return StepOutcome(success=True)
+
+    steps = _graph(producer=[], consumer=[])
+    report = await StepScheduler().run(steps, run_step, ["consumer", "producer"],
+                                       can_start=lambda s: s != "consumer" or "producer" in variables)
+    assert report.completed == ["producer", "consumer"]
+
+
+@pytest.mark.asyncio
+async def test_decision_runs_only_the_chosen_branch():
+    # Branch steps depend on the decision, as planners generate them
+    steps = {
+        "s1": ScheduledStep("s1"),
+        "d": ScheduledStep("d", ["s1"], branches=["t", "f"]),
+        "t": ScheduledStep("t", ["d"]),
+        "f": ScheduledStep("f", ["d"]),
+        "f2": ScheduledStep("f2", ["f"]),
+        "join": ScheduledStep("join", ["t", "f"]),
+        "after": ScheduledStep("after", ["d"]),
+    }
+    recorder = Recorder(durations=dict.fromkeys(steps, 0.01), activate={"d": ["t"]})
+    report = await StepScheduler().run(steps, recorder, ["s1"])
+
+    assert report.success
+    assert sorted(recorder.order) == ["after", "d", "join", "s1", "t"]
+    assert report.skipped == ["f", "f2"]
+    assert report.not_run == []
+
+
+@pytest.mark.asyncio
+async def test_critical_path_report():
+    steps = _graph(a=[], short=["a"], long=["a"], end=["short", "long"])
+    recorder = Recorder(durations={"a": 0.02, "short": 0.01, "long": 0.08, "end": 0.02})
+    report = await StepScheduler().run(steps, recorder, ["a"])
+
+    path, path_time = report.critical_path()
+    assert path == ["a", "long", "end"]
+    assert path_time == pytest.approx(0.12, abs=0.04)
+
+    timing = report.timing_report()
+    assert timing["critical_path"] == path
+    assert set(timing["steps"]) == {"a", "short", "long", "end"}
+    assert timing["step_time"] > timing["critical_path_time"]
+
+
+@pytest.mark.asyncio
+async def test_failure_kills_running_commands(tmp_path):
+    from angela.components.execution.engine import ExecutionEngine
+
+    engine = ExecutionEngine()
+    marker = tmp_path / "done"
+
+    async def run_step(step_id):
+        if step_id == "fail":
+            await asyncio.sleep(0.1)
+            return StepOutcome(success=False)
+        await engine.execute_command(f"sleep 1; echo done > {marker}", check_safety=False)
+        return StepOutcome(success=True)
+
+    report = await StepScheduler().run(_graph(fail=[], command=[]), run_step, ["fail", "command"])
+    assert report.failed_step == "fail"
+    assert report.cancelled == ["command"]
+
+    # The cancelled step's command was killed, not left to finish
+    await asyncio.sleep(1.5)
+    assert not marker.exists()
@@ -0,0 +1,73 @@
+"""
+Tests for incremental parsing of streamed AI responses.
+"""
+import pytest
+
+from angela.components.ai.parser import StreamingResponseParser, parse_ai_response_stream
+
+
+RESPONSE = (
+    '```json\n'
+    '{"intent": "list_files", "command": "ls -la", '
+    '"explanation": "Lists \\"all\\" files\\nincluding hidden ones", "additional_info": null}\n'
+    '```'
+)
+
+
+def _chunks(text, size):
+    return [text[i:i + size] for i in range(0, len(text), size)]
+
+
+@pytest.mark.parametrize("size", [1, 3, 7, len(RESPONSE)])
+def test_fields_complete_independent_of_chunking(size):
+    """Test that the result does not depend on where the chunks are split."""
+    parser = StreamingResponseParser()
+    completed = []
+    for chunk in _chunks(RESPONSE, size):
+        completed.extend(key for key, _ in parser.feed(chunk))
+
+    assert completed == ["intent", "command", "explanation", "additional_info"]
+    suggestion = parser.finish()
+    assert suggestion.command == "ls -la"
+    assert suggestion.explanation == 'Lists "all" files\nincluding hidden ones'
+
+
+def test_command_available_before_explanation():
+    """Test that the command is usable while the explanation is still streaming."""
+    parser = StreamingResponseParser()
+    cut = RESPONSE.index("hidden")
+    parser.feed(RESPONSE[:cut])
+
+    assert parser.fields["command"] == "ls -la"
+    assert "explanation" not in parser.fields
+    assert parser.partial_value("explanation") == 'Lists "all" files\nincluding '
+
+
+def test_partial_value_with_cut_escape():
+    """Test that a value cut inside an escape sequence still decodes."""
+    parser = StreamingResponseParser()
+    parser.feed('{"command": "echo caf\\u00')
+    assert parser.partial_value("command") == "echo caf"
+    parser.feed('e9 \\')
+    assert parser.partial_value("command") == "echo café "
+    assert parser.partial_value("explanation") is None
+
+
+def test_finish_falls_back_to_full_parse():
+    """Test that malformed streams use the non-incremental parser."""
+    parser = StreamingResponseParser()
+    parser.feed('command: "pwd",')
+    assert parser.finish().command == "pwd"
+
+
+@pytest.mark.asyncio
+async def test_parse_stream_reports_fields():
+    """Test the async helper over a chunk iterator."""
+    async def stream():
+        for chunk in _chunks(RESPONSE, 5):
+            yield chunk
+
+    seen = []
+    suggestion = await parse_ai_response_stream(stream(), on_field=lambda key, value: seen.append(key))
+    assert suggestion.intent == "list_files"
+    assert seen[:2] == ["intent", "command"]
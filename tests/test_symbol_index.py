@@ -0,0 +1,133 @@
+"""
+Tests for the project-wide symbol index.
+"""
+import ast
+import textwrap
+
+import pytest
+
+from angela.components.ai.semantic_analyzer import Module, PythonEntityExtractor, SemanticAnalyzer
+from angela.components.ai.symbol_index import SymbolIndex, module_name
+
+SOURCES = {
+    "/project/pkg/models.py": '''
+        """Data models."""
+        class Model:
+            """Base model that can save itself."""
+            def save(self):
+                return validate(self)
+
+        class User(Model):
+            """A user account."""
+            def load_profile(self):
+                return fetch_user(self.id)
+
+        def validate(obj):
+            """Check a model before saving it."""
+            return True
+    ''',
+    "/project/pkg/service.py": '''
+        from pkg.models import User, validate
+        import pkg.models as models
+
+        MAX_USERS = 10
+
+        def fetch_user(user_id):
+            """Load a user from the database."""
+            user = User()
+            validate(user)
+            return user
+
+        class Admin(User):
+            def save(self):
+                return validate(self)
+    ''',
+}
+
+
+def _modules():
+    modules = {}
+    for filename, source in SOURCES.items():
+        module = Module(filename)
+        PythonEntityExtractor(module).visit(ast.parse(textwrap.dedent(source)))
+        modules[filename] = module
+    return modules
+
+
+def test_definitions_and_names():
+    """Test looking up definitions by plain, qualified and full names."""
+    index = SymbolIndex(_modules(), "/project")
+    assert module_name("/project/pkg/__init__.py", "/project") == "pkg"
+    assert module_name("/elsewhere/tool.py", "/project") == "tool"
+
+    save = index.definitions("save")
+    assert [(s.qualified_name, s.kind) for s in save] == [("Model.save", "method"), ("Admin.save", "method")]
+    assert index.definitions("Admin.save")[0].full_name == "pkg.service.Admin.save"
+    assert index.definitions("pkg.models.validate")[0].kind == "function"
+    assert index.definitions("MAX_USERS", kinds=("function",)) == []
+
+    user = index.find("User")
+    assert (user.kind, user.filename, user.line_start) == ("class", "/project/pkg/models.py", 8)
+    assert index.find("User.load_profile").class_name == "User"
+    assert index.find("missing") is None
+
+
+def test_reverse_references():
+    """Test finding callers, subclasses and importers."""
+    index = SymbolIndex(_modules(), "/project")
+    assert {s.qualified_name for s in index.callers("validate")} == {"Model.save", "fetch_user", "Admin.save"}
+    assert [s.qualified_name for s in index.subclasses("User")] == ["Admin"]
+
+    references = index.references("User")
+    assert [(r.kind, r.line) for r in references] == [("import", 2), ("call", 7), ("inherit", 13)]
+    assert len(index.importers("models")) == 1
+
+
+def test_keyword_search():
+    """Test ranking entities by name and docstring keywords."""
+    index = SymbolIndex(_modules(), "/project")
+    results = index.search(["load", "user"], limit=3)
+    assert [s.qualified_name for s, _ in results] == ["fetch_user", "User", "User.load_profile"]
+    assert [score for _, score in results] == pytest.approx([1.0 + 0.3 + 0.3, 1.0 + 0.3, 1.0])
+    assert all(s.kind != "variable" for s, _ in index.search(["max"]))
+
+
+def test_keyword_search_splits_camel_case():
+    """Test that CamelCase and camelCase names are searchable by their words."""
+    module = Module("/project/rollback.py")
+    source = """
+        class RollbackManager:
+            pass
+
+        def getUserName():
+            pass
+
+        def parseHTTPResponse():
+            pass
+    """
+    PythonEntityExtractor(module).visit(ast.parse(textwrap.dedent(source)))
+    index = SymbolIndex({module.filename: module}, "/project")
+    assert [s.qualified_name for s, _ in index.search(["manager"])] == ["RollbackManager"]
+    assert [s.qualified_name for s, _ in index.search(["user"])] == ["getUserName"]
+    assert [s.qualified_name for s, _ in index.search(["http", "response"])] == ["parseHTTPResponse"]
+
+
+def test_find_related_entities_uses_index():
+    """Test relationship lookups and reuse of the index for the same modules."""
+    analyzer = SemanticAnalyzer()
+    modules = _modules()
+
+    related = analyzer.find_related_entities("validate", modules)
+    assert sorted((r["name"], r["relationship"]) for r in related) == [
+        ("Admin.save", "called_by"), ("Model.save", "called_by"),
+        ("fetch_user", "called_by"), ("fetch_user", "calls"),
+    ]
+    related = analyzer.find_related_entities("User", modules)
+    assert sorted((r["name"], r["relationship"]) for r in related) == [
+        ("Admin", "extended_by"), ("Admin", "inherits_from"), ("fetch_user", "called_by")
+    ]
+
+    index = analyzer.get_symbol_index(modules)
+    assert analyzer.get_symbol_index(dict(modules)) is index
+    modules["/project/pkg/service.py"] = _modules()["/project/pkg/service.py"]
+    assert analyzer.get_symbol_index(modules) is not index
@@ -0,0 +1,130 @@
+"""
+Tests for the persistent CLI tool catalog.
+"""
+import asyncio
+import os
+
+import pytest
+
+from angela.components.toolchain.tool_catalog import ToolCatalog
+
+
+@pytest.fixture
+def bin_dir(tmp_path, monkeypatch):
+    directory = tmp_path / "bin"
+    directory.mkdir()
+    monkeypatch.setenv("PATH", str(directory))
+    return directory
+
+
+def _install(bin_dir, name, help_text="usage: tool [options]"):
+    """Install a fake tool that logs each run next to itself."""
+    path = bin_dir / name
+    path.write_text(f"#!/bin/sh\necho \"$@\" >> {bin_dir / (name + '.log')}\necho '{help_text}'\n")
+    path.chmod(0o755)
+    return path
+
+
+def _runs(bin_dir, name):
+    log = bin_dir / (name + ".log")
+    return log.read_text().splitlines() if log.exists() else []
+
+
+def _bump_mtime(path):
+    st = os.stat(path)
+    os.utime(path, ns=(st.st_atime_ns, st.st_mtime_ns + 10**9))
+
+
+def test_resolve_follows_path_changes(bin_dir):
+    catalog = ToolCatalog(persistent=False)
+    assert catalog.resolve("mytool") is None
+    assert "mytool" not in catalog.executables()
+
+    path = _install(bin_dir, "mytool")
+    _bump_mtime(bin_dir)
+    assert catalog.resolve("mytool") == str(path)
+    assert "mytool" in catalog.executables()
+
+    path.unlink()
+    _bump_mtime(bin_dir)
+    assert catalog.resolve("mytool") is None
+
+
+@pytest.mark.asyncio
+async def test_help_text_is_fetched_once_per_binary(bin_dir, tmp_path):
+    tool = _install(bin_dir, "mytool")
+    db_path = tmp_path / "catalog.db"
+
+    catalog = ToolCatalog(db_path)
+    results = await asyncio.gather(catalog.get_help_text("mytool", "sub"), catalog.get_help_text("mytool", "sub"))
+    assert results == ["usage: tool [options]\n"] * 2
+    assert _runs(bin_dir, "mytool") == ["sub --help"]
+    catalog.close()
+
+    # A new process reads the stored help text
+    catalog = ToolCatalog(db_path)
+    assert await catalog.get_help_text("mytool", "sub") == "usage: tool [options]\n"
+    assert _runs(bin_dir, "mytool") == ["sub --help"]
+
+    # Upgrading the tool invalidates its entries
+    _bump_mtime(tool)
+    assert await catalog.get_help_text("mytool", "sub") == "usage: tool [options]\n"
+    assert len(_runs(bin_dir, "mytool")) == 2
+    assert await catalog.get_help_text("missing") is None
+
+
+def test_definitions_are_keyed_by_binary_mtime(bin_dir, tmp_path):
+    tool = _install(bin_dir, "mytool")
+    catalog = ToolCatalog(tmp_path / "catalog.db")
+    definition = {"tool": "mytool", "command": "run", "options": [{"name": "verbose"}]}
+
+    catalog.put_definition("mytool", "run", definition)
+    assert catalog.get_definition("mytool", "run") == definition
+    assert catalog.get_definition("mytool") is None
+    assert ToolCatalog(tmp_path / "catalog.db").get_definition("mytool", "run") == definition
+
+    _bump_mtime(tool)
+    assert catalog.get_definition("mytool", "run") is None
+    assert _runs(bin_dir, "mytool") == []
+
+
+def test_analyses_evict_least_recently_used(tmp_path):
+    catalog = ToolCatalog(tmp_path / "catalog.db", max_analyses=2)
+    catalog.put_analysis("list files", {"tool": "ls"})
+    catalog.put_analysis("show commits", {"tool": "git"})
+    assert catalog.get_analysis("list files") == {"tool": "ls"}
+    catalog.put_analysis("run container", {"tool": "docker"})
+
+    assert catalog.get_analysis("show commits") is None
+    assert catalog.get_analysis("list files") == {"tool": "ls"}
+    assert catalog.get_analysis("run container") == {"tool": "docker"}
+
+
+@pytest.mark.asyncio
+async def test_prewarm_fetches_installed_tools(bin_dir):
+    for name in ("git", "npm"):
+        _install(bin_dir, name)
+    catalog = ToolCatalog(persistent=False)
+    await catalog.prewarm(["git", "docker", "npm"])
+    assert _runs(bin_dir, "git") == ["--help"] and _runs(bin_dir, "npm") == ["--help"]
+
+    await catalog.prewarm(["git", "docker", "npm"])
+    assert _runs(bin_dir, "git") == ["--help"]
+
+
+@pytest.mark.asyncio
+async def test_translator_spawns_nothing_for_cached_tool(bin_dir, monkeypatch):
+    from angela.components.toolchain.universal_cli import UniversalCLITranslator
+
+    _install(bin_dir, "mytool")
+    translator = UniversalCLITranslator()
+    translator._catalog = ToolCatalog(persistent=False)
+    translator._catalog.put_definition("mytool", "run", {"tool": "mytool", "command": "run", "usage": "mytool run"})
+
+    async def no_subprocess(*args, **kwargs):
+        raise AssertionError(f"unexpected subprocess {args}")
+
+    monkeypatch.setattr(asyncio, "create_subprocess_exec", no_subprocess)
+    assert await translator._is_tool_available("mytool")
+    definition = await translator._get_command_definition("mytool", "run")
+    assert definition.usage == "mytool run"